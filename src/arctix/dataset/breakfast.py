@@ -11,22 +11,26 @@ __all__ = [
     "DATASET_SPLITS",
     "NUM_COOKING_ACTIVITIES",
     "URLS",
+    "VOCAB_COLUMNS",
     "Column",
     "MetadataKeys",
+    "Preprocessor",
     "download_data",
     "fetch_data",
     "filter_by_split",
+    "get_person",
     "group_by_sequence",
     "load_annotation_file",
     "load_data",
     "parse_annotation_lines",
     "prepare_data",
+    "prepare_data_incremental",
     "to_array",
+    "to_array_chunks",
     "to_list",
 ]
 
 import logging
-import tarfile
 from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -36,14 +40,20 @@ import polars as pl
 from coola.utils.path import sanitize_path
 
 from arctix.transformer import dataframe as td
-from arctix.utils.dataframe import drop_duplicates, generate_vocabulary
-from arctix.utils.download import download_drive_file
-from arctix.utils.iter import FileFilter, PathLister
+from arctix.utils.archive import extract_archive
+from arctix.utils.chunking import iter_sequence_chunks
+from arctix.utils.dataframe import drop_duplicates
+from arctix.utils.download import download_drive_file, download_files
+from arctix.utils.incremental import prepare_incremental
+from arctix.utils.iter import FileFilter, PathFilter, PathLister
 from arctix.utils.mapping import convert_to_dict_of_flat_lists
 from arctix.utils.masking import convert_sequences_to_array, generate_mask_from_lengths
+from arctix.utils.preprocessor import BasePreprocessor
+from arctix.utils.vocab import Vocabulary
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections import Counter
+    from collections.abc import Iterator, Mapping, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -125,8 +135,19 @@ class MetadataKeys:
     VOCAB_PERSON: str = "vocab_person"
 
 
+VOCAB_COLUMNS = {
+    MetadataKeys.VOCAB_ACTION: Column.ACTION,
+    MetadataKeys.VOCAB_ACTIVITY: Column.COOKING_ACTIVITY,
+    MetadataKeys.VOCAB_PERSON: Column.PERSON,
+}
+
+
 def fetch_data(
-    path: Path, name: str, remove_duplicate: bool = True, force_download: bool = False
+    path: Path,
+    name: str,
+    remove_duplicate: bool = True,
+    force_download: bool = False,
+    split: str | None = None,
 ) -> pl.DataFrame:
     r"""Download and load the data for Breakfast dataset.
 
@@ -140,12 +161,15 @@ def fetch_data(
             everytime this function is called. If ``False``,
             the annotations are downloaded only if the
             given path does not contain the annotation data.
+        split: The dataset split to load. If ``None``, all the
+            annotations are loaded. See ``load_data`` for more
+            information.
 
     Returns:
         The data in a DataFrame
 
     Raises:
-        RuntimeError: if the name is incorrect
+        RuntimeError: if the name or the split is incorrect
 
     Example usage:
 
@@ -164,18 +188,22 @@ def fetch_data(
         raise RuntimeError(msg)
     path = sanitize_path(path)
     download_data(path, force_download)
-    return load_data(path.joinpath(name), remove_duplicate)
+    return load_data(path.joinpath(name), remove_duplicate, split=split)
 
 
-def download_data(path: Path, force_download: bool = False) -> None:
+def download_data(path: Path, force_download: bool = False, max_workers: int = 2) -> None:
     r"""Download the Breakfast annotations.
 
+    The archives are downloaded concurrently, and each archive is
+    extracted as soon as it is downloaded.
+
     Args:
         path: The path where to store the downloaded data.
         force_download: If ``True``, the annotations are downloaded
             everytime this function is called. If ``False``,
             the annotations are downloaded only if the
             given path does not contain the annotation data.
+        max_workers: The maximum number of concurrent downloads.
 
     Example usage:
 
@@ -189,25 +217,42 @@ def download_data(path: Path, force_download: bool = False) -> None:
     """
     path = sanitize_path(path)
     logger.info(f"Downloading Breakfast dataset annotations in {path}...")
-    for name, url in URLS.items():
-        if not path.joinpath(name).is_dir() or force_download:
-            tar_file = path.joinpath(f"{name}.tar.gz")
-            download_drive_file(url, tar_file, quiet=False, fuzzy=True)
-            with tarfile.open(tar_file) as file:
-                file.extractall(path)  # noqa: S202
-            tar_file.unlink(missing_ok=True)
+
+    def _extract(url: str, tar_file: Path) -> None:  # noqa: ARG001
+        extract_archive(tar_file, path)
+        tar_file.unlink(missing_ok=True)
+
+    download_files(
+        [
+            (url, path.joinpath(f"{name}.tar.gz"))
+            for name, url in URLS.items()
+            if not path.joinpath(name).is_dir() or force_download
+        ],
+        download_fn=partial(download_drive_file, quiet=True, fuzzy=True),
+        on_complete=_extract,
+        max_workers=max_workers,
+    )
 
 
-def load_data(path: Path, remove_duplicate: bool = True) -> pl.DataFrame:
+def load_data(path: Path, remove_duplicate: bool = True, split: str | None = None) -> pl.DataFrame:
     r"""Load all the annotations in a DataFrame.
 
     Args:
         path: The directory where the dataset annotations are stored.
         remove_duplicate: If ``True``, the duplicate rows are removed.
+        split: The dataset split to load. If ``None``, all the
+            annotations are loaded. The person is encoded in the
+            annotation file name, so the files of the other persons
+            are skipped without being read. Note that
+            ``prepare_data`` generates the vocabularies from the
+            loaded data, so they only contain the tokens of the split.
 
     Returns:
         The annotations in a DataFrame.
 
+    Raises:
+        RuntimeError: if the split is incorrect
+
     Example usage:
 
     ```pycon
@@ -218,19 +263,38 @@ def load_data(path: Path, remove_duplicate: bool = True) -> pl.DataFrame:
 
     ```
     """
-    paths = FileFilter(PathLister([sanitize_path(path)], pattern="**/*.txt"))
+    paths = PathLister([sanitize_path(path)], pattern="**/*.txt")
+    if split is not None:
+        if split not in DATASET_SPLITS:
+            msg = f"Incorrect split: {split}. Valid splits are: {sorted(DATASET_SPLITS)}"
+            raise RuntimeError(msg)
+        persons = set(DATASET_SPLITS[split])
+        paths = PathFilter(paths, predicate=lambda path: get_person(path) in persons)
+    paths = FileFilter(paths)
     annotations = list(map(load_annotation_file, paths))
     data = convert_to_dict_of_flat_lists(annotations)
-    data = pl.DataFrame(data)
+    return _combine_annotations(pl.DataFrame(data), remove_duplicate=remove_duplicate)
+
+
+def _combine_annotations(frame: pl.DataFrame, remove_duplicate: bool = True) -> pl.DataFrame:
+    r"""Combine the annotations of several files in a sorted DataFrame.
+
+    Args:
+        frame: The annotations of the files.
+        remove_duplicate: If ``True``, the duplicate rows are removed.
+
+    Returns:
+        The annotations in a sorted DataFrame.
+    """
     if remove_duplicate:
-        data = drop_duplicates(data)
+        frame = drop_duplicates(frame)
     transformer = td.Sequential(
         [
             td.Sort(columns=[Column.COOKING_ACTIVITY, Column.PERSON, Column.START_TIME]),
             td.SortColumns(),
         ]
     )
-    return transformer.transform(data)
+    return transformer.transform(frame)
 
 
 def load_annotation_file(path: Path) -> dict[str, list]:
@@ -269,13 +333,36 @@ def load_annotation_file(path: Path) -> dict[str, list]:
         lines = [x.strip() for x in file.readlines()]
 
     annotation = parse_annotation_lines(lines)
-    person_id = path.stem.split("_", maxsplit=1)[0]
+    person_id = get_person(path)
     cooking_activity = path.stem.rsplit("_", maxsplit=1)[-1]
     annotation[Column.PERSON] = [person_id] * len(lines)
     annotation[Column.COOKING_ACTIVITY] = [cooking_activity] * len(lines)
     return annotation
 
 
+def get_person(path: Path) -> str:
+    r"""Get the person from the annotation file name.
+
+    Args:
+        path: The path to the annotation file.
+
+    Returns:
+        The person.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from pathlib import Path
+    >>> from arctix.dataset.breakfast import get_person
+    >>> get_person(Path("/path/to/data/P03_cam01_P03_cereals.txt"))
+    'P03'
+
+    ```
+    """
+    return path.stem.split("_", maxsplit=1)[0]
+
+
 def parse_annotation_lines(lines: Sequence[str]) -> dict:
     r"""Parse the action annotation lines and returns a dictionary with
     the prepared data.
@@ -439,11 +526,74 @@ def prepare_data(frame: pl.DataFrame, split: str = "all") -> tuple[pl.DataFrame,
 
     ```
     """
-    vocab_action = generate_vocabulary(frame, col=Column.ACTION).sort_by_count()
-    vocab_person = generate_vocabulary(frame, col=Column.PERSON).sort_by_count()
-    vocab_activity = (
-        generate_vocabulary(frame, col=Column.COOKING_ACTIVITY).sort_by_token().sort_by_count()
-    )
+    preprocessor = Preprocessor().fit(frame)
+    return preprocessor.transform(frame, split=split), preprocessor.metadata
+
+
+class Preprocessor(BasePreprocessor):
+    r"""Implement the preprocessor of the Breakfast data.
+
+    The vocabularies are generated by ``fit``, and ``transform``
+    prepares a raw DataFrame like ``prepare_data`` but with the fitted
+    vocabularies.
+
+    Args:
+        metadata: The metadata of a fitted preprocessor. If ``None``,
+            the preprocessor must be fitted before transforming data.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from pathlib import Path
+    >>> from arctix.dataset.breakfast import Preprocessor, filter_by_split, load_data
+    >>> frame = load_data(Path("/path/to/data/breakfast/"))  # doctest: +SKIP
+    >>> preprocessor = Preprocessor().fit(
+    ...     filter_by_split(frame, split="train1")
+    ... )  # doctest: +SKIP
+    >>> data = preprocessor.transform(frame, split="test1")  # doctest: +SKIP
+
+    ```
+    """
+
+    vocab_cols = VOCAB_COLUMNS
+
+    def _generate_metadata(self, counters: Mapping[str, Counter]) -> dict:
+        return _generate_metadata(counters)
+
+    def _transform(self, frame: pl.DataFrame, metadata: dict, split: str) -> pl.DataFrame:
+        return _transform_data(frame, metadata=metadata, split=split)
+
+
+def _generate_metadata(counters: Mapping[str, Counter]) -> dict:
+    r"""Generate the vocabularies from the token counters.
+
+    Args:
+        counters: The token counters, indexed by metadata key.
+
+    Returns:
+        The metadata with the vocabularies.
+    """
+    return {
+        MetadataKeys.VOCAB_ACTION: Vocabulary(counters[MetadataKeys.VOCAB_ACTION]).sort_by_count(),
+        MetadataKeys.VOCAB_ACTIVITY: Vocabulary(counters[MetadataKeys.VOCAB_ACTIVITY])
+        .sort_by_token()
+        .sort_by_count(),
+        MetadataKeys.VOCAB_PERSON: Vocabulary(counters[MetadataKeys.VOCAB_PERSON]).sort_by_count(),
+    }
+
+
+def _transform_data(frame: pl.DataFrame, metadata: dict, split: str = "all") -> pl.DataFrame:
+    r"""Transform the raw DataFrame with some vocabularies.
+
+    Args:
+        frame: The raw DataFrame.
+        metadata: The metadata with the vocabularies.
+        split: The dataset split.
+
+    Returns:
+        The prepared data.
+    """
     transformer = td.Sequential(
         [
             td.TimeDiff(
@@ -456,13 +606,17 @@ def prepare_data(frame: pl.DataFrame, split: str = "all") -> tuple[pl.DataFrame,
             td.StripChars(columns=[Column.ACTION, Column.PERSON, Column.COOKING_ACTIVITY]),
             td.Function(partial(filter_by_split, split=split)),
             td.TokenToIndex(
-                vocab=vocab_action, token_column=Column.ACTION, index_column=Column.ACTION_ID
+                vocab=metadata[MetadataKeys.VOCAB_ACTION],
+                token_column=Column.ACTION,
+                index_column=Column.ACTION_ID,
             ),
             td.TokenToIndex(
-                vocab=vocab_person, token_column=Column.PERSON, index_column=Column.PERSON_ID
+                vocab=metadata[MetadataKeys.VOCAB_PERSON],
+                token_column=Column.PERSON,
+                index_column=Column.PERSON_ID,
             ),
             td.TokenToIndex(
-                vocab=vocab_activity,
+                vocab=metadata[MetadataKeys.VOCAB_ACTIVITY],
                 token_column=Column.COOKING_ACTIVITY,
                 index_column=Column.COOKING_ACTIVITY_ID,
             ),
@@ -473,12 +627,61 @@ def prepare_data(frame: pl.DataFrame, split: str = "all") -> tuple[pl.DataFrame,
             td.SortColumns(),
         ]
     )
-    out = transformer.transform(frame)
-    return out, {
-        MetadataKeys.VOCAB_ACTION: vocab_action,
-        MetadataKeys.VOCAB_ACTIVITY: vocab_activity,
-        MetadataKeys.VOCAB_PERSON: vocab_person,
-    }
+    return transformer.transform(frame)
+
+
+def prepare_data_incremental(
+    path: Path, cache_path: Path, split: str = "all"
+) -> tuple[pl.DataFrame, dict]:
+    r"""Load and prepare the data, and reuse the cached results of the
+    annotation files which did not change since the previous call.
+
+    The output is the same as ``prepare_data(load_data(path), split)``.
+    The fingerprint and the parsed rows of each annotation file are
+    cached, so only the changed files are parsed again, and only the
+    sequences of the affected persons and cooking activities are
+    prepared again, unless the order of a vocabulary changes.
+
+    Args:
+        path: The directory where the dataset annotations are stored.
+        cache_path: The directory where to cache the intermediate
+            results.
+        split: The dataset split. By default, the union of all the
+            dataset splits is used.
+
+    Returns:
+        A tuple containing the prepared data and the metadata.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from pathlib import Path
+    >>> from arctix.dataset.breakfast import prepare_data_incremental
+    >>> data, metadata = prepare_data_incremental(
+    ...     Path("/path/to/data/breakfast/"), cache_path=Path("/path/to/cache/breakfast/")
+    ... )  # doctest: +SKIP
+
+    ```
+    """
+    path = sanitize_path(path)
+    filenames = sorted(
+        file.relative_to(path).as_posix()
+        for file in FileFilter(PathLister([path], pattern="**/*.txt"))
+    )
+    frame, metadata = prepare_incremental(
+        path,
+        filenames,
+        cache_path,
+        load_fn=load_annotation_file,
+        combine_fn=_combine_annotations,
+        metadata_fn=_generate_metadata,
+        prepare_fn=_transform_data,
+        vocab_cols=VOCAB_COLUMNS,
+        group_cols=[Column.COOKING_ACTIVITY, Column.PERSON],
+        sort_cols=[Column.COOKING_ACTIVITY, Column.PERSON, Column.START_TIME],
+    )
+    return filter_by_split(frame, split), metadata
 
 
 def group_by_sequence(frame: pl.DataFrame) -> pl.DataFrame:
@@ -812,6 +1015,46 @@ def to_array(frame: pl.DataFrame) -> dict[str, np.ndarray]:
     }
 
 
+def to_array_chunks(
+    frame: pl.DataFrame,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+) -> Iterator[dict[str, np.ndarray]]:
+    r"""Convert a DataFrame to dictionaries of arrays, chunk by chunk.
+
+    The sequences are split with ``iter_sequence_chunks``.
+
+    Args:
+        frame: The input DataFrame.
+        max_rows: The maximum number of padded rows in a chunk.
+            If ``None``, the number of rows is not limited.
+        max_bytes: The (estimated) maximum number of bytes in a
+            chunk. If ``None``, the number of bytes is not limited.
+
+    Returns:
+        An iterator over the dictionaries of arrays. Each dictionary
+            has the same structure as the output of ``to_array``.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.dataset.breakfast import to_array_chunks
+    >>> for arrays in to_array_chunks(data, max_bytes=2**30):  # doctest: +SKIP
+    ...     arrays
+    ...
+
+    ```
+    """
+    for chunk in iter_sequence_chunks(
+        frame,
+        group_cols=[Column.PERSON_ID, Column.COOKING_ACTIVITY_ID],
+        max_rows=max_rows,
+        max_bytes=max_bytes,
+    ):
+        yield to_array(chunk)
+
+
 def to_list(frame: pl.DataFrame) -> dict[str, list]:
     r"""Convert a DataFrame to a dictionary of lists.
 
@@ -17,20 +17,28 @@ __all__ = [
     "load_taxonomy_vocab",
     "load_verb_vocab",
     "prepare_data",
+    "prepare_splits",
+    "to_array_chunks",
 ]
 
 import logging
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import numpy as np
 import polars as pl
 from iden.io import load_json
 
 from arctix.transformer import dataframe as td
+from arctix.utils.chunking import iter_sequence_chunks
 from arctix.utils.masking import convert_sequences_to_array, generate_mask_from_lengths
 from arctix.utils.vocab import Vocabulary
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
 logger = logging.getLogger(__name__)
 
 NUM_NOUNS = 521
@@ -369,6 +377,60 @@ def prepare_data(
     return out, metadata
 
 
+def prepare_splits(
+    path: Path,
+    splits: Sequence[str],
+    group_col: str = Column.CLIP_ID,
+    max_workers: int | None = None,
+) -> dict[str, tuple[pl.DataFrame, dict]]:
+    r"""Load and prepare several dataset splits concurrently.
+
+    The vocabularies are loaded once and shared by all the splits,
+    then the event data of each split are loaded and prepared in a
+    thread pool. ``polars`` releases the GIL during its computations,
+    so the splits are processed in parallel without copying the
+    vocabularies to other processes.
+
+    Args:
+        path: The directory where the dataset annotations are stored.
+        splits: The dataset splits to prepare.
+        group_col: The column used to generate the sequences.
+        max_workers: The maximum number of threads used to prepare
+            the splits. If ``None``, one thread is used per split.
+
+    Returns:
+        A dictionary with the prepared data and the metadata of each
+            split. The metadata are shared by all the splits.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from pathlib import Path
+    >>> from arctix.dataset.ego4d import prepare_splits
+    >>> outputs = prepare_splits(
+    ...     Path("/path/to/data/ego4d/"), splits=["train", "val"]
+    ... )  # doctest: +SKIP
+    >>> data, metadata = outputs["train"]  # doctest: +SKIP
+
+    ```
+    """
+    splits = list(splits)
+    metadata = {
+        MetadataKeys.VOCAB_NOUN: load_noun_vocab(path),
+        MetadataKeys.VOCAB_VERB: load_verb_vocab(path),
+    }
+
+    def _prepare_split(split: str) -> tuple[pl.DataFrame, dict]:
+        logger.info(f"preparing the {split} split...")
+        frame = load_event_data(path=path, split=split)
+        return prepare_data(frame, metadata=metadata, group_col=group_col)
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(splits), 1)) as executor:
+        outputs = list(executor.map(_prepare_split, splits))
+    return dict(zip(splits, outputs))
+
+
 def group_by_sequence(frame: pl.DataFrame, group_col: str = Column.CLIP_ID) -> pl.DataFrame:
     r"""Group the DataFrame by sequences of actions.
 
@@ -648,6 +710,45 @@ def to_array(frame: pl.DataFrame, group_col: str = Column.CLIP_ID) -> dict[str,
     }
 
 
+def to_array_chunks(
+    frame: pl.DataFrame,
+    group_col: str = Column.CLIP_ID,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+) -> Iterator[dict[str, np.ndarray]]:
+    r"""Convert a DataFrame to dictionaries of arrays, chunk by chunk.
+
+    The sequences are split with ``iter_sequence_chunks``.
+
+    Args:
+        frame: The input DataFrame.
+        group_col: The column used to generate the sequences.
+        max_rows: The maximum number of padded rows in a chunk.
+            If ``None``, the number of rows is not limited.
+        max_bytes: The (estimated) maximum number of bytes in a
+            chunk. If ``None``, the number of bytes is not limited.
+
+    Returns:
+        An iterator over the dictionaries of arrays. Each dictionary
+            has the same structure as the output of ``to_array``.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.dataset.ego4d import to_array_chunks
+    >>> for arrays in to_array_chunks(data, max_bytes=2**30):  # doctest: +SKIP
+    ...     arrays
+    ...
+
+    ```
+    """
+    for chunk in iter_sequence_chunks(
+        frame, group_cols=[group_col], max_rows=max_rows, max_bytes=max_bytes
+    ):
+        yield to_array(chunk, group_col)
+
+
 def to_list(frame: pl.DataFrame, group_col: str = Column.CLIP_ID) -> dict[str, list]:
     r"""Convert a DataFrame to a dictionary of lists.
 
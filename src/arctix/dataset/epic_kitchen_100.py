@@ -22,24 +22,33 @@ __all__ = [
     "load_noun_vocab",
     "load_verb_vocab",
     "prepare_data",
+    "prepare_splits",
     "to_array",
+    "to_array_chunks",
     "to_list",
 ]
 
 import logging
-import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
 
 import numpy as np
 import polars as pl
 from coola.utils.path import sanitize_path
 
 from arctix.transformer import dataframe as td
+from arctix.utils.archive import extract_archive
+from arctix.utils.chunking import iter_sequence_chunks
 from arctix.utils.download import download_url_to_file
+from arctix.utils.manifest import MANIFEST_FILENAME, verify_manifest, write_manifest
 from arctix.utils.masking import convert_sequences_to_array, generate_mask_from_lengths
 from arctix.utils.vocab import Vocabulary
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
 logger = logging.getLogger(__name__)
 
 ANNOTATION_URL = (
@@ -151,16 +160,15 @@ def download_data(path: Path, force_download: bool = False) -> None:
             logger.info(f"downloading EPIC-KITCHENS-100 annotations data in {zip_file}...")
             download_url_to_file(ANNOTATION_URL, zip_file.as_posix(), progress=True)
 
-            logger.info(f"extracting {zip_file} in {tmp_path}...")
-            with zipfile.ZipFile(zip_file, "r") as zip_ref:
-                zip_ref.extractall(tmp_path)
-
-            logger.info(f"moving extracted files to {path}...")
-            path.mkdir(parents=True, exist_ok=True)
-            for filename in ANNOTATION_FILENAMES:
-                tmp_path.joinpath(f"epic-kitchens-100-annotations-master/{filename}").rename(
-                    path.joinpath(filename)
-                )
+            extract_archive(
+                zip_file,
+                path,
+                members={
+                    f"epic-kitchens-100-annotations-master/{filename}": filename
+                    for filename in ANNOTATION_FILENAMES
+                },
+            )
+            write_manifest(path, ANNOTATION_FILENAMES)
 
     logger.info(f"EPIC-KITCHENS-100 annotation data are available in {path}")
 
@@ -169,6 +177,12 @@ def is_annotation_path_ready(path: Path) -> bool:
     r"""Indicate if the given path contains the EPIC-KITCHENS-100
     annotation data.
 
+    If the directory has a manifest, which is written after the
+    download, the files are also verified against their recorded
+    size and checksum. Only the files whose modification time
+    changed are hashed, so the check is cheap when the files are
+    unchanged.
+
     Args:
         path: The path to check.
 
@@ -188,6 +202,8 @@ def is_annotation_path_ready(path: Path) -> bool:
     ```
     """
     path = sanitize_path(path)
+    if path.joinpath(MANIFEST_FILENAME).is_file():
+        return verify_manifest(path, ANNOTATION_FILENAMES)
     return all(path.joinpath(filename).is_file() for filename in ANNOTATION_FILENAMES)
 
 
@@ -467,6 +483,64 @@ def prepare_data(frame: pl.DataFrame, metadata: dict) -> tuple[pl.DataFrame, dic
     return out, metadata
 
 
+def prepare_splits(
+    path: Path,
+    splits: Sequence[str],
+    force_download: bool = False,
+    max_workers: int | None = None,
+) -> dict[str, tuple[pl.DataFrame, dict]]:
+    r"""Download, load, and prepare several dataset splits
+    concurrently.
+
+    The annotations are downloaded and the vocabularies are loaded
+    once and shared by all the splits, then the event data of each
+    split are loaded and prepared in a thread pool.
+
+    Args:
+        path: The path where to store the downloaded data.
+        splits: The dataset splits to prepare.
+        force_download: If ``True``, the annotations are downloaded
+            everytime this function is called. If ``False``,
+            the annotations are downloaded only if the
+            given path does not contain the annotation data.
+        max_workers: The maximum number of threads used to prepare
+            the splits. If ``None``, one thread is used per split.
+
+    Returns:
+        A dictionary with the prepared data and the metadata of each
+            split. The metadata are shared by all the splits.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from pathlib import Path
+    >>> from arctix.dataset.epic_kitchen_100 import prepare_splits
+    >>> outputs = prepare_splits(
+    ...     Path("/path/to/data/epic_kitchen_100/"), splits=["train", "validation"]
+    ... )  # doctest: +SKIP
+    >>> data, metadata = outputs["train"]  # doctest: +SKIP
+
+    ```
+    """
+    path = sanitize_path(path)
+    splits = list(splits)
+    download_data(path, force_download)
+    metadata = {
+        MetadataKeys.VOCAB_NOUN: load_noun_vocab(path),
+        MetadataKeys.VOCAB_VERB: load_verb_vocab(path),
+    }
+
+    def _prepare_split(split: str) -> tuple[pl.DataFrame, dict]:
+        logger.info(f"preparing the {split} split...")
+        frame = load_event_data(path.joinpath(f"EPIC_100_{split}.csv"))
+        return prepare_data(frame, metadata=metadata)
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(splits), 1)) as executor:
+        outputs = list(executor.map(_prepare_split, splits))
+    return dict(zip(splits, outputs))
+
+
 def group_by_sequence(frame: pl.DataFrame) -> pl.DataFrame:
     r"""Group the DataFrame by sequences of actions.
 
@@ -629,6 +703,43 @@ def to_array(frame: pl.DataFrame) -> dict[str, np.ndarray]:
     }
 
 
+def to_array_chunks(
+    frame: pl.DataFrame,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+) -> Iterator[dict[str, np.ndarray]]:
+    r"""Convert a DataFrame to dictionaries of arrays, chunk by chunk.
+
+    The sequences are split with ``iter_sequence_chunks``.
+
+    Args:
+        frame: The input DataFrame.
+        max_rows: The maximum number of padded rows in a chunk.
+            If ``None``, the number of rows is not limited.
+        max_bytes: The (estimated) maximum number of bytes in a
+            chunk. If ``None``, the number of bytes is not limited.
+
+    Returns:
+        An iterator over the dictionaries of arrays. Each dictionary
+            has the same structure as the output of ``to_array``.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.dataset.epic_kitchen_100 import to_array_chunks
+    >>> for arrays in to_array_chunks(data, max_bytes=2**30):  # doctest: +SKIP
+    ...     arrays
+    ...
+
+    ```
+    """
+    for chunk in iter_sequence_chunks(
+        frame, group_cols=[Column.VIDEO_ID], max_rows=max_rows, max_bytes=max_bytes
+    ):
+        yield to_array(chunk)
+
+
 def to_list(frame: pl.DataFrame) -> dict[str, list]:
     r"""Convert a DataFrame to a dictionary of lists.
 
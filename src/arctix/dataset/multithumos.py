@@ -9,8 +9,11 @@ from __future__ import annotations
 __all__ = [
     "ANNOTATION_FILENAMES",
     "ANNOTATION_URL",
+    "DATASET_SPLITS",
+    "VOCAB_COLUMNS",
     "Column",
     "MetadataKeys",
+    "Preprocessor",
     "download_data",
     "fetch_data",
     "filter_by_split",
@@ -21,12 +24,13 @@ __all__ = [
     "load_data",
     "parse_annotation_lines",
     "prepare_data",
+    "prepare_data_incremental",
     "to_array",
+    "to_array_chunks",
     "to_list",
 ]
 
 import logging
-import zipfile
 from functools import partial
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -37,19 +41,27 @@ import polars as pl
 from coola.utils.path import sanitize_path
 
 from arctix.transformer import dataframe as td
-from arctix.utils.dataframe import generate_vocabulary
+from arctix.utils.archive import extract_archive
+from arctix.utils.chunking import iter_sequence_chunks
 from arctix.utils.download import download_url_to_file
+from arctix.utils.incremental import prepare_incremental
 from arctix.utils.iter import FileFilter, PathLister
+from arctix.utils.manifest import MANIFEST_FILENAME, verify_manifest, write_manifest
 from arctix.utils.mapping import convert_to_dict_of_flat_lists
 from arctix.utils.masking import convert_sequences_to_array, generate_mask_from_lengths
+from arctix.utils.preprocessor import BasePreprocessor
+from arctix.utils.vocab import Vocabulary
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections import Counter
+    from collections.abc import Iterator, Mapping, Sequence
 
 logger = logging.getLogger(__name__)
 
 ANNOTATION_URL = "http://ai.stanford.edu/~syyeung/resources/multithumos.zip"
 
+DATASET_SPLITS = {"all": ("test", "validation"), "test": ("test",), "validation": ("validation",)}
+
 ANNOTATION_FILENAMES = [
     "README",
     "class_list.txt",
@@ -141,7 +153,10 @@ class MetadataKeys:
     VOCAB_ACTION: str = "vocab_action"
 
 
-def fetch_data(path: Path, force_download: bool = False) -> pl.DataFrame:
+VOCAB_COLUMNS = {MetadataKeys.VOCAB_ACTION: Column.ACTION}
+
+
+def fetch_data(path: Path, force_download: bool = False, split: str | None = None) -> pl.DataFrame:
     r"""Download and load the data for Breakfast dataset.
 
     Args:
@@ -150,10 +165,16 @@ def fetch_data(path: Path, force_download: bool = False) -> pl.DataFrame:
             everytime this function is called. If ``False``,
             the annotations are downloaded only if the
             given path does not contain the annotation data.
+        split: The dataset split to load. If ``None``, all the
+            annotations are loaded. See ``load_data`` for more
+            information.
 
     Returns:
         The data in a DataFrame
 
+    Raises:
+        RuntimeError: if the split is incorrect.
+
     Example usage:
 
     ```pycon
@@ -166,16 +187,16 @@ def fetch_data(path: Path, force_download: bool = False) -> pl.DataFrame:
     """
     path = sanitize_path(path)
     download_data(path, force_download)
-    return load_data(path)
+    return load_data(path, split=split)
 
 
 def download_data(path: Path, force_download: bool = False) -> None:
     r"""Download the MultiTHUMOS annotation data.
 
-    Internally, this function downloads the annotations in a temporary
-    directory, then extracts the files from the download zip files in
-    the temporary directory, and finally moves the extracted files to
-    the given path.
+    Internally, this function downloads the zip file in a temporary
+    directory, then streams the annotation files listed in
+    ``ANNOTATION_FILENAMES`` from the zip file directly into the
+    given path, and writes a manifest of these files.
 
     Args:
         path: The path where to store the MultiTHUMOS data.
@@ -203,16 +224,12 @@ def download_data(path: Path, force_download: bool = False) -> None:
             logger.info(f"downloading MultiTHUMOS annotations data in {zip_file}...")
             download_url_to_file(ANNOTATION_URL, zip_file.as_posix(), progress=True)
 
-            logger.info(f"extracting {zip_file} in {tmp_path}...")
-            with zipfile.ZipFile(zip_file, "r") as zip_ref:
-                zip_ref.extractall(tmp_path)
-
-            logger.info(f"moving extracted files to {path}...")
-            path.mkdir(parents=True, exist_ok=True)
-            for filename in ANNOTATION_FILENAMES:
-                dst = path.joinpath(filename)
-                dst.parent.mkdir(parents=True, exist_ok=True)
-                tmp_path.joinpath(f"multithumos/{filename}").rename(dst)
+            extract_archive(
+                zip_file,
+                path,
+                members={f"multithumos/{filename}": filename for filename in ANNOTATION_FILENAMES},
+            )
+            write_manifest(path, ANNOTATION_FILENAMES)
 
     logger.info(f"MultiTHUMOS annotation data are available in {path}")
 
@@ -221,6 +238,12 @@ def is_annotation_path_ready(path: Path) -> bool:
     r"""Indicate if the given path contains the MultiTHUMOS annotation
     data.
 
+    If the directory has a manifest, which is written after the
+    download, the files are also verified against their recorded
+    size and checksum. Only the files whose modification time
+    changed are hashed, so the check is cheap when the files are
+    unchanged.
+
     Args:
         path: The path to check.
 
@@ -240,19 +263,29 @@ def is_annotation_path_ready(path: Path) -> bool:
     ```
     """
     path = sanitize_path(path)
+    if path.joinpath(MANIFEST_FILENAME).is_file():
+        return verify_manifest(path, ANNOTATION_FILENAMES)
     return all(path.joinpath(filename).is_file() for filename in ANNOTATION_FILENAMES)
 
 
-def load_data(path: Path) -> pl.DataFrame:
+def load_data(path: Path, split: str | None = None) -> pl.DataFrame:
     r"""Load all the annotations in a DataFrame.
 
     Args:
         path: The directory where the dataset annotations are stored.
-        remove_duplicate: If ``True``, the duplicate rows are removed.
+        split: The dataset split to load. If ``None``, all the
+            annotations are loaded. The split is encoded in the video
+            name, so the lines of the other splits are discarded
+            while the annotation files are parsed. Note that
+            ``prepare_data`` generates the vocabulary from the loaded
+            data, so it only contains the actions of the split.
 
     Returns:
         The annotations in a DataFrame.
 
+    Raises:
+        RuntimeError: if the split is incorrect.
+
     Example usage:
 
     ```pycon
@@ -263,24 +296,40 @@ def load_data(path: Path) -> pl.DataFrame:
 
     ```
     """
+    if split is not None and split not in DATASET_SPLITS:
+        msg = f"Incorrect split: {split}. Valid splits are: {sorted(DATASET_SPLITS)}"
+        raise RuntimeError(msg)
     paths = FileFilter(PathLister([sanitize_path(path)], pattern="annotations/*.txt"))
-    annotations = list(map(load_annotation_file, paths))
+    annotations = [load_annotation_file(path, split=split) for path in paths]
     data = convert_to_dict_of_flat_lists(annotations)
-    data = pl.DataFrame(data)
+    return _combine_annotations(pl.DataFrame(data))
+
+
+def _combine_annotations(frame: pl.DataFrame) -> pl.DataFrame:
+    r"""Combine the annotations of several files in a sorted DataFrame.
+
+    Args:
+        frame: The annotations of the files.
+
+    Returns:
+        The annotations in a sorted DataFrame.
+    """
     transformer = td.Sequential(
         [
             td.Sort(columns=[Column.VIDEO, Column.START_TIME]),
             td.SortColumns(),
         ]
     )
-    return transformer.transform(data)
+    return transformer.transform(frame)
 
 
-def load_annotation_file(path: Path) -> dict[str, list]:
+def load_annotation_file(path: Path, split: str | None = None) -> dict[str, list]:
     r"""Load the annotation data from a text file.
 
     Args:
         path: The file path to the annotation data.
+        split: The dataset split to keep. If ``None``, all the
+            annotations are kept.
 
     Returns:
         A dictionary with the action, the start time, and end time
@@ -309,17 +358,20 @@ def load_annotation_file(path: Path) -> dict[str, list]:
     with Path.open(path) as file:
         lines = [x.strip() for x in file.readlines()]
 
-    annotation = parse_annotation_lines(lines)
+    annotation = parse_annotation_lines(lines, split=split)
     annotation[Column.ACTION] = [path.stem] * len(annotation[Column.VIDEO])
     return annotation
 
 
-def parse_annotation_lines(lines: Sequence[str]) -> dict:
+def parse_annotation_lines(lines: Sequence[str], split: str | None = None) -> dict:
     r"""Parse the action annotation lines and returns a dictionary with
     the prepared data.
 
     Args:
         lines: The lines to parse.
+        split: The dataset split to keep. If ``None``, all the lines
+            are kept. Otherwise, the lines of the videos of the other
+            splits are discarded without being parsed.
 
     Returns:
         A dictionary with the sequence of video names, the start
@@ -342,15 +394,23 @@ def parse_annotation_lines(lines: Sequence[str]) -> dict:
     {'video': ['video_validation_0000266', 'video_validation_0000681', 'video_validation_0000682', 'video_validation_0000682'],
      'start_time': [72.8, 44.0, 1.5, 79.3],
      'end_time': [76.4, 50.9, 5.4, 83.9]}
+    >>> parse_annotation_lines(
+    ...     ["video_test_0000004 0.50 2.10", "video_validation_0000266 72.80 76.40"],
+    ...     split="test",
+    ... )
+    {'video': ['video_test_0000004'], 'start_time': [0.5], 'end_time': [2.1]}
 
     ```
     """
+    splits = None if split is None else DATASET_SPLITS[split]
     videos = []
     start_time = []
     end_time = []
     for line in (item.strip() for item in lines):
         if not line:
             continue
+        if splits is not None and line.split("_", maxsplit=2)[1] not in splits:
+            continue
         video, start, end = line.split(" ")
         videos.append(video)
         start_time.append(float(start))
@@ -410,7 +470,68 @@ def prepare_data(frame: pl.DataFrame, split: str = "all") -> tuple[pl.DataFrame,
 
     ```
     """
-    vocab_action = generate_vocabulary(frame, col=Column.ACTION).sort_by_count()
+    preprocessor = Preprocessor().fit(frame)
+    return preprocessor.transform(frame, split=split), preprocessor.metadata
+
+
+class Preprocessor(BasePreprocessor):
+    r"""Implement the preprocessor of the MultiTHUMOS data.
+
+    The vocabularies are generated by ``fit``, and ``transform``
+    prepares a raw DataFrame like ``prepare_data`` but with the fitted
+    vocabularies.
+
+    Args:
+        metadata: The metadata of a fitted preprocessor. If ``None``,
+            the preprocessor must be fitted before transforming data.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from pathlib import Path
+    >>> from arctix.dataset.multithumos import Preprocessor, load_data
+    >>> path = Path("/path/to/data/multithumos/")
+    >>> preprocessor = Preprocessor().fit(load_data(path, split="validation"))  # doctest: +SKIP
+    >>> data = preprocessor.transform(load_data(path, split="test"))  # doctest: +SKIP
+
+    ```
+    """
+
+    vocab_cols = VOCAB_COLUMNS
+
+    def _generate_metadata(self, counters: Mapping[str, Counter]) -> dict:
+        return _generate_metadata(counters)
+
+    def _transform(self, frame: pl.DataFrame, metadata: dict, split: str) -> pl.DataFrame:
+        return _transform_data(frame, metadata=metadata, split=split)
+
+
+def _generate_metadata(counters: Mapping[str, Counter]) -> dict:
+    r"""Generate the vocabulary from the token counters.
+
+    Args:
+        counters: The token counters, indexed by metadata key.
+
+    Returns:
+        The metadata with the vocabulary.
+    """
+    return {
+        MetadataKeys.VOCAB_ACTION: Vocabulary(counters[MetadataKeys.VOCAB_ACTION]).sort_by_count()
+    }
+
+
+def _transform_data(frame: pl.DataFrame, metadata: dict, split: str = "all") -> pl.DataFrame:
+    r"""Transform the raw DataFrame with a vocabulary.
+
+    Args:
+        frame: The raw DataFrame.
+        metadata: The metadata with the vocabulary.
+        split: The dataset split.
+
+    Returns:
+        The prepared data.
+    """
     transformer = td.Sequential(
         [
             td.TimeDiff(
@@ -422,7 +543,9 @@ def prepare_data(frame: pl.DataFrame, split: str = "all") -> tuple[pl.DataFrame,
             td.Cast(columns=[Column.START_TIME, Column.END_TIME], dtype=pl.Float64),
             td.StripChars(columns=[Column.ACTION, Column.VIDEO]),
             td.TokenToIndex(
-                vocab=vocab_action, token_column=Column.ACTION, index_column=Column.ACTION_ID
+                vocab=metadata[MetadataKeys.VOCAB_ACTION],
+                token_column=Column.ACTION,
+                index_column=Column.ACTION_ID,
             ),
             td.Cast(columns=[Column.ACTION_ID], dtype=pl.Int64),
             td.Function(generate_split_column),
@@ -430,8 +553,61 @@ def prepare_data(frame: pl.DataFrame, split: str = "all") -> tuple[pl.DataFrame,
             td.SortColumns(),
         ]
     )
-    out = transformer.transform(frame)
-    return out, {MetadataKeys.VOCAB_ACTION: vocab_action}
+    return transformer.transform(frame)
+
+
+def prepare_data_incremental(
+    path: Path, cache_path: Path, split: str = "all"
+) -> tuple[pl.DataFrame, dict]:
+    r"""Load and prepare the data, and reuse the cached results of the
+    annotation files which did not change since the previous call.
+
+    The output is the same as ``prepare_data(load_data(path), split)``.
+    The fingerprint and the parsed rows of each annotation file are
+    cached, so only the changed files are parsed again, and only the
+    videos annotated in these files are prepared again, unless the
+    order of the action vocabulary changes.
+
+    Args:
+        path: The directory where the dataset annotations are stored.
+        cache_path: The directory where to cache the intermediate
+            results.
+        split: The dataset split. By default, the union of all the
+            dataset splits is used.
+
+    Returns:
+        A tuple containing the prepared data and the metadata.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from pathlib import Path
+    >>> from arctix.dataset.multithumos import prepare_data_incremental
+    >>> data, metadata = prepare_data_incremental(
+    ...     Path("/path/to/data/multithumos/"), cache_path=Path("/path/to/cache/multithumos/")
+    ... )  # doctest: +SKIP
+
+    ```
+    """
+    path = sanitize_path(path)
+    filenames = sorted(
+        file.relative_to(path).as_posix()
+        for file in FileFilter(PathLister([path], pattern="annotations/*.txt"))
+    )
+    frame, metadata = prepare_incremental(
+        path,
+        filenames,
+        cache_path,
+        load_fn=load_annotation_file,
+        combine_fn=_combine_annotations,
+        metadata_fn=_generate_metadata,
+        prepare_fn=_transform_data,
+        vocab_cols=VOCAB_COLUMNS,
+        group_cols=[Column.VIDEO],
+        sort_cols=[Column.VIDEO, Column.START_TIME],
+    )
+    return filter_by_split(frame, split), metadata
 
 
 def generate_split_column(frame: pl.DataFrame) -> pl.DataFrame:
@@ -548,9 +724,7 @@ def filter_by_split(frame: pl.DataFrame, split: str = "all") -> pl.DataFrame:
 
     ```
     """
-    splits = {split}
-    if split == "all":
-        splits = {"validation", "test"}
+    splits = DATASET_SPLITS.get(split, (split,))
     return frame.filter(pl.col(Column.SPLIT).is_in(splits))
 
 
@@ -783,6 +957,43 @@ def to_array(frame: pl.DataFrame) -> dict[str, np.ndarray]:
     }
 
 
+def to_array_chunks(
+    frame: pl.DataFrame,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+) -> Iterator[dict[str, np.ndarray]]:
+    r"""Convert a DataFrame to dictionaries of arrays, chunk by chunk.
+
+    The sequences are split with ``iter_sequence_chunks``.
+
+    Args:
+        frame: The input DataFrame.
+        max_rows: The maximum number of padded rows in a chunk.
+            If ``None``, the number of rows is not limited.
+        max_bytes: The (estimated) maximum number of bytes in a
+            chunk. If ``None``, the number of bytes is not limited.
+
+    Returns:
+        An iterator over the dictionaries of arrays. Each dictionary
+            has the same structure as the output of ``to_array``.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.dataset.multithumos import to_array_chunks
+    >>> for arrays in to_array_chunks(data, max_bytes=2**30):  # doctest: +SKIP
+    ...     arrays
+    ...
+
+    ```
+    """
+    for chunk in iter_sequence_chunks(
+        frame, group_cols=[Column.VIDEO], max_rows=max_rows, max_bytes=max_bytes
+    ):
+        yield to_array(chunk)
+
+
 def to_list(frame: pl.DataFrame) -> dict[str, list]:
     r"""Convert a DataFrame to a dictionary of lists.
 
@@ -0,0 +1,8 @@
+r"""Contain indices to efficiently access the prepared data."""
+
+from __future__ import annotations
+
+__all__ = ["IntervalIndex", "SequenceIndex"]
+
+from arctix.index.interval import IntervalIndex
+from arctix.index.sequence import SequenceIndex
@@ -0,0 +1,365 @@
+r"""Contain an index to query the temporal intervals of each sequence."""
+
+from __future__ import annotations
+
+__all__ = ["IntervalIndex"]
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from arctix.index.sequence import LENGTH, OFFSET, SequenceIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Sequence
+
+    import polars as pl
+
+ROW = "_row"
+
+
+class IntervalIndex:
+    r"""Implement an index to query the temporal intervals of each
+    sequence.
+
+    The intervals of each sequence are sorted by start time and
+    augmented with the running maximum of the end times. An overlap
+    query is answered with two binary searches, which find the
+    candidate intervals, followed by a vectorized filtering of the
+    candidates. The intervals are closed i.e. the interval
+    ``[start, end]`` overlaps the query ``[t0, t1]`` if
+    ``start <= t1`` and ``end >= t0``.
+
+    The queries return the row indices of the intervals in the
+    DataFrame used to build the index, so the matching rows can be
+    selected with ``frame[rows]``.
+
+    Args:
+        sequence_index: The index of the sequences in the sorted
+            intervals.
+        starts: The start time of each interval, sorted by sequence
+            and start time.
+        ends: The end time of each interval.
+        rows: The row index of each interval in the original
+            DataFrame.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.index import IntervalIndex
+    >>> frame = pl.DataFrame(
+    ...     {
+    ...         "video": ["v1", "v1", "v1", "v2"],
+    ...         "start_time": [0.0, 2.0, 5.0, 1.0],
+    ...         "end_time": [3.0, 4.0, 9.0, 2.0],
+    ...     }
+    ... )
+    >>> index = IntervalIndex.from_frame(
+    ...     frame, group_cols=["video"], start_col="start_time", end_col="end_time"
+    ... )
+    >>> index
+    IntervalIndex(num_sequences=2, num_intervals=4)
+    >>> index.query_overlap("v1", 3.5, 6.0)
+    array([1, 2])
+    >>> index.query_point("v1", 2.5)
+    array([0, 1])
+
+    ```
+    """
+
+    def __init__(
+        self,
+        sequence_index: SequenceIndex,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        rows: np.ndarray,
+    ) -> None:
+        self._sequence_index = sequence_index
+        self._starts = np.asarray(starts, dtype=np.float64)
+        self._ends = np.asarray(ends, dtype=np.float64)
+        self._rows = np.asarray(rows, dtype=np.int64)
+        self._max_ends = np.empty_like(self._ends)
+        table = self._sequence_index.to_frame()
+        for offset, length in zip(table.get_column(OFFSET), table.get_column(LENGTH)):
+            np.maximum.accumulate(
+                self._ends[offset : offset + length],
+                out=self._max_ends[offset : offset + length],
+            )
+
+    def __len__(self) -> int:
+        return self._starts.shape[0]
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__qualname__}(num_sequences={len(self._sequence_index):,}, "
+            f"num_intervals={len(self):,})"
+        )
+
+    @property
+    def sequence_index(self) -> SequenceIndex:
+        r"""The index of the sequences in the sorted intervals."""
+        return self._sequence_index
+
+    def query_overlap(self, key: Hashable, start: float, end: float) -> np.ndarray:
+        r"""Find the intervals of a sequence that overlap a time range.
+
+        Args:
+            key: The sequence key. If there are several group columns,
+                the key is a tuple with one value per group column.
+            start: The start time of the query range.
+            end: The end time of the query range.
+
+        Returns:
+            The row indices of the overlapping intervals, sorted by
+                start time.
+
+        Raises:
+            KeyError: if the key does not exist.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import IntervalIndex
+        >>> frame = pl.DataFrame(
+        ...     {"video": ["v1", "v1", "v1"], "start": [0, 2, 5], "end": [3, 4, 9]}
+        ... )
+        >>> index = IntervalIndex.from_frame(
+        ...     frame, group_cols=["video"], start_col="start", end_col="end"
+        ... )
+        >>> index.query_overlap("v1", 3.5, 6.0)
+        array([1, 2])
+
+        ```
+        """
+        return self.query_overlap_batch([key], [start], [end])[0]
+
+    def query_overlap_batch(
+        self,
+        keys: Sequence[Hashable],
+        starts: np.ndarray | Sequence[float],
+        ends: np.ndarray | Sequence[float],
+    ) -> list[np.ndarray]:
+        r"""Find the intervals that overlap a batch of time ranges.
+
+        The queries are grouped by sequence, and the queries of a
+        sequence are answered with vectorized operations.
+
+        Args:
+            keys: The sequence key of each query.
+            starts: The start time of each query range.
+            ends: The end time of each query range.
+
+        Returns:
+            The row indices of the overlapping intervals for each
+                query, sorted by start time.
+
+        Raises:
+            KeyError: if a key does not exist.
+            RuntimeError: if the inputs do not have the same length.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import IntervalIndex
+        >>> frame = pl.DataFrame(
+        ...     {"video": ["v1", "v1", "v1", "v2"], "start": [0, 2, 5, 1], "end": [3, 4, 9, 2]}
+        ... )
+        >>> index = IntervalIndex.from_frame(
+        ...     frame, group_cols=["video"], start_col="start", end_col="end"
+        ... )
+        >>> index.query_overlap_batch(["v1", "v2", "v1"], [3.5, 0.0, 10.0], [6.0, 1.0, 11.0])
+        [array([1, 2]), array([3]), array([], dtype=int64)]
+
+        ```
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        if not len(keys) == starts.shape[0] == ends.shape[0]:
+            msg = (
+                f"keys, starts, and ends must have the same length but received "
+                f"{len(keys)}, {starts.shape[0]}, and {ends.shape[0]}"
+            )
+            raise RuntimeError(msg)
+        positions = {}
+        for i, key in enumerate(keys):
+            positions.setdefault(key, []).append(i)
+        results = [None] * len(keys)
+        for key, indices in positions.items():
+            offset, length = self._sequence_index.get_location(key)
+            segment = slice(offset, offset + length)
+            for i, rows in zip(
+                indices,
+                _query_overlap_segment(
+                    starts=self._starts[segment],
+                    ends=self._ends[segment],
+                    max_ends=self._max_ends[segment],
+                    rows=self._rows[segment],
+                    query_starts=starts[indices],
+                    query_ends=ends[indices],
+                ),
+            ):
+                results[i] = rows
+        return results
+
+    def query_point(self, key: Hashable, time: float) -> np.ndarray:
+        r"""Find the intervals of a sequence that contain a time.
+
+        Args:
+            key: The sequence key. If there are several group columns,
+                the key is a tuple with one value per group column.
+            time: The query time.
+
+        Returns:
+            The row indices of the intervals that contain the time,
+                sorted by start time.
+
+        Raises:
+            KeyError: if the key does not exist.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import IntervalIndex
+        >>> frame = pl.DataFrame(
+        ...     {"video": ["v1", "v1", "v1"], "start": [0, 2, 5], "end": [3, 4, 9]}
+        ... )
+        >>> index = IntervalIndex.from_frame(
+        ...     frame, group_cols=["video"], start_col="start", end_col="end"
+        ... )
+        >>> index.query_point("v1", 2.5)
+        array([0, 1])
+
+        ```
+        """
+        return self.query_overlap_batch([key], [time], [time])[0]
+
+    def query_point_batch(
+        self, keys: Sequence[Hashable], times: np.ndarray | Sequence[float]
+    ) -> list[np.ndarray]:
+        r"""Find the intervals that contain a batch of times.
+
+        Args:
+            keys: The sequence key of each query.
+            times: The query times.
+
+        Returns:
+            The row indices of the intervals that contain the time
+                for each query, sorted by start time.
+
+        Raises:
+            KeyError: if a key does not exist.
+            RuntimeError: if the inputs do not have the same length.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import IntervalIndex
+        >>> frame = pl.DataFrame(
+        ...     {"video": ["v1", "v1", "v1", "v2"], "start": [0, 2, 5, 1], "end": [3, 4, 9, 2]}
+        ... )
+        >>> index = IntervalIndex.from_frame(
+        ...     frame, group_cols=["video"], start_col="start", end_col="end"
+        ... )
+        >>> index.query_point_batch(["v1", "v1", "v2"], [2.5, 6.0, 1.5])
+        [array([0, 1]), array([2]), array([3])]
+
+        ```
+        """
+        return self.query_overlap_batch(keys, times, times)
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: pl.DataFrame,
+        group_cols: Sequence[str],
+        start_col: str,
+        end_col: str,
+    ) -> IntervalIndex:
+        r"""Build the index from a DataFrame.
+
+        The rows with a missing start or end time are ignored.
+
+        Args:
+            frame: The DataFrame with one row per interval, for
+                example the output of ``prepare_data``.
+            group_cols: The columns used to generate the sequences.
+            start_col: The column with the start time of each
+                interval.
+            end_col: The column with the end time of each interval.
+
+        Returns:
+            The index.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import IntervalIndex
+        >>> frame = pl.DataFrame(
+        ...     {"video": ["v1", "v2", "v1"], "start": [5, 1, 0], "end": [9, 2, 3]}
+        ... )
+        >>> IntervalIndex.from_frame(frame, group_cols=["video"], start_col="start", end_col="end")
+        IntervalIndex(num_sequences=2, num_intervals=3)
+
+        ```
+        """
+        group_cols = list(group_cols)
+        table = (
+            frame.select([*group_cols, start_col, end_col])
+            .with_row_index(ROW)
+            .drop_nulls([start_col, end_col])
+            .sort(by=[*group_cols, start_col], maintain_order=True)
+        )
+        return cls(
+            sequence_index=SequenceIndex.from_frame(table, group_cols=group_cols),
+            starts=table.get_column(start_col).to_numpy(),
+            ends=table.get_column(end_col).to_numpy(),
+            rows=table.get_column(ROW).to_numpy(),
+        )
+
+
+def _query_overlap_segment(
+    *,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    max_ends: np.ndarray,
+    rows: np.ndarray,
+    query_starts: np.ndarray,
+    query_ends: np.ndarray,
+) -> list[np.ndarray]:
+    r"""Find the intervals of a sequence that overlap each query range.
+
+    Args:
+        starts: The sorted start times of the intervals.
+        ends: The end times of the intervals.
+        max_ends: The running maximum of the end times.
+        rows: The row indices of the intervals.
+        query_starts: The start time of each query range.
+        query_ends: The end time of each query range.
+
+    Returns:
+        The row indices of the overlapping intervals for each query.
+    """
+    # The intervals before ``lo`` end before the query starts, and the
+    # intervals after ``hi`` start after the query ends.
+    lo = np.searchsorted(max_ends, query_starts, side="left")
+    hi = np.searchsorted(starts, query_ends, side="right")
+    counts = np.maximum(hi - lo, 0)
+    total = int(counts.sum())
+    offsets = np.cumsum(counts) - counts
+    candidates = np.repeat(lo - offsets, counts) + np.arange(total)
+    valid = ends[candidates] >= np.repeat(query_starts, counts)
+    query_ids = np.repeat(np.arange(query_starts.shape[0]), counts)[valid]
+    matches = rows[candidates[valid]]
+    return np.split(matches, np.cumsum(np.bincount(query_ids, minlength=counts.shape[0]))[:-1])
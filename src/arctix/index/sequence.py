@@ -0,0 +1,328 @@
+r"""Contain an index to access the sequences of a prepared DataFrame."""
+
+from __future__ import annotations
+
+__all__ = ["SequenceIndex"]
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+import polars as pl
+from coola.utils.path import sanitize_path
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Sequence
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+OFFSET = "offset"
+LENGTH = "length"
+
+
+class SequenceIndex:
+    r"""Implement an index that maps each sequence key to its row
+    offset and length in a prepared DataFrame.
+
+    The index is built once from a DataFrame where the rows of each
+    sequence are contiguous, for example the output of
+    ``prepare_data``. Then, a sequence is accessed with a dictionary
+    lookup and a zero-copy slice, without scanning the DataFrame.
+
+    Args:
+        table: A DataFrame with one row per sequence. It must contain
+            the group columns, and the ``offset`` and ``length``
+            columns.
+        group_cols: The columns used to generate the sequences.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.index import SequenceIndex
+    >>> frame = pl.DataFrame({"video": ["v1", "v1", "v2", "v3", "v3"], "action": [1, 2, 3, 4, 5]})
+    >>> index = SequenceIndex.from_frame(frame, group_cols=["video"])
+    >>> index
+    SequenceIndex(num_sequences=3, group_cols=('video',))
+    >>> index.get_location("v3")
+    (3, 2)
+    >>> index.get_sequence(frame, "v3")
+    shape: (2, 2)
+    ┌───────┬────────┐
+    │ video ┆ action │
+    │ ---   ┆ ---    │
+    │ str   ┆ i64    │
+    ╞═══════╪════════╡
+    │ v3    ┆ 4      │
+    │ v3    ┆ 5      │
+    └───────┴────────┘
+
+    ```
+    """
+
+    def __init__(self, table: pl.DataFrame, group_cols: Sequence[str]) -> None:
+        self._group_cols = tuple(group_cols)
+        self._table = table.select([*self._group_cols, OFFSET, LENGTH]).cast(
+            {OFFSET: pl.Int64, LENGTH: pl.Int64}
+        )
+        keys = self._table.select(self._group_cols).rows()
+        if len(self._group_cols) == 1:
+            keys = [key[0] for key in keys]
+        self._key_to_position = {key: i for i, key in enumerate(keys)}
+        if len(self._key_to_position) != self._table.height:
+            msg = "The sequence keys are not unique"
+            raise RuntimeError(msg)
+        self._offsets = self._table.get_column(OFFSET).to_list()
+        self._lengths = self._table.get_column(LENGTH).to_list()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._key_to_position
+
+    def __len__(self) -> int:
+        return self._table.height
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__qualname__}(num_sequences={len(self):,}, "
+            f"group_cols={self._group_cols})"
+        )
+
+    @property
+    def group_cols(self) -> tuple[str, ...]:
+        r"""The columns used to generate the sequences."""
+        return self._group_cols
+
+    def equal(self, other: Any) -> bool:
+        r"""Indicate if two indices are equal or not.
+
+        Args:
+            other: The object to compare with.
+
+        Returns:
+            ``True`` if the indices are equal, otherwise ``False``.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import SequenceIndex
+        >>> frame = pl.DataFrame({"video": ["v1", "v1", "v2"], "action": [1, 2, 3]})
+        >>> index = SequenceIndex.from_frame(frame, group_cols=["video"])
+        >>> index.equal(SequenceIndex.from_frame(frame, group_cols=["video"]))
+        True
+
+        ```
+        """
+        if not isinstance(other, SequenceIndex):
+            return False
+        return self._group_cols == other._group_cols and self._table.equals(other._table)
+
+    def get_location(self, key: Hashable) -> tuple[int, int]:
+        r"""Return the row offset and the length of a sequence.
+
+        Args:
+            key: The sequence key. If there are several group columns,
+                the key is a tuple with one value per group column.
+
+        Returns:
+            A tuple with the row offset and the length of the
+                sequence.
+
+        Raises:
+            KeyError: if the key does not exist.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import SequenceIndex
+        >>> frame = pl.DataFrame(
+        ...     {"person": ["P1", "P1", "P2"], "activity": ["tea", "tea", "tea"], "action": [1, 2, 3]}
+        ... )
+        >>> index = SequenceIndex.from_frame(frame, group_cols=["person", "activity"])
+        >>> index.get_location(("P2", "tea"))
+        (2, 1)
+
+        ```
+        """
+        position = self._key_to_position[key]
+        return self._offsets[position], self._lengths[position]
+
+    def get_sequence(self, frame: pl.DataFrame, key: Hashable) -> pl.DataFrame:
+        r"""Return the rows of a sequence.
+
+        Args:
+            frame: The DataFrame used to build the index.
+            key: The sequence key. If there are several group columns,
+                the key is a tuple with one value per group column.
+
+        Returns:
+            The rows of the sequence.
+
+        Raises:
+            KeyError: if the key does not exist.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import SequenceIndex
+        >>> frame = pl.DataFrame({"video": ["v1", "v1", "v2"], "action": [1, 2, 3]})
+        >>> index = SequenceIndex.from_frame(frame, group_cols=["video"])
+        >>> index.get_sequence(frame, "v1")
+        shape: (2, 2)
+        ┌───────┬────────┐
+        │ video ┆ action │
+        │ ---   ┆ ---    │
+        │ str   ┆ i64    │
+        ╞═══════╪════════╡
+        │ v1    ┆ 1      │
+        │ v1    ┆ 2      │
+        └───────┴────────┘
+
+        ```
+        """
+        offset, length = self.get_location(key)
+        return frame.slice(offset, length)
+
+    def keys(self) -> list:
+        r"""Return the sequence keys in the row order.
+
+        Returns:
+            The sequence keys.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import SequenceIndex
+        >>> frame = pl.DataFrame({"video": ["v1", "v1", "v2"], "action": [1, 2, 3]})
+        >>> index = SequenceIndex.from_frame(frame, group_cols=["video"])
+        >>> index.keys()
+        ['v1', 'v2']
+
+        ```
+        """
+        return list(self._key_to_position)
+
+    def to_frame(self) -> pl.DataFrame:
+        r"""Return the index as a DataFrame.
+
+        Returns:
+            A DataFrame with one row per sequence, with the group
+                columns, and the ``offset`` and ``length`` columns.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import SequenceIndex
+        >>> frame = pl.DataFrame({"video": ["v1", "v1", "v2"], "action": [1, 2, 3]})
+        >>> index = SequenceIndex.from_frame(frame, group_cols=["video"])
+        >>> index.to_frame()
+        shape: (2, 3)
+        ┌───────┬────────┬────────┐
+        │ video ┆ offset ┆ length │
+        │ ---   ┆ ---    ┆ ---    │
+        │ str   ┆ i64    ┆ i64    │
+        ╞═══════╪════════╪════════╡
+        │ v1    ┆ 0      ┆ 2      │
+        │ v2    ┆ 2      ┆ 1      │
+        └───────┴────────┴────────┘
+
+        ```
+        """
+        return self._table
+
+    def save(self, path: Path | str) -> None:
+        r"""Save the index in a Parquet file.
+
+        Args:
+            path: The path to the Parquet file.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import tempfile
+        >>> from pathlib import Path
+        >>> import polars as pl
+        >>> from arctix.index import SequenceIndex
+        >>> frame = pl.DataFrame({"video": ["v1", "v1", "v2"], "action": [1, 2, 3]})
+        >>> index = SequenceIndex.from_frame(frame, group_cols=["video"])
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     path = Path(tmpdir).joinpath("index.parquet")
+        ...     index.save(path)
+        ...     SequenceIndex.load(path, group_cols=["video"])
+        ...
+        SequenceIndex(num_sequences=2, group_cols=('video',))
+
+        ```
+        """
+        path = sanitize_path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        logger.info(f"saving sequence index in {path}...")
+        self._table.write_parquet(path)
+
+    @classmethod
+    def load(cls, path: Path | str, group_cols: Sequence[str]) -> SequenceIndex:
+        r"""Load an index from a Parquet file.
+
+        Args:
+            path: The path to the Parquet file.
+            group_cols: The columns used to generate the sequences.
+
+        Returns:
+            The loaded index.
+        """
+        return cls(pl.read_parquet(sanitize_path(path)), group_cols=group_cols)
+
+    @classmethod
+    def from_frame(cls, frame: pl.DataFrame, group_cols: Sequence[str]) -> SequenceIndex:
+        r"""Build the index from a DataFrame.
+
+        Args:
+            frame: The DataFrame with one row per event. The rows of
+                each sequence must be contiguous.
+            group_cols: The columns used to generate the sequences.
+
+        Returns:
+            The index.
+
+        Raises:
+            RuntimeError: if the rows of a sequence are not
+                contiguous.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.index import SequenceIndex
+        >>> frame = pl.DataFrame({"video": ["v1", "v1", "v2"], "action": [1, 2, 3]})
+        >>> index = SequenceIndex.from_frame(frame, group_cols=["video"])
+        >>> index
+        SequenceIndex(num_sequences=2, group_cols=('video',))
+
+        ```
+        """
+        group_cols = list(group_cols)
+        table = (
+            frame.select(group_cols)
+            .with_row_index(OFFSET)
+            .group_by(pl.struct(group_cols).rle_id().alias("_run"), maintain_order=True)
+            .agg(*[pl.first(col) for col in group_cols], pl.first(OFFSET), pl.len().alias(LENGTH))
+        )
+        if table.height != table.select(group_cols).n_unique():
+            msg = (
+                f"The rows of each sequence must be contiguous. Please sort the DataFrame "
+                f"by {group_cols} before building the index"
+            )
+            raise RuntimeError(msg)
+        return cls(table, group_cols=group_cols)
@@ -0,0 +1,18 @@
+r"""Contain functions to save and load the prepared data."""
+
+from __future__ import annotations
+
+__all__ = [
+    "load_array_store",
+    "load_shard",
+    "load_shard_index",
+    "read_parquet",
+    "save_array_store",
+    "to_arrow",
+    "write_parquet",
+    "write_shards",
+]
+
+from arctix.io.array import load_array_store, save_array_store
+from arctix.io.parquet import read_parquet, to_arrow, write_parquet
+from arctix.io.shard import load_shard, load_shard_index, write_shards
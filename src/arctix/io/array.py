@@ -0,0 +1,197 @@
+r"""Contain functions to save arrays in a directory-backed store and to
+load them with memory-mapping.
+
+A store is a directory with one ``.npy`` file per array and a
+``manifest.json`` file which describes the arrays (shape, data type,
+mask) and the metadata (e.g. vocabularies). The masked arrays are
+stored with two ``.npy`` files: one for the data and one for the mask.
+"""
+
+from __future__ import annotations
+
+__all__ = ["MANIFEST_FILENAME", "load_array_store", "save_array_store"]
+
+import logging
+import shutil
+from typing import TYPE_CHECKING
+
+import numpy as np
+from coola.utils.path import sanitize_path
+from iden.io import load_json, save_json
+from iden.io.utils import generate_unique_tmp_path
+
+from arctix.io.metadata import decode_metadata, encode_metadata
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def save_array_store(
+    arrays: Mapping[str, np.ndarray],
+    path: Path | str,
+    metadata: dict | None = None,
+    exist_ok: bool = False,
+) -> None:
+    r"""Save a dictionary of arrays in a directory-backed store.
+
+    Each array is written in its own ``.npy`` file, so only one array
+    is serialized at a time. The store is written in a temporary
+    directory which is then renamed, so an interrupted job never
+    leaves a partial store at ``path``.
+
+    Args:
+        arrays: The dictionary of arrays to save, for example the
+            output of ``to_array``. The masked arrays are stored with
+            their mask.
+        path: The directory where to save the store.
+        metadata: The metadata to save in the manifest, for example
+            the vocabularies returned by ``prepare_data``.
+        exist_ok: If ``False``, ``FileExistsError`` is raised if the
+            path already exists. If ``True``, the existing store is
+            replaced.
+
+    Raises:
+        FileExistsError: if the path already exists and
+            ``exist_ok=False``.
+        TypeError: if an array has an ``object`` data type, which
+            cannot be memory-mapped.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> import numpy as np
+    >>> from arctix.io import load_array_store, save_array_store
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("store")
+    ...     save_array_store(
+    ...         {
+    ...             "action_id": np.ma.masked_array(
+    ...                 data=np.array([[0, 2, 1], [1, 0, -1]]),
+    ...                 mask=np.array([[False, False, False], [False, False, True]]),
+    ...             ),
+    ...             "sequence_length": np.array([3, 2]),
+    ...         },
+    ...         path,
+    ...     )
+    ...     arrays, metadata = load_array_store(path)
+    ...     arrays["sequence_length"]
+    ...
+    memmap([3, 2])
+
+    ```
+    """
+    path = sanitize_path(path)
+    if path.exists() and not exist_ok:
+        msg = f"path {path} already exists. Use exist_ok=True to overwrite the store"
+        raise FileExistsError(msg)
+
+    # Save to tmp, then commit by moving the directory in case the job gets
+    # interrupted while writing the files
+    tmp_path = generate_unique_tmp_path(path)
+    tmp_path.mkdir(parents=True)
+    manifest = {}
+    try:
+        for key, array in arrays.items():
+            logger.info(f"writing array {key!r} with shape {array.shape}...")
+            manifest[key] = _save_array(array, key, tmp_path)
+        save_json(
+            {"arrays": manifest, "metadata": encode_metadata(metadata or {})},
+            tmp_path.joinpath(MANIFEST_FILENAME),
+        )
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    if path.exists():
+        shutil.rmtree(path)
+    tmp_path.rename(path)
+
+
+def load_array_store(
+    path: Path | str, mmap_mode: str | None = "r"
+) -> tuple[dict[str, np.ndarray], dict]:
+    r"""Load the arrays and the metadata from a directory-backed store.
+
+    By default, the arrays are memory-mapped in read-only mode, so
+    several processes opening the same store share the pages through
+    the OS cache.
+
+    Args:
+        path: The directory where the store is saved.
+        mmap_mode: The memory-mapping mode. See the documentation of
+            ``numpy.load``. If ``None``, the arrays are loaded in
+            memory.
+
+    Returns:
+        A tuple with the dictionary of arrays and the metadata.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> import numpy as np
+    >>> from arctix.io import load_array_store, save_array_store
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("store")
+    ...     save_array_store({"sequence_length": np.array([3, 2])}, path)
+    ...     arrays, metadata = load_array_store(path, mmap_mode=None)
+    ...     arrays
+    ...
+    {'sequence_length': array([3, 2])}
+
+    ```
+    """
+    path = sanitize_path(path)
+    manifest = load_json(path.joinpath(MANIFEST_FILENAME))
+    arrays = {}
+    for key, info in manifest["arrays"].items():
+        data = np.load(path.joinpath(info["file"]), mmap_mode=mmap_mode)
+        if info.get("mask_file") is not None:
+            mask = np.load(path.joinpath(info["mask_file"]), mmap_mode=mmap_mode)
+            data = np.ma.masked_array(data=data, mask=mask, copy=False)
+        arrays[key] = data
+    return arrays, decode_metadata(manifest["metadata"])
+
+
+def _save_array(array: np.ndarray, key: str, path: Path) -> dict:
+    r"""Save an array and return its manifest entry.
+
+    Args:
+        array: The array to save.
+        key: The array name.
+        path: The directory where to save the array.
+
+    Returns:
+        The manifest entry of the array.
+
+    Raises:
+        TypeError: if the array has an ``object`` data type.
+    """
+    if array.dtype == np.object_:
+        msg = (
+            f"array {key!r} has an object data type which cannot be memory-mapped. "
+            "Please convert it to a fixed-size data type (e.g. with `.astype(str)`)"
+        )
+        raise TypeError(msg)
+    info = {
+        "file": f"{key}.npy",
+        "mask_file": None,
+        "shape": list(array.shape),
+        "dtype": array.dtype.str,
+    }
+    if isinstance(array, np.ma.MaskedArray):
+        info["mask_file"] = f"{key}.mask.npy"
+        np.save(path.joinpath(info["mask_file"]), np.ma.getmaskarray(array))
+        array = np.ma.getdata(array)
+    np.save(path.joinpath(info["file"]), np.asarray(array))
+    return info
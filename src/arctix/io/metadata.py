@@ -0,0 +1,86 @@
+r"""Contain functions to convert the metadata to JSON-compatible
+objects."""
+
+from __future__ import annotations
+
+__all__ = ["decode_metadata", "encode_metadata"]
+
+from collections import Counter
+from typing import Any
+
+from arctix.utils.vocab import Vocabulary
+
+VOCABULARY_TYPE = "Vocabulary"
+
+
+def encode_metadata(metadata: dict) -> dict:
+    r"""Encode the metadata to a JSON-compatible dictionary.
+
+    The ``Vocabulary`` objects are encoded as a dictionary with the
+    tokens and their counts, ordered by index. The other values are
+    returned as they are, so they must be JSON-compatible.
+
+    Args:
+        metadata: The metadata to encode.
+
+    Returns:
+        The encoded metadata.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from collections import Counter
+    >>> from arctix.io.metadata import encode_metadata
+    >>> from arctix.utils.vocab import Vocabulary
+    >>> encode_metadata({"vocab": Vocabulary(Counter({"b": 3, "a": 1})), "num": 2})
+    {'vocab': {'_type': 'Vocabulary', 'tokens': ['b', 'a'], 'counts': [3, 1]}, 'num': 2}
+
+    ```
+    """
+    return {key: _encode_value(value) for key, value in metadata.items()}
+
+
+def decode_metadata(metadata: dict) -> dict:
+    r"""Decode the metadata encoded by ``encode_metadata``.
+
+    Args:
+        metadata: The encoded metadata.
+
+    Returns:
+        The decoded metadata.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.io.metadata import decode_metadata
+    >>> decode_metadata(
+    ...     {"vocab": {"_type": "Vocabulary", "tokens": ["b", "a"], "counts": [3, 1]}, "num": 2}
+    ... )
+    {'vocab': Vocabulary(
+      counter=Counter({'b': 3, 'a': 1}),
+      index_to_token=('b', 'a'),
+      token_to_index={'b': 0, 'a': 1},
+    ), 'num': 2}
+
+    ```
+    """
+    return {key: _decode_value(value) for key, value in metadata.items()}
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Vocabulary):
+        tokens = list(value.get_index_to_token())
+        return {
+            "_type": VOCABULARY_TYPE,
+            "tokens": tokens,
+            "counts": [value.counter[token] for token in tokens],
+        }
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and value.get("_type") == VOCABULARY_TYPE:
+        return Vocabulary(Counter(dict(zip(value["tokens"], value["counts"]))))
+    return value
@@ -0,0 +1,269 @@
+r"""Contain functions to export the grouped sequences to Arrow tables and
+Parquet files.
+
+The list columns are kept as native list columns, the token columns
+are dictionary-encoded, and the metadata (e.g. vocabularies) is
+embedded in the schema metadata under the ``arctix`` key, so a
+Parquet file is self-describing.
+"""
+
+from __future__ import annotations
+
+__all__ = ["METADATA_KEY", "encode_token_columns", "read_parquet", "to_arrow", "write_parquet"]
+
+import json
+import logging
+from typing import TYPE_CHECKING
+
+import polars as pl
+from coola.utils.path import sanitize_path
+from iden.io.utils import generate_unique_tmp_path
+
+from arctix.io.metadata import decode_metadata, encode_metadata
+from arctix.utils.imports import check_pyarrow
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+METADATA_KEY = "arctix"
+
+
+def encode_token_columns(
+    frame: pl.DataFrame, token_columns: Sequence[str] | None = None
+) -> pl.DataFrame:
+    r"""Dictionary-encode the token columns of a DataFrame.
+
+    The string columns are cast to ``Categorical`` and the list of
+    string columns are cast to ``List(Categorical)``, so each token
+    is stored once per chunk instead of once per occurrence.
+
+    Args:
+        frame: The input DataFrame.
+        token_columns: The token columns to encode. If ``None``, all
+            the string and list of string columns are encoded.
+
+    Returns:
+        The DataFrame with the encoded token columns.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.io.parquet import encode_token_columns
+    >>> frame = encode_token_columns(
+    ...     pl.DataFrame({"action": [["SIL", "take_bowl"], ["SIL"]], "action_id": [[0, 1], [0]]})
+    ... )
+    >>> frame.schema
+    Schema([('action', List(Categorical)), ('action_id', List(Int64))])
+
+    ```
+    """
+    if token_columns is None:
+        token_columns = [
+            col
+            for col, dtype in frame.schema.items()
+            if dtype == pl.String or dtype == pl.List(pl.String)
+        ]
+    return frame.with_columns(
+        pl.col(col).cast(
+            pl.List(pl.Categorical) if isinstance(frame.schema[col], pl.List) else pl.Categorical
+        )
+        for col in token_columns
+    )
+
+
+def to_arrow(
+    frame: pl.DataFrame,
+    metadata: dict | None = None,
+    token_columns: Sequence[str] | None = None,
+) -> pa.Table:
+    r"""Convert a DataFrame of grouped sequences to an Arrow table.
+
+    The conversion does not copy the numeric buffers: the list
+    columns become Arrow list arrays and the token columns become
+    dictionary arrays. The metadata is stored as JSON in the schema
+    metadata.
+
+    Args:
+        frame: The input DataFrame, for example the output of
+            ``group_by_sequence``.
+        metadata: The metadata to embed in the schema, for example
+            the vocabularies returned by ``prepare_data``.
+        token_columns: The token columns to dictionary-encode.
+            If ``None``, all the string and list of string columns
+            are encoded.
+
+    Returns:
+        The Arrow table.
+
+    Raises:
+        RuntimeError: if ``pyarrow`` is not installed.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.io import to_arrow
+    >>> table = to_arrow(
+    ...     pl.DataFrame({"action": [["SIL", "take_bowl"], ["SIL"]], "sequence_length": [2, 1]}),
+    ...     metadata={"num": 2},
+    ... )  # doctest: +SKIP
+    >>> table.schema.metadata  # doctest: +SKIP
+    {b'arctix': b'{"num": 2}'}
+
+    ```
+    """
+    check_pyarrow()
+    table = encode_token_columns(frame, token_columns).to_arrow()
+    return table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), METADATA_KEY: _dump_metadata(metadata)}
+    )
+
+
+def write_parquet(
+    frame: pl.DataFrame,
+    path: Path | str,
+    metadata: dict | None = None,
+    *,
+    token_columns: Sequence[str] | None = None,
+    row_group_size: int | None = None,
+    compression: str = "zstd",
+) -> None:
+    r"""Write a DataFrame of grouped sequences to a Parquet file.
+
+    The list columns are written as native Parquet lists, the token
+    columns are dictionary-encoded, and the metadata is stored as
+    JSON in the file metadata. The file is written to a temporary
+    path which is then renamed, so an interrupted job never leaves a
+    partial file at ``path``.
+
+    Args:
+        frame: The input DataFrame, for example the output of
+            ``group_by_sequence``.
+        path: The path to the Parquet file.
+        metadata: The metadata to embed in the file, for example the
+            vocabularies returned by ``prepare_data``.
+        token_columns: The token columns to dictionary-encode.
+            If ``None``, all the string and list of string columns
+            are encoded.
+        row_group_size: The number of sequences per row group.
+            Smaller row groups allow to read a subset of the
+            sequences without decoding the whole file. If ``None``,
+            the default of ``polars.DataFrame.write_parquet`` is used.
+        compression: The compression codec.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from collections import Counter
+    >>> from pathlib import Path
+    >>> import polars as pl
+    >>> from arctix.io import read_parquet, write_parquet
+    >>> from arctix.utils.vocab import Vocabulary
+    >>> frame = pl.DataFrame(
+    ...     {
+    ...         "action": [["SIL", "take_bowl"], ["SIL"]],
+    ...         "action_id": [[0, 1], [0]],
+    ...         "sequence_length": [2, 1],
+    ...     }
+    ... )
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("data.parquet")
+    ...     write_parquet(
+    ...         frame,
+    ...         path,
+    ...         metadata={"vocab_action": Vocabulary(Counter({"SIL": 2, "take_bowl": 1}))},
+    ...         row_group_size=1,
+    ...     )
+    ...     frame, metadata = read_parquet(path, columns=["action_id"])
+    ...
+    >>> frame
+    shape: (2, 1)
+    ┌───────────┐
+    │ action_id │
+    │ ---       │
+    │ list[i64] │
+    ╞═══════════╡
+    │ [0, 1]    │
+    │ [0]       │
+    └───────────┘
+    >>> metadata["vocab_action"].get_index_to_token()
+    ('SIL', 'take_bowl')
+
+    ```
+    """
+    path = sanitize_path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"writing {frame.shape[0]:,} rows to {path}...")
+    # Save to tmp, then commit by renaming the file in case the job gets
+    # interrupted while writing the file
+    tmp_path = generate_unique_tmp_path(path)
+    try:
+        encode_token_columns(frame, token_columns).write_parquet(
+            tmp_path,
+            compression=compression,
+            row_group_size=row_group_size,
+            metadata={METADATA_KEY: _dump_metadata(metadata)},
+        )
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def read_parquet(
+    path: Path | str, columns: Sequence[str] | None = None
+) -> tuple[pl.DataFrame, dict]:
+    r"""Read a Parquet file written by ``write_parquet``.
+
+    Args:
+        path: The path to the Parquet file.
+        columns: The columns to read. If ``None``, all the columns
+            are read.
+
+    Returns:
+        A tuple with the DataFrame and the metadata. The metadata is
+            empty if the file was not written by ``write_parquet``.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> import polars as pl
+    >>> from arctix.io import read_parquet, write_parquet
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("data.parquet")
+    ...     write_parquet(pl.DataFrame({"sequence_length": [2, 1]}), path, metadata={"num": 2})
+    ...     frame, metadata = read_parquet(path)
+    ...
+    >>> metadata
+    {'num': 2}
+
+    ```
+    """
+    path = sanitize_path(path)
+    frame = pl.read_parquet(path, columns=None if columns is None else list(columns))
+    metadata = pl.read_parquet_metadata(path).get(METADATA_KEY)
+    return frame, decode_metadata(json.loads(metadata)) if metadata else {}
+
+
+def _dump_metadata(metadata: dict | None) -> str:
+    r"""Encode the metadata to a JSON string.
+
+    Args:
+        metadata: The metadata to encode.
+
+    Returns:
+        The JSON string.
+    """
+    return json.dumps(encode_metadata(metadata or {}))
@@ -0,0 +1,315 @@
+r"""Contain functions to split the grouped sequences in balanced shards
+and to load a single shard.
+
+A sharded dataset is a directory with one shard per rank and an
+``index.json`` file which describes the shards: the format, the
+number of sequences and events, and the keys of the sequences in
+each shard. A shard is either a Parquet file (see ``write_parquet``)
+or a directory-backed array store (see ``save_array_store``).
+"""
+
+from __future__ import annotations
+
+__all__ = ["INDEX_FILENAME", "load_shard", "load_shard_index", "write_shards"]
+
+import logging
+import multiprocessing
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import polars as pl
+from coola.utils.path import sanitize_path
+from iden.io import load_json, save_json
+from iden.io.utils import generate_unique_tmp_path
+
+from arctix.io.array import load_array_store, save_array_store
+from arctix.io.parquet import read_parquet, write_parquet
+from arctix.utils.batching import convert_groups_to_arrays
+from arctix.utils.chunking import find_balanced_chunks
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+SHARD_FORMATS = ("npy", "parquet")
+
+
+def write_shards(
+    frame: pl.DataFrame,
+    path: Path | str,
+    num_shards: int,
+    metadata: dict | None = None,
+    *,
+    key_cols: Sequence[str] | None = None,
+    length_col: str = "sequence_length",
+    shard_format: str = "parquet",
+    max_workers: int | None = None,
+    exist_ok: bool = False,
+) -> dict:
+    r"""Split the grouped sequences in shards with a balanced number of
+    events and write them in parallel.
+
+    The shards are contiguous slices of the DataFrame, whose
+    boundaries are chosen on the cumulative sequence length, so each
+    shard has about the same number of events. Each shard is written
+    by a worker process. The shards are written in a temporary
+    directory which is then renamed, so an interrupted job never
+    leaves a partial dataset at ``path``.
+
+    Args:
+        frame: The grouped sequences, for example the output of
+            ``group_by_sequence``.
+        path: The directory where to write the shards.
+        num_shards: The number of shards.
+        metadata: The metadata to save in each shard, for example
+            the vocabularies returned by ``prepare_data``.
+        key_cols: The columns which identify a sequence. The keys of
+            the sequences of each shard are saved in the index.
+            If ``None``, the sequence keys are their row indices in
+            ``frame``.
+        length_col: The column with the sequence lengths.
+        shard_format: The shard format. ``'parquet'`` writes a
+            Parquet file per shard and ``'npy'`` writes an array store
+            with one ``.npy`` file per column.
+        max_workers: The maximum number of worker processes.
+            If ``None``, the default of
+            ``concurrent.futures.ProcessPoolExecutor`` is used.
+            If ``1``, the shards are written in the current process.
+        exist_ok: If ``False``, ``FileExistsError`` is raised if the
+            path already exists. If ``True``, the existing shards are
+            replaced.
+
+    Returns:
+        The shard index.
+
+    Raises:
+        FileExistsError: if the path already exists and
+            ``exist_ok=False``.
+        RuntimeError: if the shard format is not supported.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> import polars as pl
+    >>> from arctix.io import load_shard, write_shards
+    >>> frame = pl.DataFrame(
+    ...     {
+    ...         "action_id": [[0, 2, 5, 1, 3, 0], [0, 1], [0, 1, 4]],
+    ...         "person": ["P03", "P12", "P54"],
+    ...         "sequence_length": [6, 2, 3],
+    ...     }
+    ... )
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("shards")
+    ...     index = write_shards(frame, path, num_shards=2, key_cols=["person"], max_workers=1)
+    ...     shard, metadata = load_shard(path, rank=1)
+    ...
+    >>> [shard["keys"] for shard in index["shards"]]
+    [[['P03']], [['P12'], ['P54']]]
+    >>> shard
+    shape: (2, 3)
+    ┌───────────┬────────┬─────────────────┐
+    │ action_id ┆ person ┆ sequence_length │
+    │ ---       ┆ ---    ┆ ---             │
+    │ list[i64] ┆ cat    ┆ i64             │
+    ╞═══════════╪════════╪═════════════════╡
+    │ [0, 1]    ┆ P12    ┆ 2               │
+    │ [0, 1, 4] ┆ P54    ┆ 3               │
+    └───────────┴────────┴─────────────────┘
+
+    ```
+    """
+    if shard_format not in SHARD_FORMATS:
+        msg = f"Incorrect shard format: {shard_format!r}. The supported formats are {SHARD_FORMATS}"
+        raise RuntimeError(msg)
+    path = sanitize_path(path)
+    if path.exists() and not exist_ok:
+        msg = f"path {path} already exists. Use exist_ok=True to overwrite the shards"
+        raise FileExistsError(msg)
+
+    lengths = frame.get_column(length_col).to_numpy()
+    chunks = find_balanced_chunks(lengths, num_chunks=num_shards)
+    if key_cols is None:
+        keys = list(range(frame.height))
+    else:
+        keys = [list(row) for row in frame.select(key_cols).iter_rows()]
+    shards = [
+        {
+            "name": _get_shard_name(rank, shard_format),
+            "num_sequences": end - start,
+            "num_events": int(lengths[start:end].sum()),
+            "keys": keys[start:end],
+        }
+        for rank, (start, end) in enumerate(chunks)
+    ]
+
+    # Save to tmp, then commit by moving the directory in case the job gets
+    # interrupted while writing the shards
+    tmp_path = generate_unique_tmp_path(path)
+    tmp_path.mkdir(parents=True)
+    try:
+        args = [
+            (frame.slice(start, end - start), tmp_path.joinpath(shard["name"]))
+            for shard, (start, end) in zip(shards, chunks)
+        ]
+        logger.info(f"writing {num_shards:,} {shard_format} shards in {path}...")
+        if max_workers == 1:
+            for shard_frame, shard_path in args:
+                _write_shard(shard_frame, shard_path, shard_format, metadata)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                futures = [
+                    executor.submit(_write_shard, shard_frame, shard_path, shard_format, metadata)
+                    for shard_frame, shard_path in args
+                ]
+                for future in futures:
+                    future.result()
+        index = {
+            "format": shard_format,
+            "num_shards": num_shards,
+            "key_cols": None if key_cols is None else list(key_cols),
+            "shards": shards,
+        }
+        save_json(index, tmp_path.joinpath(INDEX_FILENAME))
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    if path.exists():
+        shutil.rmtree(path)
+    tmp_path.rename(path)
+    return index
+
+
+def load_shard_index(path: Path | str) -> dict:
+    r"""Load the index of a sharded dataset.
+
+    Args:
+        path: The directory where the shards are written.
+
+    Returns:
+        The shard index.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> import polars as pl
+    >>> from arctix.io import load_shard_index, write_shards
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("shards")
+    ...     _ = write_shards(
+    ...         pl.DataFrame({"sequence_length": [6, 2, 4]}), path, num_shards=2, max_workers=1
+    ...     )
+    ...     index = load_shard_index(path)
+    ...
+    >>> [(shard["name"], shard["num_events"]) for shard in index["shards"]]
+    [('shard-00000.parquet', 6), ('shard-00001.parquet', 6)]
+
+    ```
+    """
+    return load_json(sanitize_path(path).joinpath(INDEX_FILENAME))
+
+
+def load_shard(
+    path: Path | str, rank: int, mmap_mode: str | None = "r"
+) -> tuple[pl.DataFrame | dict[str, np.ndarray], dict]:
+    r"""Load a single shard of a sharded dataset.
+
+    Only the files of the requested shard are read, so each rank of a
+    distributed job can open its own shard.
+
+    Args:
+        path: The directory where the shards are written.
+        rank: The index of the shard to load.
+        mmap_mode: The memory-mapping mode of the ``'npy'`` shards.
+            See the documentation of ``load_array_store``.
+
+    Returns:
+        A tuple with the shard and the metadata. The shard is a
+            DataFrame for the ``'parquet'`` format and a dictionary of
+            arrays for the ``'npy'`` format.
+
+    Raises:
+        RuntimeError: if the rank is not valid.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> import polars as pl
+    >>> from arctix.io import load_shard, write_shards
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("shards")
+    ...     _ = write_shards(
+    ...         pl.DataFrame({"action_id": [[0, 2, 5], [0], [1, 4]], "sequence_length": [3, 1, 2]}),
+    ...         path,
+    ...         num_shards=2,
+    ...         shard_format="npy",
+    ...         max_workers=1,
+    ...     )
+    ...     arrays, metadata = load_shard(path, rank=1, mmap_mode=None)
+    ...
+    >>> arrays["sequence_length"]
+    array([1, 2])
+
+    ```
+    """
+    path = sanitize_path(path)
+    index = load_shard_index(path)
+    if not 0 <= rank < index["num_shards"]:
+        msg = f"Incorrect rank {rank}. The rank must be in [0, {index['num_shards']})"
+        raise RuntimeError(msg)
+    shard_path = path.joinpath(index["shards"][rank]["name"])
+    if index["format"] == "npy":
+        return load_array_store(shard_path, mmap_mode=mmap_mode)
+    return read_parquet(shard_path)
+
+
+def _get_shard_name(rank: int, shard_format: str) -> str:
+    r"""Return the file name of a shard.
+
+    Args:
+        rank: The index of the shard.
+        shard_format: The shard format.
+
+    Returns:
+        The file name of the shard.
+    """
+    name = f"shard-{rank:05d}"
+    return f"{name}.parquet" if shard_format == "parquet" else name
+
+
+def _write_shard(frame: pl.DataFrame, path: Path, shard_format: str, metadata: dict | None) -> None:
+    r"""Write a shard.
+
+    Args:
+        frame: The sequences of the shard.
+        path: The path of the shard.
+        shard_format: The shard format.
+        metadata: The metadata to save in the shard.
+    """
+    if shard_format == "npy":
+        # The categorical columns are stored as strings
+        frame = frame.with_columns(
+            pl.col(pl.Categorical).cast(pl.String),
+            pl.col(pl.List(pl.Categorical)).cast(pl.List(pl.String)),
+        )
+        save_array_store(convert_groups_to_arrays(frame), path, metadata=metadata)
+    else:
+        write_parquet(frame, path, metadata=metadata)
@@ -2,6 +2,11 @@ r"""Contain some utility functions for testing."""
 
 from __future__ import annotations
 
-__all__ = ["gdown_available", "requests_available", "tqdm_available"]
+__all__ = ["gdown_available", "pyarrow_available", "requests_available", "tqdm_available"]
 
-from arctix.testing.fixtures import gdown_available, requests_available, tqdm_available
+from arctix.testing.fixtures import (
+    gdown_available,
+    pyarrow_available,
+    requests_available,
+    tqdm_available,
+)
@@ -2,16 +2,18 @@ r"""Define some PyTest fixtures."""
 
 from __future__ import annotations
 
-__all__ = ["gdown_available", "requests_available", "tqdm_available"]
+__all__ = ["gdown_available", "pyarrow_available", "requests_available", "tqdm_available"]
 
 import pytest
 
 from arctix.utils.imports import (
     is_gdown_available,
+    is_pyarrow_available,
     is_requests_available,
     is_tqdm_available,
 )
 
 gdown_available = pytest.mark.skipif(not is_gdown_available(), reason="Require gdown")
+pyarrow_available = pytest.mark.skipif(not is_pyarrow_available(), reason="Require pyarrow")
 requests_available = pytest.mark.skipif(not is_requests_available(), reason="Require requests")
 tqdm_available = pytest.mark.skipif(not is_tqdm_available(), reason="Require tqdm")
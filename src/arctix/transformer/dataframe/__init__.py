@@ -4,6 +4,8 @@ from __future__ import annotations
 
 __all__ = [
     "BaseDataFrameTransformer",
+    "Cache",
+    "CacheDataFrameTransformer",
     "Cast",
     "CastDataFrameTransformer",
     "Diff",
@@ -26,6 +28,8 @@ __all__ = [
     "SortDataFrameTransformer",
     "StripChars",
     "StripCharsDataFrameTransformer",
+    "TimeBin",
+    "TimeBinDataFrameTransformer",
     "TimeDiff",
     "TimeDiffDataFrameTransformer",
     "TimeToSecond",
@@ -36,6 +40,7 @@ __all__ = [
     "TokenToIndexDataFrameTransformer",
     "is_dataframe_transformer_config",
     "setup_dataframe_transformer",
+    "transform_to_parquet",
 ]
 
 from arctix.transformer.dataframe.base import (
@@ -43,6 +48,10 @@ from arctix.transformer.dataframe.base import (
     is_dataframe_transformer_config,
     setup_dataframe_transformer,
 )
+from arctix.transformer.dataframe.binning import TimeBinDataFrameTransformer
+from arctix.transformer.dataframe.binning import TimeBinDataFrameTransformer as TimeBin
+from arctix.transformer.dataframe.cache import CacheDataFrameTransformer
+from arctix.transformer.dataframe.cache import CacheDataFrameTransformer as Cache
 from arctix.transformer.dataframe.casting import CastDataFrameTransformer
 from arctix.transformer.dataframe.casting import CastDataFrameTransformer as Cast
 from arctix.transformer.dataframe.casting import ToTimeDataFrameTransformer
@@ -75,6 +84,7 @@ from arctix.transformer.dataframe.sorting import (
 )
 from arctix.transformer.dataframe.sorting import SortDataFrameTransformer
 from arctix.transformer.dataframe.sorting import SortDataFrameTransformer as Sort
+from arctix.transformer.dataframe.streaming import transform_to_parquet
 from arctix.transformer.dataframe.string import StripCharsDataFrameTransformer
 from arctix.transformer.dataframe.string import (
     StripCharsDataFrameTransformer as StripChars,
@@ -0,0 +1,164 @@
+r"""Contain ``polars.DataFrame`` transformers to bin the events on a
+regular time grid."""
+
+from __future__ import annotations
+
+__all__ = ["TimeBinDataFrameTransformer"]
+
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from arctix.transformer.dataframe import BaseDataFrameTransformer
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+AGGREGATIONS = {"first", "last", "max", "mean", "min", "sum"}
+
+
+class TimeBinDataFrameTransformer(BaseDataFrameTransformer):
+    r"""Implement a transformer to resample the asynchronous events of
+    each sequence on a regular time grid.
+
+    The time axis is split in bins of ``bin_size`` time units starting
+    at 0, and the events of each sequence are aggregated per bin. The
+    output DataFrame has one row per sequence and bin, with the bin
+    index, the bin start time, the number of events in the bin, and
+    the aggregated columns. If ``fill_empty=True``, the empty bins
+    from the bin 0 to the last non-empty bin of each sequence are
+    added, so all the sequences are on the same regular grid. If a
+    sequence has events with negative times, its grid starts at its
+    first non-empty bin, which has a negative index. The output is
+    sorted by sequence and bin, and can be converted to padded or
+    ragged arrays with ``convert_frame_to_sequence_arrays``.
+
+    Args:
+        group_cols: The columns used to generate the group for each
+            sequence.
+        time_col: The time column name.
+        bin_size: The bin duration, in the same unit as the time
+            column.
+        columns: The columns to aggregate per bin.
+        agg: The aggregation applied to the columns. The valid
+            values are ``'first'``, ``'last'``, ``'max'``,
+            ``'mean'``, ``'min'``, and ``'sum'``.
+        bin_col: The output column with the bin index.
+        bin_time_col: The output column with the bin start time.
+        count_col: The output column with the number of events in
+            each bin.
+        fill_empty: If ``True``, the empty bins are added.
+
+    Raises:
+        RuntimeError: if ``bin_size`` or ``agg`` is incorrect.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.transformer.dataframe import TimeBin
+    >>> transformer = TimeBin(
+    ...     group_cols=["video"], time_col="start_time", bin_size=2.0, columns=["action_id"]
+    ... )
+    >>> transformer
+    TimeBinDataFrameTransformer(group_cols=['video'], time_col=start_time, bin_size=2.0, columns=['action_id'], agg=last, bin_col=bin, bin_time_col=bin_time, count_col=count, fill_empty=True)
+    >>> frame = pl.DataFrame(
+    ...     {
+    ...         "video": ["v1", "v1", "v1", "v2"],
+    ...         "start_time": [0.5, 1.2, 4.1, 2.5],
+    ...         "action_id": [3, 1, 2, 0],
+    ...     }
+    ... )
+    >>> out = transformer.transform(frame)
+    >>> out
+    shape: (5, 5)
+    ┌───────┬─────┬──────────┬───────┬───────────┐
+    │ video ┆ bin ┆ bin_time ┆ count ┆ action_id │
+    │ ---   ┆ --- ┆ ---      ┆ ---   ┆ ---       │
+    │ str   ┆ i64 ┆ f64      ┆ i64   ┆ i64       │
+    ╞═══════╪═════╪══════════╪═══════╪═══════════╡
+    │ v1    ┆ 0   ┆ 0.0      ┆ 2     ┆ 1         │
+    │ v1    ┆ 1   ┆ 2.0      ┆ 0     ┆ null      │
+    │ v1    ┆ 2   ┆ 4.0      ┆ 1     ┆ 2         │
+    │ v2    ┆ 0   ┆ 0.0      ┆ 0     ┆ null      │
+    │ v2    ┆ 1   ┆ 2.0      ┆ 1     ┆ 0         │
+    └───────┴─────┴──────────┴───────┴───────────┘
+
+    ```
+    """
+
+    def __init__(
+        self,
+        group_cols: Sequence[str],
+        time_col: str,
+        bin_size: float,
+        *,
+        columns: Sequence[str] = (),
+        agg: str = "last",
+        bin_col: str = "bin",
+        bin_time_col: str = "bin_time",
+        count_col: str = "count",
+        fill_empty: bool = True,
+    ) -> None:
+        if bin_size <= 0:
+            msg = f"bin_size must be greater than 0 but received {bin_size}"
+            raise RuntimeError(msg)
+        if agg not in AGGREGATIONS:
+            msg = f"Incorrect agg: {agg}. The valid values are: {sorted(AGGREGATIONS)}"
+            raise RuntimeError(msg)
+        self._group_cols = list(group_cols)
+        self._time_col = time_col
+        self._bin_size = bin_size
+        self._columns = list(columns)
+        self._agg = agg
+        self._bin_col = bin_col
+        self._bin_time_col = bin_time_col
+        self._count_col = count_col
+        self._fill_empty = bool(fill_empty)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__qualname__}(group_cols={self._group_cols}, "
+            f"time_col={self._time_col}, bin_size={self._bin_size}, columns={self._columns}, "
+            f"agg={self._agg}, bin_col={self._bin_col}, bin_time_col={self._bin_time_col}, "
+            f"count_col={self._count_col}, fill_empty={self._fill_empty})"
+        )
+
+    def transform(self, frame: pl.DataFrame) -> pl.DataFrame:
+        keys = [*self._group_cols, self._bin_col]
+        binned = (
+            frame.drop_nulls(self._time_col)
+            .sort(by=[*self._group_cols, self._time_col], maintain_order=True)
+            .with_columns(
+                (pl.col(self._time_col) / self._bin_size)
+                .floor()
+                .cast(pl.Int64)
+                .alias(self._bin_col)
+            )
+            .group_by(keys, maintain_order=True)
+            .agg(
+                pl.len().cast(pl.Int64).alias(self._count_col),
+                *[getattr(pl.col(col), self._agg)() for col in self._columns],
+            )
+        )
+        if self._fill_empty:
+            grid = (
+                binned.group_by(self._group_cols)
+                .agg(
+                    pl.int_range(
+                        pl.min_horizontal(pl.col(self._bin_col).min(), 0),
+                        pl.col(self._bin_col).max() + 1,
+                    ).alias(self._bin_col)
+                )
+                .explode(self._bin_col)
+            )
+            binned = grid.join(binned, on=keys, how="left").with_columns(
+                pl.col(self._count_col).fill_null(0)
+            )
+        return binned.sort(by=keys).select(
+            *keys,
+            (pl.col(self._bin_col) * self._bin_size).cast(pl.Float64).alias(self._bin_time_col),
+            self._count_col,
+            *self._columns,
+        )
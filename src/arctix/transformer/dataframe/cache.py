@@ -0,0 +1,220 @@
+r"""Contain a transformer to cache the outputs of another
+transformer."""
+
+from __future__ import annotations
+
+__all__ = ["CacheDataFrameTransformer"]
+
+import hashlib
+import logging
+import pickle
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import polars as pl
+from coola.utils import repr_indent, repr_mapping, str_indent, str_mapping
+from coola.utils.path import sanitize_path
+
+from arctix.io.parquet import write_parquet
+from arctix.transformer.dataframe.base import (
+    BaseDataFrameTransformer,
+    setup_dataframe_transformer,
+)
+from arctix.utils.dataframe import compute_fingerprint
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class CacheDataFrameTransformer(BaseDataFrameTransformer):
+    r"""Implement a ``polars.DataFrame`` transformer which caches the
+    outputs of another transformer.
+
+    The cache key combines a fingerprint of the input DataFrame (see
+    ``compute_fingerprint``) and a fingerprint of the wrapped
+    transformer, which is computed from its ``repr`` and its pickled
+    state. The outputs are stored in an in-memory LRU cache whose
+    total estimated size is at most ``max_bytes``. If ``cache_dir`` is
+    set, the outputs are also written to Parquet files in this
+    directory, so they can be reused by another process.
+
+    The wrapped transformer must not be modified after the cache is
+    created. The functions are pickled by reference, so the disk
+    cache must be cleared when the code of a function changes. If the
+    transformer cannot be pickled (e.g. a ``Function`` transformer
+    with a lambda function), its fingerprint is only valid in the
+    current process, so the disk cache is disabled.
+
+    Args:
+        transformer: The transformer or its configuration.
+        max_bytes: The maximum total estimated size of the DataFrames
+            stored in memory. An output larger than this budget is
+            not stored in memory.
+        cache_dir: The directory where to store the outputs on disk.
+            If ``None``, the outputs are only stored in memory.
+        sample_size: The approximate number of rows to hash to
+            compute the fingerprint of the input DataFrame.
+            If ``None``, all the rows are hashed.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.transformer.dataframe import Cache, Cast
+    >>> transformer = Cache(Cast(columns=["col1"], dtype=pl.Float32))
+    >>> transformer
+    CacheDataFrameTransformer(
+      (transformer): CastDataFrameTransformer(columns=('col1',), dtype=Float32)
+      (max_bytes): 1073741824
+      (cache_dir): None
+      (sample_size): None
+    )
+    >>> frame = pl.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"]})
+    >>> out = transformer.transform(frame)
+    >>> out = transformer.transform(frame)
+    >>> stats = transformer.get_stats()
+    >>> stats["hits"], stats["misses"]
+    (1, 1)
+    >>> out
+    shape: (3, 2)
+    ┌──────┬──────┐
+    │ col1 ┆ col2 │
+    │ ---  ┆ ---  │
+    │ f32  ┆ str  │
+    ╞══════╪══════╡
+    │ 1.0  ┆ a    │
+    │ 2.0  ┆ b    │
+    │ 3.0  ┆ c    │
+    └──────┴──────┘
+
+    ```
+    """
+
+    def __init__(
+        self,
+        transformer: BaseDataFrameTransformer | dict,
+        max_bytes: int = 2**30,
+        cache_dir: Path | str | None = None,
+        sample_size: int | None = None,
+    ) -> None:
+        self._transformer = setup_dataframe_transformer(transformer)
+        self._max_bytes = int(max_bytes)
+        self._cache_dir = None if cache_dir is None else sanitize_path(cache_dir)
+        self._sample_size = sample_size
+
+        self._transformer_key, is_stable = _compute_transformer_key(self._transformer)
+        if self._cache_dir is not None and not is_stable:
+            logger.warning(
+                f"The disk cache is disabled because the transformer cannot be pickled: "
+                f"{self._transformer}"
+            )
+            self._cache_dir = None
+
+        self._items: OrderedDict[str, pl.DataFrame] = OrderedDict()
+        self._num_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __repr__(self) -> str:
+        args = repr_indent(repr_mapping(self._get_args()))
+        return f"{self.__class__.__qualname__}(\n  {args}\n)"
+
+    def __str__(self) -> str:
+        args = str_indent(str_mapping(self._get_args()))
+        return f"{self.__class__.__qualname__}(\n  {args}\n)"
+
+    def transform(self, frame: pl.DataFrame) -> pl.DataFrame:
+        key = hashlib.sha256(
+            f"{compute_fingerprint(frame, self._sample_size)}:{self._transformer_key}".encode()
+        ).hexdigest()
+        out = self._items.get(key)
+        if out is not None:
+            self._items.move_to_end(key)
+            self._hits += 1
+            return out.clone()
+
+        path = None if self._cache_dir is None else self._cache_dir.joinpath(f"{key}.parquet")
+        if path is not None and path.is_file():
+            logger.debug(f"loading the cached output from {path}")
+            out = pl.read_parquet(path)
+            self._hits += 1
+        else:
+            out = self._transformer.transform(frame)
+            self._misses += 1
+            if path is not None:
+                write_parquet(out, path, token_columns=())
+        self._store(key, out)
+        return out.clone()
+
+    def clear(self) -> None:
+        r"""Remove all the outputs stored in memory.
+
+        The outputs stored on disk are not removed.
+        """
+        self._items.clear()
+        self._num_bytes = 0
+
+    def get_stats(self) -> dict[str, int]:
+        r"""Get the cache statistics.
+
+        Returns:
+            A dictionary with the number of hits and misses, and the
+                number and total estimated size of the DataFrames
+                stored in memory.
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "num_items": len(self._items),
+            "num_bytes": self._num_bytes,
+        }
+
+    def _get_args(self) -> dict:
+        return {
+            "transformer": self._transformer,
+            "max_bytes": self._max_bytes,
+            "cache_dir": self._cache_dir,
+            "sample_size": self._sample_size,
+        }
+
+    def _store(self, key: str, frame: pl.DataFrame) -> None:
+        r"""Store a DataFrame in memory and evict the least recently
+        used DataFrames to respect the memory budget.
+
+        Args:
+            key: The cache key.
+            frame: The DataFrame to store.
+        """
+        num_bytes = frame.estimated_size()
+        if num_bytes > self._max_bytes:
+            return
+        self._items[key] = frame
+        self._num_bytes += num_bytes
+        while self._num_bytes > self._max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self._num_bytes -= evicted.estimated_size()
+
+
+def _compute_transformer_key(transformer: BaseDataFrameTransformer) -> tuple[str, bool]:
+    r"""Compute the fingerprint of a transformer.
+
+    The ``repr`` of some transformers does not show all their
+    arguments (e.g. the mapping of a ``Replace`` transformer), so the
+    pickled state is also used when the transformer can be pickled.
+
+    Args:
+        transformer: The transformer to fingerprint.
+
+    Returns:
+        A tuple with the fingerprint and a boolean which indicates if
+            the fingerprint is stable across processes.
+    """
+    digest = hashlib.sha256(repr(transformer).encode())
+    try:
+        digest.update(pickle.dumps(transformer))
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return digest.hexdigest(), False
+    return digest.hexdigest(), True
@@ -10,18 +10,13 @@ from typing import TYPE_CHECKING, Union
 import polars as pl
 
 from arctix.transformer.dataframe.base import BaseDataFrameTransformer
-from arctix.utils.imports import is_tqdm_available
+from arctix.utils.progress import tqdm
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
     from polars.type_aliases import PythonDataType
 
-if is_tqdm_available():
-    from tqdm import tqdm
-else:  # pragma: no cover
-    from arctix.utils.noop import tqdm
-
 
 PolarsDataType = Union[pl.DataType, type[pl.DataType]]
 
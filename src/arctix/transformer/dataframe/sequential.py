@@ -13,9 +13,11 @@ from arctix.transformer.dataframe.base import (
     BaseDataFrameTransformer,
     setup_dataframe_transformer,
 )
+from arctix.transformer.dataframe.streaming import transform_to_parquet
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
+    from pathlib import Path
 
     import polars as pl
 
@@ -107,3 +109,65 @@ class SequentialDataFrameTransformer(BaseDataFrameTransformer):
         for transformer in self._transformers:
             frame = transformer.transform(frame)
         return frame
+
+    def transform_to_parquet(
+        self,
+        source: pl.DataFrame | pl.LazyFrame | Path | str,
+        path: Path | str,
+        *,
+        group_cols: Sequence[str] = (),
+        batch_size: int = 1_000_000,
+        compression: str = "zstd",
+    ) -> int:
+        r"""Transform the rows by batches and write the output to a
+        Parquet file.
+
+        See the documentation of ``transform_to_parquet`` for the
+        constraints on the transformers and the input rows.
+
+        Args:
+            source: The input rows. It can be a DataFrame, a
+                LazyFrame or the path to a Parquet file.
+            path: The path to the output Parquet file.
+            group_cols: The columns which identify a group of rows,
+                for example the ``group_cols`` of a ``TimeDiff``
+                transformer.
+            batch_size: The number of rows read at each iteration.
+            compression: The compression codec of the output file.
+
+        Returns:
+            The number of rows written.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import tempfile
+        >>> from pathlib import Path
+        >>> import polars as pl
+        >>> from arctix.transformer.dataframe import Cast, Sequential, TimeDiff
+        >>> transformer = Sequential(
+        ...     [
+        ...         TimeDiff(group_cols=["col"], time_col="time", time_diff_col="diff"),
+        ...         Cast(columns=["diff"], dtype=pl.Float32),
+        ...     ]
+        ... )
+        >>> frame = pl.DataFrame({"col": ["a", "a", "b", "b"], "time": [1, 3, 2, 5]})
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     path = Path(tmpdir).joinpath("data.parquet")
+        ...     _ = transformer.transform_to_parquet(frame, path, group_cols=["col"], batch_size=3)
+        ...     out = pl.read_parquet(path)
+        ...
+        >>> out["diff"].to_list()
+        [0.0, 2.0, 0.0, 3.0]
+
+        ```
+        """
+        return transform_to_parquet(
+            self,
+            source,
+            path,
+            group_cols=group_cols,
+            batch_size=batch_size,
+            compression=compression,
+        )
@@ -0,0 +1,187 @@
+r"""Contain a function to apply a DataFrame transformer by batches of
+rows and write the output to a Parquet file, so the preparation of a
+large dataset runs in bounded memory."""
+
+from __future__ import annotations
+
+__all__ = ["transform_to_parquet"]
+
+import logging
+import shutil
+from typing import TYPE_CHECKING
+
+import polars as pl
+from coola.utils.path import sanitize_path
+from iden.io.utils import generate_unique_tmp_path
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from pathlib import Path
+
+    from arctix.transformer.dataframe.base import BaseDataFrameTransformer
+
+logger = logging.getLogger(__name__)
+
+
+def transform_to_parquet(
+    transformer: BaseDataFrameTransformer,
+    source: pl.DataFrame | pl.LazyFrame | Path | str,
+    path: Path | str,
+    *,
+    group_cols: Sequence[str] = (),
+    batch_size: int = 1_000_000,
+    compression: str = "zstd",
+) -> int:
+    r"""Transform the rows of a DataFrame by batches and write the
+    output to a Parquet file.
+
+    The input is read by batches of about ``batch_size`` rows, so only
+    one batch and its transformed output are in memory at the same
+    time. If ``group_cols`` is set, a group is never split across two
+    batches: the rows of the last group of a batch are moved to the
+    next batch. This is required by the transformers which compute a
+    value per group, like ``TimeDiff``. The input must then be
+    clustered by group, i.e. all the rows of a group are contiguous,
+    for example by sorting the input by ``group_cols``. The memory
+    usage is bounded by the batch size plus the size of the largest
+    group.
+
+    The transformer is applied to each batch independently, so the
+    output is the same as ``transformer.transform(frame)`` only if
+    the transformer is row-wise or group-wise. For example, a
+    ``Sort`` transformer only sorts the rows of each batch, and it
+    gives the same output if the input is already sorted by the
+    group columns. Each transformed batch is written to a temporary
+    Parquet file, and the files are then concatenated in ``path``
+    with the ``polars`` streaming engine.
+
+    Args:
+        transformer: The transformer to apply.
+        source: The input rows. It can be a DataFrame, a LazyFrame
+            or the path to a Parquet file. The query of a LazyFrame
+            is executed for each batch, so it should be cheap to
+            slice, for example a Parquet scan.
+        path: The path to the output Parquet file.
+        group_cols: The columns which identify a group of rows.
+            If empty, the batches are split at any row.
+        batch_size: The number of rows read at each iteration.
+        compression: The compression codec of the output file.
+
+    Returns:
+        The number of rows written.
+
+    Raises:
+        RuntimeError: if ``batch_size`` is not greater than 0.
+        RuntimeError: if the rows of a group are not contiguous.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> import polars as pl
+    >>> from arctix.transformer.dataframe import TimeDiff, transform_to_parquet
+    >>> transformer = TimeDiff(group_cols=["col"], time_col="time", time_diff_col="diff")
+    >>> frame = pl.DataFrame({"col": ["a", "a", "a", "b", "b"], "time": [1, 3, 4, 2, 5]})
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("data.parquet")
+    ...     num_rows = transform_to_parquet(
+    ...         transformer, frame, path, group_cols=["col"], batch_size=2
+    ...     )
+    ...     out = pl.read_parquet(path)
+    ...
+    >>> num_rows
+    5
+    >>> out
+    shape: (5, 3)
+    ┌─────┬──────┬──────┐
+    │ col ┆ time ┆ diff │
+    │ --- ┆ ---  ┆ ---  │
+    │ str ┆ i64  ┆ i64  │
+    ╞═════╪══════╪══════╡
+    │ a   ┆ 1    ┆ 0    │
+    │ a   ┆ 3    ┆ 2    │
+    │ a   ┆ 4    ┆ 1    │
+    │ b   ┆ 2    ┆ 0    │
+    │ b   ┆ 5    ┆ 3    │
+    └─────┴──────┴──────┘
+
+    ```
+    """
+    if batch_size <= 0:
+        msg = f"batch_size must be greater than 0 (received: {batch_size})"
+        raise RuntimeError(msg)
+    path = sanitize_path(path)
+    if isinstance(source, pl.DataFrame):
+        source = source.lazy()
+    elif not isinstance(source, pl.LazyFrame):
+        source = pl.scan_parquet(sanitize_path(source))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = generate_unique_tmp_path(path)
+    tmp_path.mkdir()
+    try:
+        parts = []
+        num_rows = 0
+        for batch in _iter_group_batches(source, group_cols=group_cols, batch_size=batch_size):
+            out = transformer.transform(batch)
+            part = tmp_path.joinpath(f"part-{len(parts):05d}.parquet")
+            out.write_parquet(part, compression=compression)
+            parts.append(part)
+            num_rows += out.height
+        logger.info(f"writing {num_rows:,} rows from {len(parts):,} batches in {path}...")
+        tmp_file = tmp_path.joinpath("output.parquet")
+        pl.scan_parquet(parts).sink_parquet(tmp_file, compression=compression)
+        tmp_file.replace(path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return num_rows
+
+
+def _iter_group_batches(
+    frame: pl.LazyFrame, group_cols: Sequence[str], batch_size: int
+) -> Iterator[pl.DataFrame]:
+    r"""Iterate over the batches of rows of a LazyFrame without
+    splitting the groups.
+
+    Args:
+        frame: The input rows.
+        group_cols: The columns which identify a group of rows.
+        batch_size: The number of rows read at each iteration.
+
+    Returns:
+        An iterator over the batches. At least one batch is returned,
+            even if the input is empty.
+
+    Raises:
+        RuntimeError: if the rows of a group are not contiguous.
+    """
+    group_cols = list(group_cols)
+    num_rows = frame.select(pl.len()).collect().item()
+    carry = None
+    seen = set()
+    for offset in range(0, max(num_rows, 1), batch_size):
+        batch = frame.slice(offset, batch_size).collect()
+        if carry is not None:
+            batch = pl.concat([carry, batch], how="vertical_relaxed")
+        if group_cols and offset + batch_size < num_rows:
+            # The last group can continue in the next rows
+            is_last = pl.all_horizontal(
+                pl.col(col).eq_missing(batch[col][-1]) for col in group_cols
+            )
+            carry = batch.filter(is_last)
+            batch = batch.filter(~is_last)
+        else:
+            carry = None
+        if group_cols:
+            keys = set(batch.select(group_cols).unique().iter_rows())
+            if not seen.isdisjoint(keys):
+                msg = (
+                    f"The rows of a group are not contiguous (group_cols={group_cols}). "
+                    "Sort the input by the group columns"
+                )
+                raise RuntimeError(msg)
+            seen.update(keys)
+        if batch.height or num_rows == 0:
+            yield batch
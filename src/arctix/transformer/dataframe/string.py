@@ -10,16 +10,11 @@ from typing import TYPE_CHECKING
 import polars as pl
 
 from arctix.transformer.dataframe.base import BaseDataFrameTransformer
-from arctix.utils.imports import is_tqdm_available
+from arctix.utils.progress import tqdm
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
-if is_tqdm_available():
-    from tqdm import tqdm
-else:  # pragma: no cover
-    from arctix.utils.noop import tqdm
-
 
 class StripCharsDataFrameTransformer(BaseDataFrameTransformer):
     r"""Implement a transformer to remove leading and trailing
@@ -0,0 +1,182 @@
+r"""Contain utility functions to extract archives."""
+
+from __future__ import annotations
+
+__all__ = ["extract_archive"]
+
+import logging
+import shutil
+import tarfile
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import IO, TYPE_CHECKING
+
+from coola.utils.path import sanitize_path
+from iden.io.utils import generate_unique_tmp_path
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def extract_archive(
+    path: Path | str,
+    dst: Path | str,
+    members: Mapping[str, str] | None = None,
+    *,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> list[Path]:
+    r"""Extract the files of a zip or tar archive.
+
+    The archive is read sequentially, and each selected file is
+    streamed to a unique temporary file next to its final path, then
+    committed by renaming the temporary file. The other files are
+    not written to disk, and an interrupted extraction never leaves
+    a partial file at a final path. The compressed tar archives are
+    read in streaming mode, so they are decompressed only once.
+
+    Args:
+        path: The path to the archive. The format is inferred from
+            the content of the file.
+        dst: The directory where to extract the files.
+        members: The files to extract. The keys are the member names
+            in the archive and the values are the output paths
+            relative to ``dst``. If ``None``, all the regular files
+            are extracted at their member name.
+        buffer_size: The number of bytes copied at each iteration.
+
+    Returns:
+        The paths of the extracted files.
+
+    Raises:
+        RuntimeError: if the archive format is not supported, if a
+            member is missing, or if an output path is outside of
+            ``dst``.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> import zipfile
+    >>> from pathlib import Path
+    >>> from arctix.utils.archive import extract_archive
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("data.zip")
+    ...     with zipfile.ZipFile(path, "w") as file:
+    ...         file.writestr("data/a.txt", "abc")
+    ...         file.writestr("data/b.txt", "def")
+    ...
+    ...     paths = extract_archive(path, Path(tmpdir), members={"data/a.txt": "a.txt"})
+    ...     [p.name for p in paths]
+    ...
+    ['a.txt']
+
+    ```
+    """
+    path = sanitize_path(path)
+    dst = sanitize_path(dst)
+    if zipfile.is_zipfile(path):
+        entries = _iter_zip_files(path)
+    elif tarfile.is_tarfile(path):
+        entries = _iter_tar_files(path)
+    else:
+        msg = f"Unsupported archive format: {path}"
+        raise RuntimeError(msg)
+
+    remaining = None if members is None else dict(members)
+    outputs = []
+    logger.info(f"extracting {path} in {dst}...")
+    for name, file in entries:
+        if remaining is not None:
+            if name not in remaining:
+                continue
+            output = remaining.pop(name)
+        else:
+            output = name
+        target = _resolve_output_path(dst, output)
+        _write_file(file, target, buffer_size=buffer_size)
+        outputs.append(target)
+        if remaining is not None and not remaining:
+            break
+
+    if remaining:
+        msg = f"The following members are missing in {path}: {sorted(remaining)}"
+        raise RuntimeError(msg)
+    return outputs
+
+
+def _iter_zip_files(path: Path) -> Iterator[tuple[str, IO[bytes]]]:
+    r"""Iterate over the regular files of a zip archive.
+
+    Args:
+        path: The path to the zip archive.
+
+    Returns:
+        An iterator over the member names and the file objects.
+    """
+    with zipfile.ZipFile(path, "r") as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            with archive.open(info) as file:
+                yield info.filename, file
+
+
+def _iter_tar_files(path: Path) -> Iterator[tuple[str, IO[bytes]]]:
+    r"""Iterate over the regular files of a tar archive in streaming
+    mode.
+
+    Args:
+        path: The path to the tar archive.
+
+    Returns:
+        An iterator over the member names and the file objects.
+    """
+    with tarfile.open(path, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            yield member.name, archive.extractfile(member)
+
+
+def _resolve_output_path(dst: Path, name: str) -> Path:
+    r"""Resolve the output path of a member and check it is in the
+    output directory.
+
+    Args:
+        dst: The output directory.
+        name: The relative output path.
+
+    Returns:
+        The output path.
+
+    Raises:
+        RuntimeError: if the output path is outside of ``dst``.
+    """
+    relative = PurePosixPath(name)
+    if relative.is_absolute() or ".." in relative.parts:
+        msg = f"Incorrect member path {name!r}: the path must be relative and inside {dst}"
+        raise RuntimeError(msg)
+    return dst.joinpath(*relative.parts)
+
+
+def _write_file(file: IO[bytes], path: Path, buffer_size: int) -> None:
+    r"""Write a file object to a path with an atomic commit.
+
+    Args:
+        file: The file object to read.
+        path: The output path.
+        buffer_size: The number of bytes copied at each iteration.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = generate_unique_tmp_path(path)
+    try:
+        with Path.open(tmp_path, mode="wb") as out:
+            shutil.copyfileobj(file, out, length=buffer_size)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,263 @@
+r"""Contain utility functions to generate batches of sequences."""
+
+from __future__ import annotations
+
+__all__ = [
+    "convert_frame_to_sequence_arrays",
+    "convert_groups_to_arrays",
+    "generate_bucketed_batch_indices",
+    "iter_bucketed_batches",
+]
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import polars as pl
+
+from arctix.utils.masking import convert_list_series_to_masked_array
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+
+def generate_bucketed_batch_indices(
+    lengths: np.ndarray | Sequence[int],
+    batch_size: int,
+    *,
+    bucket_size: int | None = None,
+    shuffle: bool = False,
+    seed: int | None = None,
+    drop_last: bool = False,
+) -> list[np.ndarray]:
+    r"""Generate the indices of the sequences in each batch, where the
+    sequences are bucketed by length.
+
+    The sequences are sorted by length, and split in buckets of
+    ``bucket_size`` sequences. Each bucket is split in batches of
+    ``batch_size`` sequences, so the sequences in a batch have
+    similar lengths. If ``shuffle=True``, the sequences are shuffled
+    within each bucket and the batches are shuffled.
+
+    Args:
+        lengths: The length of each sequence.
+        batch_size: The number of sequences in a batch.
+        bucket_size: The number of sequences in a bucket.
+            If ``None``, it is set to ``batch_size``.
+        shuffle: If ``True``, the sequences are shuffled within the
+            buckets and the batch order is shuffled.
+        seed: The random seed used to shuffle the data.
+        drop_last: If ``True``, the last batch of each bucket is
+            dropped if it is incomplete.
+
+    Returns:
+        The list of batches. Each batch is represented by the array
+            of sequence indices.
+
+    Raises:
+        RuntimeError: if ``batch_size`` or ``bucket_size`` is
+            incorrect.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.utils.batching import generate_bucketed_batch_indices
+    >>> generate_bucketed_batch_indices([5, 2, 8, 3, 1], batch_size=2)
+    [array([4, 1]), array([3, 0]), array([2])]
+
+    ```
+    """
+    if batch_size < 1:
+        msg = f"batch_size must be greater or equal to 1 but received {batch_size}"
+        raise RuntimeError(msg)
+    bucket_size = bucket_size or batch_size
+    if bucket_size < batch_size:
+        msg = (
+            f"bucket_size must be greater or equal to batch_size ({batch_size}) "
+            f"but received {bucket_size}"
+        )
+        raise RuntimeError(msg)
+    rng = np.random.default_rng(seed)
+    order = np.argsort(np.asarray(lengths, dtype=np.int64), kind="stable")
+    batches = []
+    for start in range(0, order.shape[0], bucket_size):
+        bucket = order[start : start + bucket_size]
+        if shuffle:
+            bucket = rng.permutation(bucket)
+        for i in range(0, bucket.shape[0], batch_size):
+            batch = bucket[i : i + batch_size]
+            if drop_last and batch.shape[0] < batch_size:
+                continue
+            batches.append(batch)
+    if shuffle:
+        batches = [batches[i] for i in rng.permutation(len(batches))]
+    return batches
+
+
+def convert_groups_to_arrays(groups: pl.DataFrame) -> dict[str, np.ndarray]:
+    r"""Convert a DataFrame of grouped sequences to a dictionary of
+    arrays.
+
+    The list columns are converted to masked arrays padded to the
+    maximum sequence length in the DataFrame, and the other columns
+    are converted to 1-d arrays.
+
+    Args:
+        groups: The DataFrame with one row per sequence, for example
+            the output of ``group_by_sequence``.
+
+    Returns:
+        The dictionary of arrays.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.utils.batching import convert_groups_to_arrays
+    >>> groups = pl.DataFrame(
+    ...     {"action_id": [[1, 2, 3], [4]], "sequence_length": [3, 1], "video": ["v1", "v2"]}
+    ... )
+    >>> arrays = convert_groups_to_arrays(groups)
+    >>> arrays
+    {'action_id': masked_array(
+      data=[[1, 2, 3],
+            [4, --, --]],
+      mask=[[False, False, False],
+            [False,  True,  True]],
+      fill_value=999999),
+     'sequence_length': array([3, 1]),
+     'video': array(['v1', 'v2'], dtype='<U2')}
+
+    ```
+    """
+    arrays = {}
+    for series in groups.iter_columns():
+        if isinstance(series.dtype, pl.List):
+            arrays[series.name] = convert_list_series_to_masked_array(series)
+        elif series.dtype == pl.String:
+            arrays[series.name] = series.to_numpy().astype(str)
+        else:
+            arrays[series.name] = series.to_numpy()
+    return arrays
+
+
+def convert_frame_to_sequence_arrays(
+    frame: pl.DataFrame,
+    group_cols: Sequence[str],
+    columns: Sequence[str],
+    padded: bool = True,
+) -> dict[str, np.ndarray | list[np.ndarray]]:
+    r"""Convert the columns of a DataFrame with one row per event to
+    per-sequence arrays.
+
+    The sequences are sorted by the group columns, and the order of
+    the rows within each sequence is preserved.
+
+    Args:
+        frame: The DataFrame with one row per event.
+        group_cols: The columns used to generate the sequences.
+        columns: The columns to convert.
+        padded: If ``True``, each column is converted to a
+            ``(num_sequences, max_length)`` masked array. If
+            ``False``, each column is converted to a list with one
+            array per sequence.
+
+    Returns:
+        The dictionary of padded or ragged arrays.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.utils.batching import convert_frame_to_sequence_arrays
+    >>> frame = pl.DataFrame({"video": ["v2", "v1", "v1"], "count": [4, 1, 2]})
+    >>> convert_frame_to_sequence_arrays(frame, group_cols=["video"], columns=["count"])
+    {'count': masked_array(
+      data=[[1, 2],
+            [4, --]],
+      mask=[[False, False],
+            [False,  True]],
+      fill_value=999999)}
+    >>> convert_frame_to_sequence_arrays(
+    ...     frame, group_cols=["video"], columns=["count"], padded=False
+    ... )
+    {'count': [array([1, 2]), array([4])]}
+
+    ```
+    """
+    group_cols, columns = list(group_cols), list(columns)
+    frame = frame.sort(by=group_cols, maintain_order=True)
+    if padded:
+        groups = frame.group_by(group_cols, maintain_order=True).agg(columns)
+        return {col: convert_list_series_to_masked_array(groups.get_column(col)) for col in columns}
+    lengths = frame.group_by(group_cols, maintain_order=True).len().get_column("len").to_numpy()
+    splits = np.cumsum(lengths)[:-1]
+    return {col: np.split(frame.get_column(col).to_numpy(), splits) for col in columns}
+
+
+def iter_bucketed_batches(
+    groups: pl.DataFrame,
+    batch_size: int,
+    *,
+    bucket_size: int | None = None,
+    shuffle: bool = False,
+    seed: int | None = None,
+    drop_last: bool = False,
+    length_col: str = "sequence_length",
+) -> Iterator[dict[str, np.ndarray]]:
+    r"""Iterate over padded batches of sequences bucketed by length.
+
+    Each batch is padded to its own maximum sequence length instead
+    of the global maximum sequence length, which reduces the memory
+    and compute wasted on padding when the length distribution is
+    heavy-tailed. The batches are dictionaries of arrays, so they can
+    be directly manipulated with ``batcharray``.
+
+    Args:
+        groups: The DataFrame with one row per sequence, for example
+            the output of ``group_by_sequence``.
+        batch_size: The number of sequences in a batch.
+        bucket_size: The number of sequences in a bucket.
+            If ``None``, it is set to ``batch_size``.
+        shuffle: If ``True``, the sequences are shuffled within the
+            buckets and the batch order is shuffled.
+        seed: The random seed used to shuffle the data.
+        drop_last: If ``True``, the last batch of each bucket is
+            dropped if it is incomplete.
+        length_col: The column with the sequence lengths.
+
+    Returns:
+        An iterator over the batches.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.utils.batching import iter_bucketed_batches
+    >>> groups = pl.DataFrame(
+    ...     {
+    ...         "action_id": [[1, 2, 3], [4], [5, 6, 7, 8], [9]],
+    ...         "sequence_length": [3, 1, 4, 1],
+    ...     }
+    ... )
+    >>> for batch in iter_bucketed_batches(groups, batch_size=2):
+    ...     batch["action_id"].shape
+    ...
+    (2, 1)
+    (2, 4)
+
+    ```
+    """
+    indices = generate_bucketed_batch_indices(
+        groups.get_column(length_col).to_numpy(),
+        batch_size=batch_size,
+        bucket_size=bucket_size,
+        shuffle=shuffle,
+        seed=seed,
+        drop_last=drop_last,
+    )
+    for batch in indices:
+        yield convert_groups_to_arrays(groups[batch])
@@ -0,0 +1,179 @@
+r"""Contain utility functions to split the sequences in chunks."""
+
+from __future__ import annotations
+
+__all__ = ["find_balanced_chunks", "find_sequence_chunks", "iter_sequence_chunks"]
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    import polars as pl
+
+
+def find_balanced_chunks(
+    lengths: np.ndarray | Sequence[int], num_chunks: int
+) -> list[tuple[int, int]]:
+    r"""Split consecutive sequences in chunks with a balanced number of
+    events.
+
+    The chunk boundaries are placed where the cumulative sequence
+    length is the closest to a multiple of ``total / num_chunks``,
+    so the chunks have about the same number of events even if the
+    sequences have very different lengths. The order of the
+    sequences is preserved.
+
+    Args:
+        lengths: The length of each sequence.
+        num_chunks: The number of chunks.
+
+    Returns:
+        The list of ``num_chunks`` chunks. Each chunk is represented
+            by a tuple ``(start, end)`` with the index of the first
+            sequence and the index after the last sequence. A chunk
+            can be empty if there are fewer sequences than chunks.
+
+    Raises:
+        RuntimeError: if ``num_chunks`` is lower than 1.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.utils.chunking import find_balanced_chunks
+    >>> find_balanced_chunks([8, 1, 1, 1, 1, 4, 4], num_chunks=3)
+    [(0, 1), (1, 5), (5, 7)]
+
+    ```
+    """
+    if num_chunks < 1:
+        msg = f"num_chunks must be greater than 0 (received: {num_chunks})"
+        raise RuntimeError(msg)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    targets = offsets[-1] * np.arange(1, num_chunks) / num_chunks
+    # Pick the closest boundary to each target: offsets[right - 1] < target <= offsets[right]
+    right = np.searchsorted(offsets, targets, side="left").clip(1, lengths.shape[0])
+    left = right - 1
+    bounds = np.where(targets - offsets[left] < offsets[right] - targets, left, right)
+    bounds = np.maximum.accumulate(np.concatenate([[0], bounds, [lengths.shape[0]]]))
+    return [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def find_sequence_chunks(
+    lengths: np.ndarray | Sequence[int],
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+    row_bytes: float = 1.0,
+) -> list[tuple[int, int]]:
+    r"""Find the chunks of consecutive sequences that fit in a budget.
+
+    The budget is computed on the padded size of each chunk i.e. the
+    number of sequences times the maximum sequence length in the
+    chunk. A chunk always contains at least one sequence, even if the
+    sequence is larger than the budget.
+
+    Args:
+        lengths: The length of each sequence.
+        max_rows: The maximum number of padded rows in a chunk.
+            If ``None``, the number of rows is not limited.
+        max_bytes: The maximum number of bytes in a chunk.
+            If ``None``, the number of bytes is not limited.
+        row_bytes: The number of bytes of a row. It is used to
+            convert the number of padded rows in bytes.
+
+    Returns:
+        The list of chunks. Each chunk is represented by a tuple
+            ``(start, end)`` with the index of the first sequence and
+            the index after the last sequence.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.utils.chunking import find_sequence_chunks
+    >>> find_sequence_chunks([2, 3, 1, 4, 2], max_rows=6)
+    [(0, 2), (2, 3), (3, 4), (4, 5)]
+    >>> find_sequence_chunks([2, 3, 1, 4, 2], max_bytes=48, row_bytes=8)
+    [(0, 2), (2, 3), (3, 4), (4, 5)]
+    >>> find_sequence_chunks([2, 3, 1, 4, 2])
+    [(0, 5)]
+
+    ```
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    limit = np.inf
+    if max_rows is not None:
+        limit = min(limit, max_rows)
+    if max_bytes is not None:
+        limit = min(limit, max_bytes / row_bytes)
+    chunks = []
+    start, max_len = 0, 0
+    for i, length in enumerate(lengths.tolist()):
+        new_max_len = max(max_len, length)
+        if i > start and (i - start + 1) * new_max_len > limit:
+            chunks.append((start, i))
+            start, new_max_len = i, length
+        max_len = new_max_len
+    if lengths.shape[0] > start:
+        chunks.append((start, lengths.shape[0]))
+    return chunks
+
+
+def iter_sequence_chunks(
+    frame: pl.DataFrame,
+    group_cols: Sequence[str],
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+) -> Iterator[pl.DataFrame]:
+    r"""Iterate over chunks of sequences of a DataFrame.
+
+    The DataFrame is sorted by the group columns, so the rows of each
+    sequence are contiguous, and sliced so that each chunk contains
+    complete sequences. The chunks are sized so that their padded
+    version fits in the given budget. The number of bytes of a row is
+    estimated from the DataFrame.
+
+    Args:
+        frame: The input DataFrame with one row per event.
+        group_cols: The columns used to generate the sequences.
+        max_rows: The maximum number of padded rows in a chunk.
+            If ``None``, the number of rows is not limited.
+        max_bytes: The maximum number of bytes in a chunk.
+            If ``None``, the number of bytes is not limited.
+
+    Returns:
+        An iterator over the DataFrame chunks.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.utils.chunking import iter_sequence_chunks
+    >>> frame = pl.DataFrame({"seq": ["a", "b", "a", "c", "b", "a"], "value": [1, 2, 3, 4, 5, 6]})
+    >>> for chunk in iter_sequence_chunks(frame, group_cols=["seq"], max_rows=4):
+    ...     chunk.get_column("value").to_list()
+    ...
+    [1, 3, 6]
+    [2, 5, 4]
+
+    ```
+    """
+    if frame.is_empty():
+        return
+    group_cols = list(group_cols)
+    frame = frame.sort(by=group_cols, maintain_order=True)
+    lengths = frame.group_by(group_cols, maintain_order=True).len().get_column("len").to_numpy()
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    chunks = find_sequence_chunks(
+        lengths,
+        max_rows=max_rows,
+        max_bytes=max_bytes,
+        row_bytes=frame.estimated_size() / frame.height,
+    )
+    for start, end in chunks:
+        yield frame.slice(int(offsets[start]), int(offsets[end] - offsets[start]))
@@ -0,0 +1,61 @@
+r"""Contain a function to compute a cheap fingerprint of a
+DataFrame."""
+
+from __future__ import annotations
+
+__all__ = ["compute_fingerprint"]
+
+import hashlib
+
+import polars as pl
+
+
+def compute_fingerprint(frame: pl.DataFrame, sample_size: int | None = None) -> str:
+    r"""Compute a fingerprint of a DataFrame.
+
+    The fingerprint combines the schema, the shape, and the row hashes
+    of the DataFrame. If ``sample_size`` is set, only about
+    ``sample_size`` evenly spaced rows are hashed, which is faster on
+    large DataFrames but does not detect a change in the other rows.
+    The categorical columns are hashed by value, not by their physical
+    encoding. The row hashes depend on the ``polars`` version, so the
+    fingerprint is only stable for a given version.
+
+    Args:
+        frame: The DataFrame to fingerprint.
+        sample_size: The approximate number of rows to hash.
+            If ``None``, all the rows are hashed.
+
+    Returns:
+        The fingerprint as a SHA-256 hex digest.
+
+    Raises:
+        RuntimeError: if ``sample_size`` is not greater than 0.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.utils.dataframe import compute_fingerprint
+    >>> frame = pl.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"]})
+    >>> compute_fingerprint(frame) == compute_fingerprint(frame.clone())
+    True
+    >>> compute_fingerprint(frame) == compute_fingerprint(frame.reverse())
+    False
+
+    ```
+    """
+    if sample_size is not None and sample_size <= 0:
+        msg = f"sample_size must be greater than 0 (received: {sample_size})"
+        raise RuntimeError(msg)
+    digest = hashlib.sha256(f"{pl.__version__}:{list(frame.schema.items())}:{frame.shape}".encode())
+    if frame.width and frame.height:
+        if sample_size is not None:
+            frame = frame.gather_every(max(frame.height // sample_size, 1))
+        hashes = frame.with_columns(
+            pl.col(pl.Categorical).cast(pl.String),
+            pl.col(pl.List(pl.Categorical)).cast(pl.List(pl.String)),
+        ).hash_rows(seed=0)
+        digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
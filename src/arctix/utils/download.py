@@ -2,47 +2,148 @@ r"""Contain utility functions to download data assets."""
 
 from __future__ import annotations
 
-__all__ = ["download_drive_file", "download_url_to_file"]
+__all__ = [
+    "CACHE_ENV_VAR",
+    "compute_sha256",
+    "download_drive_file",
+    "download_files",
+    "download_url_to_file",
+    "get_cache_path",
+]
 
+import hashlib
+import logging
+import math
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import partial
+from http import HTTPStatus
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from coola.utils.path import sanitize_path
 from iden.io.utils import generate_unique_tmp_path
 
-from arctix.utils.imports import (
-    check_gdown,
-    check_requests,
-    is_gdown_available,
-    is_requests_available,
-    is_tqdm_available,
-)
+from arctix.utils.imports import check_gdown, check_requests
+from arctix.utils.progress import tqdm
 
-if is_gdown_available():
-    import gdown
-else:  # pragma: no cover
-    gdown = None
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
 
-if is_requests_available():
     import requests
-else:  # pragma: no cover
-    requests = None
 
-if is_tqdm_available():
-    from tqdm import tqdm
-else:  # pragma: no cover
-    from arctix.utils.noop import tqdm
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
 
+logger = logging.getLogger(__name__)
 
-def download_drive_file(url: str, path: Path, *args: Any, **kwargs: Any) -> None:
+CACHE_ENV_VAR = "ARCTIX_CACHE_PATH"
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def get_cache_path(url: str, checksum: str | None = None) -> Path | None:
+    r"""Get the path of a downloaded file in the download cache.
+
+    The download cache is a content-addressed directory that is
+    enabled by setting the ``ARCTIX_CACHE_PATH`` environment variable.
+    It can be shared by several datasets and machines, for example
+    on a network file system. A file is stored in
+    ``sha256/{checksum}`` if its SHA-256 checksum is known, otherwise
+    in ``url/{sha256(url)}``.
+
+    Args:
+        url: The URL of the file.
+        checksum: The expected SHA-256 checksum of the file, as an
+            hexadecimal string.
+
+    Returns:
+        The path in the download cache, or ``None`` if the download
+            cache is disabled.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import os
+    >>> from unittest.mock import patch
+    >>> from arctix.utils.download import get_cache_path
+    >>> with patch.dict(os.environ, {"ARCTIX_CACHE_PATH": "/cache"}):
+    ...     get_cache_path("https://example.com/data.zip", checksum="abcdef")
+    ...
+    PosixPath('/cache/sha256/ab/abcdef')
+
+    ```
+    """
+    root = os.environ.get(CACHE_ENV_VAR)
+    if not root:
+        return None
+    if checksum:
+        checksum = checksum.lower()
+        return sanitize_path(root).joinpath("sha256", checksum[:2], checksum)
+    key = hashlib.sha256(url.encode()).hexdigest()
+    return sanitize_path(root).joinpath("url", key[:2], key)
+
+
+def compute_sha256(path: Path | str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    r"""Compute the SHA-256 checksum of a file.
+
+    Args:
+        path: The path to the file.
+        chunk_size: The number of bytes read at each iteration.
+
+    Returns:
+        The checksum as an hexadecimal string.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> from arctix.utils.download import compute_sha256
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("data.txt")
+    ...     _ = path.write_bytes(b"abc")
+    ...     compute_sha256(path)
+    ...
+    'ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad'
+
+    ```
+    """
+    digest = hashlib.sha256()
+    with Path.open(sanitize_path(path), mode="rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def download_drive_file(
+    url: str, path: Path, *args: Any, checksum: str | None = None, **kwargs: Any
+) -> None:
     r"""Download a file from Google Drive.
 
+    If the download cache is enabled, the file is copied from the
+    cache if it is available, otherwise it is downloaded and added to
+    the cache. See ``get_cache_path`` for more information.
+
     Args:
         url: The Google Drive URL.
         path: The path where to store the downloaded file.
         *args: See the documentation of ``gdown.download``.
+        checksum: The expected SHA-256 checksum of the file, as an
+            hexadecimal string. If ``None``, the checksum is not
+            verified.
         **kwargs: See the documentation of ``gdown.download``.
 
+    Raises:
+        RuntimeError: if the checksum of the downloaded file does not
+            match the expected checksum.
+
     Example usage:
 
     ```pycon
@@ -59,25 +160,78 @@ def download_drive_file(url: str, path: Path, *args: Any, **kwargs: Any) -> None
     ```
     """
     check_gdown()
+    import gdown  # noqa: PLC0415
+
     path.parent.mkdir(parents=True, exist_ok=True)
-    if not path.is_file():
-        # Save to tmp, then commit by moving the file in case the job gets
-        # interrupted while writing the file
-        tmp_path = path.with_name(f"{path.name}.tmp")
-        gdown.download(url, tmp_path.as_posix(), *args, **kwargs)
-        tmp_path.rename(path)
+    if path.is_file():
+        return
+    cache_path = get_cache_path(url, checksum)
+    if cache_path is not None and cache_path.is_file():
+        logger.info(f"copying {url} from the download cache {cache_path}...")
+        _copy_file(cache_path, path)
+        return
+    # Save to tmp, then commit by moving the file in case the job gets
+    # interrupted while writing the file
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    gdown.download(url, tmp_path.as_posix(), *args, **kwargs)
+    _verify_checksum(tmp_path, checksum)
+    tmp_path.rename(path)
+    _add_to_cache(path, cache_path)
 
 
 def download_url_to_file(
-    url: str, dst: Path | str, progress: bool = True, timeout: float = 10.0
+    url: str,
+    dst: Path | str,
+    progress: bool = True,
+    timeout: float = 10.0,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    num_segments: int = 1,
+    checksum: str | None = None,
 ) -> None:
     r"""Download object at the given URL to a local path.
 
+    The object is first downloaded to a temporary file ``{dst}.tmp``,
+    which is moved to ``dst`` only when the download is complete.
+    If the download is interrupted, the temporary file is kept and
+    the next call resumes the download with an HTTP ``Range``
+    request, if the server supports it. The ``If-Range`` header is
+    used so the object is downloaded again if it changed since the
+    partial download. The temporary file is
+    protected by a lock file ``{dst}.lock``: if another process is
+    downloading to the same path, or if file locks are not supported
+    (e.g. on Windows), a unique temporary file is used and the
+    download cannot be resumed. If ``num_segments > 1`` and the
+    server supports ``Range`` requests, the object is split in
+    segments that are downloaded in parallel to a unique
+    ``{dst}.{uuid}.part`` file. A segmented download is not resumed:
+    it restarts from the beginning if it is interrupted.
+
+    If the download cache is enabled, the file is copied from the
+    cache if it is available, otherwise it is downloaded and added to
+    the cache. See ``get_cache_path`` for more information.
+
     Args:
         url: The URL of the object to download
         dst: The path where to store the downloaded file.
         progress: If ``True``, it displays a progress bar.
         timeout: The number of second to wait until to time out.
+        chunk_size: The number of bytes read from the response and
+            written to the file at each iteration.
+        resume: If ``True``, an existing temporary file is used to
+            resume the download, otherwise the download restarts
+            from the beginning.
+        num_segments: The number of segments downloaded in parallel.
+        checksum: The expected SHA-256 checksum of the file, as an
+            hexadecimal string. If ``None``, the checksum is not
+            verified.
+
+    Raises:
+        RuntimeError: if the number of received bytes does not
+            match the size announced by the server, or if the
+            checksum of the downloaded file does not match the
+            expected checksum.
 
     Example usage:
 
@@ -95,19 +249,478 @@ def download_url_to_file(
     check_requests()
     dst = sanitize_path(dst)
     dst.parent.mkdir(exist_ok=True, parents=True)
+    cache_path = get_cache_path(url, checksum)
+    if cache_path is not None and cache_path.is_file():
+        logger.info(f"copying {url} from the download cache {cache_path}...")
+        _copy_file(cache_path, dst)
+        return
 
     # Save to tmp, then commit by moving the file in case the job gets
-    # interrupted while writing the file
-    tmp_dst = generate_unique_tmp_path(dst)
+    # interrupted while writing the file. The tmp path is deterministic
+    # so an interrupted download can be resumed.
+    with _lock_tmp_path(dst) as tmp_dst:
+        if not resume:
+            tmp_dst.unlink(missing_ok=True)
+            _get_validator_path(tmp_dst).unlink(missing_ok=True)
 
-    with (
-        requests.get(url, stream=True, timeout=timeout) as response,
-        Path.open(tmp_dst, mode="wb") as file,
-    ):
-        chunks = response.iter_content(chunk_size=1024)
+        size = None
+        if num_segments > 1 and not tmp_dst.is_file():
+            size = _get_range_size(url, timeout=timeout)
+        if size:
+            # The segments are written to a separate preallocated file,
+            # so the stream download never resumes from a file with holes.
+            part_dst = _generate_part_path(dst)
+            _download_segments(
+                url,
+                part_dst,
+                size=size,
+                num_segments=num_segments,
+                chunk_size=chunk_size,
+                progress=progress,
+                timeout=timeout,
+            )
+            part_dst.replace(tmp_dst)
+        else:
+            _download_stream(
+                url, tmp_dst, chunk_size=chunk_size, progress=progress, timeout=timeout
+            )
+
+        _verify_checksum(tmp_dst, checksum)
+        tmp_dst.replace(dst)
+        _get_validator_path(tmp_dst).unlink(missing_ok=True)
+    _add_to_cache(dst, cache_path)
+
+
+def download_files(
+    files: Sequence[tuple[str, Path]],
+    download_fn: Callable[[str, Path], None] | None = None,
+    on_complete: Callable[[str, Path], None] | None = None,
+    max_workers: int = 4,
+    progress: bool = True,
+) -> list[Path]:
+    r"""Download several files concurrently.
+
+    The files are downloaded in a thread pool with at most
+    ``max_workers`` concurrent downloads. ``on_complete`` is called in
+    the worker thread as soon as a file is downloaded, so for example
+    the extraction of an archive overlaps with the other downloads.
+    The progress is reported per file with a single progress bar, and
+    the progress bars of the individual downloads should be disabled
+    in ``download_fn`` to avoid interleaved outputs.
+
+    Args:
+        files: The files to download. Each item is a tuple with the
+            URL and the path where to store the downloaded file.
+        download_fn: The function used to download a file. It takes
+            the URL and the path as input. If ``None``,
+            ``download_url_to_file`` is used without progress bar.
+        on_complete: An optional function called after each download
+            with the URL and the path of the downloaded file.
+        max_workers: The maximum number of concurrent downloads.
+        progress: If ``True``, it displays a progress bar with the
+            number of completed files.
+
+    Returns:
+        The paths of the downloaded files, in the same order as the
+            inputs.
+
+    Raises:
+        RuntimeError: if ``max_workers`` is incorrect.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from pathlib import Path
+    >>> from arctix.utils.download import download_files
+    >>> download_files(
+    ...     [
+    ...         ("https://example.com/a.zip", Path("/tmp/a.zip")),
+    ...         ("https://example.com/b.zip", Path("/tmp/b.zip")),
+    ...     ],
+    ...     max_workers=2,
+    ... )  # doctest: +SKIP
+
+    ```
+    """
+    if max_workers < 1:
+        msg = f"max_workers must be greater than 0 but received {max_workers}"
+        raise RuntimeError(msg)
+    if download_fn is None:
+        download_fn = partial(download_url_to_file, progress=False)
+
+    def _download_file(url: str, path: Path) -> Path:
+        download_fn(url, path)
+        logger.info(f"downloaded {url} to {path}")
+        if on_complete is not None:
+            on_complete(url, path)
+        return path
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_download_file, url, path) for url, path in files]
+        done = as_completed(futures)
         if progress:
-            chunks = tqdm(chunks, desc="downloading URL to file")
-        for chunk in chunks:
-            file.write(chunk)
+            done = tqdm(done, desc="downloading files", total=len(futures))
+        try:
+            for future in done:
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return [future.result() for future in futures]
+
 
-    tmp_dst.rename(dst)
+def _download_stream(
+    url: str, path: Path, *, chunk_size: int, progress: bool, timeout: float
+) -> None:
+    r"""Download an object in a single stream, and resume the download
+    if the file already exists.
+
+    The validator of the object (its strong ``ETag``, or its
+    ``Last-Modified`` date) is stored in ``{path}.validator`` and
+    sent in the ``If-Range`` header of a resumed download, so the
+    server sends the full object if it changed since the partial
+    download. A partial file without validator is downloaded again
+    from the beginning, because its bytes cannot be validated.
+
+    Args:
+        url: The URL of the object to download
+        path: The path where to store the downloaded bytes.
+        chunk_size: The number of bytes read at each iteration.
+        progress: If ``True``, it displays a progress bar.
+        timeout: The number of second to wait until to time out.
+
+    Raises:
+        RuntimeError: if the number of received bytes does not
+            match the size announced by the server.
+    """
+    import requests  # noqa: PLC0415
+
+    validator_path = _get_validator_path(path)
+    offset = path.stat().st_size if path.is_file() else 0
+    validator = validator_path.read_text() if offset and validator_path.is_file() else None
+    if offset and not validator:
+        logger.info(f"{path} cannot be validated so the download restarts from the beginning")
+        offset = 0
+    headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset else None
+    with requests.get(url, stream=True, timeout=timeout, headers=headers) as response:
+        if offset and response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+            if _parse_content_range_size(response.headers.get("Content-Range", "")) == offset:
+                # The previous download was interrupted after the last write
+                return
+            path.unlink()
+            _download_stream(url, path, chunk_size=chunk_size, progress=progress, timeout=timeout)
+            return
+        response.raise_for_status()
+        if response.status_code != HTTPStatus.PARTIAL_CONTENT:
+            # The server ignored the Range request, or the object changed
+            # since the partial download, so the download restarts
+            offset = 0
+            _save_validator(response, validator_path)
+        expected = _get_expected_size(response)
+
+        chunks = response.iter_content(chunk_size=chunk_size)
+        if progress:
+            total = None if expected is None else math.ceil(expected / chunk_size)
+            chunks = tqdm(chunks, desc="downloading URL to file", total=total)
+        received = 0
+        with Path.open(path, mode="ab" if offset else "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+                received += len(chunk)
+
+    if expected is not None and received != expected:
+        msg = (
+            f"Incomplete download of {url}: received {received:,} bytes but expected "
+            f"{expected:,} bytes. The partial file {path} is kept to resume the download"
+        )
+        raise RuntimeError(msg)
+
+
+def _download_segments(
+    url: str,
+    path: Path,
+    *,
+    size: int,
+    num_segments: int,
+    chunk_size: int,
+    progress: bool,
+    timeout: float,
+) -> None:
+    r"""Download an object by downloading its segments in parallel.
+
+    Each segment is downloaded with an HTTP ``Range`` request and
+    written at its offset in a preallocated file. The file is deleted
+    if a segment fails, because it may contain holes, so it must not
+    be used to resume a download.
+
+    Args:
+        url: The URL of the object to download
+        path: The path where to store the downloaded bytes.
+        size: The size of the object in bytes.
+        num_segments: The number of segments.
+        chunk_size: The number of bytes read at each iteration.
+        progress: If ``True``, it displays a progress bar.
+        timeout: The number of second to wait until to time out.
+
+    Raises:
+        RuntimeError: if a segment is incomplete.
+    """
+    import requests  # noqa: PLC0415
+
+    step = math.ceil(size / num_segments)
+    segments = [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+    def _download_segment(start: int, end: int) -> None:
+        headers = {"Range": f"bytes={start}-{end}"}
+        received = 0
+        with requests.get(url, stream=True, timeout=timeout, headers=headers) as response:
+            response.raise_for_status()
+            if response.status_code != HTTPStatus.PARTIAL_CONTENT:
+                # The body is the full object, so it must not be written at the offset
+                msg = (
+                    f"Incorrect segment {start}-{end} of {url}: received status "
+                    f"{response.status_code} instead of {HTTPStatus.PARTIAL_CONTENT.value}"
+                )
+                raise RuntimeError(msg)
+            with Path.open(path, mode="r+b") as file:
+                file.seek(start)
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    file.write(chunk)
+                    received += len(chunk)
+        if received != end - start + 1:
+            msg = (
+                f"Incorrect segment {start}-{end} of {url}: received {received:,} bytes "
+                f"but expected {end - start + 1:,} bytes"
+            )
+            raise RuntimeError(msg)
+
+    with Path.open(path, mode="wb") as file:
+        file.truncate(size)
+    try:
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            futures = [executor.submit(_download_segment, *segment) for segment in segments]
+            done = as_completed(futures)
+            if progress:
+                done = tqdm(done, desc="downloading URL to file", total=len(futures))
+            for future in done:
+                future.result()
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def _lock_tmp_path(dst: Path) -> Iterator[Path]:
+    r"""Acquire the temporary path used to download a file.
+
+    The deterministic path ``{dst}.tmp`` is returned if the lock file
+    ``{dst}.lock`` can be locked, so only one process resumes a
+    download. Otherwise, a unique temporary path is returned and
+    removed at the end.
+
+    Args:
+        dst: The path where to store the downloaded file.
+
+    Returns:
+        A context manager which yields the temporary path.
+    """
+    if fcntl is not None:
+        lock_path = dst.with_name(f"{dst.name}.lock")
+        with Path.open(lock_path, mode="a+b") as lock:
+            if _try_lock(lock.fileno(), lock_path):
+                try:
+                    yield dst.with_name(f"{dst.name}.tmp")
+                finally:
+                    lock_path.unlink(missing_ok=True)
+                return
+        logger.warning(f"{dst} is downloaded by another process, so the download cannot be resumed")
+    tmp_path = _generate_part_path(dst, suffix="tmp")
+    try:
+        yield tmp_path
+    finally:
+        tmp_path.unlink(missing_ok=True)
+        _get_validator_path(tmp_path).unlink(missing_ok=True)
+
+
+def _try_lock(fd: int, path: Path) -> bool:
+    r"""Try to lock a lock file without blocking.
+
+    The lock file is removed by its owner at the end of the download,
+    so the lock is only valid if the file descriptor still refers to
+    the file at ``path``.
+
+    Args:
+        fd: The file descriptor of the open lock file.
+        path: The path of the lock file.
+
+    Returns:
+        ``True`` if the lock is acquired, otherwise ``False``.
+    """
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    try:
+        return path.stat().st_ino == os.fstat(fd).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def _generate_part_path(dst: Path, suffix: str = "part") -> Path:
+    r"""Generate a unique temporary path next to a downloaded file.
+
+    Args:
+        dst: The path where to store the downloaded file.
+        suffix: The suffix of the temporary path.
+
+    Returns:
+        The unique temporary path.
+    """
+    return dst.with_name(f"{dst.name}.{uuid.uuid4().hex}.{suffix}")
+
+
+def _get_validator_path(path: Path) -> Path:
+    r"""Get the path of the file which stores the validator of a
+    partial download.
+
+    Args:
+        path: The path of the partial download.
+
+    Returns:
+        The path of the validator file.
+    """
+    return path.with_name(f"{path.name}.validator")
+
+
+def _save_validator(response: requests.Response, path: Path) -> None:
+    r"""Save the validator of a downloaded object.
+
+    The weak entity tags cannot be used in an ``If-Range`` header, so
+    the ``Last-Modified`` date is used instead. The validator file is
+    removed if the response has no usable validator.
+
+    Args:
+        response: The response of the download.
+        path: The path of the validator file.
+    """
+    validator = response.headers.get("ETag")
+    if not validator or validator.startswith("W/"):
+        validator = response.headers.get("Last-Modified")
+    if validator:
+        path.write_text(validator)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def _get_range_size(url: str, timeout: float) -> int | None:
+    r"""Get the size of an object if the server supports ``Range``
+    requests.
+
+    Args:
+        url: The URL of the object.
+        timeout: The number of second to wait until to time out.
+
+    Returns:
+        The size of the object in bytes, or ``None`` if the server
+            does not support ``Range`` requests or does not announce
+            the size.
+    """
+    import requests  # noqa: PLC0415
+
+    response = requests.head(url, timeout=timeout, allow_redirects=True)
+    if not response.ok or response.headers.get("Accept-Ranges") != "bytes":
+        return None
+    return _get_expected_size(response)
+
+
+def _get_expected_size(response: requests.Response) -> int | None:
+    r"""Get the number of bytes announced in the response headers.
+
+    Args:
+        response: The HTTP response.
+
+    Returns:
+        The number of bytes, or ``None`` if it is unknown. The size
+            is unknown if the content is encoded because the decoded
+            content does not have the same size.
+    """
+    length = response.headers.get("Content-Length")
+    if length is None or response.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    return int(length)
+
+
+def _parse_content_range_size(content_range: str) -> int | None:
+    r"""Parse the total size in a ``Content-Range`` header.
+
+    Args:
+        content_range: The header value e.g. ``'bytes 0-9/100'`` or
+            ``'bytes */100'``.
+
+    Returns:
+        The total size, or ``None`` if it is unknown.
+    """
+    _, _, size = content_range.rpartition("/")
+    return int(size) if size.isdigit() else None
+
+
+def _verify_checksum(path: Path, checksum: str | None) -> None:
+    r"""Verify the SHA-256 checksum of a downloaded file.
+
+    The file is deleted if the checksum does not match, so it is not
+    used to resume a download.
+
+    Args:
+        path: The path to the downloaded file.
+        checksum: The expected checksum. If ``None``, the checksum is
+            not verified.
+
+    Raises:
+        RuntimeError: if the checksum does not match.
+    """
+    if checksum is None:
+        return
+    if (value := compute_sha256(path)) != checksum.lower():
+        path.unlink()
+        msg = f"Incorrect checksum for {path}: expected {checksum} but received {value}"
+        raise RuntimeError(msg)
+
+
+def _add_to_cache(path: Path, cache_path: Path | None) -> None:
+    r"""Add a downloaded file to the download cache.
+
+    A failure to write the cache is logged but not raised because the
+    file is already downloaded.
+
+    Args:
+        path: The path to the downloaded file.
+        cache_path: The path in the download cache. If ``None``, the
+            download cache is disabled and nothing is done.
+    """
+    if cache_path is None:
+        return
+    try:
+        _copy_file(path, cache_path)
+    except OSError as exc:
+        logger.warning(f"failed to add {path} to the download cache {cache_path}: {exc}")
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    r"""Copy a file atomically.
+
+    The file is copied to a unique temporary file that is then
+    renamed, so concurrent readers never see a partial file.
+
+    Args:
+        src: The source path.
+        dst: The destination path.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dst = generate_unique_tmp_path(dst)
+    try:
+        shutil.copyfile(src, tmp_dst)
+        tmp_dst.replace(dst)
+    finally:
+        tmp_dst.unlink(missing_ok=True)
@@ -5,14 +5,17 @@ from __future__ import annotations
 __all__ = [
     "check_gdown",
     "check_matplotlib",
+    "check_pyarrow",
     "check_requests",
     "check_tqdm",
     "gdown_available",
     "is_gdown_available",
     "is_matplotlib_available",
+    "is_pyarrow_available",
     "is_requests_available",
     "is_tqdm_available",
     "matplotlib_available",
+    "pyarrow_available",
     "requests_available",
     "tqdm_available",
 ]
@@ -173,6 +176,80 @@ def matplotlib_available(fn: Callable[..., Any]) -> Callable[..., Any]:
     return decorator_package_available(fn, is_matplotlib_available)
 
 
+###################
+#     pyarrow     #
+###################
+
+
+def is_pyarrow_available() -> bool:
+    r"""Indicate if the ``pyarrow`` package is installed or not.
+
+    Returns:
+        ``True`` if ``pyarrow`` is available otherwise ``False``.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.utils.imports import is_pyarrow_available
+    >>> is_pyarrow_available()
+
+    ```
+    """
+    return find_spec("pyarrow") is not None
+
+
+def check_pyarrow() -> None:
+    r"""Check if the ``pyarrow`` package is installed.
+
+    Raises:
+        RuntimeError: if the ``pyarrow`` package is not installed.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.utils.imports import check_pyarrow
+    >>> check_pyarrow()
+
+    ```
+    """
+    if not is_pyarrow_available():
+        msg = (
+            "`pyarrow` package is required but not installed. "
+            "You can install `pyarrow` package with the command:\n\n"
+            "pip install pyarrow\n"
+        )
+        raise RuntimeError(msg)
+
+
+def pyarrow_available(fn: Callable[..., Any]) -> Callable[..., Any]:
+    r"""Implement a decorator to execute a function only if
+    ``pyarrow`` package is installed.
+
+    Args:
+        fn: Specifies the function to execute.
+
+    Returns:
+        A wrapper around ``fn`` if ``pyarrow`` package is installed,
+            otherwise ``None``.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.utils.imports import pyarrow_available
+    >>> @pyarrow_available
+    ... def my_function(n: int = 0) -> int:
+    ...     return 42 + n
+    ...
+    >>> my_function()
+
+    ```
+    """
+    return decorator_package_available(fn, is_pyarrow_available)
+
+
 ####################
 #     requests     #
 ####################
@@ -0,0 +1,353 @@
+r"""Contain utility functions to prepare a dataset incrementally when
+only some of its source files change.
+
+The cache directory contains a ``state.json`` file with the
+fingerprint and the sequence groups of each source file, a Parquet
+file with the parsed rows of each source file, the combined raw
+DataFrame, and the prepared DataFrame.
+"""
+
+from __future__ import annotations
+
+__all__ = ["STATE_FILENAME", "count_tokens", "prepare_incremental"]
+
+import hashlib
+import logging
+from typing import TYPE_CHECKING
+
+import polars as pl
+from coola.utils.path import sanitize_path
+from iden.io import load_json, save_json
+
+from arctix.io.metadata import decode_metadata, encode_metadata
+from arctix.io.parquet import write_parquet
+from arctix.utils.dataframe import generate_vocabulary
+from arctix.utils.manifest import compute_file_record
+
+if TYPE_CHECKING:
+    from collections import Counter
+    from collections.abc import Callable, Mapping, Sequence
+    from pathlib import Path
+
+    from arctix.utils.vocab import Vocabulary
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = "state.json"
+RAW_FILENAME = "raw.parquet"
+PREPARED_FILENAME = "prepared.parquet"
+PARTIALS_DIRNAME = "partials"
+
+
+def count_tokens(frame: pl.DataFrame, vocab_cols: Mapping[str, str]) -> dict[str, Counter]:
+    r"""Count the tokens of some columns.
+
+    Args:
+        frame: The input DataFrame.
+        vocab_cols: The columns to count, indexed by metadata key.
+
+    Returns:
+        The token counters, indexed by metadata key.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.utils.incremental import count_tokens
+    >>> count_tokens(pl.DataFrame({"action": ["a", "b", "a"]}), {"vocab_action": "action"})
+    {'vocab_action': Counter({'a': 2, 'b': 1})}
+
+    ```
+    """
+    return {key: generate_vocabulary(frame, col=col).counter for key, col in vocab_cols.items()}
+
+
+def prepare_incremental(
+    path: Path | str,
+    filenames: Sequence[str],
+    cache_path: Path | str,
+    *,
+    load_fn: Callable[[Path], dict[str, list]],
+    combine_fn: Callable[[pl.DataFrame], pl.DataFrame],
+    metadata_fn: Callable[[Mapping[str, Counter]], dict],
+    prepare_fn: Callable[[pl.DataFrame, dict], pl.DataFrame],
+    vocab_cols: Mapping[str, str],
+    group_cols: Sequence[str],
+    sort_cols: Sequence[str],
+) -> tuple[pl.DataFrame, dict]:
+    r"""Prepare a dataset and update the result incrementally when some
+    source files change.
+
+    A source file is re-parsed only if its size or modification time
+    changed and its SHA-256 checksum does not match the cached one.
+    The rows of the sequence groups touched by the changed files are
+    then replaced in the cached raw DataFrame, and the token counts
+    are updated by removing the counts of the old rows and adding the
+    counts of the new rows. If the index of every existing token is
+    unchanged, only the affected groups are prepared again and
+    spliced into the cached prepared DataFrame. Otherwise, the token
+    indices of the other groups are stale, so the whole DataFrame is
+    prepared again.
+
+    Args:
+        path: The directory with the source files.
+        filenames: The source file names, relative to ``path``.
+        cache_path: The directory where to cache the intermediate
+            results.
+        load_fn: The function which parses a source file to a
+            dictionary of lists.
+        combine_fn: The function which combines the parsed rows of
+            several source files into the raw DataFrame, for example
+            to remove the duplicates and sort the rows.
+        metadata_fn: The function which generates the metadata (e.g.
+            vocabularies) from the token counters.
+        prepare_fn: The function which prepares a raw DataFrame given
+            the metadata. The transformation must be independent
+            for each sequence group.
+        vocab_cols: The columns used to generate the vocabularies,
+            indexed by metadata key.
+        group_cols: The columns which identify a sequence group.
+        sort_cols: The columns used to sort the raw and prepared
+            DataFrames.
+
+    Returns:
+        A tuple containing the prepared data and the metadata.
+    """
+    path = sanitize_path(path)
+    cache_path = sanitize_path(cache_path)
+    state = _load_state(cache_path)
+    cached_files = {} if state is None else state["files"]
+
+    records, changed = {}, {}
+    for filename in filenames:
+        file = path.joinpath(filename)
+        record = cached_files.get(filename)
+        stat = file.stat()
+        if record and (stat.st_size, stat.st_mtime_ns) == (record["size"], record["mtime_ns"]):
+            records[filename] = record
+            continue
+        new_record = compute_file_record(file)
+        if record and new_record["sha256"] == record["sha256"]:
+            records[filename] = {**record, "mtime_ns": new_record["mtime_ns"]}
+            continue
+        frame = pl.DataFrame(load_fn(file))
+        changed[filename] = frame
+        records[filename] = {
+            **new_record,
+            "partial": _get_partial_name(filename, new_record["sha256"]),
+            "groups": [list(row) for row in frame.select(group_cols).unique().iter_rows()],
+        }
+    removed = [filename for filename in cached_files if filename not in records]
+
+    if state is None:
+        logger.info(f"preparing the data from {len(records):,} files...")
+        raw = combine_fn(_concat(list(changed.values())))
+        metadata = metadata_fn(count_tokens(raw, vocab_cols))
+        prepared = prepare_fn(raw, metadata)
+    elif changed or removed:
+        logger.info(
+            f"updating the data: {len(changed):,} changed files and {len(removed):,} removed files"
+        )
+        raw, prepared, metadata = _update(
+            cache_path=cache_path,
+            state=state,
+            records=records,
+            changed=changed,
+            removed=removed,
+            combine_fn=combine_fn,
+            metadata_fn=metadata_fn,
+            prepare_fn=prepare_fn,
+            vocab_cols=vocab_cols,
+            group_cols=group_cols,
+            sort_cols=sort_cols,
+        )
+    else:
+        metadata = decode_metadata(state["metadata"])
+        prepared = pl.read_parquet(cache_path.joinpath(PREPARED_FILENAME))
+        if records != cached_files:
+            _save_state(cache_path, records, metadata)
+        return prepared, metadata
+
+    partials_path = cache_path.joinpath(PARTIALS_DIRNAME)
+    for filename, frame in changed.items():
+        write_parquet(frame, partials_path.joinpath(records[filename]["partial"]), token_columns=())
+    write_parquet(raw, cache_path.joinpath(RAW_FILENAME), token_columns=())
+    write_parquet(prepared, cache_path.joinpath(PREPARED_FILENAME), token_columns=())
+    _save_state(cache_path, records, metadata)
+    # Remove the partial files of the previous versions of the source files
+    names = {record["partial"] for record in records.values()}
+    for file in partials_path.glob("*.parquet"):
+        if file.name not in names:
+            file.unlink()
+    return prepared, metadata
+
+
+def _update(
+    *,
+    cache_path: Path,
+    state: dict,
+    records: dict[str, dict],
+    changed: dict[str, pl.DataFrame],
+    removed: Sequence[str],
+    combine_fn: Callable[[pl.DataFrame], pl.DataFrame],
+    metadata_fn: Callable[[Mapping[str, Counter]], dict],
+    prepare_fn: Callable[[pl.DataFrame, dict], pl.DataFrame],
+    vocab_cols: Mapping[str, str],
+    group_cols: Sequence[str],
+    sort_cols: Sequence[str],
+) -> tuple[pl.DataFrame, pl.DataFrame, dict]:
+    r"""Update the cached raw and prepared DataFrames with the rows of
+    the changed source files.
+
+    Args:
+        cache_path: The cache directory.
+        state: The cached state.
+        records: The new records of the source files.
+        changed: The parsed rows of the changed source files.
+        removed: The removed source files.
+        combine_fn: The function which combines the parsed rows.
+        metadata_fn: The function which generates the metadata.
+        prepare_fn: The function which prepares a raw DataFrame.
+        vocab_cols: The columns used to generate the vocabularies.
+        group_cols: The columns which identify a sequence group.
+        sort_cols: The columns used to sort the DataFrames.
+
+    Returns:
+        A tuple with the raw DataFrame, the prepared DataFrame, and
+            the metadata.
+    """
+    group_cols = list(group_cols)
+    old_files = state["files"]
+    affected = set()
+    for filename in [*changed, *removed]:
+        affected.update(tuple(group) for group in old_files.get(filename, {}).get("groups", []))
+        affected.update(tuple(group) for group in records.get(filename, {}).get("groups", []))
+
+    # The groups can span several source files, so the unchanged files of
+    # the affected groups are read from the cache
+    frames = [frame for frame in changed.values() if not frame.is_empty()]
+    for filename, record in records.items():
+        if filename not in changed and any(tuple(g) in affected for g in record["groups"]):
+            frames.append(pl.read_parquet(cache_path.joinpath(PARTIALS_DIRNAME, record["partial"])))
+
+    old_raw = pl.read_parquet(cache_path.joinpath(RAW_FILENAME))
+    keys = pl.DataFrame(list(affected), schema=group_cols, orient="row").cast(
+        {col: old_raw.schema[col] for col in group_cols}
+    )
+    new_rows = old_raw.clear()
+    if frames:
+        new_rows = combine_fn(_concat(frames)).join(keys, on=group_cols, how="semi")
+    old_rows = old_raw.join(keys, on=group_cols, how="semi")
+
+    old_metadata = decode_metadata(state["metadata"])
+    old_counts = count_tokens(old_rows, vocab_cols)
+    new_counts = count_tokens(new_rows, vocab_cols)
+    metadata = metadata_fn(
+        {key: old_metadata[key].counter - old_counts[key] + new_counts[key] for key in vocab_cols}
+    )
+    raw = pl.concat(
+        [old_raw.join(keys, on=group_cols, how="anti"), new_rows.select(old_raw.columns)],
+        how="vertical_relaxed",
+    ).sort(sort_cols)
+
+    if not all(_has_same_indices(old_metadata[key], metadata[key]) for key in vocab_cols):
+        logger.info("the vocabulary order changed, so all the data are prepared again")
+        return raw, prepare_fn(raw, metadata), metadata
+
+    logger.info(f"preparing the data of {len(affected):,} sequence groups...")
+    prepared = pl.read_parquet(cache_path.joinpath(PREPARED_FILENAME))
+    prepared = prepared.join(keys, on=group_cols, how="anti")
+    if not new_rows.is_empty():
+        prepared = pl.concat(
+            [prepared, prepare_fn(new_rows, metadata).select(prepared.columns)],
+            how="vertical_relaxed",
+        )
+    return raw, prepared.sort(sort_cols), metadata
+
+
+def _has_same_indices(old: Vocabulary, new: Vocabulary) -> bool:
+    r"""Indicate if the tokens of a new vocabulary have the same index
+    in the old vocabulary.
+
+    The tokens which are only in one of the vocabularies are ignored,
+    because they are not used by the unchanged rows.
+
+    Args:
+        old: The old vocabulary.
+        new: The new vocabulary.
+
+    Returns:
+        ``True`` if the shared tokens have the same index, otherwise
+            ``False``.
+    """
+    old_indices = old.get_token_to_index()
+    return all(
+        old_indices.get(token, index) == index for token, index in new.get_token_to_index().items()
+    )
+
+
+def _concat(frames: Sequence[pl.DataFrame]) -> pl.DataFrame:
+    r"""Concatenate the parsed rows of several source files.
+
+    Args:
+        frames: The parsed rows of each source file. The rows of an
+            empty file can have ``Null`` columns.
+
+    Returns:
+        The concatenated DataFrame.
+    """
+    return pl.concat(frames, how="vertical_relaxed") if frames else pl.DataFrame()
+
+
+def _get_partial_name(filename: str, checksum: str) -> str:
+    r"""Return the name of the cached partial file of a source file.
+
+    Args:
+        filename: The name of the source file.
+        checksum: The SHA-256 checksum of the source file.
+
+    Returns:
+        The name of the partial file.
+    """
+    return f"{hashlib.sha256(f'{filename}:{checksum}'.encode()).hexdigest()}.parquet"
+
+
+def _load_state(cache_path: Path) -> dict | None:
+    r"""Load the cached state.
+
+    Args:
+        cache_path: The cache directory.
+
+    Returns:
+        The cached state, or ``None`` if the cache is missing or
+            incomplete.
+    """
+    state_path = cache_path.joinpath(STATE_FILENAME)
+    if not state_path.is_file():
+        return None
+    state = load_json(state_path)
+    paths = [cache_path.joinpath(RAW_FILENAME), cache_path.joinpath(PREPARED_FILENAME)]
+    paths.extend(
+        cache_path.joinpath(PARTIALS_DIRNAME, record["partial"])
+        for record in state["files"].values()
+    )
+    if not all(path.is_file() for path in paths):
+        logger.info(f"the cache in {cache_path} is incomplete, so it is ignored")
+        return None
+    return state
+
+
+def _save_state(cache_path: Path, records: dict[str, dict], metadata: dict) -> None:
+    r"""Save the state in the cache.
+
+    Args:
+        cache_path: The cache directory.
+        records: The records of the source files.
+        metadata: The metadata.
+    """
+    save_json(
+        {"files": records, "metadata": encode_metadata(metadata)},
+        cache_path.joinpath(STATE_FILENAME),
+        exist_ok=True,
+    )
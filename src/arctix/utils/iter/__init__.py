@@ -2,6 +2,20 @@ r"""Contain some iterables."""
 
 from __future__ import annotations
 
-__all__ = ["DirFilter", "FileFilter", "PathLister"]
+__all__ = [
+    "DirFilter",
+    "FileFilter",
+    "PathFilter",
+    "PathLister",
+    "clear_scan_cache",
+    "scan_paths",
+]
 
-from arctix.utils.iter.path import DirFilter, FileFilter, PathLister
+from arctix.utils.iter.path import (
+    DirFilter,
+    FileFilter,
+    PathFilter,
+    PathLister,
+    clear_scan_cache,
+    scan_paths,
+)
@@ -2,13 +2,29 @@ r"""Contain some iterables for paths."""
 
 from __future__ import annotations
 
-__all__ = ["DirFilter", "FileFilter", "PathLister"]
-
-from collections.abc import Iterable, Iterator
-from pathlib import Path
+__all__ = [
+    "DirFilter",
+    "FileFilter",
+    "PathFilter",
+    "PathLister",
+    "clear_scan_cache",
+    "scan_paths",
+]
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+from typing import NamedTuple
 
 from coola.utils import str_indent, str_mapping
 
+RECURSIVE = "**"
+SCAN_CACHE_SIZE = 4096
+
 
 class DirFilter(Iterable[Path]):
     r"""Implement an iterable to keep only the directory.
@@ -80,14 +96,79 @@ class FileFilter(Iterable[Path]):
         return f"{self.__class__.__qualname__}(\n  {args}\n)"
 
 
+class PathFilter(Iterable[Path]):
+    r"""Implement an iterable to keep only the paths that verify a
+    predicate.
+
+    The predicate is evaluated on the path only, so it can be used to
+    prune the paths before accessing the file system, for example
+    based on the file name.
+
+    Args:
+        source: The source with the paths.
+        predicate: The function used to decide if a path is kept.
+            It takes a path as input and returns ``True`` if the path
+            is kept.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from pathlib import Path
+    >>> from arctix.utils.iter import PathFilter
+    >>> it = PathFilter(
+    ...     [Path("tmp/P03_cereals.txt"), Path("tmp/P16_milk.txt")],
+    ...     predicate=lambda path: path.name.startswith("P03"),
+    ... )
+    >>> list(it)
+    [PosixPath('tmp/P03_cereals.txt')]
+
+    ```
+    """
+
+    def __init__(self, source: Iterable[Path], predicate: Callable[[Path], bool]) -> None:
+        self._source = source
+        self._predicate = predicate
+
+    def __iter__(self) -> Iterator[Path]:
+        for path in self._source:
+            if self._predicate(path):
+                yield path
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(predicate={self._predicate})"
+
+    def __str__(self) -> str:
+        args = str_indent(
+            str_mapping({"predicate": self._predicate, "source": str_indent(self._source)})
+        )
+        return f"{self.__class__.__qualname__}(\n  {args}\n)"
+
+
 class PathLister(Iterable[Path]):
     r"""Implement an iterable to list paths.
 
+    The directories are enumerated with ``os.scandir``, and the type
+    of each entry is recorded in the returned paths, so
+    ``DirFilter`` and ``FileFilter`` do not need a ``stat`` call per
+    path. The recorded type is the type when the directory was
+    listed. The subdirectories of the same depth can be listed in
+    parallel threads, which reduces the latency on network file
+    systems. If ``cache=True``, the listing of each directory is
+    cached and reused while the modification time of the directory
+    does not change. The cache keeps the listings of the
+    ``SCAN_CACHE_SIZE`` most recently listed directories, and it can
+    be cleared with ``clear_scan_cache``.
+
     Args:
         source: The source with the paths.
         pattern: A glob pattern, to return only the matching paths.
+            ``**`` matches any number of directories.
         deterministic: If ``True``, the paths are returned in a
             deterministic order.
+        max_workers: The maximum number of threads used to list the
+            directories.
+        cache: If ``True``, the directory listings are cached.
 
     Example usage:
 
@@ -97,7 +178,7 @@ class PathLister(Iterable[Path]):
     >>> from arctix.utils.iter import PathLister
     >>> it = PathLister([Path("tmp/A"), Path("tmp/B"), Path("tmp/C")])
     >>> it
-    PathLister(pattern=*, deterministic=True)
+    PathLister(pattern=*, deterministic=True, max_workers=1, cache=False)
 
     ```
     """
@@ -107,14 +188,20 @@ class PathLister(Iterable[Path]):
         source: Iterable[Path],
         pattern: str = "*",
         deterministic: bool = True,
+        max_workers: int = 1,
+        cache: bool = False,
     ) -> None:
         self._source = source
         self._pattern = pattern
         self._deterministic = bool(deterministic)
+        self._max_workers = max_workers
+        self._cache = bool(cache)
 
     def __iter__(self) -> Iterator[Path]:
         for path in self._source:
-            paths = path.glob(self._pattern)
+            paths = scan_paths(
+                path, pattern=self._pattern, max_workers=self._max_workers, cache=self._cache
+            )
             if self._deterministic:
                 paths = sorted(paths)
             yield from paths
@@ -122,7 +209,8 @@ class PathLister(Iterable[Path]):
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__qualname__}(pattern={self._pattern}, "
-            f"deterministic={self._deterministic})"
+            f"deterministic={self._deterministic}, max_workers={self._max_workers}, "
+            f"cache={self._cache})"
         )
 
     def __str__(self) -> str:
@@ -131,8 +219,207 @@ class PathLister(Iterable[Path]):
                 {
                     "pattern": self._pattern,
                     "deterministic": self._deterministic,
+                    "max_workers": self._max_workers,
+                    "cache": self._cache,
                     "source": str_indent(self._source),
                 }
             )
         )
         return f"{self.__class__.__qualname__}(\n  {args}\n)"
+
+
+class _Entry(NamedTuple):
+    r"""Store the name and the type of a directory entry."""
+
+    name: str
+    is_dir: bool
+    is_file: bool
+    is_symlink: bool
+
+
+class _ScannedPath(type(Path())):
+    r"""Implement a path that records the type of the file when it
+    was listed.
+
+    The derived paths, for example the parent, do not have a recorded
+    type and query the file system.
+    """
+
+    _scanned_is_dir: bool | None = None
+    _scanned_is_file: bool | None = None
+    _scanned_is_symlink: bool = False
+
+    def __repr__(self) -> str:
+        return f"{type(Path()).__name__}({self.as_posix()!r})"
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        if self._scanned_is_dir is None:
+            # ``follow_symlinks`` is only supported since Python 3.13
+            if follow_symlinks:
+                return super().is_dir()
+            return super().is_dir(follow_symlinks=follow_symlinks)
+        return self._scanned_is_dir and (follow_symlinks or not self._scanned_is_symlink)
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        if self._scanned_is_file is None:
+            if follow_symlinks:
+                return super().is_file()
+            return super().is_file(follow_symlinks=follow_symlinks)
+        return self._scanned_is_file and (follow_symlinks or not self._scanned_is_symlink)
+
+
+_SCAN_CACHE: OrderedDict[str, tuple[int, list[_Entry]]] = OrderedDict()
+_SCAN_CACHE_LOCK = threading.Lock()
+
+
+def clear_scan_cache() -> None:
+    r"""Clear the cache of the directory listings used by
+    ``scan_paths``.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.utils.iter import clear_scan_cache
+    >>> clear_scan_cache()
+
+    ```
+    """
+    with _SCAN_CACHE_LOCK:
+        _SCAN_CACHE.clear()
+
+
+def scan_paths(
+    path: Path, pattern: str = "*", max_workers: int = 1, cache: bool = False
+) -> list[Path]:
+    r"""Find the paths that match a glob pattern in a directory.
+
+    The directories are listed level by level with ``os.scandir``,
+    and the directories of the same level are listed in parallel if
+    ``max_workers > 1``. The directories deeper than the pattern are
+    not listed. The returned paths record the type of the entries,
+    so ``is_dir`` and ``is_file`` do not query the file system. Like
+    ``Path.glob``, the directories that cannot be listed, for example
+    because of a permission error, are skipped, and ``**`` does not
+    descend into the symbolic links to directories, so a symbolic
+    link cycle is not followed.
+
+    Args:
+        path: The directory to scan.
+        pattern: A glob pattern relative to the directory. ``**``
+            matches any number of directories.
+        max_workers: The maximum number of threads used to list the
+            directories.
+        cache: If ``True``, the listing of each directory is cached
+            and reused while the modification time of the directory
+            does not change.
+
+    Returns:
+        The matching paths, in an arbitrary order.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> from arctix.utils.iter.path import scan_paths
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir)
+    ...     _ = path.joinpath("a.txt").write_text("abc")
+    ...     path.joinpath("dir").mkdir()
+    ...     _ = path.joinpath("dir/b.txt").write_text("abc")
+    ...     sorted(p.relative_to(path).as_posix() for p in scan_paths(path, "**/*.txt"))
+    ...
+    ['a.txt', 'dir/b.txt']
+
+    ```
+    """
+    patterns = PurePosixPath(pattern).parts
+    max_depth = None if RECURSIVE in patterns else len(patterns)
+    # The symbolic links are only followed by the components before ``**``
+    num_fixed = patterns.index(RECURSIVE) if RECURSIVE in patterns else len(patterns)
+    matches = []
+    level = [(path, ())] if path.is_dir() else []
+    depth = 0
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        while level:
+            depth += 1
+            listings = executor.map(
+                lambda directory: _list_dir(directory, cache=cache), [d for d, _ in level]
+            )
+            next_level = []
+            for (directory, parts), entries in zip(level, listings):
+                for entry in entries:
+                    entry_parts = (*parts, entry.name)
+                    if _match_parts(entry_parts, patterns):
+                        child = _ScannedPath(directory, entry.name)
+                        child._scanned_is_dir = entry.is_dir
+                        child._scanned_is_file = entry.is_file
+                        child._scanned_is_symlink = entry.is_symlink
+                        matches.append(child)
+                    if (
+                        entry.is_dir
+                        and (max_depth is None or depth < max_depth)
+                        and (not entry.is_symlink or depth <= num_fixed)
+                    ):
+                        next_level.append((directory.joinpath(entry.name), entry_parts))
+            level = next_level
+    return matches
+
+
+def _list_dir(path: Path, cache: bool) -> list[_Entry]:
+    r"""List the entries of a directory.
+
+    Args:
+        path: The directory to list.
+        cache: If ``True``, the cached listing is used if the
+            modification time of the directory did not change, and
+            the new listing is cached.
+
+    Returns:
+        The entries of the directory, or an empty list if the
+            directory cannot be listed.
+    """
+    key = os.fspath(path)
+    try:
+        if cache:
+            mtime = path.stat().st_mtime_ns
+            with _SCAN_CACHE_LOCK:
+                cached = _SCAN_CACHE.get(key)
+                if cached is not None and cached[0] == mtime:
+                    _SCAN_CACHE.move_to_end(key)
+                    return cached[1]
+        with os.scandir(path) as it:
+            entries = [
+                _Entry(entry.name, entry.is_dir(), entry.is_file(), entry.is_symlink())
+                for entry in it
+            ]
+    except OSError:
+        return []
+    if cache:
+        with _SCAN_CACHE_LOCK:
+            _SCAN_CACHE[key] = (mtime, entries)
+            _SCAN_CACHE.move_to_end(key)
+            while len(_SCAN_CACHE) > SCAN_CACHE_SIZE:
+                _SCAN_CACHE.popitem(last=False)
+    return entries
+
+
+def _match_parts(parts: tuple[str, ...], patterns: tuple[str, ...]) -> bool:
+    r"""Indicate if a relative path matches a glob pattern.
+
+    Args:
+        parts: The components of the relative path.
+        patterns: The components of the glob pattern.
+
+    Returns:
+        ``True`` if the path matches the pattern, otherwise ``False``.
+    """
+    if not patterns:
+        return not parts
+    if patterns[0] == RECURSIVE:
+        return any(_match_parts(parts[i:], patterns[1:]) for i in range(len(parts) + 1))
+    return (
+        bool(parts) and fnmatchcase(parts[0], patterns[0]) and _match_parts(parts[1:], patterns[1:])
+    )
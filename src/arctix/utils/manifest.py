@@ -0,0 +1,225 @@
+r"""Contain utility functions to record and verify the integrity of the
+files in a directory."""
+
+from __future__ import annotations
+
+__all__ = [
+    "MANIFEST_FILENAME",
+    "compute_file_record",
+    "load_manifest",
+    "verify_manifest",
+    "write_manifest",
+]
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from coola.utils.path import sanitize_path
+from iden.io import load_json, save_json
+
+from arctix.utils.download import compute_sha256
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".arctix_manifest.json"
+
+
+def compute_file_record(path: Path) -> dict:
+    r"""Compute the record of a file in a manifest.
+
+    Args:
+        path: The path to the file.
+
+    Returns:
+        A dictionary with the size in bytes, the modification time in
+            nanoseconds, and the SHA-256 checksum of the file.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> from arctix.utils.manifest import compute_file_record
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir).joinpath("data.txt")
+    ...     _ = path.write_bytes(b"abc")
+    ...     record = compute_file_record(path)
+    ...
+    >>> record["size"], record["sha256"]
+    (3, 'ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad')
+
+    ```
+    """
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": compute_sha256(path)}
+
+
+def write_manifest(
+    path: Path | str, filenames: Sequence[str], max_workers: int | None = None
+) -> dict[str, dict]:
+    r"""Write the manifest of some files in a directory.
+
+    The manifest is stored in the ``.arctix_manifest.json`` file of
+    the directory, and contains the size, the modification time, and
+    the SHA-256 checksum of each file. The files are hashed in
+    parallel.
+
+    Args:
+        path: The directory with the files.
+        filenames: The file names, relative to the directory.
+        max_workers: The maximum number of threads used to hash the
+            files. If ``None``, the default of
+            ``concurrent.futures.ThreadPoolExecutor`` is used.
+
+    Returns:
+        The manifest records, indexed by file name.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> from arctix.utils.manifest import verify_manifest, write_manifest
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir)
+    ...     _ = path.joinpath("data.txt").write_bytes(b"abc")
+    ...     manifest = write_manifest(path, ["data.txt"])
+    ...     verify_manifest(path, ["data.txt"])
+    ...
+    True
+
+    ```
+    """
+    path = sanitize_path(path)
+    filenames = list(filenames)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        records = executor.map(
+            compute_file_record, [path.joinpath(filename) for filename in filenames]
+        )
+        manifest = dict(zip(filenames, records))
+    save_json(manifest, path.joinpath(MANIFEST_FILENAME), exist_ok=True)
+    return manifest
+
+
+def load_manifest(path: Path | str) -> dict[str, dict] | None:
+    r"""Load the manifest of a directory.
+
+    Args:
+        path: The directory with the manifest.
+
+    Returns:
+        The manifest records indexed by file name, or ``None`` if the
+            directory does not have a manifest.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from pathlib import Path
+    >>> from arctix.utils.manifest import load_manifest
+    >>> load_manifest(Path("/path/to/data/")) is None
+    True
+
+    ```
+    """
+    manifest_path = sanitize_path(path).joinpath(MANIFEST_FILENAME)
+    if not manifest_path.is_file():
+        return None
+    return load_json(manifest_path)
+
+
+def verify_manifest(
+    path: Path | str,
+    filenames: Sequence[str] | None = None,
+    max_workers: int | None = None,
+    update: bool = True,
+) -> bool:
+    r"""Verify the files of a directory against its manifest.
+
+    The verification is incremental: a file whose size and
+    modification time match its record is trusted without being
+    read, so the verification of an unchanged directory only needs
+    a ``stat`` call per file. The other files are hashed in parallel.
+    If ``update=True`` and the checksums of the modified files match,
+    their new modification time is recorded so they are not hashed
+    again. A failure to write the manifest, for example on a
+    read-only file system, is logged but not raised.
+
+    Args:
+        path: The directory with the files and the manifest.
+        filenames: The file names to verify. If ``None``, all the
+            files in the manifest are verified.
+        max_workers: The maximum number of threads used to hash the
+            files. If ``None``, the default of
+            ``concurrent.futures.ThreadPoolExecutor`` is used.
+        update: If ``True``, the manifest is updated with the new
+            modification time of the verified files.
+
+    Returns:
+        ``True`` if the directory has a manifest and all the files
+            match their record, otherwise ``False``.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> from arctix.utils.manifest import verify_manifest, write_manifest
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = Path(tmpdir)
+    ...     _ = path.joinpath("data.txt").write_bytes(b"abc")
+    ...     manifest = write_manifest(path, ["data.txt"])
+    ...     _ = path.joinpath("data.txt").write_bytes(b"abd")
+    ...     verify_manifest(path, ["data.txt"])
+    ...
+    False
+
+    ```
+    """
+    path = sanitize_path(path)
+    manifest = load_manifest(path)
+    if manifest is None:
+        return False
+    filenames = list(manifest) if filenames is None else list(filenames)
+    changed = []
+    for filename in filenames:
+        record = manifest.get(filename)
+        file = path.joinpath(filename)
+        if record is None or not file.is_file():
+            logger.info(f"{file} is missing in the manifest or on disk")
+            return False
+        stat = file.stat()
+        if stat.st_size != record["size"]:
+            logger.info(f"{file} does not have the expected size")
+            return False
+        if stat.st_mtime_ns != record["mtime_ns"]:
+            changed.append(filename)
+    if not changed:
+        return True
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        records = dict(
+            zip(
+                changed,
+                executor.map(compute_file_record, [path.joinpath(name) for name in changed]),
+            )
+        )
+    for filename, record in records.items():
+        if record["sha256"] != manifest[filename]["sha256"]:
+            logger.info(f"{path.joinpath(filename)} does not have the expected checksum")
+            return False
+    if update:
+        manifest.update(records)
+        try:
+            save_json(manifest, path.joinpath(MANIFEST_FILENAME), exist_ok=True)
+        except OSError as exc:
+            logger.warning(f"failed to update the manifest of {path}: {exc}")
+    return True
@@ -2,11 +2,16 @@ r"""Contain utility functions to generate or manipulate masks."""
 
 from __future__ import annotations
 
-__all__ = ["convert_sequences_to_array", "generate_mask_from_lengths"]
+__all__ = [
+    "convert_list_series_to_masked_array",
+    "convert_sequences_to_array",
+    "generate_mask_from_lengths",
+]
 
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
+import polars as pl
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -99,3 +104,126 @@ def generate_mask_from_lengths(lengths: np.ndarray, max_len: int | None = None)
     lengths = np.broadcast_to(lengths.reshape(batch_size, 1), (batch_size, max_len))
     indices = np.broadcast_to(np.arange(max_len).reshape(1, max_len), (batch_size, max_len))
     return indices >= lengths
+
+
+def convert_list_series_to_masked_array(
+    series: pl.Series, padded_value: Any = None
+) -> np.ma.MaskedArray:
+    r"""Convert a ``polars.Series`` of lists to a padded masked array.
+
+    The values are copied in a single vectorized assignment, so it is
+    faster than ``convert_sequences_to_array`` for large series.
+    The series of nested lists are converted to arrays of objects.
+
+    Args:
+        series: The series of lists to convert.
+        padded_value: The value used to pad the sequences.
+            If ``None``, the padded value is inferred from the data
+            type: ``'N/A'`` for strings, ``-1`` for integers,
+            and ``-1.0`` for floats. If an integer padded value does
+            not fit in the data type, e.g. ``-1`` for unsigned
+            integers, the array is widened to a signed integer type.
+
+    Returns:
+        The masked array of shape ``(num_sequences, max_len)``.
+
+    Raises:
+        RuntimeError: if the padded value does not fit in the data
+            type and no integer type can represent both.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.utils.masking import convert_list_series_to_masked_array
+    >>> arr = convert_list_series_to_masked_array(pl.Series([[1, 2, 3], [4], [5, 6]]))
+    >>> arr
+    masked_array(
+      data=[[1, 2, 3],
+            [4, --, --],
+            [5, 6, --]],
+      mask=[[False, False, False],
+            [False,  True,  True],
+            [False, False,  True]],
+      fill_value=999999)
+    >>> arr.data
+    array([[ 1,  2,  3],
+           [ 4, -1, -1],
+           [ 5,  6, -1]])
+
+    ```
+    """
+    inner = series.dtype.inner if isinstance(series.dtype, pl.List) else None
+    if padded_value is None:
+        padded_value = _default_padded_value(inner)
+    lengths = series.list.len().fill_null(0).to_numpy().astype(np.int64)
+    mask = generate_mask_from_lengths(lengths)
+    if isinstance(inner, (pl.List, pl.Array, pl.Struct)):
+        data = convert_sequences_to_array(
+            series.to_list(), max_len=mask.shape[1], dtype=np.object_, padded_value=padded_value
+        )
+        return np.ma.masked_array(data=data, mask=mask)
+    values = series.filter(lengths > 0).explode().to_numpy()
+    is_str = inner == pl.String or values.dtype.kind in {"O", "U"}
+    data = np.full(
+        mask.shape,
+        fill_value=padded_value,
+        dtype=np.object_ if is_str else _get_padded_dtype(values.dtype, padded_value),
+    )
+    data[~mask] = values
+    if is_str:
+        data = data.astype(str)
+    return np.ma.masked_array(data=data, mask=mask)
+
+
+def _get_padded_dtype(dtype: np.dtype, padded_value: Any) -> np.dtype:
+    r"""Return the data type of a padded integer array.
+
+    Args:
+        dtype: The data type of the sequence values.
+        padded_value: The value used to pad the sequences.
+
+    Returns:
+        The data type of the values if it can represent the padded
+            value, otherwise the integer type obtained by promoting
+            the data type of the values with the data type of the
+            padded value.
+
+    Raises:
+        RuntimeError: if no integer type can represent the values
+            and the padded value.
+    """
+    if dtype.kind not in {"i", "u"} or not isinstance(padded_value, (int, np.integer)):
+        return dtype
+    padded_dtype = np.min_scalar_type(padded_value)
+    if np.can_cast(padded_dtype, dtype):
+        return dtype
+    dtype = np.promote_types(dtype, padded_dtype)
+    if dtype.kind not in {"i", "u"}:
+        msg = (
+            f"The padded value {padded_value} does not fit in the data type of the "
+            f"sequences. Use a padded value which fits in the data type"
+        )
+        raise RuntimeError(msg)
+    return dtype
+
+
+def _default_padded_value(dtype: pl.DataType | None) -> Any:
+    r"""Return the default padded value for a data type.
+
+    Args:
+        dtype: The data type of the sequence values.
+
+    Returns:
+        The default padded value.
+    """
+    if dtype is None:
+        return None
+    if dtype == pl.String:
+        return "N/A"
+    if dtype.is_integer():
+        return -1
+    if dtype.is_float():
+        return -1.0
+    return None
@@ -6,20 +6,15 @@ __all__ = ["find_ngrams", "find_seq_ngrams", "plot_ngrams"]
 
 from collections import Counter
 from typing import TYPE_CHECKING
-from unittest.mock import Mock
 
 import numpy as np
 
-from arctix.utils.imports import is_matplotlib_available
 from arctix.utils.vocab import Vocabulary
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
-if is_matplotlib_available():
     import matplotlib.pyplot as plt
-else:  # pragma: no cover
-    plt = Mock()
 
 
 def find_ngrams(sequence: Sequence, n: int) -> list:
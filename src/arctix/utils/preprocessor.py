@@ -0,0 +1,279 @@
+r"""Contain the base class to implement a dataset preprocessor which
+learns the metadata (e.g. vocabularies) once and then transforms new
+DataFrames with it."""
+
+from __future__ import annotations
+
+__all__ = ["BasePreprocessor"]
+
+import logging
+import multiprocessing
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, ClassVar
+
+from coola.utils.path import sanitize_path
+from iden.io import load_json, save_json
+
+from arctix.io.metadata import decode_metadata, encode_metadata
+from arctix.utils.incremental import count_tokens
+
+if TYPE_CHECKING:
+    from collections import Counter
+    from collections.abc import Mapping, Sequence
+    from pathlib import Path
+
+    import polars as pl
+
+logger = logging.getLogger(__name__)
+
+
+class BasePreprocessor(ABC):
+    r"""Define the base class to implement a dataset preprocessor.
+
+    ``fit`` counts the tokens of the vocabulary columns and generates
+    the metadata once. ``transform`` then applies the preparation
+    pipeline to any DataFrame with this metadata, so the test data
+    can be prepared with the vocabularies of the training data, and
+    the vocabularies are not generated again for each DataFrame.
+    The metadata can be saved to and loaded from a JSON file.
+
+    The child classes must define the vocabulary columns in
+    ``vocab_cols`` and implement ``_generate_metadata`` and
+    ``_transform``.
+
+    Args:
+        metadata: The metadata of a fitted preprocessor. If ``None``,
+            the preprocessor must be fitted before transforming data.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.dataset.multithumos import Column, Preprocessor
+    >>> frame = pl.DataFrame(
+    ...     {
+    ...         Column.VIDEO: ["video_validation_1", "video_validation_1", "video_test_2"],
+    ...         Column.START_TIME: [1.5, 72.8, 17.57],
+    ...         Column.END_TIME: [5.4, 76.4, 18.33],
+    ...         Column.ACTION: ["dribble", "guard", "dribble"],
+    ...     }
+    ... )
+    >>> preprocessor = Preprocessor().fit(frame)
+    >>> preprocessor
+    Preprocessor(is_fitted=True)
+    >>> preprocessor.transform(frame, split="test")
+    shape: (1, 7)
+    ┌─────────┬───────────┬──────────┬───────┬────────────┬─────────────────┬──────────────┐
+    │ action  ┆ action_id ┆ end_time ┆ split ┆ start_time ┆ start_time_diff ┆ video        │
+    │ ---     ┆ ---       ┆ ---      ┆ ---   ┆ ---        ┆ ---             ┆ ---          │
+    │ str     ┆ i64       ┆ f64      ┆ str   ┆ f64        ┆ f64             ┆ str          │
+    ╞═════════╪═══════════╪══════════╪═══════╪════════════╪═════════════════╪══════════════╡
+    │ dribble ┆ 0         ┆ 18.33    ┆ test  ┆ 17.57      ┆ 0.0             ┆ video_test_2 │
+    └─────────┴───────────┴──────────┴───────┴────────────┴─────────────────┴──────────────┘
+
+    ```
+    """
+
+    vocab_cols: ClassVar[Mapping[str, str]] = {}
+
+    def __init__(self, metadata: dict | None = None) -> None:
+        self._metadata = metadata
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(is_fitted={self.is_fitted})"
+
+    @property
+    def is_fitted(self) -> bool:
+        r"""Indicate if the preprocessor is fitted."""
+        return self._metadata is not None
+
+    @property
+    def metadata(self) -> dict:
+        r"""The metadata learned by ``fit``.
+
+        Raises:
+            RuntimeError: if the preprocessor is not fitted.
+        """
+        self._check_is_fitted()
+        return self._metadata
+
+    def fit(self, frame: pl.DataFrame) -> BasePreprocessor:
+        r"""Generate the metadata from a raw DataFrame.
+
+        Args:
+            frame: The raw DataFrame, for example the training data.
+
+        Returns:
+            The fitted preprocessor.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.dataset.multithumos import Column, Preprocessor
+        >>> preprocessor = Preprocessor().fit(pl.DataFrame({Column.ACTION: ["b", "a", "b"]}))
+        >>> preprocessor.metadata
+        {'vocab_action': Vocabulary(
+          counter=Counter({'b': 2, 'a': 1}),
+          index_to_token=('b', 'a'),
+          token_to_index={'b': 0, 'a': 1},
+        )}
+
+        ```
+        """
+        self._metadata = self._generate_metadata(count_tokens(frame, self.vocab_cols))
+        return self
+
+    def transform(self, frame: pl.DataFrame, split: str = "all") -> pl.DataFrame:
+        r"""Prepare a raw DataFrame with the fitted metadata.
+
+        The tokens must be in the fitted vocabularies, otherwise the
+        conversion of the tokens to indices fails.
+
+        Args:
+            frame: The raw DataFrame.
+            split: The dataset split. By default, the union of all
+                the dataset splits is used.
+
+        Returns:
+            The prepared data.
+
+        Raises:
+            RuntimeError: if the preprocessor is not fitted.
+        """
+        return self._transform(frame, metadata=self.metadata, split=split)
+
+    def fit_transform(self, frame: pl.DataFrame, split: str = "all") -> pl.DataFrame:
+        r"""Fit the preprocessor on a raw DataFrame and prepare it.
+
+        The metadata are generated on the whole DataFrame, before
+        filtering the dataset split.
+
+        Args:
+            frame: The raw DataFrame.
+            split: The dataset split. By default, the union of all
+                the dataset splits is used.
+
+        Returns:
+            The prepared data.
+        """
+        return self.fit(frame).transform(frame, split=split)
+
+    def transform_shards(
+        self,
+        frames: Sequence[pl.DataFrame],
+        split: str = "all",
+        max_workers: int | None = None,
+    ) -> list[pl.DataFrame]:
+        r"""Prepare several raw DataFrames in parallel with the fitted
+        metadata.
+
+        Each DataFrame is transformed by a worker process. The
+        sequences must not be split across DataFrames because some
+        transformations (e.g. the time differences) are computed per
+        sequence.
+
+        Args:
+            frames: The raw DataFrames.
+            split: The dataset split. By default, the union of all
+                the dataset splits is used.
+            max_workers: The maximum number of worker processes.
+                If ``None``, the default of
+                ``concurrent.futures.ProcessPoolExecutor`` is used.
+                If ``1``, the DataFrames are transformed in the
+                current process.
+
+        Returns:
+            The prepared DataFrames, in the same order as the inputs.
+
+        Raises:
+            RuntimeError: if the preprocessor is not fitted.
+        """
+        self._check_is_fitted()
+        if max_workers == 1:
+            return [self.transform(frame, split=split) for frame in frames]
+        logger.info(f"transforming {len(frames):,} DataFrames...")
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [executor.submit(self.transform, frame, split) for frame in frames]
+            return [future.result() for future in futures]
+
+    def save(self, path: Path | str) -> None:
+        r"""Save the fitted metadata to a JSON file.
+
+        Args:
+            path: The path to the JSON file.
+
+        Raises:
+            RuntimeError: if the preprocessor is not fitted.
+        """
+        save_json(encode_metadata(self.metadata), sanitize_path(path), exist_ok=True)
+
+    @classmethod
+    def load(cls, path: Path | str) -> BasePreprocessor:
+        r"""Load a fitted preprocessor from a JSON file.
+
+        Args:
+            path: The path to the JSON file written by ``save``.
+
+        Returns:
+            The fitted preprocessor.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import tempfile
+        >>> from pathlib import Path
+        >>> import polars as pl
+        >>> from arctix.dataset.multithumos import Column, Preprocessor
+        >>> preprocessor = Preprocessor().fit(pl.DataFrame({Column.ACTION: ["b", "a", "b"]}))
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     path = Path(tmpdir).joinpath("preprocessor.json")
+        ...     preprocessor.save(path)
+        ...     loaded = Preprocessor.load(path)
+        ...
+        >>> loaded.metadata["vocab_action"].get_index_to_token()
+        ('b', 'a')
+
+        ```
+        """
+        return cls(metadata=decode_metadata(load_json(sanitize_path(path))))
+
+    def _check_is_fitted(self) -> None:
+        r"""Check if the preprocessor is fitted.
+
+        Raises:
+            RuntimeError: if the preprocessor is not fitted.
+        """
+        if self._metadata is None:
+            msg = f"{self.__class__.__qualname__} is not fitted. Call fit before using it"
+            raise RuntimeError(msg)
+
+    @abstractmethod
+    def _generate_metadata(self, counters: Mapping[str, Counter]) -> dict:
+        r"""Generate the metadata from the token counters.
+
+        Args:
+            counters: The token counters, indexed by metadata key.
+
+        Returns:
+            The metadata.
+        """
+
+    @abstractmethod
+    def _transform(self, frame: pl.DataFrame, metadata: dict, split: str) -> pl.DataFrame:
+        r"""Prepare a raw DataFrame with some metadata.
+
+        Args:
+            frame: The raw DataFrame.
+            metadata: The metadata.
+            split: The dataset split.
+
+        Returns:
+            The prepared data.
+        """
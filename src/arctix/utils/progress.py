@@ -0,0 +1,45 @@
+r"""Contain a progress bar that imports ``tqdm`` on first use."""
+
+from __future__ import annotations
+
+__all__ = ["tqdm"]
+
+from typing import TYPE_CHECKING, Any
+
+from arctix.utils import noop
+from arctix.utils.imports import is_tqdm_available
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def tqdm(iterable: Iterable, *args: Any, **kwargs: Any) -> Iterable:
+    r"""Decorate an iterable with a ``tqdm`` progress bar.
+
+    ``tqdm`` is imported the first time this function is called, so
+    importing a module that uses it does not pay the import cost.
+    If ``tqdm`` is not installed, the iterable is returned unchanged.
+
+    Args:
+        iterable: Iterable to decorate with a progressbar.
+        *args: See the documentation of ``tqdm.tqdm``.
+        **kwargs: See the documentation of ``tqdm.tqdm``.
+
+    Returns:
+        The decorated iterable.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.utils.progress import tqdm
+    >>> list(tqdm([1, 2, 3], disable=True))
+    [1, 2, 3]
+
+    ```
+    """
+    if not is_tqdm_available():  # pragma: no cover
+        return noop.tqdm(iterable, *args, **kwargs)
+    from tqdm import tqdm as tqdm_  # noqa: PLC0415
+
+    return tqdm_(iterable, *args, **kwargs)
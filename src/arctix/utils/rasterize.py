@@ -0,0 +1,538 @@
+r"""Contain utility functions to convert temporal segments to dense
+frame-level labels."""
+
+from __future__ import annotations
+
+__all__ = ["SparseFrameLabels", "compute_frame_bounds", "rasterize_segments"]
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import polars as pl
+
+from arctix.index.sequence import SequenceIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Sequence
+
+SEQUENCE_ID = "_sequence_id"
+
+# Tolerance used to absorb the floating point errors when the times are
+# converted to frame indices e.g. 0.2 * 5 = 1.0000000000000002
+EPSILON = 1e-9
+
+
+def compute_frame_bounds(
+    starts: np.ndarray | Sequence[float],
+    ends: np.ndarray | Sequence[float],
+    fps: float = 1.0,
+    stride: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    r"""Compute the frame bounds of some temporal segments.
+
+    The frame ``i`` is sampled at time ``i * stride / fps``, and a
+    segment ``[start, end)`` covers the frames sampled in the segment.
+
+    Args:
+        starts: The start time of each segment.
+        ends: The end time of each segment.
+        fps: The number of frames per time unit. Use ``1.0`` if the
+            times are already frame indices.
+        stride: The number of frames between two sampled frames.
+
+    Returns:
+        A tuple with the index of the first frame and the index after
+            the last frame of each segment.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.utils.rasterize import compute_frame_bounds
+    >>> compute_frame_bounds([0.0, 1.5, 2.2], [1.5, 2.2, 4.0], fps=2.0)
+    (array([0, 3, 5]), array([3, 5, 8]))
+
+    ```
+    """
+    scale = fps / stride
+    first = np.ceil(np.asarray(starts, dtype=np.float64) * scale - EPSILON).astype(np.int64)
+    last = np.ceil(np.asarray(ends, dtype=np.float64) * scale - EPSILON).astype(np.int64)
+    return np.maximum(first, 0), np.maximum(last, 0)
+
+
+def rasterize_segments(
+    frame: pl.DataFrame,
+    group_cols: Sequence[str],
+    *,
+    start_col: str,
+    end_col: str,
+    label_col: str,
+    fps: float = 1.0,
+    stride: int = 1,
+    num_frames: int | None = None,
+    multi_hot: bool = False,
+    num_classes: int | None = None,
+    background: int = -1,
+) -> np.ma.MaskedArray:
+    r"""Convert temporal segments to dense frame-level labels.
+
+    The sequences are sorted by the group columns, like in
+    ``group_by_sequence``. Each sequence ends at the end of its last
+    segment, and the frames after the end are masked.
+
+    With ``multi_hot=False``, the output is a ``(num_sequences,
+    num_frames)`` array of labels where the frames outside the
+    segments have the ``background`` label. If several segments
+    overlap, the segment with the latest start time has priority. The
+    frames are filled with ``np.repeat`` without Python loop.
+
+    With ``multi_hot=True``, the output is a ``(num_sequences,
+    num_frames, num_classes)`` boolean array, so the overlapping
+    segments (e.g. MultiTHUMOS) are all represented. It is computed
+    with a cumulative sum over the segment boundaries. For long
+    sequences with many classes, a sparse representation is more
+    memory efficient.
+
+    Args:
+        frame: The DataFrame with one row per segment, for example
+            the output of ``prepare_data``.
+        group_cols: The columns used to generate the sequences.
+        start_col: The column with the start time of each segment.
+        end_col: The column with the end time of each segment.
+        label_col: The column with the label index of each segment.
+        fps: The number of frames per time unit. Use ``1.0`` if the
+            times are already frame indices.
+        stride: The number of frames between two sampled frames.
+        num_frames: The number of frames in the output. If ``None``,
+            it is set to the number of frames of the longest
+            sequence. The longer sequences are truncated.
+        multi_hot: If ``True``, the output is a multi-hot encoding
+            of the labels.
+        num_classes: The number of classes for the multi-hot
+            encoding. If ``None``, it is inferred from the labels.
+        background: The label of the frames outside the segments.
+            It is only used if ``multi_hot=False``.
+
+    Returns:
+        The masked array of frame-level labels.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.utils.rasterize import rasterize_segments
+    >>> frame = pl.DataFrame(
+    ...     {
+    ...         "video": ["v1", "v1", "v2"],
+    ...         "start_time": [0.0, 1.0, 0.5],
+    ...         "end_time": [1.0, 2.5, 1.5],
+    ...         "action_id": [0, 2, 1],
+    ...     }
+    ... )
+    >>> rasterize_segments(
+    ...     frame,
+    ...     group_cols=["video"],
+    ...     start_col="start_time",
+    ...     end_col="end_time",
+    ...     label_col="action_id",
+    ...     fps=2.0,
+    ... )
+    masked_array(
+      data=[[0, 0, 2, 2, 2],
+            [-1, 1, 1, --, --]],
+      mask=[[False, False, False, False, False],
+            [False, False, False,  True,  True]],
+      fill_value=999999)
+
+    ```
+    """
+    group_cols = list(group_cols)
+    frame = (
+        frame.select([*group_cols, start_col, end_col, label_col])
+        .drop_nulls([start_col, end_col, label_col])
+        .sort(by=[*group_cols, start_col], maintain_order=True)
+        .with_columns(pl.struct(group_cols).rle_id().alias(SEQUENCE_ID))
+    )
+    sequence_ids = frame.get_column(SEQUENCE_ID).to_numpy().astype(np.int64)
+    labels = frame.get_column(label_col).to_numpy().astype(np.int64)
+    first, last = compute_frame_bounds(
+        frame.get_column(start_col).to_numpy(),
+        frame.get_column(end_col).to_numpy(),
+        fps=fps,
+        stride=stride,
+    )
+    num_sequences = int(sequence_ids[-1]) + 1 if sequence_ids.shape[0] else 0
+    lengths = np.zeros(num_sequences, dtype=np.int64)
+    np.maximum.at(lengths, sequence_ids, last)
+    if num_frames is None:
+        num_frames = int(lengths.max()) if num_sequences else 0
+    first, last = np.minimum(first, num_frames), np.minimum(last, num_frames)
+    mask = np.arange(num_frames) >= lengths[:, None]
+
+    if multi_hot:
+        if num_classes is None:
+            num_classes = int(labels.max()) + 1 if labels.shape[0] else 0
+        diff = np.zeros((num_sequences, num_frames + 1, num_classes), dtype=np.int32)
+        np.add.at(diff, (sequence_ids, first, labels), 1)
+        np.add.at(diff, (sequence_ids, last, labels), -1)
+        data = np.cumsum(diff[:, :-1], axis=1) > 0
+        mask = np.repeat(mask[:, :, None], num_classes, axis=2)
+        return np.ma.masked_array(data=data, mask=mask)
+
+    counts = np.maximum(last - first, 0)
+    offsets = np.cumsum(counts) - counts
+    frame_ids = np.repeat(first - offsets, counts) + np.arange(int(counts.sum()))
+    # The segments are sorted by start time, so the segment with the
+    # largest position has priority over the overlapping segments.
+    winners = np.full(num_sequences * num_frames, fill_value=-1, dtype=np.int64)
+    np.maximum.at(
+        winners,
+        np.repeat(sequence_ids, counts) * num_frames + frame_ids,
+        np.repeat(np.arange(labels.shape[0]), counts),
+    )
+    # The frames without segment have the index -1, which selects the
+    # background label appended at the end of the labels.
+    data = np.append(labels, background)[winners]
+    return np.ma.masked_array(data=data.reshape(num_sequences, num_frames), mask=mask)
+
+
+class SparseFrameLabels:
+    r"""Implement a sparse representation of frame-level multi-hot
+    labels.
+
+    The labels of each sequence are stored as run-length encoded
+    activations i.e. one ``[first, last)`` frame range and one class
+    per segment, instead of one value per frame and class. The memory
+    is proportional to the number of segments, independently of the
+    frame rate and the sequence durations. The dense multi-hot labels
+    are computed on demand for the requested frames only.
+
+    Args:
+        sequence_index: The index of the sequences in the
+            activations.
+        first: The index of the first frame of each activation,
+            sorted by sequence.
+        last: The index after the last frame of each activation.
+        labels: The class of each activation.
+        num_classes: The number of classes.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.utils.rasterize import SparseFrameLabels
+    >>> frame = pl.DataFrame(
+    ...     {
+    ...         "video": ["v1", "v1", "v2"],
+    ...         "start_time": [0.0, 1.0, 0.5],
+    ...         "end_time": [2.0, 2.5, 1.5],
+    ...         "action_id": [0, 2, 1],
+    ...     }
+    ... )
+    >>> labels = SparseFrameLabels.from_frame(
+    ...     frame,
+    ...     group_cols=["video"],
+    ...     start_col="start_time",
+    ...     end_col="end_time",
+    ...     label_col="action_id",
+    ...     fps=2.0,
+    ... )
+    >>> labels
+    SparseFrameLabels(num_sequences=2, num_activations=3, num_classes=3)
+    >>> labels.get_num_frames("v1")
+    5
+    >>> labels.to_dense("v1", start=1, end=4)
+    array([[ True, False, False],
+           [ True, False,  True],
+           [ True, False,  True]])
+
+    ```
+    """
+
+    def __init__(
+        self,
+        sequence_index: SequenceIndex,
+        first: np.ndarray,
+        last: np.ndarray,
+        labels: np.ndarray,
+        num_classes: int,
+    ) -> None:
+        self._sequence_index = sequence_index
+        self._first = np.asarray(first, dtype=np.int64)
+        self._last = np.asarray(last, dtype=np.int64)
+        self._labels = np.asarray(labels, dtype=np.int64)
+        self._num_classes = int(num_classes)
+
+    def __len__(self) -> int:
+        return len(self._sequence_index)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__qualname__}(num_sequences={len(self):,}, "
+            f"num_activations={self._labels.shape[0]:,}, num_classes={self._num_classes:,})"
+        )
+
+    @property
+    def num_classes(self) -> int:
+        r"""The number of classes."""
+        return self._num_classes
+
+    @property
+    def sequence_index(self) -> SequenceIndex:
+        r"""The index of the sequences in the activations."""
+        return self._sequence_index
+
+    def get_activations(self, key: Hashable) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        r"""Return the run-length encoded activations of a sequence.
+
+        Args:
+            key: The sequence key. If there are several group columns,
+                the key is a tuple with one value per group column.
+
+        Returns:
+            A tuple with the index of the first frame, the index after
+                the last frame, and the class of each activation.
+
+        Raises:
+            KeyError: if the key does not exist.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.utils.rasterize import SparseFrameLabels
+        >>> frame = pl.DataFrame(
+        ...     {"video": ["v1", "v1"], "start": [0, 1], "end": [2, 4], "action_id": [0, 2]}
+        ... )
+        >>> labels = SparseFrameLabels.from_frame(
+        ...     frame, group_cols=["video"], start_col="start", end_col="end", label_col="action_id"
+        ... )
+        >>> labels.get_activations("v1")
+        (array([0, 1]), array([2, 4]), array([0, 2]))
+
+        ```
+        """
+        offset, length = self._sequence_index.get_location(key)
+        segment = slice(offset, offset + length)
+        return self._first[segment], self._last[segment], self._labels[segment]
+
+    def get_num_frames(self, key: Hashable) -> int:
+        r"""Return the number of frames of a sequence.
+
+        A sequence ends at the end of its last activation.
+
+        Args:
+            key: The sequence key. If there are several group columns,
+                the key is a tuple with one value per group column.
+
+        Returns:
+            The number of frames.
+
+        Raises:
+            KeyError: if the key does not exist.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.utils.rasterize import SparseFrameLabels
+        >>> frame = pl.DataFrame(
+        ...     {"video": ["v1", "v1"], "start": [0, 1], "end": [2, 4], "action_id": [0, 2]}
+        ... )
+        >>> labels = SparseFrameLabels.from_frame(
+        ...     frame, group_cols=["video"], start_col="start", end_col="end", label_col="action_id"
+        ... )
+        >>> labels.get_num_frames("v1")
+        4
+
+        ```
+        """
+        _, last, _ = self.get_activations(key)
+        return int(last.max()) if last.shape[0] else 0
+
+    def to_dense(self, key: Hashable, start: int = 0, end: int | None = None) -> np.ndarray:
+        r"""Compute the dense multi-hot labels of a window of frames.
+
+        Only the activations overlapping the window are decoded, so
+        the cost depends on the window size and not on the sequence
+        duration.
+
+        Args:
+            key: The sequence key. If there are several group columns,
+                the key is a tuple with one value per group column.
+            start: The index of the first frame of the window.
+            end: The index after the last frame of the window.
+                If ``None``, it is set to the number of frames of the
+                sequence.
+
+        Returns:
+            The ``(end - start, num_classes)`` boolean array of
+                multi-hot labels. The frames after the end of the
+                sequence have no active class.
+
+        Raises:
+            KeyError: if the key does not exist.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.utils.rasterize import SparseFrameLabels
+        >>> frame = pl.DataFrame(
+        ...     {"video": ["v1", "v1"], "start": [0, 1], "end": [2, 4], "action_id": [0, 2]}
+        ... )
+        >>> labels = SparseFrameLabels.from_frame(
+        ...     frame, group_cols=["video"], start_col="start", end_col="end", label_col="action_id"
+        ... )
+        >>> labels.to_dense("v1", start=1, end=5)
+        array([[ True, False,  True],
+               [False, False,  True],
+               [False, False,  True],
+               [False, False, False]])
+
+        ```
+        """
+        first, last, labels = self.get_activations(key)
+        if end is None:
+            end = int(last.max()) if last.shape[0] else start
+        size = max(end - start, 0)
+        keep = (first < end) & (last > start)
+        diff = np.zeros((size + 1, self._num_classes), dtype=np.int32)
+        np.add.at(diff, (np.maximum(first[keep], start) - start, labels[keep]), 1)
+        np.add.at(diff, (np.minimum(last[keep], end) - start, labels[keep]), -1)
+        return np.cumsum(diff[:-1], axis=0) > 0
+
+    def to_dense_batch(
+        self,
+        keys: Sequence[Hashable],
+        starts: np.ndarray | Sequence[int],
+        window_size: int,
+    ) -> np.ma.MaskedArray:
+        r"""Compute the dense multi-hot labels of a batch of windows.
+
+        Args:
+            keys: The sequence key of each window.
+            starts: The index of the first frame of each window.
+            window_size: The number of frames in each window.
+
+        Returns:
+            The ``(batch_size, window_size, num_classes)`` masked
+                array of multi-hot labels. The frames after the end of
+                the sequence are masked.
+
+        Raises:
+            KeyError: if a key does not exist.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.utils.rasterize import SparseFrameLabels
+        >>> frame = pl.DataFrame(
+        ...     {"video": ["v1", "v1", "v2"], "start": [0, 1, 0], "end": [2, 4, 1], "action_id": [0, 1, 1]}
+        ... )
+        >>> labels = SparseFrameLabels.from_frame(
+        ...     frame, group_cols=["video"], start_col="start", end_col="end", label_col="action_id"
+        ... )
+        >>> batch = labels.to_dense_batch(["v1", "v2"], starts=[2, 0], window_size=2)
+        >>> batch.shape
+        (2, 2, 2)
+        >>> batch.mask[:, :, 0]
+        array([[False, False],
+               [False,  True]])
+
+        ```
+        """
+        data = np.zeros((len(keys), window_size, self._num_classes), dtype=bool)
+        mask = np.zeros((len(keys), window_size), dtype=bool)
+        for i, (key, start) in enumerate(zip(keys, starts)):
+            data[i] = self.to_dense(key, start=int(start), end=int(start) + window_size)
+            mask[i] = np.arange(start, start + window_size) >= self.get_num_frames(key)
+        return np.ma.masked_array(
+            data=data, mask=np.repeat(mask[:, :, None], self._num_classes, axis=2)
+        )
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: pl.DataFrame,
+        group_cols: Sequence[str],
+        *,
+        start_col: str,
+        end_col: str,
+        label_col: str,
+        fps: float = 1.0,
+        stride: int = 1,
+        num_classes: int | None = None,
+    ) -> SparseFrameLabels:
+        r"""Build the sparse labels from a DataFrame of segments.
+
+        The rows with a missing start time, end time, or label are
+        ignored.
+
+        Args:
+            frame: The DataFrame with one row per segment, for example
+                the output of ``prepare_data``.
+            group_cols: The columns used to generate the sequences.
+            start_col: The column with the start time of each segment.
+            end_col: The column with the end time of each segment.
+            label_col: The column with the label index of each
+                segment.
+            fps: The number of frames per time unit. Use ``1.0`` if
+                the times are already frame indices.
+            stride: The number of frames between two sampled frames.
+            num_classes: The number of classes. If ``None``, it is
+                inferred from the labels.
+
+        Returns:
+            The sparse labels.
+
+        Example usage:
+
+        ```pycon
+
+        >>> import polars as pl
+        >>> from arctix.utils.rasterize import SparseFrameLabels
+        >>> frame = pl.DataFrame(
+        ...     {"video": ["v1", "v1"], "start": [0, 1], "end": [2, 4], "action_id": [0, 2]}
+        ... )
+        >>> SparseFrameLabels.from_frame(
+        ...     frame,
+        ...     group_cols=["video"],
+        ...     start_col="start",
+        ...     end_col="end",
+        ...     label_col="action_id",
+        ...     num_classes=65,
+        ... )
+        SparseFrameLabels(num_sequences=1, num_activations=2, num_classes=65)
+
+        ```
+        """
+        group_cols = list(group_cols)
+        frame = (
+            frame.select([*group_cols, start_col, end_col, label_col])
+            .drop_nulls([start_col, end_col, label_col])
+            .sort(by=[*group_cols, start_col], maintain_order=True)
+        )
+        first, last = compute_frame_bounds(
+            frame.get_column(start_col).to_numpy(),
+            frame.get_column(end_col).to_numpy(),
+            fps=fps,
+            stride=stride,
+        )
+        labels = frame.get_column(label_col).to_numpy().astype(np.int64)
+        if num_classes is None:
+            num_classes = int(labels.max()) + 1 if labels.shape[0] else 0
+        return cls(
+            sequence_index=SequenceIndex.from_frame(frame, group_cols=group_cols),
+            first=first,
+            last=last,
+            labels=labels,
+            num_classes=num_classes,
+        )
@@ -0,0 +1,230 @@
+r"""Contain utility functions to generate sliding windows over
+sequences."""
+
+from __future__ import annotations
+
+__all__ = ["create_anticipation_windows", "gather_windows", "generate_window_indices"]
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import polars as pl
+
+
+def generate_window_indices(
+    lengths: np.ndarray | Sequence[int],
+    history: int,
+    future: int = 0,
+    *,
+    stride: int = 1,
+    min_history: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    r"""Generate the indices of the sliding windows over some
+    sequences.
+
+    A window is anchored at a position ``t`` of a sequence. It
+    contains the ``history`` events before ``t`` i.e. the observed
+    events, and the ``future`` events from ``t`` i.e. the events to
+    anticipate. The anchors are spaced by ``stride`` events. A window
+    is generated only if it has at least ``min_history`` observed
+    events and ``future`` events to anticipate, so the start of a
+    window can be negative if ``min_history < history``.
+
+    The indices are computed with vectorized operations, without
+    Python loop over the windows.
+
+    Args:
+        lengths: The length of each sequence.
+        history: The number of observed events in a window.
+        future: The number of events to anticipate in a window.
+        stride: The number of events between two anchors.
+        min_history: The minimum number of observed events in a
+            window. If ``None``, it is set to ``history``.
+
+    Returns:
+        A tuple with the sequence index, the start index, and the end
+            index (exclusive) of each window.
+
+    Raises:
+        RuntimeError: if a parameter is incorrect.
+
+    Example usage:
+
+    ```pycon
+
+    >>> from arctix.utils.window import generate_window_indices
+    >>> generate_window_indices([5, 2, 4], history=2, future=1)
+    (array([0, 0, 0, 2, 2]), array([0, 1, 2, 0, 1]), array([3, 4, 5, 3, 4]))
+    >>> generate_window_indices([5, 2, 4], history=2, future=1, min_history=1, stride=2)
+    (array([0, 0, 1, 2, 2]), array([-1,  1, -1, -1,  1]), array([2, 4, 2, 2, 4]))
+
+    ```
+    """
+    min_history = history if min_history is None else min_history
+    if history < 1 or future < 0 or stride < 1 or not 0 <= min_history <= history:
+        msg = (
+            f"Incorrect window parameters: history={history}, future={future}, "
+            f"stride={stride}, min_history={min_history}. The parameters must verify "
+            "history >= 1, future >= 0, stride >= 1, and 0 <= min_history <= history"
+        )
+        raise RuntimeError(msg)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    # The anchors of a sequence are in the range [min_history, length - future]
+    span = lengths - future - min_history
+    counts = np.where(span >= 0, span // stride + 1, 0)
+    sequence_ids = np.repeat(np.arange(lengths.shape[0]), counts)
+    offsets = np.cumsum(counts) - counts
+    anchors = min_history + (np.arange(int(counts.sum())) - offsets[sequence_ids]) * stride
+    return sequence_ids, anchors - history, anchors + future
+
+
+def gather_windows(
+    values: np.ndarray,
+    lengths: np.ndarray | Sequence[int],
+    sequence_ids: np.ndarray,
+    starts: np.ndarray,
+    window_size: int,
+) -> np.ma.MaskedArray:
+    r"""Gather the values of some windows from the flat values of the
+    sequences.
+
+    The values are gathered with a single fancy indexing operation.
+    The positions outside of their sequence are masked.
+
+    Args:
+        values: The flat values of the sequences, where the values
+            of each sequence are contiguous and the sequences are in
+            the same order as ``lengths``.
+        lengths: The length of each sequence.
+        sequence_ids: The sequence index of each window.
+        starts: The start index of each window in its sequence.
+        window_size: The number of values in a window.
+
+    Returns:
+        The ``(num_windows, window_size, *)`` masked array of values.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import numpy as np
+    >>> from arctix.utils.window import gather_windows
+    >>> gather_windows(
+    ...     np.array([1, 2, 3, 4, 5, 6]),
+    ...     lengths=[4, 2],
+    ...     sequence_ids=np.array([0, 0, 1]),
+    ...     starts=np.array([0, 2, -1]),
+    ...     window_size=2,
+    ... )
+    masked_array(
+      data=[[1, 2],
+            [3, 4],
+            [--, 5]],
+      mask=[[False, False],
+            [False, False],
+            [ True, False]],
+      fill_value=999999)
+
+    ```
+    """
+    values = np.asarray(values)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    positions = starts[:, None] + np.arange(window_size)
+    mask = (positions < 0) | (positions >= lengths[sequence_ids][:, None])
+    indices = np.where(mask, 0, offsets[sequence_ids][:, None] + positions)
+    data = values[indices]
+    if data.ndim > mask.ndim:
+        mask = np.broadcast_to(mask.reshape(*mask.shape, *([1] * (data.ndim - 2))), data.shape)
+    return np.ma.masked_array(data=data, mask=mask)
+
+
+def create_anticipation_windows(
+    frame: pl.DataFrame,
+    group_cols: Sequence[str],
+    columns: Sequence[str],
+    history: int,
+    future: int = 1,
+    *,
+    stride: int = 1,
+    min_history: int | None = None,
+) -> dict[str, np.ndarray]:
+    r"""Create the windows of observed and future events for action
+    anticipation.
+
+    The DataFrame is sorted by the group columns, so the rows of each
+    sequence are contiguous, and the windows are generated and
+    gathered with vectorized operations. The returned dictionary
+    contains the sequence index and the anchor of each window, and
+    for each column, the ``history_{column}`` array with the observed
+    events and the ``future_{column}`` array with the events to
+    anticipate.
+
+    Args:
+        frame: The DataFrame with one row per event, for example the
+            output of ``prepare_data``.
+        group_cols: The columns used to generate the sequences.
+        columns: The columns to gather in the windows.
+        history: The number of observed events in a window.
+        future: The number of events to anticipate in a window.
+        stride: The number of events between two anchors.
+        min_history: The minimum number of observed events in a
+            window. If ``None``, it is set to ``history``.
+
+    Returns:
+        The dictionary of arrays.
+
+    Raises:
+        RuntimeError: if a window parameter is incorrect.
+
+    Example usage:
+
+    ```pycon
+
+    >>> import polars as pl
+    >>> from arctix.utils.window import create_anticipation_windows
+    >>> frame = pl.DataFrame(
+    ...     {"clip": ["c1", "c1", "c1", "c1", "c2", "c2"], "verb_id": [1, 2, 3, 4, 5, 6]}
+    ... )
+    >>> windows = create_anticipation_windows(
+    ...     frame, group_cols=["clip"], columns=["verb_id"], history=2, future=1
+    ... )
+    >>> windows["history_verb_id"]
+    masked_array(
+      data=[[1, 2],
+            [2, 3]],
+      mask=[[False, False],
+            [False, False]],
+      fill_value=999999)
+    >>> windows["future_verb_id"]
+    masked_array(
+      data=[[3],
+            [4]],
+      mask=[[False],
+            [False]],
+      fill_value=999999)
+
+    ```
+    """
+    group_cols = list(group_cols)
+    frame = frame.sort(by=group_cols, maintain_order=True)
+    lengths = frame.group_by(group_cols, maintain_order=True).len().get_column("len").to_numpy()
+    sequence_ids, starts, _ = generate_window_indices(
+        lengths, history=history, future=future, stride=stride, min_history=min_history
+    )
+    arrays = {"sequence_id": sequence_ids, "anchor": starts + history}
+    for col in columns:
+        windows = gather_windows(
+            frame.get_column(col).to_numpy(),
+            lengths=lengths,
+            sequence_ids=sequence_ids,
+            starts=starts,
+            window_size=history + future,
+        )
+        arrays[f"history_{col}"] = windows[:, :history]
+        arrays[f"future_{col}"] = windows[:, history:]
+    return arrays
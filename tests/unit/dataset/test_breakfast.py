@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import shutil
 from collections import Counter
 from pathlib import Path
 from unittest.mock import Mock, call, patch
@@ -15,15 +16,19 @@ from arctix.dataset.breakfast import (
     URLS,
     Column,
     MetadataKeys,
+    Preprocessor,
     download_data,
     fetch_data,
     filter_by_split,
+    get_person,
     group_by_sequence,
     load_annotation_file,
     load_data,
     parse_annotation_lines,
     prepare_data,
+    prepare_data_incremental,
     to_array,
+    to_array_chunks,
     to_list,
 )
 from arctix.utils.vocab import Vocabulary
@@ -359,6 +364,13 @@ def test_fetch_data_incorrect_name(tmp_path: Path) -> None:
         fetch_data(tmp_path, "incorrect")
 
 
+def test_fetch_data_split(data_dir: Path, data_raw: pl.DataFrame) -> None:
+    with patch("arctix.dataset.breakfast.download_data") as download_mock:
+        data = fetch_data(data_dir, name="segmentation_coarse", split="test4")
+        download_mock.assert_called_once_with(data_dir, False)
+    assert_frame_equal(data, data_raw.filter(pl.col(Column.PERSON) == "P54"))
+
+
 ###################################
 #     Tests for download_data     #
 ###################################
@@ -367,65 +379,99 @@ def test_fetch_data_incorrect_name(tmp_path: Path) -> None:
 def test_download_data(tmp_path: Path) -> None:
     with (
         patch("arctix.dataset.breakfast.download_drive_file") as download_mock,
-        patch("arctix.dataset.breakfast.tarfile.open") as tarfile_mock,
+        patch("arctix.dataset.breakfast.extract_archive") as extract_mock,
     ):
         download_data(tmp_path)
-        assert download_mock.call_args_list == [
-            call(
-                URLS["segmentation_coarse"],
-                tmp_path.joinpath("segmentation_coarse.tar.gz"),
-                quiet=False,
-                fuzzy=True,
-            ),
-            call(
-                URLS["segmentation_fine"],
-                tmp_path.joinpath("segmentation_fine.tar.gz"),
-                quiet=False,
-                fuzzy=True,
-            ),
-        ]
-        assert tarfile_mock.call_args_list == [
-            call(tmp_path.joinpath("segmentation_coarse.tar.gz")),
-            call(tmp_path.joinpath("segmentation_fine.tar.gz")),
-        ]
+        assert download_mock.call_count == 2
+        download_mock.assert_has_calls(
+            [
+                call(
+                    URLS["segmentation_coarse"],
+                    tmp_path.joinpath("segmentation_coarse.tar.gz"),
+                    quiet=True,
+                    fuzzy=True,
+                ),
+                call(
+                    URLS["segmentation_fine"],
+                    tmp_path.joinpath("segmentation_fine.tar.gz"),
+                    quiet=True,
+                    fuzzy=True,
+                ),
+            ],
+            any_order=True,
+        )
+        assert extract_mock.call_count == 2
+        extract_mock.assert_has_calls(
+            [
+                call(tmp_path.joinpath("segmentation_coarse.tar.gz"), tmp_path),
+                call(tmp_path.joinpath("segmentation_fine.tar.gz"), tmp_path),
+            ],
+            any_order=True,
+        )
+
+
+def test_download_data_partial(tmp_path: Path) -> None:
+    tmp_path.joinpath("segmentation_coarse").mkdir()
+    with (
+        patch("arctix.dataset.breakfast.download_drive_file") as download_mock,
+        patch("arctix.dataset.breakfast.extract_archive") as extract_mock,
+    ):
+        download_data(tmp_path, max_workers=1)
+        download_mock.assert_called_once_with(
+            URLS["segmentation_fine"],
+            tmp_path.joinpath("segmentation_fine.tar.gz"),
+            quiet=True,
+            fuzzy=True,
+        )
+        extract_mock.assert_called_once_with(
+            tmp_path.joinpath("segmentation_fine.tar.gz"), tmp_path
+        )
 
 
 def test_download_data_dir_exists(tmp_path: Path) -> None:
     with (
         patch("arctix.dataset.breakfast.Path.is_dir", lambda *args, **kwargs: True),  # noqa: ARG005
         patch("arctix.dataset.breakfast.download_drive_file") as download_mock,
-        patch("arctix.dataset.breakfast.tarfile.open") as tarfile_mock,
+        patch("arctix.dataset.breakfast.extract_archive") as extract_mock,
     ):
         download_data(tmp_path)
         download_mock.assert_not_called()
-        tarfile_mock.assert_not_called()
+        extract_mock.assert_not_called()
 
 
 def test_download_data_dir_exists_force_download(tmp_path: Path) -> None:
     with (
         patch("arctix.dataset.breakfast.Path.is_dir", lambda *args, **kwargs: True),  # noqa: ARG005
         patch("arctix.dataset.breakfast.download_drive_file") as download_mock,
-        patch("arctix.dataset.breakfast.tarfile.open") as tarfile_mock,
+        patch("arctix.dataset.breakfast.extract_archive") as extract_mock,
     ):
         download_data(tmp_path, force_download=True)
-        assert download_mock.call_args_list == [
-            call(
-                URLS["segmentation_coarse"],
-                tmp_path.joinpath("segmentation_coarse.tar.gz"),
-                quiet=False,
-                fuzzy=True,
-            ),
-            call(
-                URLS["segmentation_fine"],
-                tmp_path.joinpath("segmentation_fine.tar.gz"),
-                quiet=False,
-                fuzzy=True,
-            ),
-        ]
-        assert tarfile_mock.call_args_list == [
-            call(tmp_path.joinpath("segmentation_coarse.tar.gz")),
-            call(tmp_path.joinpath("segmentation_fine.tar.gz")),
-        ]
+        assert download_mock.call_count == 2
+        download_mock.assert_has_calls(
+            [
+                call(
+                    URLS["segmentation_coarse"],
+                    tmp_path.joinpath("segmentation_coarse.tar.gz"),
+                    quiet=True,
+                    fuzzy=True,
+                ),
+                call(
+                    URLS["segmentation_fine"],
+                    tmp_path.joinpath("segmentation_fine.tar.gz"),
+                    quiet=True,
+                    fuzzy=True,
+                ),
+            ],
+            any_order=True,
+        )
+        assert extract_mock.call_count == 2
+        extract_mock.assert_has_calls(
+            [
+                call(tmp_path.joinpath("segmentation_coarse.tar.gz"), tmp_path),
+                call(tmp_path.joinpath("segmentation_fine.tar.gz"), tmp_path),
+            ],
+            any_order=True,
+        )
 
 
 ###############################
@@ -544,6 +590,44 @@ def test_load_data_keep_duplicates(data_dir: Path) -> None:
     )
 
 
+def test_load_data_split(data_dir: Path, data_raw: pl.DataFrame) -> None:
+    assert_frame_equal(
+        load_data(data_dir, split="test1"), data_raw.filter(pl.col(Column.PERSON) == "P03")
+    )
+
+
+def test_load_data_split_skip_files(data_dir: Path) -> None:
+    with patch(
+        "arctix.dataset.breakfast.load_annotation_file", wraps=load_annotation_file
+    ) as load_mock:
+        load_data(data_dir, split="test4")
+    load_mock.assert_called_once_with(
+        data_dir.joinpath("segmentation_coarse/milk/P54_webcam02_P54_milk.txt")
+    )
+
+
+def test_load_data_split_all(data_dir: Path, data_raw: pl.DataFrame) -> None:
+    assert_frame_equal(load_data(data_dir, split="all"), data_raw)
+
+
+def test_load_data_incorrect_split(data_dir: Path) -> None:
+    with pytest.raises(RuntimeError, match="Incorrect split: incorrect"):
+        load_data(data_dir, split="incorrect")
+
+
+################################
+#     Tests for get_person     #
+################################
+
+
+def test_get_person() -> None:
+    assert get_person(Path("/path/to/data/P03_cam01_P03_cereals.txt")) == "P03"
+
+
+def test_get_person_webcam() -> None:
+    assert get_person(Path("/path/to/data/P54_webcam02_P54_milk.txt")) == "P54"
+
+
 ##########################################
 #     Tests for load_annotation_file     #
 ##########################################
@@ -875,6 +959,122 @@ def test_prepare_data_empty(data_prepared_empty: pl.DataFrame) -> None:
     )
 
 
+##################################
+#     Tests for Preprocessor     #
+##################################
+
+
+def test_preprocessor(data_raw: pl.DataFrame, data_prepared: pl.DataFrame) -> None:
+    preprocessor = Preprocessor().fit(data_raw)
+    assert_frame_equal(preprocessor.transform(data_raw), data_prepared)
+    assert objects_are_equal(preprocessor.metadata, prepare_data(data_raw)[1])
+
+
+def test_preprocessor_transform_split(data_raw: pl.DataFrame) -> None:
+    assert_frame_equal(
+        Preprocessor().fit(data_raw).transform(data_raw, split="test1"),
+        prepare_data(data_raw, split="test1")[0],
+    )
+
+
+def test_preprocessor_transform_new_frame(
+    data_raw: pl.DataFrame, data_prepared: pl.DataFrame
+) -> None:
+    # The vocabularies are not generated again, so the indices match the fitted data
+    preprocessor = Preprocessor().fit(data_raw)
+    assert_frame_equal(
+        preprocessor.transform(data_raw.filter(pl.col(Column.PERSON) == "P54")),
+        data_prepared.filter(pl.col(Column.PERSON) == "P54"),
+    )
+
+
+def test_preprocessor_save_load(tmp_path: Path, data_raw: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("preprocessor.json")
+    preprocessor = Preprocessor().fit(data_raw)
+    preprocessor.save(path)
+    assert objects_are_equal(Preprocessor.load(path).metadata, preprocessor.metadata)
+
+
+##############################################
+#     Tests for prepare_data_incremental     #
+##############################################
+
+
+@pytest.fixture
+def dataset_dir(data_dir: Path, tmp_path: Path) -> Path:
+    return Path(shutil.copytree(data_dir, tmp_path.joinpath("dataset")))
+
+
+def test_prepare_data_incremental(dataset_dir: Path, tmp_path: Path) -> None:
+    assert objects_are_equal(
+        prepare_data_incremental(dataset_dir, cache_path=tmp_path.joinpath("cache")),
+        prepare_data(load_data(dataset_dir)),
+    )
+
+
+def test_prepare_data_incremental_split(dataset_dir: Path, tmp_path: Path) -> None:
+    assert objects_are_equal(
+        prepare_data_incremental(
+            dataset_dir, cache_path=tmp_path.joinpath("cache"), split="train1"
+        ),
+        prepare_data(load_data(dataset_dir), split="train1"),
+    )
+
+
+def test_prepare_data_incremental_unchanged(dataset_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    expected = prepare_data_incremental(dataset_dir, cache_path=cache_path)
+    with patch(
+        "arctix.dataset.breakfast.load_annotation_file", wraps=load_annotation_file
+    ) as load_mock:
+        assert objects_are_equal(prepare_data_incremental(dataset_dir, cache_path), expected)
+        load_mock.assert_not_called()
+
+
+def test_prepare_data_incremental_changed_file(dataset_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    prepare_data_incremental(dataset_dir, cache_path=cache_path)
+    save_text(
+        "1-4 SIL  \n5-215 pour_milk  \n216-565 spoon_powder  \n566-800 SIL  \n",
+        dataset_dir.joinpath("segmentation_coarse/milk/P54_webcam02_P54_milk.txt"),
+        exist_ok=True,
+    )
+    expected = prepare_data(load_data(dataset_dir))
+    with patch(
+        "arctix.dataset.breakfast.load_annotation_file", wraps=load_annotation_file
+    ) as load_mock:
+        assert objects_are_equal(prepare_data_incremental(dataset_dir, cache_path), expected)
+        assert load_mock.call_count == 1
+
+
+def test_prepare_data_incremental_vocab_order_changed(dataset_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    prepare_data_incremental(dataset_dir, cache_path=cache_path)
+    save_text(
+        "1-40 spoon_powder  \n41-215 spoon_powder  \n216-565 spoon_powder  \n",
+        dataset_dir.joinpath("segmentation_coarse/milk/P54_webcam02_P54_milk.txt"),
+        exist_ok=True,
+    )
+    save_text(
+        "1-40 SIL  \n41-215 butter_pan  \n",
+        dataset_dir.joinpath("segmentation_coarse/P12_cam01_P12_friedegg.txt"),
+        exist_ok=True,
+    )
+    data, metadata = prepare_data_incremental(dataset_dir, cache_path)
+    assert objects_are_equal((data, metadata), prepare_data(load_data(dataset_dir)))
+    assert metadata[MetadataKeys.VOCAB_ACTION].get_index_to_token()[0] == "spoon_powder"
+
+
+def test_prepare_data_incremental_removed_file(dataset_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    prepare_data_incremental(dataset_dir, cache_path=cache_path)
+    dataset_dir.joinpath("segmentation_coarse/P03_cam01_P03_cereals.txt").unlink()
+    assert objects_are_equal(
+        prepare_data_incremental(dataset_dir, cache_path),
+        prepare_data(load_data(dataset_dir)),
+    )
+
+
 #######################################
 #     Tests for group_by_sequence     #
 #######################################
@@ -1037,6 +1237,35 @@ def test_to_array_empty(data_prepared_empty: pl.DataFrame) -> None:
     )
 
 
+#####################################
+#     Tests for to_array_chunks     #
+#####################################
+
+
+def test_to_array_chunks(data_prepared: pl.DataFrame) -> None:
+    chunks = list(to_array_chunks(data_prepared, max_rows=6))
+    assert objects_are_equal(
+        chunks,
+        [
+            to_array(data_prepared.filter(pl.col(Column.PERSON) == "P03")),
+            to_array(data_prepared.filter(pl.col(Column.PERSON) == "P54")),
+        ],
+    )
+    assert chunks[1][Column.ACTION_ID].shape == (1, 4)
+
+
+def test_to_array_chunks_max_bytes(data_prepared: pl.DataFrame) -> None:
+    assert len(list(to_array_chunks(data_prepared, max_bytes=1))) == 2
+
+
+def test_to_array_chunks_no_budget(data_prepared: pl.DataFrame) -> None:
+    assert objects_are_equal(list(to_array_chunks(data_prepared)), [to_array(data_prepared)])
+
+
+def test_to_array_chunks_empty(data_prepared_empty: pl.DataFrame) -> None:
+    assert list(to_array_chunks(data_prepared_empty)) == []
+
+
 #############################
 #     Tests for to_list     #
 #############################
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from collections import Counter
 from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
 
 import numpy as np
 import polars as pl
@@ -23,7 +24,9 @@ from arctix.dataset.ego4d import (
     load_taxonomy_vocab,
     load_verb_vocab,
     prepare_data,
+    prepare_splits,
     to_array,
+    to_array_chunks,
     to_list,
 )
 from arctix.utils.vocab import Vocabulary
@@ -321,6 +324,46 @@ def test_prepare_data(
     )
 
 
+####################################
+#     Tests for prepare_splits     #
+####################################
+
+
+def test_prepare_splits(
+    data_dir: Path,
+    data_prepared: pl.DataFrame,
+    vocab_noun: Vocabulary,
+    vocab_verb: Vocabulary,
+) -> None:
+    outputs = prepare_splits(data_dir, splits=["train"])
+    assert list(outputs) == ["train"]
+    data, metadata = outputs["train"]
+    assert_frame_equal(data, data_prepared)
+    assert objects_are_equal(
+        metadata, {MetadataKeys.VOCAB_NOUN: vocab_noun, MetadataKeys.VOCAB_VERB: vocab_verb}
+    )
+
+
+def test_prepare_splits_load_vocab_once(
+    data_dir: Path, data_raw: pl.DataFrame, data_prepared: pl.DataFrame
+) -> None:
+    with (
+        patch("arctix.dataset.ego4d.load_event_data", Mock(return_value=data_raw)) as load_mock,
+        patch("arctix.dataset.ego4d.load_noun_vocab", wraps=load_noun_vocab) as noun_mock,
+    ):
+        outputs = prepare_splits(data_dir, splits=["train", "val"], max_workers=1)
+        noun_mock.assert_called_once_with(data_dir)
+        assert load_mock.call_count == 2
+    assert list(outputs) == ["train", "val"]
+    assert_frame_equal(outputs["val"][0], data_prepared)
+    assert outputs["train"][1] is outputs["val"][1]
+
+
+def test_prepare_splits_missing_split(data_dir: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        prepare_splits(data_dir, splits=["train", "missing"])
+
+
 #######################################
 #     Tests for group_by_sequence     #
 #######################################
@@ -487,6 +530,47 @@ def test_to_array_video_id(data_prepared: pl.DataFrame) -> None:
     )
 
 
+#####################################
+#     Tests for to_array_chunks     #
+#####################################
+
+
+def test_to_array_chunks_clip_id(data_prepared: pl.DataFrame) -> None:
+    chunks = list(to_array_chunks(data_prepared, max_rows=5))
+    assert objects_are_equal(
+        chunks,
+        [
+            to_array(data_prepared.filter(pl.col(Column.CLIP_ID) == "clip1")),
+            to_array(data_prepared.filter(pl.col(Column.CLIP_ID) == "clip2")),
+        ],
+    )
+    assert chunks[1][Column.NOUN_ID].shape == (1, 2)
+
+
+def test_to_array_chunks_video_id(data_prepared: pl.DataFrame) -> None:
+    assert objects_are_equal(
+        list(to_array_chunks(data_prepared, group_col=Column.VIDEO_ID, max_rows=5)),
+        [
+            to_array(
+                data_prepared.filter(pl.col(Column.VIDEO_ID) == "video1"),
+                group_col=Column.VIDEO_ID,
+            ),
+            to_array(
+                data_prepared.filter(pl.col(Column.VIDEO_ID) == "video2"),
+                group_col=Column.VIDEO_ID,
+            ),
+        ],
+    )
+
+
+def test_to_array_chunks_no_budget(data_prepared: pl.DataFrame) -> None:
+    assert objects_are_equal(list(to_array_chunks(data_prepared)), [to_array(data_prepared)])
+
+
+def test_to_array_chunks_empty(data_prepared: pl.DataFrame) -> None:
+    assert list(to_array_chunks(data_prepared.clear())) == []
+
+
 #############################
 #     Tests for to_list     #
 #############################
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+import os
 from collections import Counter
 from typing import TYPE_CHECKING
 from unittest.mock import Mock, patch
@@ -29,9 +30,12 @@ from arctix.dataset.epic_kitchen_100 import (
     load_noun_vocab,
     load_verb_vocab,
     prepare_data,
+    prepare_splits,
     to_array,
+    to_array_chunks,
     to_list,
 )
+from arctix.utils.manifest import MANIFEST_FILENAME, write_manifest
 from arctix.utils.vocab import Vocabulary
 
 if TYPE_CHECKING:
@@ -734,6 +738,8 @@ def test_download_data(data_zip_file: Path, tmp_path: Path, force_download: bool
             ANNOTATION_URL, data_zip_file.as_posix(), progress=True
         )
         assert all(tmp_path.joinpath(filename).is_file() for filename in ANNOTATION_FILENAMES)
+        assert is_annotation_path_ready(tmp_path)
+        assert tmp_path.joinpath(MANIFEST_FILENAME).is_file()
 
 
 def test_download_data_already_exists_force_download_false(tmp_path: Path) -> None:
@@ -788,6 +794,37 @@ def test_is_annotation_path_ready_false_missing_partial(tmp_path: Path) -> None:
     assert not is_annotation_path_ready(tmp_path)
 
 
+def test_is_annotation_path_ready_manifest_true(tmp_path: Path) -> None:
+    for filename in ANNOTATION_FILENAMES:
+        save_text("abc", tmp_path.joinpath(filename))
+    write_manifest(tmp_path, ANNOTATION_FILENAMES)
+    assert is_annotation_path_ready(tmp_path)
+
+
+def test_is_annotation_path_ready_manifest_corrupted(tmp_path: Path) -> None:
+    for filename in ANNOTATION_FILENAMES:
+        save_text("abc", tmp_path.joinpath(filename))
+    write_manifest(tmp_path, ANNOTATION_FILENAMES)
+    save_text("abd", tmp_path.joinpath(ANNOTATION_FILENAMES[0]), exist_ok=True)
+    assert not is_annotation_path_ready(tmp_path)
+
+
+def test_is_annotation_path_ready_manifest_read_only(tmp_path: Path) -> None:
+    for filename in ANNOTATION_FILENAMES:
+        save_text("abc", tmp_path.joinpath(filename))
+    write_manifest(tmp_path, ANNOTATION_FILENAMES)
+    path = tmp_path.joinpath(ANNOTATION_FILENAMES[0])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    tmp_path.chmod(0o555)
+    try:
+        # The permissions are not enforced for the root user
+        with patch("arctix.utils.manifest.save_json", side_effect=PermissionError("read-only")):
+            assert is_annotation_path_ready(tmp_path)
+    finally:
+        tmp_path.chmod(0o755)
+
+
 ###############################
 #     Tests for load_data     #
 ###############################
@@ -994,6 +1031,46 @@ def test_prepare_data_empty() -> None:
     assert objects_are_equal(metadata, {})
 
 
+####################################
+#     Tests for prepare_splits     #
+####################################
+
+
+def test_prepare_splits(
+    data_dir: Path,
+    data_raw: pl.DataFrame,
+    data_prepared: pl.DataFrame,
+    noun_vocab: Vocabulary,
+    verb_vocab: Vocabulary,
+) -> None:
+    with (
+        patch("arctix.dataset.epic_kitchen_100.download_data") as download_mock,
+        patch(
+            "arctix.dataset.epic_kitchen_100.load_event_data", Mock(return_value=data_raw)
+        ) as load_mock,
+        patch(
+            "arctix.dataset.epic_kitchen_100.load_noun_vocab", Mock(return_value=noun_vocab)
+        ) as noun_mock,
+    ):
+        outputs = prepare_splits(data_dir, splits=["train", "validation"])
+        download_mock.assert_called_once_with(data_dir, False)
+        noun_mock.assert_called_once_with(data_dir)
+        assert sorted(call.args[0].name for call in load_mock.call_args_list) == [
+            "EPIC_100_train.csv",
+            "EPIC_100_validation.csv",
+        ]
+    assert list(outputs) == ["train", "validation"]
+    metadata = {MetadataKeys.VOCAB_NOUN: noun_vocab, MetadataKeys.VOCAB_VERB: verb_vocab}
+    for data, meta in outputs.values():
+        assert_frame_equal(data, data_prepared)
+        assert objects_are_equal(meta, metadata)
+
+
+def test_prepare_splits_empty(data_dir: Path) -> None:
+    with patch("arctix.dataset.epic_kitchen_100.download_data"):
+        assert prepare_splits(data_dir, splits=[], max_workers=2) == {}
+
+
 #######################################
 #     Tests for group_by_sequence     #
 #######################################
@@ -1590,6 +1667,32 @@ def test_to_array_empty() -> None:
     )
 
 
+#####################################
+#     Tests for to_array_chunks     #
+#####################################
+
+
+def test_to_array_chunks(data_prepared2: pl.DataFrame) -> None:
+    chunks = list(to_array_chunks(data_prepared2, max_rows=10))
+    assert objects_are_equal(
+        chunks,
+        [
+            to_array(data_prepared2.filter(pl.col(Column.VIDEO_ID).is_in(["P01_01", "P01_02"]))),
+            to_array(data_prepared2.filter(pl.col(Column.VIDEO_ID).is_in(["P01_03", "P01_04"]))),
+            to_array(data_prepared2.filter(pl.col(Column.VIDEO_ID) == "P01_05")),
+        ],
+    )
+    assert chunks[1][Column.VERB_ID].shape == (2, 5)
+
+
+def test_to_array_chunks_no_budget(data_prepared2: pl.DataFrame) -> None:
+    assert objects_are_equal(list(to_array_chunks(data_prepared2)), [to_array(data_prepared2)])
+
+
+def test_to_array_chunks_empty(data_prepared2: pl.DataFrame) -> None:
+    assert list(to_array_chunks(data_prepared2.clear())) == []
+
+
 #############################
 #     Tests for to_list     #
 #############################
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import shutil
 from collections import Counter
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -17,6 +19,7 @@ from arctix.dataset.multithumos import (
     ANNOTATION_URL,
     Column,
     MetadataKeys,
+    Preprocessor,
     download_data,
     fetch_data,
     filter_by_split,
@@ -27,9 +30,12 @@ from arctix.dataset.multithumos import (
     load_data,
     parse_annotation_lines,
     prepare_data,
+    prepare_data_incremental,
     to_array,
+    to_array_chunks,
     to_list,
 )
+from arctix.utils.manifest import MANIFEST_FILENAME, write_manifest
 from arctix.utils.vocab import Vocabulary
 
 
@@ -202,6 +208,13 @@ def test_fetch_data(data_dir: Path, data_raw: pl.DataFrame) -> None:
     assert_frame_equal(data, data_raw)
 
 
+def test_fetch_data_split(data_dir: Path, data_raw: pl.DataFrame) -> None:
+    with patch("arctix.dataset.multithumos.download_data") as download_mock:
+        data = fetch_data(data_dir, split="validation")
+        download_mock.assert_called_once_with(data_dir, False)
+    assert_frame_equal(data, data_raw)
+
+
 ###################################
 #     Tests for download_data     #
 ###################################
@@ -222,6 +235,8 @@ def test_download_data(data_zip_file: Path, tmp_path: Path, force_download: bool
             ANNOTATION_URL, data_zip_file.as_posix(), progress=True
         )
         assert all(data_path.joinpath(filename).is_file() for filename in ANNOTATION_FILENAMES)
+        assert is_annotation_path_ready(data_path)
+        assert data_path.joinpath(MANIFEST_FILENAME).is_file()
 
 
 def test_download_data_already_exists_force_download_false(tmp_path: Path) -> None:
@@ -277,6 +292,37 @@ def test_is_annotation_path_ready_false_missing_partial(tmp_path: Path) -> None:
     assert not is_annotation_path_ready(tmp_path)
 
 
+def test_is_annotation_path_ready_manifest_true(tmp_path: Path) -> None:
+    for filename in ANNOTATION_FILENAMES:
+        save_text("abc", tmp_path.joinpath(filename))
+    write_manifest(tmp_path, ANNOTATION_FILENAMES)
+    assert is_annotation_path_ready(tmp_path)
+
+
+def test_is_annotation_path_ready_manifest_corrupted(tmp_path: Path) -> None:
+    for filename in ANNOTATION_FILENAMES:
+        save_text("abc", tmp_path.joinpath(filename))
+    write_manifest(tmp_path, ANNOTATION_FILENAMES)
+    save_text("abd", tmp_path.joinpath(ANNOTATION_FILENAMES[0]), exist_ok=True)
+    assert not is_annotation_path_ready(tmp_path)
+
+
+def test_is_annotation_path_ready_manifest_read_only(tmp_path: Path) -> None:
+    for filename in ANNOTATION_FILENAMES:
+        save_text("abc", tmp_path.joinpath(filename))
+    write_manifest(tmp_path, ANNOTATION_FILENAMES)
+    path = tmp_path.joinpath(ANNOTATION_FILENAMES[0])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    tmp_path.chmod(0o555)
+    try:
+        # The permissions are not enforced for the root user
+        with patch("arctix.utils.manifest.save_json", side_effect=PermissionError("read-only")):
+            assert is_annotation_path_ready(tmp_path)
+    finally:
+        tmp_path.chmod(0o755)
+
+
 ###############################
 #     Tests for load_data     #
 ###############################
@@ -286,11 +332,32 @@ def test_load_data(data_dir: Path, data_raw: pl.DataFrame) -> None:
     assert_frame_equal(load_data(data_dir), data_raw)
 
 
+@pytest.mark.parametrize("split", ["all", "validation"])
+def test_load_data_split(data_dir: Path, data_raw: pl.DataFrame, split: str) -> None:
+    assert_frame_equal(load_data(data_dir, split=split), data_raw)
+
+
+def test_load_data_split_test(data_dir: Path) -> None:
+    assert load_data(data_dir, split="test").is_empty()
+
+
+def test_load_data_incorrect_split(data_dir: Path) -> None:
+    with pytest.raises(RuntimeError, match="Incorrect split: incorrect"):
+        load_data(data_dir, split="incorrect")
+
+
 ##########################################
 #     Tests for load_annotation_file     #
 ##########################################
 
 
+def test_load_annotation_file_split_test(data_file: Path) -> None:
+    assert objects_are_equal(
+        load_annotation_file(data_file, split="test"),
+        {Column.VIDEO: [], Column.START_TIME: [], Column.END_TIME: [], Column.ACTION: []},
+    )
+
+
 def test_load_annotation_file_incorrect_extension() -> None:
     with pytest.raises(ValueError, match=r"Incorrect file extension."):
         load_annotation_file(Mock(spec=Path))
@@ -342,6 +409,24 @@ def test_parse_annotation_lines() -> None:
     )
 
 
+@pytest.mark.parametrize(
+    ("split", "videos"),
+    [
+        ("all", ["video_validation_0000266", "video_test_0000004"]),
+        ("validation", ["video_validation_0000266"]),
+        ("test", ["video_test_0000004"]),
+    ],
+)
+def test_parse_annotation_lines_split(split: str, videos: list[str]) -> None:
+    assert (
+        parse_annotation_lines(
+            ["video_validation_0000266 72.80 76.40", "", " video_test_0000004 0.50 2.10 "],
+            split=split,
+        )[Column.VIDEO]
+        == videos
+    )
+
+
 def test_parse_annotation_lines_empty() -> None:
     assert objects_are_equal(
         parse_annotation_lines([]),
@@ -660,6 +745,120 @@ def test_filter_by_split_test() -> None:
     )
 
 
+##################################
+#     Tests for Preprocessor     #
+##################################
+
+
+def test_preprocessor(data_raw: pl.DataFrame, data_prepared: pl.DataFrame) -> None:
+    preprocessor = Preprocessor().fit(data_raw)
+    assert_frame_equal(preprocessor.transform(data_raw), data_prepared)
+    assert objects_are_equal(preprocessor.metadata, prepare_data(data_raw)[1])
+
+
+def test_preprocessor_transform_split(data_raw: pl.DataFrame) -> None:
+    assert_frame_equal(
+        Preprocessor().fit(data_raw).transform(data_raw, split="test"),
+        prepare_data(data_raw, split="test")[0],
+    )
+
+
+def test_preprocessor_transform_new_frame(
+    data_raw: pl.DataFrame, data_prepared: pl.DataFrame
+) -> None:
+    # The vocabulary is not generated again, so the indices match the fitted data
+    preprocessor = Preprocessor().fit(data_raw)
+    assert_frame_equal(
+        preprocessor.transform(data_raw, split="validation"),
+        data_prepared.filter(pl.col(Column.SPLIT) == "validation"),
+    )
+
+
+def test_preprocessor_save_load(tmp_path: Path, data_raw: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("preprocessor.json")
+    preprocessor = Preprocessor().fit(data_raw)
+    preprocessor.save(path)
+    assert objects_are_equal(Preprocessor.load(path).metadata, preprocessor.metadata)
+
+
+##############################################
+#     Tests for prepare_data_incremental     #
+##############################################
+
+
+@pytest.fixture
+def dataset_dir(data_dir: Path, tmp_path: Path) -> Path:
+    return Path(shutil.copytree(data_dir, tmp_path.joinpath("dataset")))
+
+
+def test_prepare_data_incremental(dataset_dir: Path, tmp_path: Path) -> None:
+    assert objects_are_equal(
+        prepare_data_incremental(dataset_dir, cache_path=tmp_path.joinpath("cache")),
+        prepare_data(load_data(dataset_dir)),
+    )
+
+
+def test_prepare_data_incremental_split(dataset_dir: Path, tmp_path: Path) -> None:
+    save_text(
+        "video_test_0000004 0.50 2.10\n",
+        dataset_dir.joinpath("annotations").joinpath("shoot.txt"),
+        exist_ok=True,
+    )
+    assert objects_are_equal(
+        prepare_data_incremental(dataset_dir, cache_path=tmp_path.joinpath("cache"), split="test"),
+        prepare_data(load_data(dataset_dir), split="test"),
+    )
+
+
+def test_prepare_data_incremental_unchanged(dataset_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    expected = prepare_data_incremental(dataset_dir, cache_path=cache_path)
+    with patch(
+        "arctix.dataset.multithumos.load_annotation_file", wraps=load_annotation_file
+    ) as load_mock:
+        assert objects_are_equal(prepare_data_incremental(dataset_dir, cache_path), expected)
+        load_mock.assert_not_called()
+
+
+def test_prepare_data_incremental_changed_file(dataset_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    prepare_data_incremental(dataset_dir, cache_path=cache_path)
+    save_text(
+        "video_validation_0000682 17.00 18.00\nvideo_validation_0000902 2.00 3.00\n",
+        dataset_dir.joinpath("annotations").joinpath("guard.txt"),
+        exist_ok=True,
+    )
+    expected = prepare_data(load_data(dataset_dir))
+    with patch(
+        "arctix.dataset.multithumos.load_annotation_file", wraps=load_annotation_file
+    ) as load_mock:
+        assert objects_are_equal(prepare_data_incremental(dataset_dir, cache_path), expected)
+        assert load_mock.call_count == 1
+
+
+def test_prepare_data_incremental_vocab_order_changed(dataset_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    prepare_data_incremental(dataset_dir, cache_path=cache_path)
+    save_text(
+        "\n".join(f"video_validation_0000100 {i}.00 {i}.50" for i in range(10)),
+        dataset_dir.joinpath("annotations").joinpath("guard.txt"),
+        exist_ok=True,
+    )
+    data, metadata = prepare_data_incremental(dataset_dir, cache_path)
+    assert objects_are_equal((data, metadata), prepare_data(load_data(dataset_dir)))
+    assert metadata[MetadataKeys.VOCAB_ACTION].get_index_to_token() == ("guard", "dribble")
+
+
+def test_prepare_data_incremental_removed_file(dataset_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    prepare_data_incremental(dataset_dir, cache_path=cache_path)
+    dataset_dir.joinpath("annotations").joinpath("dribble.txt").unlink()
+    assert objects_are_equal(
+        prepare_data_incremental(dataset_dir, cache_path),
+        prepare_data(load_data(dataset_dir)),
+    )
+
+
 #######################################
 #     Tests for group_by_sequence     #
 #######################################
@@ -889,6 +1088,38 @@ def test_to_array_empty() -> None:
     )
 
 
+#####################################
+#     Tests for to_array_chunks     #
+#####################################
+
+
+def test_to_array_chunks(data_prepared: pl.DataFrame) -> None:
+    chunks = list(to_array_chunks(data_prepared, max_rows=4))
+    assert objects_are_equal(
+        chunks,
+        [
+            to_array(
+                data_prepared.filter(
+                    pl.col(Column.VIDEO).is_in(
+                        ["video_validation_0000266", "video_validation_0000681"]
+                    )
+                )
+            ),
+            to_array(data_prepared.filter(pl.col(Column.VIDEO) == "video_validation_0000682")),
+            to_array(data_prepared.filter(pl.col(Column.VIDEO) == "video_validation_0000902")),
+        ],
+    )
+    assert chunks[0][Column.ACTION_ID].shape == (2, 1)
+
+
+def test_to_array_chunks_no_budget(data_prepared: pl.DataFrame) -> None:
+    assert objects_are_equal(list(to_array_chunks(data_prepared)), [to_array(data_prepared)])
+
+
+def test_to_array_chunks_empty(data_prepared: pl.DataFrame) -> None:
+    assert list(to_array_chunks(data_prepared.clear())) == []
+
+
 #############################
 #     Tests for to_list     #
 #############################
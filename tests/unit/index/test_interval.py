@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import numpy as np
+import polars as pl
+import pytest
+from coola import objects_are_equal
+
+from arctix.index import IntervalIndex, SequenceIndex
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "video": ["v1", "v2", "v1", "v1", "v2", "v1"],
+            "start_time": [5.0, 1.0, 0.0, 2.0, 3.0, 1.0],
+            "end_time": [9.0, 2.0, 8.0, 4.0, 6.0, 1.5],
+        }
+    )
+
+
+@pytest.fixture
+def index(frame: pl.DataFrame) -> IntervalIndex:
+    return IntervalIndex.from_frame(
+        frame, group_cols=["video"], start_col="start_time", end_col="end_time"
+    )
+
+
+###################################
+#     Tests for IntervalIndex     #
+###################################
+
+
+def test_interval_index_repr(index: IntervalIndex) -> None:
+    assert repr(index) == "IntervalIndex(num_sequences=2, num_intervals=6)"
+
+
+def test_interval_index_len(index: IntervalIndex) -> None:
+    assert len(index) == 6
+
+
+def test_interval_index_sequence_index(index: IntervalIndex) -> None:
+    assert isinstance(index.sequence_index, SequenceIndex)
+    assert index.sequence_index.keys() == ["v1", "v2"]
+
+
+def test_interval_index_query_overlap(index: IntervalIndex) -> None:
+    assert objects_are_equal(index.query_overlap("v1", 4.5, 6.0), np.array([2, 0]))
+
+
+def test_interval_index_query_overlap_nested(index: IntervalIndex) -> None:
+    # the long interval [0, 8] overlaps the query even if [1, 1.5] ends before it
+    assert objects_are_equal(index.query_overlap("v1", 3.5, 3.8), np.array([2, 3]))
+
+
+def test_interval_index_query_overlap_closed_bounds(index: IntervalIndex) -> None:
+    assert objects_are_equal(index.query_overlap("v2", 2.0, 3.0), np.array([1, 4]))
+
+
+def test_interval_index_query_overlap_empty(index: IntervalIndex) -> None:
+    assert objects_are_equal(index.query_overlap("v2", 10.0, 12.0), np.array([], dtype=np.int64))
+
+
+def test_interval_index_query_overlap_missing_key(index: IntervalIndex) -> None:
+    with pytest.raises(KeyError):
+        index.query_overlap("v3", 0.0, 1.0)
+
+
+def test_interval_index_query_overlap_batch(index: IntervalIndex) -> None:
+    assert objects_are_equal(
+        index.query_overlap_batch(["v1", "v2", "v1"], [0.0, 0.0, 10.0], [1.0, 1.0, 11.0]),
+        [np.array([2, 5]), np.array([1]), np.array([], dtype=np.int64)],
+    )
+
+
+def test_interval_index_query_overlap_batch_empty(index: IntervalIndex) -> None:
+    assert index.query_overlap_batch([], [], []) == []
+
+
+def test_interval_index_query_overlap_batch_incorrect_length(index: IntervalIndex) -> None:
+    with pytest.raises(RuntimeError, match="keys, starts, and ends must have the same length"):
+        index.query_overlap_batch(["v1"], [0.0, 1.0], [1.0, 2.0])
+
+
+def test_interval_index_query_point(index: IntervalIndex) -> None:
+    assert objects_are_equal(index.query_point("v1", 3.0), np.array([2, 3]))
+
+
+def test_interval_index_query_point_batch(index: IntervalIndex) -> None:
+    assert objects_are_equal(
+        index.query_point_batch(["v1", "v2", "v2"], [1.2, 1.5, 7.0]),
+        [np.array([2, 5]), np.array([1]), np.array([], dtype=np.int64)],
+    )
+
+
+def test_interval_index_query_overlap_batch_brute_force() -> None:
+    rng = np.random.default_rng(42)
+    starts = rng.uniform(0, 100, size=200)
+    frame = pl.DataFrame(
+        {
+            "video": rng.integers(0, 5, size=200),
+            "start": starts,
+            "end": starts + rng.exponential(10, size=200),
+        }
+    )
+    index = IntervalIndex.from_frame(frame, group_cols=["video"], start_col="start", end_col="end")
+    keys = rng.integers(0, 5, size=50).tolist()
+    query_starts = rng.uniform(0, 100, size=50)
+    query_ends = query_starts + rng.uniform(0, 10, size=50)
+    results = index.query_overlap_batch(keys, query_starts, query_ends)
+    for key, t0, t1, rows in zip(keys, query_starts, query_ends, results):
+        expected = (
+            frame.with_row_index()
+            .filter((pl.col("video") == key) & (pl.col("start") <= t1) & (pl.col("end") >= t0))
+            .get_column("index")
+            .to_numpy()
+        )
+        assert set(rows.tolist()) == set(expected.tolist())
+
+
+def test_interval_index_from_frame_multiple_group_cols() -> None:
+    frame = pl.DataFrame(
+        {
+            "person": ["P1", "P1", "P2"],
+            "activity": ["tea", "tea", "tea"],
+            "start": [0, 10, 0],
+            "end": [10, 20, 5],
+        }
+    )
+    index = IntervalIndex.from_frame(
+        frame, group_cols=["person", "activity"], start_col="start", end_col="end"
+    )
+    assert objects_are_equal(index.query_point(("P1", "tea"), 10), np.array([0, 1]))
+
+
+def test_interval_index_from_frame_null_times() -> None:
+    frame = pl.DataFrame(
+        {"video": ["v1", "v1", "v1"], "start": [0.0, None, 2.0], "end": [3.0, 4.0, 5.0]}
+    )
+    index = IntervalIndex.from_frame(frame, group_cols=["video"], start_col="start", end_col="end")
+    assert len(index) == 2
+    assert objects_are_equal(index.query_point("v1", 2.5), np.array([0, 2]))
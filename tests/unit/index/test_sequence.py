@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from arctix.index import SequenceIndex
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "person": ["P1", "P1", "P1", "P2", "P2", "P3"],
+            "activity": ["tea", "tea", "coffee", "tea", "tea", "tea"],
+            "action": [1, 2, 3, 4, 5, 6],
+        }
+    )
+
+
+###################################
+#     Tests for SequenceIndex     #
+###################################
+
+
+def test_sequence_index_repr(frame: pl.DataFrame) -> None:
+    assert (
+        repr(SequenceIndex.from_frame(frame, group_cols=["person"]))
+        == "SequenceIndex(num_sequences=3, group_cols=('person',))"
+    )
+
+
+def test_sequence_index_init_duplicate_keys() -> None:
+    with pytest.raises(RuntimeError, match="The sequence keys are not unique"):
+        SequenceIndex(
+            pl.DataFrame({"person": ["P1", "P1"], "offset": [0, 1], "length": [1, 1]}),
+            group_cols=["person"],
+        )
+
+
+def test_sequence_index_len(frame: pl.DataFrame) -> None:
+    assert len(SequenceIndex.from_frame(frame, group_cols=["person", "activity"])) == 4
+
+
+def test_sequence_index_contains(frame: pl.DataFrame) -> None:
+    index = SequenceIndex.from_frame(frame, group_cols=["person"])
+    assert "P2" in index
+    assert "P4" not in index
+
+
+def test_sequence_index_contains_multiple_cols(frame: pl.DataFrame) -> None:
+    index = SequenceIndex.from_frame(frame, group_cols=["person", "activity"])
+    assert ("P1", "coffee") in index
+    assert ("P2", "coffee") not in index
+
+
+def test_sequence_index_group_cols(frame: pl.DataFrame) -> None:
+    assert SequenceIndex.from_frame(frame, group_cols=["person", "activity"]).group_cols == (
+        "person",
+        "activity",
+    )
+
+
+def test_sequence_index_equal_true(frame: pl.DataFrame) -> None:
+    assert SequenceIndex.from_frame(frame, group_cols=["person"]).equal(
+        SequenceIndex.from_frame(frame, group_cols=["person"])
+    )
+
+
+def test_sequence_index_equal_false_different_group_cols(frame: pl.DataFrame) -> None:
+    assert not SequenceIndex.from_frame(frame, group_cols=["person"]).equal(
+        SequenceIndex.from_frame(frame, group_cols=["person", "activity"])
+    )
+
+
+def test_sequence_index_equal_false_different_type(frame: pl.DataFrame) -> None:
+    assert not SequenceIndex.from_frame(frame, group_cols=["person"]).equal(42)
+
+
+def test_sequence_index_get_location(frame: pl.DataFrame) -> None:
+    index = SequenceIndex.from_frame(frame, group_cols=["person"])
+    assert index.get_location("P1") == (0, 3)
+    assert index.get_location("P2") == (3, 2)
+    assert index.get_location("P3") == (5, 1)
+
+
+def test_sequence_index_get_location_multiple_cols(frame: pl.DataFrame) -> None:
+    index = SequenceIndex.from_frame(frame, group_cols=["person", "activity"])
+    assert index.get_location(("P1", "tea")) == (0, 2)
+    assert index.get_location(("P1", "coffee")) == (2, 1)
+
+
+def test_sequence_index_get_location_missing_key(frame: pl.DataFrame) -> None:
+    index = SequenceIndex.from_frame(frame, group_cols=["person"])
+    with pytest.raises(KeyError):
+        index.get_location("P4")
+
+
+def test_sequence_index_get_sequence(frame: pl.DataFrame) -> None:
+    assert_frame_equal(
+        SequenceIndex.from_frame(frame, group_cols=["person"]).get_sequence(frame, "P2"),
+        pl.DataFrame({"person": ["P2", "P2"], "activity": ["tea", "tea"], "action": [4, 5]}),
+    )
+
+
+def test_sequence_index_keys(frame: pl.DataFrame) -> None:
+    assert SequenceIndex.from_frame(frame, group_cols=["person", "activity"]).keys() == [
+        ("P1", "tea"),
+        ("P1", "coffee"),
+        ("P2", "tea"),
+        ("P3", "tea"),
+    ]
+
+
+def test_sequence_index_to_frame(frame: pl.DataFrame) -> None:
+    assert_frame_equal(
+        SequenceIndex.from_frame(frame, group_cols=["person"]).to_frame(),
+        pl.DataFrame({"person": ["P1", "P2", "P3"], "offset": [0, 3, 5], "length": [3, 2, 1]}),
+    )
+
+
+def test_sequence_index_save_load(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("index.parquet")
+    index = SequenceIndex.from_frame(frame, group_cols=["person", "activity"])
+    index.save(path)
+    assert path.is_file()
+    loaded = SequenceIndex.load(path, group_cols=["person", "activity"])
+    assert loaded.equal(index)
+    assert loaded.get_location(("P2", "tea")) == (3, 2)
+
+
+def test_sequence_index_from_frame_empty() -> None:
+    index = SequenceIndex.from_frame(
+        pl.DataFrame(
+            {"person": [], "action": []}, schema={"person": pl.String, "action": pl.Int64}
+        ),
+        group_cols=["person"],
+    )
+    assert len(index) == 0
+
+
+def test_sequence_index_from_frame_not_contiguous() -> None:
+    frame = pl.DataFrame({"person": ["P1", "P2", "P1"], "action": [1, 2, 3]})
+    with pytest.raises(RuntimeError, match="The rows of each sequence must be contiguous"):
+        SequenceIndex.from_frame(frame, group_cols=["person"])
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+from coola import objects_are_equal
+
+from arctix.io import load_array_store, save_array_store
+from arctix.io.array import MANIFEST_FILENAME
+from arctix.utils.vocab import Vocabulary
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def arrays() -> dict[str, np.ndarray]:
+    mask = np.array([[False, False, False], [False, False, True]])
+    return {
+        "action": np.ma.masked_array(
+            data=np.array([["a", "b", "c"], ["c", "a", "N/A"]]), mask=mask
+        ),
+        "action_id": np.ma.masked_array(data=np.array([[0, 2, 1], [1, 0, -1]]), mask=mask),
+        "start_time": np.ma.masked_array(
+            data=np.array([[1.0, 2.0, 5.0], [0.5, 3.0, -1.0]]), mask=mask
+        ),
+        "sequence_length": np.array([3, 2]),
+    }
+
+
+######################################
+#     Tests for save_array_store     #
+######################################
+
+
+def test_save_array_store(tmp_path: Path, arrays: dict[str, np.ndarray]) -> None:
+    path = tmp_path.joinpath("store")
+    save_array_store(arrays, path)
+    assert sorted(p.name for p in path.iterdir()) == [
+        "action.mask.npy",
+        "action.npy",
+        "action_id.mask.npy",
+        "action_id.npy",
+        MANIFEST_FILENAME,
+        "sequence_length.npy",
+        "start_time.mask.npy",
+        "start_time.npy",
+    ]
+    assert [p.name for p in tmp_path.iterdir()] == ["store"]
+
+
+def test_save_array_store_exist_ok_false(tmp_path: Path, arrays: dict[str, np.ndarray]) -> None:
+    path = tmp_path.joinpath("store")
+    save_array_store(arrays, path)
+    with pytest.raises(FileExistsError, match="already exists"):
+        save_array_store(arrays, path)
+
+
+def test_save_array_store_exist_ok_true(tmp_path: Path, arrays: dict[str, np.ndarray]) -> None:
+    path = tmp_path.joinpath("store")
+    save_array_store(arrays, path)
+    save_array_store({"sequence_length": np.array([1, 2, 3])}, path, exist_ok=True)
+    out, _ = load_array_store(path, mmap_mode=None)
+    assert objects_are_equal(out, {"sequence_length": np.array([1, 2, 3])})
+
+
+def test_save_array_store_object_dtype(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("store")
+    with pytest.raises(TypeError, match="object data type"):
+        save_array_store({"action": np.array(["a", "b"], dtype=object)}, path)
+    assert list(tmp_path.iterdir()) == []
+
+
+######################################
+#     Tests for load_array_store     #
+######################################
+
+
+def test_load_array_store(tmp_path: Path, arrays: dict[str, np.ndarray]) -> None:
+    path = tmp_path.joinpath("store")
+    save_array_store(arrays, path)
+    out, metadata = load_array_store(path)
+    assert out.keys() == arrays.keys()
+    for key, array in arrays.items():
+        assert np.array_equal(np.ma.getdata(out[key]), np.ma.getdata(array))
+        assert np.array_equal(np.ma.getmaskarray(out[key]), np.ma.getmaskarray(array))
+    assert metadata == {}
+    assert isinstance(out["sequence_length"], np.memmap)
+    assert isinstance(np.ma.getdata(out["action_id"]), np.memmap)
+
+
+def test_load_array_store_mmap_mode_none(tmp_path: Path, arrays: dict[str, np.ndarray]) -> None:
+    path = tmp_path.joinpath("store")
+    save_array_store(arrays, path)
+    out, _ = load_array_store(path, mmap_mode=None)
+    assert objects_are_equal(out, arrays)
+    assert not isinstance(out["sequence_length"], np.memmap)
+
+
+def test_load_array_store_read_only(tmp_path: Path, arrays: dict[str, np.ndarray]) -> None:
+    path = tmp_path.joinpath("store")
+    save_array_store(arrays, path)
+    out, _ = load_array_store(path)
+    with pytest.raises(ValueError, match="read-only"):
+        out["sequence_length"][0] = 5
+
+
+def test_load_array_store_metadata(tmp_path: Path, arrays: dict[str, np.ndarray]) -> None:
+    path = tmp_path.joinpath("store")
+    metadata = {"vocab_action": Vocabulary(Counter({"a": 2, "c": 2, "b": 1})), "fps": 15}
+    save_array_store(arrays, path, metadata=metadata)
+    _, out = load_array_store(path)
+    assert objects_are_equal(out, metadata)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from coola import objects_are_equal
+
+from arctix.io.metadata import decode_metadata, encode_metadata
+from arctix.utils.vocab import Vocabulary
+
+#####################################
+#     Tests for encode_metadata     #
+#####################################
+
+
+def test_encode_metadata() -> None:
+    assert objects_are_equal(
+        encode_metadata({"vocab": Vocabulary(Counter({"b": 3, "a": 1, "c": 2})), "num": 2}),
+        {
+            "vocab": {"_type": "Vocabulary", "tokens": ["b", "a", "c"], "counts": [3, 1, 2]},
+            "num": 2,
+        },
+    )
+
+
+def test_encode_metadata_empty() -> None:
+    assert encode_metadata({}) == {}
+
+
+#####################################
+#     Tests for decode_metadata     #
+#####################################
+
+
+def test_decode_metadata() -> None:
+    assert objects_are_equal(
+        decode_metadata(
+            {
+                "vocab": {"_type": "Vocabulary", "tokens": ["b", "a", "c"], "counts": [3, 1, 2]},
+                "num": 2,
+            }
+        ),
+        {"vocab": Vocabulary(Counter({"b": 3, "a": 1, "c": 2})), "num": 2},
+    )
+
+
+def test_decode_metadata_empty() -> None:
+    assert decode_metadata({}) == {}
+
+
+def test_encode_decode_metadata_int_tokens() -> None:
+    metadata = {"vocab": Vocabulary(Counter({5: 1, 2: 4}))}
+    assert objects_are_equal(decode_metadata(encode_metadata(metadata)), metadata)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+from coola import objects_are_equal
+from polars.testing import assert_frame_equal
+
+from arctix.io import read_parquet, to_arrow, write_parquet
+from arctix.io.parquet import METADATA_KEY, encode_token_columns
+from arctix.testing import pyarrow_available
+from arctix.utils.vocab import Vocabulary
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def decode_token_columns(frame: pl.DataFrame) -> pl.DataFrame:
+    return frame.with_columns(
+        pl.col("action").cast(pl.List(pl.String)), pl.col("cooking_activity").cast(pl.String)
+    )
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "action": [["SIL", "take_bowl", "SIL"], ["SIL", "pour_milk"]],
+            "action_id": [[0, 2, 0], [0, 1]],
+            "cooking_activity": ["cereals", "milk"],
+            "sequence_length": [3, 2],
+            "start_time": [[1.0, 31.0, 151.0], [1.0, 48.0]],
+        }
+    )
+
+
+@pytest.fixture
+def metadata() -> dict:
+    return {
+        "vocab_action": Vocabulary(Counter({"SIL": 3, "pour_milk": 1, "take_bowl": 1})),
+        "num_sequences": 2,
+    }
+
+
+##########################################
+#     Tests for encode_token_columns     #
+##########################################
+
+
+def test_encode_token_columns(frame: pl.DataFrame) -> None:
+    schema = encode_token_columns(frame).schema
+    assert schema["action"] == pl.List(pl.Categorical)
+    assert schema["action_id"] == pl.List(pl.Int64)
+    assert schema["cooking_activity"] == pl.Categorical
+    assert schema["sequence_length"] == pl.Int64
+    assert schema["start_time"] == pl.List(pl.Float64)
+
+
+def test_encode_token_columns_token_columns(frame: pl.DataFrame) -> None:
+    out = encode_token_columns(frame, token_columns=["action"])
+    assert out.schema["action"] == pl.List(pl.Categorical)
+    assert out.schema["cooking_activity"] == pl.String
+
+
+def test_encode_token_columns_values(frame: pl.DataFrame) -> None:
+    assert_frame_equal(decode_token_columns(encode_token_columns(frame)), frame)
+
+
+##############################
+#     Tests for to_arrow     #
+##############################
+
+
+@pyarrow_available
+def test_to_arrow(frame: pl.DataFrame, metadata: dict) -> None:
+    import pyarrow as pa
+
+    table = to_arrow(frame, metadata=metadata)
+    assert table.num_rows == 2
+    assert pa.types.is_list(table.schema.field("action_id").type)
+    assert pa.types.is_dictionary(table.schema.field("cooking_activity").type)
+    assert pa.types.is_dictionary(table.schema.field("action").type.value_type)
+    assert json.loads(table.schema.metadata[METADATA_KEY.encode()]) == {
+        "vocab_action": {
+            "_type": "Vocabulary",
+            "tokens": ["SIL", "pour_milk", "take_bowl"],
+            "counts": [3, 1, 1],
+        },
+        "num_sequences": 2,
+    }
+
+
+def test_to_arrow_without_pyarrow(frame: pl.DataFrame) -> None:
+    with (
+        patch("arctix.utils.imports.is_pyarrow_available", lambda: False),
+        pytest.raises(RuntimeError, match=r"`pyarrow` package is required but not installed."),
+    ):
+        to_arrow(frame)
+
+
+###################################
+#     Tests for write_parquet     #
+###################################
+
+
+def test_write_parquet(tmp_path: Path, frame: pl.DataFrame, metadata: dict) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    write_parquet(frame, path, metadata=metadata)
+    assert [p.name for p in tmp_path.iterdir()] == ["data.parquet"]
+    assert pl.read_parquet_schema(path)["action"] == pl.List(pl.Categorical)
+    assert json.loads(pl.read_parquet_metadata(path)[METADATA_KEY])["num_sequences"] == 2
+
+
+def test_write_parquet_row_group_size(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    write_parquet(frame, path, row_group_size=1)
+    assert_frame_equal(decode_token_columns(read_parquet(path)[0]), frame)
+
+
+def test_write_parquet_overwrite(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    write_parquet(frame, path)
+    write_parquet(frame.head(1), path)
+    assert read_parquet(path)[0].shape == (1, 5)
+
+
+def test_write_parquet_create_parent(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("sub", "data.parquet")
+    write_parquet(frame, path)
+    assert path.is_file()
+
+
+def test_write_parquet_failure(tmp_path: Path, frame: pl.DataFrame) -> None:
+    with (
+        patch.object(pl.DataFrame, "write_parquet", side_effect=RuntimeError("error")),
+        pytest.raises(RuntimeError, match=r"error"),
+    ):
+        write_parquet(frame, tmp_path.joinpath("data.parquet"))
+    assert list(tmp_path.iterdir()) == []
+
+
+##################################
+#     Tests for read_parquet     #
+##################################
+
+
+def test_read_parquet(tmp_path: Path, frame: pl.DataFrame, metadata: dict) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    write_parquet(frame, path, metadata=metadata)
+    out, meta = read_parquet(path)
+    assert_frame_equal(out, encode_token_columns(frame))
+    assert objects_are_equal(meta, metadata)
+
+
+def test_read_parquet_columns(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    write_parquet(frame, path)
+    out, meta = read_parquet(path, columns=["action_id", "sequence_length"])
+    assert_frame_equal(out, frame.select(["action_id", "sequence_length"]))
+    assert meta == {}
+
+
+def test_read_parquet_without_metadata(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    frame.write_parquet(path)
+    out, meta = read_parquet(path)
+    assert_frame_equal(out, frame)
+    assert meta == {}
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import numpy as np
+import polars as pl
+import pytest
+from coola import objects_are_equal
+from polars.testing import assert_frame_equal
+
+from arctix.io import load_shard, load_shard_index, write_shards
+from arctix.io.shard import INDEX_FILENAME
+from arctix.utils.vocab import Vocabulary
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "action": [
+                ["SIL", "take_bowl", "pour_milk", "SIL"],
+                ["SIL"],
+                ["SIL", "pour_milk"],
+                ["SIL"],
+            ],
+            "action_id": [[0, 2, 1, 0], [0], [0, 1], [0]],
+            "person": ["P03", "P12", "P54", "P54"],
+            "sequence_length": [4, 1, 2, 1],
+        }
+    )
+
+
+@pytest.fixture
+def metadata() -> dict:
+    return {"vocab_action": Vocabulary(Counter({"SIL": 5, "pour_milk": 2, "take_bowl": 1}))}
+
+
+##################################
+#     Tests for write_shards     #
+##################################
+
+
+def test_write_shards(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("shards")
+    index = write_shards(frame, path, num_shards=2, key_cols=["person"], max_workers=1)
+    assert index == {
+        "format": "parquet",
+        "num_shards": 2,
+        "key_cols": ["person"],
+        "shards": [
+            {
+                "name": "shard-00000.parquet",
+                "num_sequences": 1,
+                "num_events": 4,
+                "keys": [["P03"]],
+            },
+            {
+                "name": "shard-00001.parquet",
+                "num_sequences": 3,
+                "num_events": 4,
+                "keys": [["P12"], ["P54"], ["P54"]],
+            },
+        ],
+    }
+    assert sorted(p.name for p in path.iterdir()) == [
+        INDEX_FILENAME,
+        "shard-00000.parquet",
+        "shard-00001.parquet",
+    ]
+    assert [p.name for p in tmp_path.iterdir()] == ["shards"]
+
+
+def test_write_shards_keys_row_index(tmp_path: Path, frame: pl.DataFrame) -> None:
+    index = write_shards(frame, tmp_path.joinpath("shards"), num_shards=3, max_workers=1)
+    assert [shard["keys"] for shard in index["shards"]] == [[0], [1], [2, 3]]
+    assert index["key_cols"] is None
+
+
+def test_write_shards_npy(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("shards")
+    index = write_shards(frame, path, num_shards=2, shard_format="npy", max_workers=1)
+    assert [shard["name"] for shard in index["shards"]] == ["shard-00000", "shard-00001"]
+    assert path.joinpath("shard-00001", "action_id.npy").is_file()
+
+
+def test_write_shards_multiprocessing(tmp_path: Path, frame: pl.DataFrame, metadata: dict) -> None:
+    path = tmp_path.joinpath("shards")
+    write_shards(frame, path, num_shards=2, metadata=metadata, max_workers=2)
+    shard, meta = load_shard(path, rank=1)
+    assert_frame_equal(shard.cast({"action": pl.List(pl.String), "person": pl.String}), frame[1:])
+    assert objects_are_equal(meta, metadata)
+
+
+def test_write_shards_exist_ok_false(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("shards")
+    write_shards(frame, path, num_shards=2, max_workers=1)
+    with pytest.raises(FileExistsError, match=r"already exists"):
+        write_shards(frame, path, num_shards=2, max_workers=1)
+
+
+def test_write_shards_exist_ok_true(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("shards")
+    write_shards(frame, path, num_shards=2, max_workers=1)
+    write_shards(frame, path, num_shards=1, max_workers=1, exist_ok=True)
+    assert sorted(p.name for p in path.iterdir()) == [INDEX_FILENAME, "shard-00000.parquet"]
+
+
+def test_write_shards_incorrect_format(tmp_path: Path, frame: pl.DataFrame) -> None:
+    with pytest.raises(RuntimeError, match=r"Incorrect shard format"):
+        write_shards(frame, tmp_path, num_shards=2, shard_format="csv")
+
+
+def test_write_shards_failure(tmp_path: Path, frame: pl.DataFrame) -> None:
+    with (
+        patch("arctix.io.shard.write_parquet", side_effect=RuntimeError("error")),
+        pytest.raises(RuntimeError, match=r"error"),
+    ):
+        write_shards(frame, tmp_path.joinpath("shards"), num_shards=2, max_workers=1)
+    assert list(tmp_path.iterdir()) == []
+
+
+######################################
+#     Tests for load_shard_index     #
+######################################
+
+
+def test_load_shard_index(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("shards")
+    index = write_shards(frame, path, num_shards=2, max_workers=1)
+    assert load_shard_index(path) == index
+
+
+################################
+#     Tests for load_shard     #
+################################
+
+
+def test_load_shard_parquet(tmp_path: Path, frame: pl.DataFrame, metadata: dict) -> None:
+    path = tmp_path.joinpath("shards")
+    write_shards(frame, path, num_shards=2, metadata=metadata, max_workers=1)
+    shard, meta = load_shard(path, rank=0)
+    assert_frame_equal(shard.cast({"action": pl.List(pl.String), "person": pl.String}), frame[:1])
+    assert objects_are_equal(meta, metadata)
+
+
+def test_load_shard_npy(tmp_path: Path, frame: pl.DataFrame, metadata: dict) -> None:
+    path = tmp_path.joinpath("shards")
+    write_shards(frame, path, num_shards=2, metadata=metadata, shard_format="npy", max_workers=1)
+    arrays, meta = load_shard(path, rank=1, mmap_mode=None)
+    mask = np.array([[False, True], [False, False], [False, True]])
+    assert objects_are_equal(
+        arrays,
+        {
+            "action": np.ma.masked_array(
+                data=np.array([["SIL", "N/A"], ["SIL", "pour_milk"], ["SIL", "N/A"]]), mask=mask
+            ),
+            "action_id": np.ma.masked_array(data=np.array([[0, -1], [0, 1], [0, -1]]), mask=mask),
+            "person": np.array(["P12", "P54", "P54"]),
+            "sequence_length": np.array([1, 2, 1]),
+        },
+    )
+    assert objects_are_equal(meta, metadata)
+
+
+def test_load_shard_npy_from_parquet_shard(tmp_path: Path, frame: pl.DataFrame) -> None:
+    write_shards(frame, tmp_path.joinpath("parquet"), num_shards=1, max_workers=1)
+    shard, _ = load_shard(tmp_path.joinpath("parquet"), rank=0)
+    path = tmp_path.joinpath("shards")
+    write_shards(shard, path, num_shards=1, shard_format="npy", max_workers=1)
+    arrays, _ = load_shard(path, rank=0, mmap_mode=None)
+    assert objects_are_equal(arrays["person"], np.array(["P03", "P12", "P54", "P54"]))
+    assert arrays["action"].data.dtype.kind == "U"
+
+
+@pytest.mark.parametrize("rank", [-1, 2])
+def test_load_shard_incorrect_rank(tmp_path: Path, frame: pl.DataFrame, rank: int) -> None:
+    path = tmp_path.joinpath("shards")
+    write_shards(frame, path, num_shards=2, max_workers=1)
+    with pytest.raises(RuntimeError, match=r"Incorrect rank"):
+        load_shard(path, rank=rank)
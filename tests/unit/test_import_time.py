@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+# The optional dependencies that are slow to import and must only be
+# imported when they are used.
+LAZY_MODULES = ("gdown", "matplotlib", "requests", "tqdm")
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "arctix.dataset.breakfast",
+        "arctix.dataset.epic_kitchen_100",
+        "arctix.dataset.multithumos",
+        "arctix.transformer.dataframe",
+        "arctix.utils.download",
+        "arctix.utils.ngram",
+    ],
+)
+def test_import_does_not_load_optional_dependencies(module: str) -> None:
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(sorted(m for m in {LAZY_MODULES!r} if m in sys.modules)))"
+    )
+    out = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout
+    assert out.strip() == ""
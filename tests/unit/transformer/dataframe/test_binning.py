@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from arctix.transformer.dataframe import TimeBin
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "video": ["v1", "v2", "v1", "v1", "v1"],
+            "start_time": [1.2, 2.5, 0.5, 4.1, 4.5],
+            "action_id": [1, 0, 3, 2, 5],
+        }
+    )
+
+
+#################################################
+#     Tests for TimeBinDataFrameTransformer     #
+#################################################
+
+
+def test_time_bin_dataframe_transformer_str() -> None:
+    assert str(TimeBin(group_cols=["video"], time_col="time", bin_size=1.0)).startswith(
+        "TimeBinDataFrameTransformer("
+    )
+
+
+def test_time_bin_dataframe_transformer_incorrect_bin_size() -> None:
+    with pytest.raises(RuntimeError, match="bin_size must be greater than 0"):
+        TimeBin(group_cols=["video"], time_col="time", bin_size=0)
+
+
+def test_time_bin_dataframe_transformer_incorrect_agg() -> None:
+    with pytest.raises(RuntimeError, match="Incorrect agg: median"):
+        TimeBin(group_cols=["video"], time_col="time", bin_size=1.0, agg="median")
+
+
+def test_time_bin_dataframe_transformer_transform(frame: pl.DataFrame) -> None:
+    transformer = TimeBin(
+        group_cols=["video"], time_col="start_time", bin_size=2.0, columns=["action_id"]
+    )
+    assert_frame_equal(
+        transformer.transform(frame),
+        pl.DataFrame(
+            {
+                "video": ["v1", "v1", "v1", "v2", "v2"],
+                "bin": [0, 1, 2, 0, 1],
+                "bin_time": [0.0, 2.0, 4.0, 0.0, 2.0],
+                "count": [2, 0, 2, 0, 1],
+                "action_id": [1, None, 5, None, 0],
+            }
+        ),
+    )
+
+
+def test_time_bin_dataframe_transformer_transform_agg_sum(frame: pl.DataFrame) -> None:
+    transformer = TimeBin(
+        group_cols=["video"],
+        time_col="start_time",
+        bin_size=2.0,
+        columns=["action_id"],
+        agg="sum",
+        fill_empty=False,
+    )
+    assert_frame_equal(
+        transformer.transform(frame),
+        pl.DataFrame(
+            {
+                "video": ["v1", "v1", "v2"],
+                "bin": [0, 2, 1],
+                "bin_time": [0.0, 4.0, 2.0],
+                "count": [2, 2, 1],
+                "action_id": [4, 7, 0],
+            }
+        ),
+    )
+
+
+def test_time_bin_dataframe_transformer_transform_only_count(frame: pl.DataFrame) -> None:
+    transformer = TimeBin(
+        group_cols=["video"],
+        time_col="start_time",
+        bin_size=1.0,
+        bin_col="second",
+        bin_time_col="second_time",
+        count_col="num_actions",
+    )
+    assert_frame_equal(
+        transformer.transform(frame),
+        pl.DataFrame(
+            {
+                "video": ["v1", "v1", "v1", "v1", "v1", "v2", "v2", "v2"],
+                "second": [0, 1, 2, 3, 4, 0, 1, 2],
+                "second_time": [0.0, 1.0, 2.0, 3.0, 4.0, 0.0, 1.0, 2.0],
+                "num_actions": [1, 1, 0, 0, 2, 0, 0, 1],
+            }
+        ),
+    )
+
+
+def test_time_bin_dataframe_transformer_transform_multiple_group_cols() -> None:
+    frame = pl.DataFrame(
+        {
+            "person": ["P1", "P1", "P1"],
+            "activity": ["tea", "coffee", "tea"],
+            "start_time": [0, 5, 12],
+        }
+    )
+    transformer = TimeBin(group_cols=["person", "activity"], time_col="start_time", bin_size=10)
+    assert_frame_equal(
+        transformer.transform(frame),
+        pl.DataFrame(
+            {
+                "person": ["P1", "P1", "P1"],
+                "activity": ["coffee", "tea", "tea"],
+                "bin": [0, 0, 1],
+                "bin_time": [0.0, 0.0, 10.0],
+                "count": [1, 1, 1],
+            }
+        ),
+    )
+
+
+def test_time_bin_dataframe_transformer_transform_null_time() -> None:
+    frame = pl.DataFrame({"video": ["v1", "v1"], "start_time": [None, 0.5]})
+    transformer = TimeBin(group_cols=["video"], time_col="start_time", bin_size=1.0)
+    assert_frame_equal(
+        transformer.transform(frame),
+        pl.DataFrame({"video": ["v1"], "bin": [0], "bin_time": [0.0], "count": [1]}),
+    )
+
+
+def test_time_bin_dataframe_transformer_transform_negative_time() -> None:
+    frame = pl.DataFrame(
+        {"video": ["v1", "v1", "v2"], "start_time": [-2.5, 1.5, 2.5], "action_id": [1, 2, 3]}
+    )
+    transformer = TimeBin(
+        group_cols=["video"], time_col="start_time", bin_size=1.0, columns=["action_id"]
+    )
+    assert_frame_equal(
+        transformer.transform(frame),
+        pl.DataFrame(
+            {
+                "video": ["v1", "v1", "v1", "v1", "v1", "v2", "v2", "v2"],
+                "bin": [-3, -2, -1, 0, 1, 0, 1, 2],
+                "bin_time": [-3.0, -2.0, -1.0, 0.0, 1.0, 0.0, 1.0, 2.0],
+                "count": [1, 0, 0, 0, 1, 0, 0, 1],
+                "action_id": [1, None, None, None, 2, None, None, 3],
+            }
+        ),
+    )
+
+
+def test_time_bin_dataframe_transformer_transform_empty() -> None:
+    frame = pl.DataFrame(
+        {"video": [], "start_time": []}, schema={"video": pl.String, "start_time": pl.Float64}
+    )
+    transformer = TimeBin(group_cols=["video"], time_col="start_time", bin_size=1.0)
+    assert transformer.transform(frame).shape == (0, 4)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from arctix.transformer.dataframe import (
+    BaseDataFrameTransformer,
+    Cache,
+    Cast,
+    Function,
+    Sequential,
+    TokenToIndex,
+)
+from arctix.utils.vocab import Vocabulary
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def add_one(frame: pl.DataFrame) -> pl.DataFrame:
+    return frame.with_columns(pl.col("col1") + 1)
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame({"col1": [1, 2, 3, 4, 5], "col2": ["a", "b", "c", "d", "e"]})
+
+
+def mock_transformer() -> Mock:
+    return Mock(spec=BaseDataFrameTransformer, transform=Mock(side_effect=add_one))
+
+
+###############################################
+#     Tests for CacheDataFrameTransformer     #
+###############################################
+
+
+def test_cache_dataframe_transformer_repr() -> None:
+    assert repr(Cache(Cast(columns=["col1"], dtype=pl.Float32))).startswith(
+        "CacheDataFrameTransformer("
+    )
+
+
+def test_cache_dataframe_transformer_str() -> None:
+    assert str(Cache(Cast(columns=["col1"], dtype=pl.Float32))).startswith(
+        "CacheDataFrameTransformer("
+    )
+
+
+def test_cache_dataframe_transformer_config(frame: pl.DataFrame) -> None:
+    transformer = Cache(
+        {"_target_": "arctix.transformer.dataframe.Cast", "columns": ["col1"], "dtype": pl.Float32}
+    )
+    assert transformer.transform(frame).schema["col1"] == pl.Float32
+
+
+def test_cache_dataframe_transformer_transform(frame: pl.DataFrame) -> None:
+    transformer = Cache(Function(add_one))
+    out = transformer.transform(frame)
+    assert_frame_equal(
+        out, pl.DataFrame({"col1": [2, 3, 4, 5, 6], "col2": ["a", "b", "c", "d", "e"]})
+    )
+    assert_frame_equal(transformer.transform(frame), out)
+    assert transformer.get_stats()["hits"] == 1
+    assert transformer.get_stats()["misses"] == 1
+
+
+def test_cache_dataframe_transformer_transform_hit(frame: pl.DataFrame) -> None:
+    inner = mock_transformer()
+    transformer = Cache(inner)
+    transformer.transform(frame)
+    transformer.transform(frame.clone())
+    inner.transform.assert_called_once()
+
+
+def test_cache_dataframe_transformer_transform_different_frame(frame: pl.DataFrame) -> None:
+    inner = mock_transformer()
+    transformer = Cache(inner)
+    transformer.transform(frame)
+    out = transformer.transform(frame.with_columns(pl.col("col1") * 2))
+    assert inner.transform.call_count == 2
+    assert out["col1"].to_list() == [3, 5, 7, 9, 11]
+
+
+def test_cache_dataframe_transformer_transform_different_schema(frame: pl.DataFrame) -> None:
+    inner = mock_transformer()
+    transformer = Cache(inner)
+    transformer.transform(frame)
+    transformer.transform(frame.cast({"col1": pl.Int32}))
+    assert inner.transform.call_count == 2
+
+
+def test_cache_dataframe_transformer_transform_sample_size(frame: pl.DataFrame) -> None:
+    inner = mock_transformer()
+    transformer = Cache(inner, sample_size=1)
+    transformer.transform(frame)
+    # The last row is not in the sample, so the change is not detected
+    transformer.transform(frame.with_columns(pl.col("col2").replace({"e": "z"})))
+    inner.transform.assert_called_once()
+
+
+def test_cache_dataframe_transformer_output_is_copy(frame: pl.DataFrame) -> None:
+    transformer = Cache(Function(add_one))
+    transformer.transform(frame).drop_in_place("col1")
+    assert transformer.transform(frame).columns == ["col1", "col2"]
+
+
+def test_cache_dataframe_transformer_transformer_key() -> None:
+    # The repr of TokenToIndex does not show the vocabulary
+    frame = pl.DataFrame({"col": ["a", "b"]})
+    out1 = Cache(
+        TokenToIndex(
+            vocab=Vocabulary(Counter({"a": 2, "b": 1})),
+            token_column="col",  # noqa: S106
+            index_column="id",
+        )
+    ).transform(frame)
+    out2 = Cache(
+        TokenToIndex(
+            vocab=Vocabulary(Counter({"b": 2, "a": 1})),
+            token_column="col",  # noqa: S106
+            index_column="id",
+        )
+    ).transform(frame)
+    assert out1["id"].to_list() == [0, 1]
+    assert out2["id"].to_list() == [1, 0]
+
+
+def test_cache_dataframe_transformer_max_bytes(frame: pl.DataFrame) -> None:
+    inner = mock_transformer()
+    transformer = Cache(inner, max_bytes=frame.estimated_size() * 2)
+    frame2 = frame.with_columns(pl.col("col1") * 2)
+    frame3 = frame.with_columns(pl.col("col1") * 3)
+    transformer.transform(frame)
+    transformer.transform(frame2)
+    transformer.transform(frame)  # frame2 is now the least recently used output
+    transformer.transform(frame3)
+    assert transformer.get_stats() == {
+        "hits": 1,
+        "misses": 3,
+        "num_items": 2,
+        "num_bytes": frame.estimated_size() * 2,
+    }
+    transformer.transform(frame)
+    assert inner.transform.call_count == 3
+    transformer.transform(frame2)
+    assert inner.transform.call_count == 4
+
+
+def test_cache_dataframe_transformer_max_bytes_too_large(frame: pl.DataFrame) -> None:
+    transformer = Cache(Function(add_one), max_bytes=1)
+    transformer.transform(frame)
+    assert transformer.get_stats()["num_items"] == 0
+
+
+def test_cache_dataframe_transformer_clear(frame: pl.DataFrame) -> None:
+    inner = mock_transformer()
+    transformer = Cache(inner)
+    transformer.transform(frame)
+    transformer.clear()
+    assert transformer.get_stats()["num_bytes"] == 0
+    transformer.transform(frame)
+    assert inner.transform.call_count == 2
+
+
+def test_cache_dataframe_transformer_cache_dir(tmp_path: Path, frame: pl.DataFrame) -> None:
+    transformer = Sequential([Function(add_one), Cast(columns=["col1"], dtype=pl.Float32)])
+    out = Cache(transformer, cache_dir=tmp_path).transform(frame)
+    assert len(list(tmp_path.glob("*.parquet"))) == 1
+
+    # A new cache reads the output from the disk
+    cache = Cache(transformer, cache_dir=tmp_path)
+    assert_frame_equal(cache.transform(frame), out)
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 0
+
+
+def test_cache_dataframe_transformer_cache_dir_unpicklable(
+    tmp_path: Path, frame: pl.DataFrame
+) -> None:
+    transformer = Cache(
+        Function(lambda frame: frame.with_columns(pl.col("col1") + 1)), cache_dir=tmp_path
+    )
+    transformer.transform(frame)
+    assert list(tmp_path.iterdir()) == []
+    assert transformer.get_stats()["num_items"] == 1
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import polars as pl
 from polars.testing import assert_frame_equal
 
-from arctix.transformer.dataframe import Cast, Sequential
+from arctix.transformer.dataframe import Cast, Sequential, TimeDiff
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 ####################################################
 #     Tests for SequentialDataFrameTransformer     #
@@ -89,3 +94,16 @@ def test_sequential_dataframe_transformer_transform_2() -> None:
             schema={"col1": pl.Float32, "col2": pl.Int64, "col3": pl.String},
         ),
     )
+
+
+def test_sequential_dataframe_transformer_transform_to_parquet(tmp_path: Path) -> None:
+    transformer = Sequential(
+        [
+            TimeDiff(group_cols=["col"], time_col="time", time_diff_col="diff"),
+            Cast(columns=["diff"], dtype=pl.Float32),
+        ]
+    )
+    frame = pl.DataFrame({"col": ["a", "a", "b", "b", "b"], "time": [1, 3, 2, 5, 9]})
+    path = tmp_path.joinpath("data.parquet")
+    assert transformer.transform_to_parquet(frame, path, group_cols=["col"], batch_size=2) == 5
+    assert_frame_equal(pl.read_parquet(path), transformer.transform(frame))
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from arctix.transformer.dataframe import (
+    BaseDataFrameTransformer,
+    Cast,
+    Sequential,
+    Sort,
+    TimeDiff,
+    transform_to_parquet,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "col": ["a", "a", "a", "b", "b", "c", "d", "d"],
+            "time": [1, 3, 4, 2, 5, 7, 1, 6],
+        }
+    )
+
+
+@pytest.fixture
+def transformer() -> Sequential:
+    return Sequential(
+        [
+            TimeDiff(group_cols=["col"], time_col="time", time_diff_col="diff"),
+            Sort(columns=["col", "time"]),
+            Cast(columns=["diff"], dtype=pl.Float64),
+        ]
+    )
+
+
+##########################################
+#     Tests for transform_to_parquet     #
+##########################################
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 8, 100])
+def test_transform_to_parquet(
+    tmp_path: Path, frame: pl.DataFrame, transformer: Sequential, batch_size: int
+) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    num_rows = transform_to_parquet(
+        transformer, frame, path, group_cols=["col"], batch_size=batch_size
+    )
+    assert num_rows == 8
+    assert_frame_equal(pl.read_parquet(path), transformer.transform(frame))
+    assert [p.name for p in tmp_path.iterdir()] == ["data.parquet"]
+
+
+def test_transform_to_parquet_groups_not_split(tmp_path: Path, frame: pl.DataFrame) -> None:
+    transformer = Mock(spec=BaseDataFrameTransformer, transform=Mock(side_effect=lambda x: x))
+    transform_to_parquet(
+        transformer, frame, tmp_path.joinpath("data.parquet"), group_cols=["col"], batch_size=2
+    )
+    batches = [call.args[0]["col"].to_list() for call in transformer.transform.call_args_list]
+    assert batches == [["a", "a", "a"], ["b", "b"], ["c", "d", "d"]]
+
+
+def test_transform_to_parquet_without_group_cols(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    transformer = Cast(columns=["time"], dtype=pl.Float32)
+    assert transform_to_parquet(transformer, frame, path, batch_size=3) == 8
+    assert_frame_equal(pl.read_parquet(path), transformer.transform(frame))
+
+
+def test_transform_to_parquet_lazyframe(
+    tmp_path: Path, frame: pl.DataFrame, transformer: Sequential
+) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    transform_to_parquet(transformer, frame.lazy(), path, group_cols=["col"], batch_size=2)
+    assert_frame_equal(pl.read_parquet(path), transformer.transform(frame))
+
+
+def test_transform_to_parquet_parquet_source(
+    tmp_path: Path, frame: pl.DataFrame, transformer: Sequential
+) -> None:
+    source = tmp_path.joinpath("source.parquet")
+    frame.write_parquet(source, row_group_size=2)
+    path = tmp_path.joinpath("output", "data.parquet")
+    transform_to_parquet(transformer, source, path, group_cols=["col"], batch_size=2)
+    assert_frame_equal(pl.read_parquet(path), transformer.transform(frame))
+
+
+def test_transform_to_parquet_overwrite(
+    tmp_path: Path, frame: pl.DataFrame, transformer: Sequential
+) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    transform_to_parquet(transformer, frame, path, group_cols=["col"])
+    transform_to_parquet(transformer, frame.head(3), path, group_cols=["col"])
+    assert pl.read_parquet(path).shape == (3, 3)
+
+
+def test_transform_to_parquet_empty(tmp_path: Path, transformer: Sequential) -> None:
+    path = tmp_path.joinpath("data.parquet")
+    frame = pl.DataFrame({"col": [], "time": []}, schema={"col": pl.String, "time": pl.Int64})
+    assert transform_to_parquet(transformer, frame, path, group_cols=["col"]) == 0
+    assert_frame_equal(pl.read_parquet(path), transformer.transform(frame))
+
+
+def test_transform_to_parquet_groups_not_contiguous(
+    tmp_path: Path, frame: pl.DataFrame, transformer: Sequential
+) -> None:
+    with pytest.raises(RuntimeError, match=r"The rows of a group are not contiguous"):
+        transform_to_parquet(
+            transformer,
+            frame.reverse().sort("time"),
+            tmp_path.joinpath("data.parquet"),
+            group_cols=["col"],
+            batch_size=2,
+        )
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_transform_to_parquet_incorrect_batch_size(
+    tmp_path: Path, frame: pl.DataFrame, transformer: Sequential
+) -> None:
+    with pytest.raises(RuntimeError, match=r"batch_size must be greater than 0"):
+        transform_to_parquet(transformer, frame, tmp_path.joinpath("data.parquet"), batch_size=0)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import polars as pl
+import pytest
+
+from arctix.utils.dataframe import compute_fingerprint
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "col1": [1, 2, 3, 4, 5],
+            "col2": ["a", "b", "c", "d", "e"],
+            "col3": [[1], [2], [], [4], [5]],
+        }
+    )
+
+
+#########################################
+#     Tests for compute_fingerprint     #
+#########################################
+
+
+def test_compute_fingerprint(frame: pl.DataFrame) -> None:
+    fingerprint = compute_fingerprint(frame)
+    assert isinstance(fingerprint, str)
+    assert len(fingerprint) == 64
+    assert compute_fingerprint(frame.clone()) == fingerprint
+
+
+def test_compute_fingerprint_different_values(frame: pl.DataFrame) -> None:
+    assert compute_fingerprint(frame) != compute_fingerprint(
+        frame.with_columns(pl.col("col2").replace({"e": "z"}))
+    )
+
+
+def test_compute_fingerprint_different_order(frame: pl.DataFrame) -> None:
+    assert compute_fingerprint(frame) != compute_fingerprint(frame.reverse())
+
+
+def test_compute_fingerprint_different_schema(frame: pl.DataFrame) -> None:
+    assert compute_fingerprint(frame) != compute_fingerprint(frame.cast({"col1": pl.Int32}))
+    assert compute_fingerprint(frame) != compute_fingerprint(frame.rename({"col1": "col"}))
+
+
+def test_compute_fingerprint_categorical(frame: pl.DataFrame) -> None:
+    frame = frame.with_columns(pl.col("col2").cast(pl.Categorical))
+    assert compute_fingerprint(frame) == compute_fingerprint(frame.clone())
+    assert compute_fingerprint(frame) != compute_fingerprint(
+        frame.with_columns(pl.col("col2").cast(pl.String))
+    )
+
+
+def test_compute_fingerprint_empty() -> None:
+    assert compute_fingerprint(pl.DataFrame()) != compute_fingerprint(
+        pl.DataFrame({"col": []}, schema={"col": pl.Int64})
+    )
+
+
+@pytest.mark.parametrize("sample_size", [1, 2, 5, 10])
+def test_compute_fingerprint_sample_size(frame: pl.DataFrame, sample_size: int) -> None:
+    assert compute_fingerprint(frame, sample_size=sample_size) == compute_fingerprint(
+        frame.clone(), sample_size=sample_size
+    )
+
+
+def test_compute_fingerprint_sample_size_skipped_rows(frame: pl.DataFrame) -> None:
+    assert compute_fingerprint(frame, sample_size=1) == compute_fingerprint(
+        frame.with_columns(pl.col("col2").replace({"e": "z"})), sample_size=1
+    )
+
+
+@pytest.mark.parametrize("sample_size", [0, -1])
+def test_compute_fingerprint_incorrect_sample_size(frame: pl.DataFrame, sample_size: int) -> None:
+    with pytest.raises(RuntimeError, match=r"sample_size must be greater than 0"):
+        compute_fingerprint(frame, sample_size=sample_size)
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import os
+from pathlib import Path
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 from iden.io import save_text
 
-from arctix.utils.iter import DirFilter, FileFilter, PathLister
+from arctix.utils.iter import (
+    DirFilter,
+    FileFilter,
+    PathFilter,
+    PathLister,
+    clear_scan_cache,
+    scan_paths,
+)
+from arctix.utils.iter.path import _SCAN_CACHE
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Iterator
 
 
 @pytest.fixture(scope="module")
@@ -77,6 +88,42 @@ def test_dir_filter_iter_file() -> None:
     assert list(FileFilter([])) == []
 
 
+################################
+#     Tests for PathFilter     #
+################################
+
+
+def test_path_filter_repr() -> None:
+    assert repr(PathFilter([], predicate=bool)).startswith("PathFilter(")
+
+
+def test_path_filter_str() -> None:
+    assert str(PathFilter([], predicate=bool)).startswith("PathFilter(")
+
+
+def test_path_filter_iter(data_path: Path) -> None:
+    assert list(
+        PathFilter(
+            [
+                data_path.joinpath("dir/file.txt"),
+                data_path.joinpath("dir/"),
+                data_path.joinpath("file.txt"),
+            ],
+            predicate=lambda path: path.suffix == ".txt",
+        )
+    ) == [data_path.joinpath("dir/file.txt"), data_path.joinpath("file.txt")]
+
+
+def test_path_filter_iter_missing_path(tmp_path: Path) -> None:
+    assert list(
+        PathFilter([tmp_path.joinpath("missing.txt")], predicate=lambda path: path.name != "")
+    ) == [tmp_path.joinpath("missing.txt")]
+
+
+def test_path_filter_iter_empty() -> None:
+    assert list(PathFilter([], predicate=bool)) == []
+
+
 ################################
 #     Tests for PathLister     #
 ################################
@@ -110,3 +157,196 @@ def test_path_lister_iter_deterministic_false(data_path: Path) -> None:
         data_path.joinpath("dir/file.txt"),
         data_path.joinpath("file.txt"),
     }
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_path_lister_iter_max_workers(data_path: Path, max_workers: int) -> None:
+    assert list(PathLister([data_path], pattern="**/*.txt", max_workers=max_workers)) == [
+        data_path.joinpath("dir/file.txt"),
+        data_path.joinpath("file.txt"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "pattern", ["*", "*.txt", "**/*.txt", "**/*", "dir/*", "*/*.txt", "a/**/*"]
+)
+def test_path_lister_iter_same_as_glob(tree_path: Path, pattern: str) -> None:
+    assert list(PathLister([tree_path], pattern=pattern)) == sorted(tree_path.glob(pattern))
+
+
+def test_path_lister_iter_missing(tmp_path: Path) -> None:
+    assert list(PathLister([tmp_path.joinpath("missing")])) == []
+
+
+def test_path_lister_file_filter_no_stat(tree_path: Path) -> None:
+    with patch("pathlib.Path.stat", autospec=True, side_effect=Path.stat) as stat_mock:
+        assert list(FileFilter(PathLister([tree_path], pattern="**/*.txt"))) == [
+            tree_path.joinpath("a/b/c.txt"),
+            tree_path.joinpath("a/b.txt"),
+            tree_path.joinpath("file.txt"),
+        ]
+    # Only the source directory is checked
+    assert stat_mock.call_count == 1
+
+
+def test_path_lister_dir_filter(tree_path: Path) -> None:
+    assert list(DirFilter(PathLister([tree_path], pattern="**/*"))) == [
+        tree_path.joinpath("a"),
+        tree_path.joinpath("a/b"),
+        tree_path.joinpath("empty"),
+    ]
+
+
+def test_path_lister_repr_path(tree_path: Path) -> None:
+    assert repr(next(iter(PathLister([tree_path], pattern="*.txt")))) == repr(
+        tree_path.joinpath("file.txt")
+    )
+
+
+def test_path_lister_cache(tmp_path: Path) -> None:
+    save_text("", tmp_path.joinpath("a.txt"))
+    lister = PathLister([tmp_path], pattern="*.txt", cache=True)
+    assert list(lister) == [tmp_path.joinpath("a.txt")]
+    with patch("arctix.utils.iter.path.os.scandir") as scandir_mock:
+        assert list(lister) == [tmp_path.joinpath("a.txt")]
+        scandir_mock.assert_not_called()
+
+
+def test_path_lister_cache_invalidated(tmp_path: Path) -> None:
+    save_text("", tmp_path.joinpath("a.txt"))
+    lister = PathLister([tmp_path], pattern="*.txt", cache=True)
+    assert list(lister) == [tmp_path.joinpath("a.txt")]
+    save_text("", tmp_path.joinpath("b.txt"))
+    stat = tmp_path.stat()
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert list(lister) == [tmp_path.joinpath("a.txt"), tmp_path.joinpath("b.txt")]
+
+
+def test_path_lister_cache_false(tmp_path: Path) -> None:
+    save_text("", tmp_path.joinpath("a.txt"))
+    list(PathLister([tmp_path], pattern="*.txt"))
+    assert os.fspath(tmp_path) not in _SCAN_CACHE
+
+
+def test_path_lister_cache_size(tmp_path: Path) -> None:
+    for name in ["a", "b", "c"]:
+        save_text("", tmp_path.joinpath(name, "file.txt"))
+    with patch("arctix.utils.iter.path.SCAN_CACHE_SIZE", 2):
+        list(PathLister([tmp_path], pattern="*/*.txt", cache=True))
+    assert len(_SCAN_CACHE) <= 2
+    assert os.fspath(tmp_path.joinpath("c")) in _SCAN_CACHE
+
+
+######################################
+#     Tests for clear_scan_cache     #
+######################################
+
+
+def test_clear_scan_cache(tmp_path: Path) -> None:
+    save_text("", tmp_path.joinpath("a.txt"))
+    list(PathLister([tmp_path], pattern="*.txt", cache=True))
+    assert os.fspath(tmp_path) in _SCAN_CACHE
+    clear_scan_cache()
+    assert len(_SCAN_CACHE) == 0
+
+
+################################
+#     Tests for scan_paths     #
+################################
+
+
+@pytest.fixture
+def tree_path(tmp_path: Path) -> Path:
+    save_text("", tmp_path.joinpath("file.txt"))
+    save_text("", tmp_path.joinpath("file.csv"))
+    save_text("", tmp_path.joinpath("a/b.txt"))
+    save_text("", tmp_path.joinpath("a/b/c.txt"))
+    tmp_path.joinpath("empty").mkdir()
+    return tmp_path
+
+
+def test_scan_paths(tree_path: Path) -> None:
+    assert sorted(scan_paths(tree_path, pattern="**/*.txt")) == [
+        tree_path.joinpath("a/b/c.txt"),
+        tree_path.joinpath("a/b.txt"),
+        tree_path.joinpath("file.txt"),
+    ]
+
+
+def test_scan_paths_type(tree_path: Path) -> None:
+    paths = {path.name: path for path in scan_paths(tree_path, pattern="*")}
+    assert paths["file.txt"].is_file()
+    assert not paths["file.txt"].is_dir()
+    assert paths["a"].is_dir()
+    assert not paths["a"].is_file()
+    # The derived paths query the file system
+    assert paths["file.txt"].parent.is_dir()
+
+
+def test_scan_paths_permission_error(tree_path: Path) -> None:
+    original = os.scandir
+
+    def scandir(path: Path) -> Iterator[os.DirEntry]:
+        if Path(path) == tree_path.joinpath("a"):
+            raise PermissionError(path)
+        return original(path)
+
+    with patch("arctix.utils.iter.path.os.scandir", side_effect=scandir):
+        assert sorted(scan_paths(tree_path, pattern="**/*.txt")) == [tree_path.joinpath("file.txt")]
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_scan_paths_vanished_dir(tree_path: Path, cache: bool) -> None:
+    original = os.scandir
+
+    def scandir(path: Path) -> Iterator[os.DirEntry]:
+        if Path(path) == tree_path.joinpath("a"):
+            raise FileNotFoundError(path)
+        return original(path)
+
+    with patch("arctix.utils.iter.path.os.scandir", side_effect=scandir):
+        assert sorted(scan_paths(tree_path, pattern="**/*.txt", cache=cache)) == [
+            tree_path.joinpath("file.txt")
+        ]
+
+
+@pytest.fixture
+def symlink_path(tmp_path: Path) -> Path:
+    save_text("", tmp_path.joinpath("a/x.txt"))
+    tmp_path.joinpath("a/loop").symlink_to("..", target_is_directory=True)
+    tmp_path.joinpath("a/loop2").symlink_to("..", target_is_directory=True)
+    tmp_path.joinpath("link").symlink_to("a", target_is_directory=True)
+    return tmp_path
+
+
+@pytest.mark.parametrize("pattern", ["**/*.txt", "**/*", "*/*.txt", "link/**/*.txt", "*/*/*"])
+def test_scan_paths_symlink_same_as_glob(symlink_path: Path, pattern: str) -> None:
+    assert sorted(scan_paths(symlink_path, pattern=pattern)) == sorted(symlink_path.glob(pattern))
+
+
+def test_scan_paths_symlink_cycle(symlink_path: Path) -> None:
+    assert list(PathLister([symlink_path], pattern="**/*.txt")) == [
+        symlink_path.joinpath("a/x.txt")
+    ]
+
+
+def test_scan_paths_symlink_type(symlink_path: Path) -> None:
+    paths = {path.name: path for path in scan_paths(symlink_path, pattern="*")}
+    assert paths["link"].is_dir()
+    assert not paths["link"].is_dir(follow_symlinks=False)
+    assert paths["a"].is_dir(follow_symlinks=False)
+    assert not paths["link"].is_file(follow_symlinks=False)
+
+
+def test_scan_paths_max_depth(tree_path: Path) -> None:
+    with patch("arctix.utils.iter.path.os.scandir", wraps=os.scandir) as scandir_mock:
+        assert sorted(scan_paths(tree_path, pattern="*/*.txt")) == [tree_path.joinpath("a/b.txt")]
+    assert sorted(Path(call.args[0]) for call in scandir_mock.call_args_list) == [
+        tree_path,
+        tree_path.joinpath("a"),
+        tree_path.joinpath("empty"),
+    ]
+
+
+def test_scan_paths_file(tree_path: Path) -> None:
+    assert scan_paths(tree_path.joinpath("file.txt")) == []
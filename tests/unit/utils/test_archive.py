@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import io
+import tarfile
+import zipfile
+from typing import TYPE_CHECKING
+
+import pytest
+
+from arctix.utils.archive import extract_archive
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FILES = {
+    "data/a.txt": b"abc",
+    "data/sub/b.txt": b"def" * 1000,
+    "data/c.txt": b"",
+}
+
+
+def create_zip_file(path: Path, files: dict[str, bytes]) -> Path:
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("data/", "")
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return path
+
+
+def create_tar_file(path: Path, files: dict[str, bytes], mode: str = "w:gz") -> Path:
+    with tarfile.open(path, mode) as archive:
+        info = tarfile.TarInfo("data")
+        info.type = tarfile.DIRTYPE
+        archive.addfile(info)
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+@pytest.fixture(params=["zip", "tar", "tar.gz"])
+def archive_path(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    path = tmp_path.joinpath(f"archive.{request.param}")
+    if request.param == "zip":
+        return create_zip_file(path, FILES)
+    return create_tar_file(path, FILES, mode="w:gz" if request.param == "tar.gz" else "w")
+
+
+#####################################
+#     Tests for extract_archive     #
+#####################################
+
+
+def test_extract_archive_all(archive_path: Path, tmp_path: Path) -> None:
+    dst = tmp_path.joinpath("output")
+    paths = extract_archive(archive_path, dst)
+    assert paths == [dst.joinpath(name) for name in FILES]
+    for name, data in FILES.items():
+        assert dst.joinpath(name).read_bytes() == data
+    assert sorted(p.name for p in dst.rglob("*") if p.is_file()) == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_extract_archive_members(archive_path: Path, tmp_path: Path) -> None:
+    dst = tmp_path.joinpath("output")
+    paths = extract_archive(
+        archive_path, dst, members={"data/sub/b.txt": "b.txt", "data/a.txt": "x/a.txt"}
+    )
+    assert sorted(paths) == [dst.joinpath("b.txt"), dst.joinpath("x/a.txt")]
+    assert dst.joinpath("b.txt").read_bytes() == FILES["data/sub/b.txt"]
+    assert dst.joinpath("x/a.txt").read_bytes() == FILES["data/a.txt"]
+    assert sorted(p.name for p in dst.rglob("*") if p.is_file()) == ["a.txt", "b.txt"]
+
+
+def test_extract_archive_members_empty(archive_path: Path, tmp_path: Path) -> None:
+    dst = tmp_path.joinpath("output")
+    assert extract_archive(archive_path, dst, members={}) == []
+    assert not dst.exists()
+
+
+def test_extract_archive_small_buffer(archive_path: Path, tmp_path: Path) -> None:
+    dst = tmp_path.joinpath("output")
+    extract_archive(archive_path, dst, members={"data/sub/b.txt": "b.txt"}, buffer_size=7)
+    assert dst.joinpath("b.txt").read_bytes() == FILES["data/sub/b.txt"]
+
+
+def test_extract_archive_overwrite(archive_path: Path, tmp_path: Path) -> None:
+    dst = tmp_path.joinpath("output")
+    dst.mkdir()
+    dst.joinpath("a.txt").write_bytes(b"old")
+    extract_archive(archive_path, dst, members={"data/a.txt": "a.txt"})
+    assert dst.joinpath("a.txt").read_bytes() == b"abc"
+    assert [p.name for p in dst.iterdir()] == ["a.txt"]
+
+
+def test_extract_archive_missing_member(archive_path: Path, tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError, match=r"The following members are missing"):
+        extract_archive(archive_path, tmp_path, members={"data/missing.txt": "missing.txt"})
+
+
+@pytest.mark.parametrize("name", ["../a.txt", "/data/a.txt", "x/../../a.txt"])
+def test_extract_archive_outside_dst(tmp_path: Path, name: str) -> None:
+    path = create_tar_file(tmp_path.joinpath("archive.tar"), {name: b"abc"}, mode="w")
+    with pytest.raises(RuntimeError, match=r"Incorrect member path"):
+        extract_archive(path, tmp_path.joinpath("output"))
+
+
+def test_extract_archive_unsupported(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.txt")
+    path.write_text("abc")
+    with pytest.raises(RuntimeError, match=r"Unsupported archive format"):
+        extract_archive(path, tmp_path)
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import numpy as np
+import polars as pl
+import pytest
+from coola import objects_are_equal
+
+from arctix.utils.batching import (
+    convert_frame_to_sequence_arrays,
+    convert_groups_to_arrays,
+    generate_bucketed_batch_indices,
+    iter_bucketed_batches,
+)
+
+
+@pytest.fixture
+def groups() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "action": [["a", "b", "c"], ["d"], ["e", "f", "g", "h"], ["i"]],
+            "action_id": [[1, 2, 3], [4], [5, 6, 7, 8], [9]],
+            "start_time": [[0.0, 1.0, 2.0], [0.5], [1.0, 2.0, 3.0, 4.0], [2.5]],
+            "sequence_length": [3, 1, 4, 1],
+            "video": ["v1", "v2", "v3", "v4"],
+        }
+    )
+
+
+#####################################################
+#     Tests for generate_bucketed_batch_indices     #
+#####################################################
+
+
+def test_generate_bucketed_batch_indices() -> None:
+    assert objects_are_equal(
+        generate_bucketed_batch_indices([5, 2, 8, 3, 1], batch_size=2),
+        [np.array([4, 1]), np.array([3, 0]), np.array([2])],
+    )
+
+
+def test_generate_bucketed_batch_indices_drop_last() -> None:
+    assert objects_are_equal(
+        generate_bucketed_batch_indices([5, 2, 8, 3, 1], batch_size=2, drop_last=True),
+        [np.array([4, 1]), np.array([3, 0])],
+    )
+
+
+def test_generate_bucketed_batch_indices_bucket_size() -> None:
+    assert objects_are_equal(
+        generate_bucketed_batch_indices([5, 2, 8, 3, 1, 4], batch_size=2, bucket_size=3),
+        [np.array([4, 1]), np.array([3]), np.array([5, 0]), np.array([2])],
+    )
+
+
+def test_generate_bucketed_batch_indices_shuffle_same_seed() -> None:
+    lengths = np.arange(100)[::-1]
+    assert objects_are_equal(
+        generate_bucketed_batch_indices(
+            lengths, batch_size=4, bucket_size=20, shuffle=True, seed=1
+        ),
+        generate_bucketed_batch_indices(
+            lengths, batch_size=4, bucket_size=20, shuffle=True, seed=1
+        ),
+    )
+
+
+def test_generate_bucketed_batch_indices_shuffle_different_seeds() -> None:
+    lengths = np.arange(100)[::-1]
+    assert not objects_are_equal(
+        generate_bucketed_batch_indices(
+            lengths, batch_size=4, bucket_size=20, shuffle=True, seed=1
+        ),
+        generate_bucketed_batch_indices(
+            lengths, batch_size=4, bucket_size=20, shuffle=True, seed=2
+        ),
+    )
+
+
+def test_generate_bucketed_batch_indices_shuffle_within_buckets() -> None:
+    lengths = np.arange(100)
+    batches = generate_bucketed_batch_indices(
+        lengths, batch_size=5, bucket_size=20, shuffle=True, seed=1
+    )
+    assert len(batches) == 20
+    assert np.array_equal(np.sort(np.concatenate(batches)), np.arange(100))
+    for batch in batches:
+        # all the sequences of a batch come from the same bucket
+        assert len(set((batch // 20).tolist())) == 1
+
+
+def test_generate_bucketed_batch_indices_empty() -> None:
+    assert generate_bucketed_batch_indices([], batch_size=2) == []
+
+
+def test_generate_bucketed_batch_indices_incorrect_batch_size() -> None:
+    with pytest.raises(RuntimeError, match="batch_size must be greater or equal to 1"):
+        generate_bucketed_batch_indices([1, 2, 3], batch_size=0)
+
+
+def test_generate_bucketed_batch_indices_incorrect_bucket_size() -> None:
+    with pytest.raises(RuntimeError, match="bucket_size must be greater or equal to batch_size"):
+        generate_bucketed_batch_indices([1, 2, 3], batch_size=2, bucket_size=1)
+
+
+##############################################
+#     Tests for convert_groups_to_arrays     #
+##############################################
+
+
+def test_convert_groups_to_arrays(groups: pl.DataFrame) -> None:
+    mask = np.array(
+        [
+            [False, False, False, True],
+            [False, True, True, True],
+            [False, False, False, False],
+            [False, True, True, True],
+        ]
+    )
+    assert objects_are_equal(
+        convert_groups_to_arrays(groups),
+        {
+            "action": np.ma.masked_array(
+                data=np.array(
+                    [
+                        ["a", "b", "c", "N/A"],
+                        ["d", "N/A", "N/A", "N/A"],
+                        ["e", "f", "g", "h"],
+                        ["i", "N/A", "N/A", "N/A"],
+                    ]
+                ),
+                mask=mask,
+            ),
+            "action_id": np.ma.masked_array(
+                data=np.array([[1, 2, 3, -1], [4, -1, -1, -1], [5, 6, 7, 8], [9, -1, -1, -1]]),
+                mask=mask,
+            ),
+            "start_time": np.ma.masked_array(
+                data=np.array(
+                    [
+                        [0.0, 1.0, 2.0, -1.0],
+                        [0.5, -1.0, -1.0, -1.0],
+                        [1.0, 2.0, 3.0, 4.0],
+                        [2.5, -1.0, -1.0, -1.0],
+                    ]
+                ),
+                mask=mask,
+            ),
+            "sequence_length": np.array([3, 1, 4, 1]),
+            "video": np.array(["v1", "v2", "v3", "v4"]),
+        },
+    )
+
+
+######################################################
+#     Tests for convert_frame_to_sequence_arrays     #
+######################################################
+
+
+def test_convert_frame_to_sequence_arrays() -> None:
+    frame = pl.DataFrame(
+        {"video": ["v2", "v1", "v1", "v2", "v2"], "count": [4, 1, 2, 5, 6], "x": [0, 0, 0, 0, 0]}
+    )
+    assert objects_are_equal(
+        convert_frame_to_sequence_arrays(frame, group_cols=["video"], columns=["count"]),
+        {
+            "count": np.ma.masked_array(
+                data=np.array([[1, 2, -1], [4, 5, 6]]),
+                mask=np.array([[False, False, True], [False, False, False]]),
+            )
+        },
+    )
+
+
+def test_convert_frame_to_sequence_arrays_ragged() -> None:
+    frame = pl.DataFrame(
+        {"video": ["v2", "v1", "v1", "v2", "v2"], "count": [4, 1, 2, 5, 6], "x": [0, 0, 0, 0, 0]}
+    )
+    assert objects_are_equal(
+        convert_frame_to_sequence_arrays(
+            frame, group_cols=["video"], columns=["count"], padded=False
+        ),
+        {"count": [np.array([1, 2]), np.array([4, 5, 6])]},
+    )
+
+
+def test_convert_frame_to_sequence_arrays_multiple_columns() -> None:
+    frame = pl.DataFrame({"video": ["v1", "v2", "v1"], "count": [1, 2, 3], "time": [0.0, 1.0, 2.0]})
+    assert objects_are_equal(
+        convert_frame_to_sequence_arrays(
+            frame, group_cols=["video"], columns=["count", "time"], padded=False
+        ),
+        {
+            "count": [np.array([1, 3]), np.array([2])],
+            "time": [np.array([0.0, 2.0]), np.array([1.0])],
+        },
+    )
+
+
+###########################################
+#     Tests for iter_bucketed_batches     #
+###########################################
+
+
+def test_iter_bucketed_batches(groups: pl.DataFrame) -> None:
+    batches = list(iter_bucketed_batches(groups, batch_size=2))
+    assert objects_are_equal(
+        batches,
+        [
+            {
+                "action": np.ma.masked_array(
+                    data=np.array([["d"], ["i"]]), mask=np.array([[False], [False]])
+                ),
+                "action_id": np.ma.masked_array(
+                    data=np.array([[4], [9]]), mask=np.array([[False], [False]])
+                ),
+                "start_time": np.ma.masked_array(
+                    data=np.array([[0.5], [2.5]]), mask=np.array([[False], [False]])
+                ),
+                "sequence_length": np.array([1, 1]),
+                "video": np.array(["v2", "v4"]),
+            },
+            convert_groups_to_arrays(groups[[0, 2]]),
+        ],
+    )
+    assert batches[1]["action_id"].shape == (2, 4)
+
+
+def test_iter_bucketed_batches_shuffle(groups: pl.DataFrame) -> None:
+    batches = list(iter_bucketed_batches(groups, batch_size=1, bucket_size=4, shuffle=True, seed=0))
+    assert len(batches) == 4
+    assert sorted(batch["video"][0] for batch in batches) == ["v1", "v2", "v3", "v4"]
+    assert objects_are_equal(
+        batches,
+        list(iter_bucketed_batches(groups, batch_size=1, bucket_size=4, shuffle=True, seed=0)),
+    )
+
+
+def test_iter_bucketed_batches_length_col() -> None:
+    groups = pl.DataFrame({"value": [[1, 2], [3]], "length": [2, 1]})
+    assert objects_are_equal(
+        list(iter_bucketed_batches(groups, batch_size=1, length_col="length")),
+        [
+            {
+                "value": np.ma.masked_array(data=np.array([[3]]), mask=np.array([[False]])),
+                "length": np.array([1]),
+            },
+            {
+                "value": np.ma.masked_array(
+                    data=np.array([[1, 2]]), mask=np.array([[False, False]])
+                ),
+                "length": np.array([2]),
+            },
+        ],
+    )
+
+
+def test_iter_bucketed_batches_empty(groups: pl.DataFrame) -> None:
+    assert list(iter_bucketed_batches(groups.clear(), batch_size=2)) == []
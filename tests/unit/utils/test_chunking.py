@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import numpy as np
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from arctix.utils.chunking import (
+    find_balanced_chunks,
+    find_sequence_chunks,
+    iter_sequence_chunks,
+)
+
+##########################################
+#     Tests for find_balanced_chunks     #
+##########################################
+
+
+def test_find_balanced_chunks() -> None:
+    assert find_balanced_chunks([8, 1, 1, 1, 1, 4, 4], num_chunks=3) == [(0, 1), (1, 5), (5, 7)]
+
+
+def test_find_balanced_chunks_uniform() -> None:
+    assert find_balanced_chunks(np.ones(10), num_chunks=3) == [(0, 3), (3, 7), (7, 10)]
+
+
+def test_find_balanced_chunks_one_chunk() -> None:
+    assert find_balanced_chunks([3, 2, 5], num_chunks=1) == [(0, 3)]
+
+
+def test_find_balanced_chunks_more_chunks_than_sequences() -> None:
+    assert find_balanced_chunks([5, 5], num_chunks=4) == [(0, 1), (1, 1), (1, 2), (2, 2)]
+
+
+def test_find_balanced_chunks_empty() -> None:
+    assert find_balanced_chunks([], num_chunks=2) == [(0, 0), (0, 0)]
+
+
+def test_find_balanced_chunks_balance() -> None:
+    rng = np.random.default_rng(42)
+    lengths = rng.integers(1, 100, size=1000)
+    chunks = find_balanced_chunks(lengths, num_chunks=8)
+    assert chunks[0][0] == 0
+    assert chunks[-1][1] == 1000
+    assert all(end == start for (_, end), (start, _) in zip(chunks[:-1], chunks[1:]))
+    events = [lengths[start:end].sum() for start, end in chunks]
+    assert max(events) - min(events) <= 2 * lengths.max()
+
+
+def test_find_balanced_chunks_incorrect_num_chunks() -> None:
+    with pytest.raises(RuntimeError, match=r"num_chunks must be greater than 0"):
+        find_balanced_chunks([3, 2], num_chunks=0)
+
+
+##########################################
+#     Tests for find_sequence_chunks     #
+##########################################
+
+
+def test_find_sequence_chunks_max_rows() -> None:
+    assert find_sequence_chunks([2, 3, 1, 4, 2], max_rows=6) == [(0, 2), (2, 3), (3, 4), (4, 5)]
+
+
+def test_find_sequence_chunks_max_rows_large() -> None:
+    assert find_sequence_chunks([2, 3, 1, 4, 2], max_rows=20) == [(0, 5)]
+
+
+def test_find_sequence_chunks_max_rows_small() -> None:
+    assert find_sequence_chunks([2, 3, 1], max_rows=1) == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_find_sequence_chunks_max_bytes() -> None:
+    assert find_sequence_chunks(np.array([2, 3, 1, 4, 2]), max_bytes=48, row_bytes=8) == [
+        (0, 2),
+        (2, 3),
+        (3, 4),
+        (4, 5),
+    ]
+
+
+def test_find_sequence_chunks_max_rows_and_max_bytes() -> None:
+    assert find_sequence_chunks([1, 1, 1, 1], max_rows=3, max_bytes=16, row_bytes=8) == [
+        (0, 2),
+        (2, 4),
+    ]
+
+
+def test_find_sequence_chunks_no_budget() -> None:
+    assert find_sequence_chunks([2, 3, 1, 4, 2]) == [(0, 5)]
+
+
+def test_find_sequence_chunks_empty() -> None:
+    assert find_sequence_chunks([], max_rows=5) == []
+
+
+##########################################
+#     Tests for iter_sequence_chunks     #
+##########################################
+
+
+def test_iter_sequence_chunks() -> None:
+    frame = pl.DataFrame({"seq": ["a", "b", "a", "c", "b", "a"], "value": [1, 2, 3, 4, 5, 6]})
+    chunks = list(iter_sequence_chunks(frame, group_cols=["seq"], max_rows=4))
+    assert len(chunks) == 2
+    assert_frame_equal(chunks[0], pl.DataFrame({"seq": ["a", "a", "a"], "value": [1, 3, 6]}))
+    assert_frame_equal(chunks[1], pl.DataFrame({"seq": ["b", "b", "c"], "value": [2, 5, 4]}))
+
+
+def test_iter_sequence_chunks_multiple_group_cols() -> None:
+    frame = pl.DataFrame(
+        {"col1": [1, 1, 2, 1, 2], "col2": ["a", "b", "a", "a", "a"], "value": [1, 2, 3, 4, 5]}
+    )
+    chunks = list(iter_sequence_chunks(frame, group_cols=["col1", "col2"], max_rows=2))
+    assert len(chunks) == 3
+    assert_frame_equal(
+        chunks[0], pl.DataFrame({"col1": [1, 1], "col2": ["a", "a"], "value": [1, 4]})
+    )
+    assert_frame_equal(chunks[1], pl.DataFrame({"col1": [1], "col2": ["b"], "value": [2]}))
+    assert_frame_equal(
+        chunks[2], pl.DataFrame({"col1": [2, 2], "col2": ["a", "a"], "value": [3, 5]})
+    )
+
+
+def test_iter_sequence_chunks_no_budget() -> None:
+    frame = pl.DataFrame({"seq": ["a", "b", "a"], "value": [1, 2, 3]})
+    chunks = list(iter_sequence_chunks(frame, group_cols=["seq"]))
+    assert len(chunks) == 1
+    assert_frame_equal(chunks[0], pl.DataFrame({"seq": ["a", "a", "b"], "value": [1, 3, 2]}))
+
+
+def test_iter_sequence_chunks_empty() -> None:
+    frame = pl.DataFrame({"seq": [], "value": []}, schema={"seq": pl.String, "value": pl.Int64})
+    assert list(iter_sequence_chunks(frame, group_cols=["seq"], max_rows=4)) == []
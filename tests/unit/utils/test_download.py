@@ -1,15 +1,149 @@
 from __future__ import annotations
 
+import fcntl
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
+import pytest
 from iden.io import load_text, save_text
 
 from arctix.testing import gdown_available, requests_available
-from arctix.utils.download import download_drive_file, download_url_to_file
+from arctix.utils.download import (
+    compute_sha256,
+    download_drive_file,
+    download_files,
+    download_url_to_file,
+    get_cache_path,
+)
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Iterator
+
+PAYLOAD = bytes(range(256)) * 40
+ETAG = '"v1"'
+DOWNLOAD_SCRIPT = (
+    "import sys; from arctix.utils.download import download_url_to_file; "
+    "download_url_to_file(sys.argv[1], sys.argv[2], progress=False, num_segments=2)"
+)
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    r"""Serve ``PAYLOAD`` at ``/range`` with ``Range`` and ``If-Range``
+    support, and at ``/full`` without ``Range`` support. ``/slow`` is like ``/range``
+    but the body is only sent when the ``release`` event of the server
+    is set."""
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self._send(body=False)
+
+    def do_GET(self) -> None:
+        self._send(body=True)
+
+    def _send(self, body: bool) -> None:
+        self.server.requests.append((self.command, self.path, self.headers.get("Range")))
+        if self.path not in {"/range", "/full", "/slow"}:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        start, end = 0, len(PAYLOAD) - 1
+        header = self.headers.get("Range")
+        if (
+            self.path in {"/range", "/slow"}
+            and header is not None
+            and self.headers.get("If-Range", ETAG) == ETAG
+        ):
+            first, _, last = header.removeprefix("bytes=").partition("-")
+            start, end = int(first), int(last) if last else end
+            if start >= len(PAYLOAD):
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{len(PAYLOAD)}")
+                self.end_headers()
+                return
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        else:
+            self.send_response(HTTPStatus.OK)
+        if self.path in {"/range", "/slow"}:
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if body:
+            if self.path == "/slow":
+                self.wfile.flush()
+                self.server.release.wait(timeout=10)
+            self.wfile.write(PAYLOAD[start : end + 1])
+
+
+@pytest.fixture(scope="module")
+def server() -> Iterator[ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+    server.requests = []
+    server.release = threading.Event()
+    server.release.set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Iterator[Path]:
+    path = tmp_path.joinpath("cache")
+    with patch.dict(os.environ, {"ARCTIX_CACHE_PATH": path.as_posix()}):
+        yield path
+
+
+@pytest.fixture
+def base_url(server: ThreadingHTTPServer) -> str:
+    server.requests.clear()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+####################################
+#     Tests for get_cache_path     #
+####################################
+
+
+def test_get_cache_path_disabled() -> None:
+    with patch.dict(os.environ, {"ARCTIX_CACHE_PATH": ""}):
+        assert get_cache_path("https://example.com/data.zip") is None
+
+
+def test_get_cache_path_url(cache_dir: Path) -> None:
+    key = hashlib.sha256(b"https://example.com/data.zip").hexdigest()
+    assert get_cache_path("https://example.com/data.zip") == cache_dir.joinpath("url", key[:2], key)
+
+
+def test_get_cache_path_checksum(cache_dir: Path) -> None:
+    assert get_cache_path("https://example.com/data.zip", checksum="ABCDEF") == cache_dir.joinpath(
+        "sha256", "ab", "abcdef"
+    )
+
+
+####################################
+#     Tests for compute_sha256     #
+####################################
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+def test_compute_sha256(tmp_path: Path, chunk_size: int) -> None:
+    path = tmp_path.joinpath("data.bin")
+    path.write_bytes(PAYLOAD)
+    assert compute_sha256(path, chunk_size=chunk_size) == hashlib.sha256(PAYLOAD).hexdigest()
+
 
 #########################################
 #     Tests for download_drive_file     #
@@ -21,11 +155,9 @@ def test_download_drive_file(tmp_path: Path) -> None:
     url = "https://drive.google.com/open?id=123456789ABCDEFGHIJKLMN"
     path = tmp_path.joinpath("data.txt")
     save_text("abc", tmp_path.joinpath("data.txt.tmp"))
-    with patch("arctix.utils.download.gdown") as gdown_mock:
+    with patch("gdown.download") as download_mock:
         download_drive_file(url, path)
-        gdown_mock.download.assert_called_once_with(
-            url, tmp_path.joinpath("data.txt.tmp").as_posix()
-        )
+        download_mock.assert_called_once_with(url, tmp_path.joinpath("data.txt.tmp").as_posix())
     assert load_text(path) == "abc"
 
 
@@ -34,10 +166,53 @@ def test_download_drive_file_already_exist(tmp_path: Path) -> None:
     url = "https://drive.google.com/open?id=123456789ABCDEFGHIJKLMN"
     path = tmp_path.joinpath("data.txt")
     save_text("abc", path)
-    with patch("arctix.utils.download.gdown") as gdown_mock:
+    with patch("gdown.download") as download_mock:
         download_drive_file(url, path)
-        gdown_mock.download.assert_not_called()
+        download_mock.assert_not_called()
+    assert load_text(path) == "abc"
+
+
+@gdown_available
+@pytest.mark.usefixtures("cache_dir")
+def test_download_drive_file_cache_hit(tmp_path: Path) -> None:
+    url = "https://drive.google.com/open?id=123456789ABCDEFGHIJKLMN"
+    cache_path = get_cache_path(url)
+    cache_path.parent.mkdir(parents=True)
+    cache_path.write_text("abc")
+    path = tmp_path.joinpath("data.txt")
+    with patch("gdown.download") as download_mock:
+        download_drive_file(url, path)
+        download_mock.assert_not_called()
+    assert load_text(path) == "abc"
+
+
+@gdown_available
+def test_download_drive_file_cache_miss(tmp_path: Path, cache_dir: Path) -> None:
+    url = "https://drive.google.com/open?id=123456789ABCDEFGHIJKLMN"
+    path = tmp_path.joinpath("data.txt")
+    save_text("abc", tmp_path.joinpath("data.txt.tmp"))
+    checksum = hashlib.sha256(b"abc").hexdigest()
+    with patch("gdown.download") as download_mock:
+        download_drive_file(url, path, quiet=True, checksum=checksum)
+        download_mock.assert_called_once_with(
+            url, tmp_path.joinpath("data.txt.tmp").as_posix(), quiet=True
+        )
     assert load_text(path) == "abc"
+    assert load_text(cache_dir.joinpath("sha256", checksum[:2], checksum)) == "abc"
+
+
+@gdown_available
+def test_download_drive_file_incorrect_checksum(tmp_path: Path) -> None:
+    url = "https://drive.google.com/open?id=123456789ABCDEFGHIJKLMN"
+    path = tmp_path.joinpath("data.txt")
+    save_text("abc", tmp_path.joinpath("data.txt.tmp"))
+    with (
+        patch("gdown.download"),
+        pytest.raises(RuntimeError, match=r"Incorrect checksum"),
+    ):
+        download_drive_file(url, path, checksum="0" * 64)
+    assert not path.exists()
+    assert not tmp_path.joinpath("data.txt.tmp").exists()
 
 
 ##########################################
@@ -59,3 +234,351 @@ def test_download_url_to_file_progress_false(tmp_path: Path) -> None:
     path = tmp_path.joinpath("data.txt")
     download_url_to_file(url=url, dst=path, progress=False)
     assert load_text(path).startswith("# arctix")
+
+
+@requests_available
+@pytest.mark.parametrize("chunk_size", [1, 100, 1024 * 1024])
+def test_download_url_to_file_local(base_url: str, tmp_path: Path, chunk_size: int) -> None:
+    path = tmp_path.joinpath("data.bin")
+    download_url_to_file(url=f"{base_url}/range", dst=path, chunk_size=chunk_size)
+    assert path.read_bytes() == PAYLOAD
+    assert not tmp_path.joinpath("data.bin.tmp").exists()
+
+
+@requests_available
+def test_download_url_to_file_resume(
+    server: ThreadingHTTPServer, base_url: str, tmp_path: Path
+) -> None:
+    path = tmp_path.joinpath("data.bin")
+    tmp_path.joinpath("data.bin.tmp").write_bytes(PAYLOAD[:1000])
+    tmp_path.joinpath("data.bin.tmp.validator").write_text(ETAG)
+    download_url_to_file(url=f"{base_url}/range", dst=path, progress=False)
+    assert path.read_bytes() == PAYLOAD
+    assert server.requests == [("GET", "/range", "bytes=1000-")]
+
+
+@requests_available
+def test_download_url_to_file_resume_complete(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    tmp_path.joinpath("data.bin.tmp").write_bytes(PAYLOAD)
+    tmp_path.joinpath("data.bin.tmp.validator").write_text(ETAG)
+    download_url_to_file(url=f"{base_url}/range", dst=path, progress=False)
+    assert path.read_bytes() == PAYLOAD
+
+
+@requests_available
+def test_download_url_to_file_resume_changed(
+    server: ThreadingHTTPServer, base_url: str, tmp_path: Path
+) -> None:
+    path = tmp_path.joinpath("data.bin")
+    tmp_path.joinpath("data.bin.tmp").write_bytes(b"\0" * 1000)
+    tmp_path.joinpath("data.bin.tmp.validator").write_text('"v0"')
+    download_url_to_file(url=f"{base_url}/range", dst=path, progress=False)
+    # The object changed so the server sent the full object
+    assert path.read_bytes() == PAYLOAD
+    assert server.requests == [("GET", "/range", "bytes=1000-")]
+    assert not tmp_path.joinpath("data.bin.tmp.validator").exists()
+
+
+@requests_available
+def test_download_url_to_file_resume_no_validator(
+    server: ThreadingHTTPServer, base_url: str, tmp_path: Path
+) -> None:
+    path = tmp_path.joinpath("data.bin")
+    tmp_path.joinpath("data.bin.tmp").write_bytes(b"\0" * 1000)
+    download_url_to_file(url=f"{base_url}/range", dst=path, progress=False)
+    assert path.read_bytes() == PAYLOAD
+    assert server.requests == [("GET", "/range", None)]
+
+
+@requests_available
+def test_download_url_to_file_resume_too_large(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    tmp_path.joinpath("data.bin.tmp").write_bytes(PAYLOAD + b"abc")
+    tmp_path.joinpath("data.bin.tmp.validator").write_text(ETAG)
+    download_url_to_file(url=f"{base_url}/range", dst=path, progress=False)
+    assert path.read_bytes() == PAYLOAD
+
+
+@requests_available
+def test_download_url_to_file_resume_not_supported(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    tmp_path.joinpath("data.bin.tmp").write_bytes(b"abc")
+    download_url_to_file(url=f"{base_url}/full", dst=path, progress=False)
+    assert path.read_bytes() == PAYLOAD
+
+
+@requests_available
+def test_download_url_to_file_resume_false(
+    server: ThreadingHTTPServer, base_url: str, tmp_path: Path
+) -> None:
+    path = tmp_path.joinpath("data.bin")
+    tmp_path.joinpath("data.bin.tmp").write_bytes(b"abc")
+    download_url_to_file(url=f"{base_url}/range", dst=path, progress=False, resume=False)
+    assert path.read_bytes() == PAYLOAD
+    assert server.requests == [("GET", "/range", None)]
+
+
+@requests_available
+@pytest.mark.parametrize("num_segments", [2, 3, 7])
+def test_download_url_to_file_segments(
+    server: ThreadingHTTPServer, base_url: str, tmp_path: Path, num_segments: int
+) -> None:
+    path = tmp_path.joinpath("data.bin")
+    download_url_to_file(url=f"{base_url}/range", dst=path, num_segments=num_segments)
+    assert path.read_bytes() == PAYLOAD
+    assert len([req for req in server.requests if req[0] == "GET"]) == num_segments
+
+
+@requests_available
+def test_download_url_to_file_segments_not_supported(
+    server: ThreadingHTTPServer, base_url: str, tmp_path: Path
+) -> None:
+    path = tmp_path.joinpath("data.bin")
+    download_url_to_file(url=f"{base_url}/full", dst=path, num_segments=4)
+    assert path.read_bytes() == PAYLOAD
+    assert server.requests == [("HEAD", "/full", None), ("GET", "/full", None)]
+
+
+@requests_available
+def test_download_url_to_file_segments_full_response(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    with (
+        patch("arctix.utils.download._get_range_size", return_value=len(PAYLOAD)),
+        patch("arctix.utils.download.Path.open", autospec=True, side_effect=Path.open) as open_mock,
+        pytest.raises(RuntimeError, match=r"received status 200 instead of 206"),
+    ):
+        download_url_to_file(url=f"{base_url}/full", dst=path, num_segments=2)
+    # The file is only opened to lock and preallocate it, no segment is written
+    assert [call.kwargs["mode"] for call in open_mock.call_args_list] == ["a+b", "wb"]
+    assert not path.exists()
+
+
+@requests_available
+def test_download_url_to_file_segments_killed(
+    server: ThreadingHTTPServer, base_url: str, tmp_path: Path
+) -> None:
+    path = tmp_path.joinpath("data.bin")
+    url = f"{base_url}/slow"
+    server.release.clear()
+    process = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-c",
+            DOWNLOAD_SCRIPT,
+            url,
+            path.as_posix(),
+        ]
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not list(tmp_path.glob("data.bin.*")) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # The process is killed while the preallocated file is being written
+        assert list(tmp_path.glob("data.bin.*"))
+    finally:
+        process.kill()
+        process.wait()
+        server.release.set()
+    assert not tmp_path.joinpath("data.bin.tmp").exists()
+
+    download_url_to_file(url=url, dst=path, progress=False, num_segments=2)
+    assert path.read_bytes() == PAYLOAD
+
+
+@requests_available
+def test_download_url_to_file_segments_failed(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    with (
+        patch("arctix.utils.download.tqdm", side_effect=KeyboardInterrupt),
+        pytest.raises(KeyboardInterrupt),
+    ):
+        download_url_to_file(url=f"{base_url}/range", dst=path, num_segments=2)
+    assert list(tmp_path.iterdir()) == []
+
+    download_url_to_file(url=f"{base_url}/range", dst=path, progress=False, num_segments=2)
+    assert path.read_bytes() == PAYLOAD
+
+
+@requests_available
+def test_download_url_to_file_locked(
+    server: ThreadingHTTPServer, base_url: str, tmp_path: Path
+) -> None:
+    path = tmp_path.joinpath("data.bin")
+    tmp_path.joinpath("data.bin.tmp").write_bytes(PAYLOAD[:100])
+    with tmp_path.joinpath("data.bin.lock").open(mode="a+b") as lock:
+        # Another process is downloading the file
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        download_url_to_file(url=f"{base_url}/range", dst=path, progress=False)
+    assert path.read_bytes() == PAYLOAD
+    assert tmp_path.joinpath("data.bin.tmp").read_bytes() == PAYLOAD[:100]
+    assert server.requests == [("GET", "/range", None)]
+
+
+@requests_available
+def test_download_url_to_file_lock_removed(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    download_url_to_file(url=f"{base_url}/range", dst=path, progress=False)
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["data.bin"]
+
+
+@requests_available
+def test_download_url_to_file_incomplete(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    with (
+        patch("arctix.utils.download._get_expected_size", return_value=len(PAYLOAD) + 10),
+        pytest.raises(RuntimeError, match=r"Incomplete download of"),
+    ):
+        download_url_to_file(url=f"{base_url}/full", dst=path, progress=False)
+    assert not path.exists()
+    assert tmp_path.joinpath("data.bin.tmp").read_bytes() == PAYLOAD
+
+
+@requests_available
+def test_download_url_to_file_incomplete_validator(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    with (
+        patch("arctix.utils.download._get_expected_size", return_value=len(PAYLOAD) + 10),
+        pytest.raises(RuntimeError, match=r"Incomplete download of"),
+    ):
+        download_url_to_file(url=f"{base_url}/range", dst=path, progress=False)
+    # The validator is kept to resume the download
+    assert tmp_path.joinpath("data.bin.tmp.validator").read_text() == ETAG
+
+
+@requests_available
+def test_download_url_to_file_not_found(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    with pytest.raises(Exception, match=r"404"):
+        download_url_to_file(url=f"{base_url}/missing", dst=path, progress=False)
+    assert not path.exists()
+
+
+@requests_available
+def test_download_url_to_file_checksum(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    checksum = hashlib.sha256(PAYLOAD).hexdigest()
+    download_url_to_file(url=f"{base_url}/range", dst=path, progress=False, checksum=checksum)
+    assert path.read_bytes() == PAYLOAD
+
+
+@requests_available
+def test_download_url_to_file_incorrect_checksum(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    with pytest.raises(RuntimeError, match=r"Incorrect checksum"):
+        download_url_to_file(url=f"{base_url}/range", dst=path, checksum="0" * 64)
+    assert not path.exists()
+    assert not tmp_path.joinpath("data.bin.tmp").exists()
+
+
+@requests_available
+def test_download_url_to_file_cache_miss(base_url: str, tmp_path: Path, cache_dir: Path) -> None:
+    url = f"{base_url}/range"
+    path = tmp_path.joinpath("data.bin")
+    download_url_to_file(url=url, dst=path, progress=False)
+    assert path.read_bytes() == PAYLOAD
+    assert get_cache_path(url).read_bytes() == PAYLOAD
+    assert list(cache_dir.rglob("*-*")) == []
+
+
+@requests_available
+def test_download_url_to_file_cache_hit(
+    server: ThreadingHTTPServer, base_url: str, tmp_path: Path, cache_dir: Path
+) -> None:
+    url = f"{base_url}/range"
+    checksum = hashlib.sha256(PAYLOAD).hexdigest()
+    download_url_to_file(url=url, dst=tmp_path.joinpath("data1.bin"), checksum=checksum)
+    server.requests.clear()
+    path = tmp_path.joinpath("data2.bin")
+    download_url_to_file(url=f"{base_url}/missing", dst=path, checksum=checksum)
+    assert path.read_bytes() == PAYLOAD
+    assert server.requests == []
+    assert cache_dir.joinpath("sha256", checksum[:2], checksum).is_file()
+
+
+@requests_available
+def test_download_url_to_file_cache_write_error(
+    base_url: str, tmp_path: Path, cache_dir: Path
+) -> None:
+    cache_dir.write_text("not a directory")
+    path = tmp_path.joinpath("data.bin")
+    download_url_to_file(url=f"{base_url}/range", dst=path, progress=False)
+    assert path.read_bytes() == PAYLOAD
+
+
+####################################
+#     Tests for download_files     #
+####################################
+
+
+@requests_available
+@pytest.mark.parametrize("max_workers", [1, 2, 8])
+def test_download_files(base_url: str, tmp_path: Path, max_workers: int) -> None:
+    files = [(f"{base_url}/range", tmp_path.joinpath(f"data{i}.bin")) for i in range(5)]
+    paths = download_files(files, max_workers=max_workers)
+    assert paths == [path for _, path in files]
+    for path in paths:
+        assert path.read_bytes() == PAYLOAD
+
+
+@requests_available
+def test_download_files_progress_false(base_url: str, tmp_path: Path) -> None:
+    path = tmp_path.joinpath("data.bin")
+    assert download_files([(f"{base_url}/full", path)], progress=False) == [path]
+    assert path.read_bytes() == PAYLOAD
+
+
+def test_download_files_empty() -> None:
+    assert download_files([]) == []
+
+
+def test_download_files_download_fn_on_complete(tmp_path: Path) -> None:
+    completed = []
+
+    def download(url: str, path: Path) -> None:
+        path.write_text(url)
+
+    def on_complete(url: str, path: Path) -> None:
+        completed.append((url, path.read_text()))
+
+    files = [("a", tmp_path.joinpath("a.txt")), ("b", tmp_path.joinpath("b.txt"))]
+    assert download_files(files, download_fn=download, on_complete=on_complete) == [
+        tmp_path.joinpath("a.txt"),
+        tmp_path.joinpath("b.txt"),
+    ]
+    assert sorted(completed) == [("a", "a"), ("b", "b")]
+
+
+def test_download_files_bounded_concurrency(tmp_path: Path) -> None:
+    lock = threading.Lock()
+    state = {"running": 0, "max_running": 0}
+    barrier = threading.Barrier(2, timeout=5)
+
+    def download(url: str, path: Path) -> None:  # noqa: ARG001
+        with lock:
+            state["running"] += 1
+            state["max_running"] = max(state["max_running"], state["running"])
+        barrier.wait()
+        with lock:
+            state["running"] -= 1
+
+    files = [(str(i), tmp_path.joinpath(f"{i}.txt")) for i in range(6)]
+    download_files(files, download_fn=download, max_workers=2, progress=False)
+    assert state["max_running"] == 2
+
+
+def test_download_files_error(tmp_path: Path) -> None:
+    def download(url: str, path: Path) -> None:
+        if url == "b":
+            msg = "download failed"
+            raise RuntimeError(msg)
+        path.write_text(url)
+
+    files = [("a", tmp_path.joinpath("a.txt")), ("b", tmp_path.joinpath("b.txt"))]
+    with pytest.raises(RuntimeError, match=r"download failed"):
+        download_files(files, download_fn=download, max_workers=1)
+
+
+def test_download_files_incorrect_max_workers() -> None:
+    with pytest.raises(RuntimeError, match=r"max_workers must be greater than 0"):
+        download_files([], max_workers=0)
@@ -7,14 +7,17 @@ import pytest
 from arctix.utils.imports import (
     check_gdown,
     check_matplotlib,
+    check_pyarrow,
     check_requests,
     check_tqdm,
     gdown_available,
     is_gdown_available,
     is_matplotlib_available,
+    is_pyarrow_available,
     is_requests_available,
     is_tqdm_available,
     matplotlib_available,
+    pyarrow_available,
     requests_available,
     tqdm_available,
 )
@@ -132,6 +135,60 @@ def test_matplotlib_available_decorator_without_package() -> None:
         assert fn(2) is None
 
 
+###################
+#     pyarrow     #
+###################
+
+
+def test_check_pyarrow_with_package() -> None:
+    with patch("arctix.utils.imports.is_pyarrow_available", lambda: True):
+        check_pyarrow()
+
+
+def test_check_pyarrow_without_package() -> None:
+    with (
+        patch("arctix.utils.imports.is_pyarrow_available", lambda: False),
+        pytest.raises(RuntimeError, match=r"`pyarrow` package is required but not installed."),
+    ):
+        check_pyarrow()
+
+
+def test_is_pyarrow_available() -> None:
+    assert isinstance(is_pyarrow_available(), bool)
+
+
+def test_pyarrow_available_with_package() -> None:
+    with patch("arctix.utils.imports.is_pyarrow_available", lambda: True):
+        fn = pyarrow_available(my_function)
+        assert fn(2) == 44
+
+
+def test_pyarrow_available_without_package() -> None:
+    with patch("arctix.utils.imports.is_pyarrow_available", lambda: False):
+        fn = pyarrow_available(my_function)
+        assert fn(2) is None
+
+
+def test_pyarrow_available_decorator_with_package() -> None:
+    with patch("arctix.utils.imports.is_pyarrow_available", lambda: True):
+
+        @pyarrow_available
+        def fn(n: int = 0) -> int:
+            return 42 + n
+
+        assert fn(2) == 44
+
+
+def test_pyarrow_available_decorator_without_package() -> None:
+    with patch("arctix.utils.imports.is_pyarrow_available", lambda: False):
+
+        @pyarrow_available
+        def fn(n: int = 0) -> int:
+            return 42 + n
+
+        assert fn(2) is None
+
+
 ####################
 #     requests     #
 ####################
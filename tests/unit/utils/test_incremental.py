@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import os
+from collections import Counter
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import polars as pl
+import pytest
+from coola import objects_are_equal
+from polars.testing import assert_frame_equal
+
+from arctix.utils.incremental import STATE_FILENAME, count_tokens, prepare_incremental
+from arctix.utils.vocab import Vocabulary
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+
+def load_file(path: Path) -> dict[str, list]:
+    rows = [line.split() for line in path.read_text().splitlines() if line.strip()]
+    return {
+        "group": [row[0] for row in rows],
+        "token": [row[1] for row in rows],
+        "time": [float(row[2]) for row in rows],
+    }
+
+
+def combine(frame: pl.DataFrame) -> pl.DataFrame:
+    return frame.unique().sort(["group", "time"])
+
+
+def generate_metadata(counters: Mapping[str, Counter]) -> dict:
+    return {"vocab": Vocabulary(counters["vocab"]).sort_by_count()}
+
+
+def transform(frame: pl.DataFrame, metadata: dict) -> pl.DataFrame:
+    vocab = metadata["vocab"]
+    return (
+        frame.sort(["group", "time"])
+        .with_columns(
+            pl.col("time").diff().over("group").fill_null(0.0).alias("time_diff"),
+            pl.col("token")
+            .replace_strict(vocab.get_token_to_index(), return_dtype=pl.Int64)
+            .alias("token_id"),
+        )
+        .select(sorted([*frame.columns, "time_diff", "token_id"]))
+    )
+
+
+def prepare(frame: pl.DataFrame) -> tuple[pl.DataFrame, dict]:
+    metadata = generate_metadata(count_tokens(frame, {"vocab": "token"}))
+    return transform(frame, metadata), metadata
+
+
+def run(path: Path, cache_path: Path, prepare_fn: Mock | None = None) -> tuple[pl.DataFrame, dict]:
+    return prepare_incremental(
+        path,
+        sorted(file.name for file in path.iterdir()),
+        cache_path,
+        load_fn=load_file,
+        combine_fn=combine,
+        metadata_fn=generate_metadata,
+        prepare_fn=prepare_fn or transform,
+        vocab_cols={"vocab": "token"},
+        group_cols=["group"],
+        sort_cols=["group", "time"],
+    )
+
+
+def load_all(path: Path) -> pl.DataFrame:
+    return combine(pl.concat([pl.DataFrame(load_file(file)) for file in sorted(path.iterdir())]))
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    path = tmp_path.joinpath("data")
+    path.mkdir()
+    path.joinpath("a.txt").write_text("g1 x 1\ng1 y 3\ng2 x 2\n")
+    path.joinpath("b.txt").write_text("g2 y 5\ng3 x 1\ng3 x 4\n")
+    path.joinpath("c.txt").write_text("g4 z 2\ng4 x 3\n")
+    return path
+
+
+##################################
+#     Tests for count_tokens     #
+##################################
+
+
+def test_count_tokens() -> None:
+    assert count_tokens(
+        pl.DataFrame({"action": ["a", "b", "a"], "person": ["p1", "p1", "p2"]}),
+        {"vocab_action": "action", "vocab_person": "person"},
+    ) == {"vocab_action": Counter({"a": 2, "b": 1}), "vocab_person": Counter({"p1": 2, "p2": 1})}
+
+
+#########################################
+#     Tests for prepare_incremental     #
+#########################################
+
+
+def test_prepare_incremental(data_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    assert objects_are_equal(run(data_dir, cache_path), prepare(load_all(data_dir)))
+    assert cache_path.joinpath(STATE_FILENAME).is_file()
+    assert len(list(cache_path.joinpath("partials").iterdir())) == 3
+
+
+def test_prepare_incremental_unchanged(data_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    expected = run(data_dir, cache_path)
+    prepare_fn = Mock(wraps=transform)
+    assert objects_are_equal(run(data_dir, cache_path, prepare_fn), expected)
+    prepare_fn.assert_not_called()
+
+
+def test_prepare_incremental_touched_file(data_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    expected = run(data_dir, cache_path)
+    file = data_dir.joinpath("a.txt")
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    prepare_fn = Mock(wraps=transform)
+    assert objects_are_equal(run(data_dir, cache_path, prepare_fn), expected)
+    prepare_fn.assert_not_called()
+
+
+def test_prepare_incremental_changed_file(data_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    run(data_dir, cache_path)
+    # The vocabulary order is unchanged, so only the group g4 is prepared again
+    data_dir.joinpath("c.txt").write_text("g4 z 2\ng4 x 30\n")
+    prepare_fn = Mock(wraps=transform)
+    assert objects_are_equal(run(data_dir, cache_path, prepare_fn), prepare(load_all(data_dir)))
+    prepare_fn.assert_called_once()
+    assert prepare_fn.call_args.args[0]["group"].to_list() == ["g4", "g4"]
+    assert len(list(cache_path.joinpath("partials").iterdir())) == 3
+
+
+def test_prepare_incremental_changed_group_in_several_files(data_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    run(data_dir, cache_path)
+    # The group g2 is also in b.txt, so its rows are read from the cache
+    data_dir.joinpath("a.txt").write_text("g1 x 1\ng1 y 3\ng2 x 2.5\n")
+    prepare_fn = Mock(wraps=transform)
+    assert objects_are_equal(run(data_dir, cache_path, prepare_fn), prepare(load_all(data_dir)))
+    prepare_fn.assert_called_once()
+    assert prepare_fn.call_args.args[0]["group"].to_list() == ["g1", "g1", "g2", "g2"]
+
+
+def test_prepare_incremental_vocab_order_changed(data_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    run(data_dir, cache_path)
+    data_dir.joinpath("c.txt").write_text("g4 z 2\ng4 z 3\ng4 z 4\ng4 z 5\ng4 z 6\ng4 z 7\n")
+    prepare_fn = Mock(wraps=transform)
+    data, metadata = run(data_dir, cache_path, prepare_fn)
+    assert objects_are_equal((data, metadata), prepare(load_all(data_dir)))
+    assert metadata["vocab"].get_index_to_token() == ("z", "x", "y")
+    assert prepare_fn.call_args.args[0].shape[0] == 12
+
+
+def test_prepare_incremental_new_file(data_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    run(data_dir, cache_path)
+    data_dir.joinpath("d.txt").write_text("g5 y 1\n")
+    assert objects_are_equal(run(data_dir, cache_path), prepare(load_all(data_dir)))
+
+
+def test_prepare_incremental_new_empty_file(data_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    expected = run(data_dir, cache_path)
+    data_dir.joinpath("d.txt").write_text("")
+    assert objects_are_equal(run(data_dir, cache_path), expected)
+
+
+def test_prepare_incremental_removed_file(data_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    run(data_dir, cache_path)
+    data_dir.joinpath("c.txt").unlink()
+    prepare_fn = Mock(wraps=transform)
+    assert objects_are_equal(run(data_dir, cache_path, prepare_fn), prepare(load_all(data_dir)))
+    prepare_fn.assert_not_called()
+    assert len(list(cache_path.joinpath("partials").iterdir())) == 2
+
+
+def test_prepare_incremental_incomplete_cache(data_dir: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path.joinpath("cache")
+    run(data_dir, cache_path)
+    cache_path.joinpath("prepared.parquet").unlink()
+    data, metadata = run(data_dir, cache_path)
+    expected_data, expected_metadata = prepare(load_all(data_dir))
+    assert_frame_equal(data, expected_data)
+    assert objects_are_equal(metadata, expected_metadata)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from iden.io import load_json
+
+from arctix.utils.manifest import (
+    MANIFEST_FILENAME,
+    compute_file_record,
+    load_manifest,
+    verify_manifest,
+    write_manifest,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    tmp_path.joinpath("a.txt").write_bytes(b"abc")
+    tmp_path.joinpath("sub").mkdir()
+    tmp_path.joinpath("sub/b.txt").write_bytes(b"def" * 100)
+    return tmp_path
+
+
+def touch(path: Path, delta_ns: int = 1_000_000_000) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + delta_ns))
+
+
+#########################################
+#     Tests for compute_file_record     #
+#########################################
+
+
+def test_compute_file_record(data_dir: Path) -> None:
+    path = data_dir.joinpath("a.txt")
+    assert compute_file_record(path) == {
+        "size": 3,
+        "mtime_ns": path.stat().st_mtime_ns,
+        "sha256": hashlib.sha256(b"abc").hexdigest(),
+    }
+
+
+####################################
+#     Tests for write_manifest     #
+####################################
+
+
+def test_write_manifest(data_dir: Path) -> None:
+    manifest = write_manifest(data_dir, ["a.txt", "sub/b.txt"])
+    assert manifest == {
+        "a.txt": compute_file_record(data_dir.joinpath("a.txt")),
+        "sub/b.txt": compute_file_record(data_dir.joinpath("sub/b.txt")),
+    }
+    assert load_json(data_dir.joinpath(MANIFEST_FILENAME)) == manifest
+
+
+def test_write_manifest_overwrite(data_dir: Path) -> None:
+    write_manifest(data_dir, ["a.txt", "sub/b.txt"])
+    assert list(write_manifest(data_dir, ["a.txt"], max_workers=1)) == ["a.txt"]
+    assert list(load_manifest(data_dir)) == ["a.txt"]
+
+
+def test_write_manifest_missing_file(data_dir: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        write_manifest(data_dir, ["missing.txt"])
+
+
+###################################
+#     Tests for load_manifest     #
+###################################
+
+
+def test_load_manifest(data_dir: Path) -> None:
+    manifest = write_manifest(data_dir, ["a.txt"])
+    assert load_manifest(data_dir) == manifest
+
+
+def test_load_manifest_missing(tmp_path: Path) -> None:
+    assert load_manifest(tmp_path) is None
+
+
+#####################################
+#     Tests for verify_manifest     #
+#####################################
+
+
+def test_verify_manifest_true(data_dir: Path) -> None:
+    write_manifest(data_dir, ["a.txt", "sub/b.txt"])
+    with patch("arctix.utils.manifest.compute_file_record") as record_mock:
+        assert verify_manifest(data_dir)
+        assert verify_manifest(data_dir, ["sub/b.txt"])
+        record_mock.assert_not_called()
+
+
+def test_verify_manifest_missing_manifest(data_dir: Path) -> None:
+    assert not verify_manifest(data_dir, ["a.txt"])
+
+
+def test_verify_manifest_missing_file(data_dir: Path) -> None:
+    write_manifest(data_dir, ["a.txt", "sub/b.txt"])
+    data_dir.joinpath("a.txt").unlink()
+    assert not verify_manifest(data_dir)
+
+
+def test_verify_manifest_missing_record(data_dir: Path) -> None:
+    write_manifest(data_dir, ["a.txt"])
+    assert not verify_manifest(data_dir, ["a.txt", "sub/b.txt"])
+
+
+def test_verify_manifest_size_changed(data_dir: Path) -> None:
+    write_manifest(data_dir, ["a.txt"])
+    data_dir.joinpath("a.txt").write_bytes(b"abcd")
+    assert not verify_manifest(data_dir)
+
+
+def test_verify_manifest_content_changed(data_dir: Path) -> None:
+    write_manifest(data_dir, ["a.txt"])
+    data_dir.joinpath("a.txt").write_bytes(b"abd")
+    touch(data_dir.joinpath("a.txt"))
+    assert not verify_manifest(data_dir)
+
+
+def test_verify_manifest_mtime_changed(data_dir: Path) -> None:
+    write_manifest(data_dir, ["a.txt", "sub/b.txt"])
+    touch(data_dir.joinpath("a.txt"))
+    assert verify_manifest(data_dir)
+    assert load_manifest(data_dir)["a.txt"]["mtime_ns"] == (
+        data_dir.joinpath("a.txt").stat().st_mtime_ns
+    )
+    # The updated record is trusted without hashing the file again
+    with patch("arctix.utils.manifest.compute_file_record") as record_mock:
+        assert verify_manifest(data_dir)
+        record_mock.assert_not_called()
+
+
+def test_verify_manifest_mtime_changed_update_false(data_dir: Path) -> None:
+    manifest = write_manifest(data_dir, ["a.txt"])
+    touch(data_dir.joinpath("a.txt"))
+    assert verify_manifest(data_dir, update=False, max_workers=1)
+    assert load_manifest(data_dir) == manifest
+
+
+def test_verify_manifest_mtime_changed_read_only(data_dir: Path) -> None:
+    manifest = write_manifest(data_dir, ["a.txt"])
+    touch(data_dir.joinpath("a.txt"))
+    with patch("arctix.utils.manifest.save_json", side_effect=PermissionError("read-only")):
+        assert verify_manifest(data_dir)
+    assert load_manifest(data_dir) == manifest
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 import numpy as np
+import polars as pl
+import pytest
+from coola import objects_are_equal
 
-from arctix.utils.masking import convert_sequences_to_array, generate_mask_from_lengths
+from arctix.utils.masking import (
+    convert_list_series_to_masked_array,
+    convert_sequences_to_array,
+    generate_mask_from_lengths,
+)
 
 ################################################
 #     Tests for convert_sequences_to_array     #
@@ -122,3 +129,97 @@ def test_generate_mask_from_lengths_batch_size_1() -> None:
     assert np.array_equal(
         generate_mask_from_lengths(np.array([4])), np.array([[False, False, False, False]])
     )
+
+
+#########################################################
+#     Tests for convert_list_series_to_masked_array     #
+#########################################################
+
+
+def test_convert_list_series_to_masked_array_int() -> None:
+    assert objects_are_equal(
+        convert_list_series_to_masked_array(pl.Series([[1, 2, 3], [4], [5, 6]])),
+        np.ma.masked_array(
+            data=np.array([[1, 2, 3], [4, -1, -1], [5, 6, -1]]),
+            mask=np.array([[False, False, False], [False, True, True], [False, False, True]]),
+        ),
+    )
+
+
+def test_convert_list_series_to_masked_array_float() -> None:
+    assert objects_are_equal(
+        convert_list_series_to_masked_array(pl.Series([[1.5], [], [2.0, 3.0]])),
+        np.ma.masked_array(
+            data=np.array([[1.5, -1.0], [-1.0, -1.0], [2.0, 3.0]]),
+            mask=np.array([[False, True], [True, True], [False, False]]),
+        ),
+    )
+
+
+def test_convert_list_series_to_masked_array_str() -> None:
+    assert objects_are_equal(
+        convert_list_series_to_masked_array(pl.Series([["polar", "bear"], ["cat"]])),
+        np.ma.masked_array(
+            data=np.array([["polar", "bear"], ["cat", "N/A"]]),
+            mask=np.array([[False, False], [False, True]]),
+        ),
+    )
+
+
+def test_convert_list_series_to_masked_array_padded_value() -> None:
+    assert objects_are_equal(
+        convert_list_series_to_masked_array(pl.Series([[1, 2], [3]]), padded_value=0),
+        np.ma.masked_array(
+            data=np.array([[1, 2], [3, 0]]), mask=np.array([[False, False], [False, True]])
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    ("dtype", "expected"),
+    [(pl.UInt8, np.int16), (pl.UInt16, np.int32), (pl.UInt32, np.int64)],
+)
+def test_convert_list_series_to_masked_array_unsigned(
+    dtype: pl.DataType, expected: np.dtype
+) -> None:
+    out = convert_list_series_to_masked_array(pl.Series([[1, 2], [3]], dtype=pl.List(dtype)))
+    assert objects_are_equal(
+        out,
+        np.ma.masked_array(
+            data=np.array([[1, 2], [3, -1]], dtype=expected),
+            mask=np.array([[False, False], [False, True]]),
+        ),
+    )
+
+
+def test_convert_list_series_to_masked_array_unsigned_padded_value() -> None:
+    out = convert_list_series_to_masked_array(
+        pl.Series([[1, 2], [3]], dtype=pl.List(pl.UInt32)), padded_value=0
+    )
+    assert out.dtype == np.uint32
+    assert objects_are_equal(out.data, np.array([[1, 2], [3, 0]], dtype=np.uint32))
+
+
+def test_convert_list_series_to_masked_array_padded_value_too_large() -> None:
+    out = convert_list_series_to_masked_array(
+        pl.Series([[1, 2], [3]], dtype=pl.List(pl.Int8)), padded_value=1000
+    )
+    assert objects_are_equal(out.data, np.array([[1, 2], [3, 1000]], dtype=np.int32))
+
+
+def test_convert_list_series_to_masked_array_uint64() -> None:
+    with pytest.raises(RuntimeError, match=r"The padded value -1 does not fit"):
+        convert_list_series_to_masked_array(pl.Series([[1, 2], [3]], dtype=pl.List(pl.UInt64)))
+
+
+def test_convert_list_series_to_masked_array_nested() -> None:
+    out = convert_list_series_to_masked_array(pl.Series([[[1], [2, 3]], [[4]]]))
+    assert out.dtype == np.object_
+    assert out.shape == (2, 2)
+    assert objects_are_equal(out.mask, np.array([[False, False], [False, True]]))
+    assert objects_are_equal(out[0, 1], [2, 3])
+
+
+def test_convert_list_series_to_masked_array_empty() -> None:
+    out = convert_list_series_to_masked_array(pl.Series([], dtype=pl.List(pl.Int64)))
+    assert out.shape == (0, 0)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, ClassVar
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+from coola import objects_are_equal
+from polars.testing import assert_frame_equal
+
+from arctix.dataset.multithumos import Preprocessor as MultiThumosPreprocessor
+from arctix.utils.preprocessor import BasePreprocessor
+from arctix.utils.vocab import Vocabulary
+
+if TYPE_CHECKING:
+    from collections import Counter
+    from collections.abc import Mapping
+    from pathlib import Path
+
+
+class Preprocessor(BasePreprocessor):
+    vocab_cols: ClassVar[Mapping[str, str]] = {"vocab": "token"}
+
+    def _generate_metadata(self, counters: Mapping[str, Counter]) -> dict:
+        return {"vocab": Vocabulary(counters["vocab"]).sort_by_count()}
+
+    def _transform(self, frame: pl.DataFrame, metadata: dict, split: str) -> pl.DataFrame:
+        if split != "all":
+            frame = frame.filter(pl.col("split") == split)
+        return frame.with_columns(
+            pl.col("token")
+            .replace_strict(metadata["vocab"].get_token_to_index(), return_dtype=pl.Int64)
+            .alias("token_id")
+        )
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {"split": ["train", "train", "train", "test"], "token": ["b", "a", "b", "a"]}
+    )
+
+
+@pytest.fixture
+def vocab() -> Vocabulary:
+    return Vocabulary.from_token_to_index({"b": 0, "a": 1})
+
+
+######################################
+#     Tests for BasePreprocessor     #
+######################################
+
+
+def test_preprocessor_repr() -> None:
+    assert repr(Preprocessor()) == "Preprocessor(is_fitted=False)"
+
+
+def test_preprocessor_is_fitted(frame: pl.DataFrame) -> None:
+    preprocessor = Preprocessor()
+    assert not preprocessor.is_fitted
+    assert preprocessor.fit(frame) is preprocessor
+    assert preprocessor.is_fitted
+
+
+def test_preprocessor_metadata_not_fitted() -> None:
+    with pytest.raises(RuntimeError, match=r"Preprocessor is not fitted"):
+        Preprocessor().metadata  # noqa: B018
+
+
+def test_preprocessor_fit(frame: pl.DataFrame) -> None:
+    metadata = Preprocessor().fit(frame.head(3)).metadata
+    assert metadata["vocab"].get_index_to_token() == ("b", "a")
+    assert metadata["vocab"].counter == {"b": 2, "a": 1}
+
+
+def test_preprocessor_transform(frame: pl.DataFrame, vocab: Vocabulary) -> None:
+    assert_frame_equal(
+        Preprocessor(metadata={"vocab": vocab}).transform(frame, split="test"),
+        pl.DataFrame({"split": ["test"], "token": ["a"], "token_id": [1]}),
+    )
+
+
+def test_preprocessor_transform_does_not_count_tokens(frame: pl.DataFrame) -> None:
+    preprocessor = Preprocessor().fit(frame)
+    with patch("arctix.utils.preprocessor.count_tokens") as count_mock:
+        preprocessor.transform(frame)
+    count_mock.assert_not_called()
+
+
+def test_preprocessor_transform_not_fitted(frame: pl.DataFrame) -> None:
+    with pytest.raises(RuntimeError, match=r"Preprocessor is not fitted"):
+        Preprocessor().transform(frame)
+
+
+def test_preprocessor_fit_transform(frame: pl.DataFrame) -> None:
+    preprocessor = Preprocessor()
+    assert_frame_equal(
+        preprocessor.fit_transform(frame, split="test"),
+        pl.DataFrame({"split": ["test"], "token": ["a"], "token_id": [1]}),
+    )
+    # The metadata are generated before filtering the split
+    assert preprocessor.metadata["vocab"].counter == {"a": 2, "b": 2}
+
+
+def test_preprocessor_transform_shards(frame: pl.DataFrame, vocab: Vocabulary) -> None:
+    preprocessor = Preprocessor(metadata={"vocab": vocab})
+    out = preprocessor.transform_shards([frame.head(2), frame.tail(2)], max_workers=1)
+    assert len(out) == 2
+    assert_frame_equal(pl.concat(out), preprocessor.transform(frame))
+
+
+def test_preprocessor_transform_shards_multiprocessing() -> None:
+    frame = pl.DataFrame(
+        {
+            "action": ["dribble", "guard", "dribble", "guard"],
+            "end_time": [5.4, 76.4, 18.33, 20.49],
+            "start_time": [1.5, 72.8, 17.57, 20.22],
+            "video": ["video_validation_1", "video_validation_1", "video_test_2", "video_test_2"],
+        }
+    )
+    preprocessor = MultiThumosPreprocessor().fit(frame)
+    out = preprocessor.transform_shards([frame.head(2), frame.tail(2)], max_workers=2)
+    assert_frame_equal(pl.concat(out).sort("video"), preprocessor.transform(frame).sort("video"))
+
+
+def test_preprocessor_transform_shards_not_fitted(frame: pl.DataFrame) -> None:
+    with pytest.raises(RuntimeError, match=r"Preprocessor is not fitted"):
+        Preprocessor().transform_shards([frame])
+
+
+def test_preprocessor_save_load(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("preprocessor.json")
+    preprocessor = Preprocessor().fit(frame.head(3))
+    preprocessor.save(path)
+    loaded = Preprocessor.load(path)
+    assert isinstance(loaded, Preprocessor)
+    assert objects_are_equal(loaded.metadata, preprocessor.metadata)
+    assert_frame_equal(loaded.transform(frame), preprocessor.transform(frame))
+
+
+def test_preprocessor_save_overwrite(tmp_path: Path, frame: pl.DataFrame) -> None:
+    path = tmp_path.joinpath("preprocessor.json")
+    Preprocessor().fit(frame).save(path)
+    Preprocessor().fit(frame.head(3)).save(path)
+    assert Preprocessor.load(path).metadata["vocab"].counter == {"b": 2, "a": 1}
+
+
+def test_preprocessor_save_not_fitted(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError, match=r"Preprocessor is not fitted"):
+        Preprocessor().save(tmp_path.joinpath("preprocessor.json"))
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from arctix.testing import tqdm_available
+from arctix.utils.progress import tqdm
+
+
+@tqdm_available
+def test_tqdm() -> None:
+    assert list(tqdm([1, 2, 3, 4], disable=True)) == [1, 2, 3, 4]
+
+
+@tqdm_available
+def test_tqdm_wraps_tqdm() -> None:
+    with patch("tqdm.tqdm") as tqdm_mock:
+        tqdm([1, 2, 3], desc="abc")
+        tqdm_mock.assert_called_once_with([1, 2, 3], desc="abc")
+
+
+def test_tqdm_not_available() -> None:
+    x = [1, 2, 3, 4]
+    with patch("arctix.utils.progress.is_tqdm_available", lambda: False):
+        assert tqdm(x, desc="abc") is x
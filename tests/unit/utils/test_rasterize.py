@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import numpy as np
+import polars as pl
+import pytest
+from coola import objects_are_equal
+
+from arctix.utils.rasterize import (
+    SparseFrameLabels,
+    compute_frame_bounds,
+    rasterize_segments,
+)
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "video": ["v2", "v1", "v1", "v1"],
+            "start_time": [0.0, 0.0, 2.0, 1.0],
+            "end_time": [1.0, 4.0, 3.0, 2.5],
+            "action_id": [1, 0, 1, 2],
+        }
+    )
+
+
+@pytest.fixture
+def sparse_labels(frame: pl.DataFrame) -> SparseFrameLabels:
+    return SparseFrameLabels.from_frame(
+        frame,
+        group_cols=["video"],
+        start_col="start_time",
+        end_col="end_time",
+        label_col="action_id",
+    )
+
+
+#######################################
+#     Tests for SparseFrameLabels     #
+#######################################
+
+
+def test_sparse_frame_labels_repr(sparse_labels: SparseFrameLabels) -> None:
+    assert (
+        repr(sparse_labels)
+        == "SparseFrameLabels(num_sequences=2, num_activations=4, num_classes=3)"
+    )
+
+
+def test_sparse_frame_labels_len(sparse_labels: SparseFrameLabels) -> None:
+    assert len(sparse_labels) == 2
+
+
+def test_sparse_frame_labels_num_classes(sparse_labels: SparseFrameLabels) -> None:
+    assert sparse_labels.num_classes == 3
+
+
+def test_sparse_frame_labels_sequence_index(sparse_labels: SparseFrameLabels) -> None:
+    assert sparse_labels.sequence_index.keys() == ["v1", "v2"]
+
+
+def test_sparse_frame_labels_get_activations(sparse_labels: SparseFrameLabels) -> None:
+    assert objects_are_equal(
+        sparse_labels.get_activations("v1"),
+        (np.array([0, 1, 2]), np.array([4, 3, 3]), np.array([0, 2, 1])),
+    )
+
+
+def test_sparse_frame_labels_get_activations_missing_key(
+    sparse_labels: SparseFrameLabels,
+) -> None:
+    with pytest.raises(KeyError):
+        sparse_labels.get_activations("v3")
+
+
+def test_sparse_frame_labels_get_num_frames(sparse_labels: SparseFrameLabels) -> None:
+    assert sparse_labels.get_num_frames("v1") == 4
+    assert sparse_labels.get_num_frames("v2") == 1
+
+
+def test_sparse_frame_labels_to_dense(sparse_labels: SparseFrameLabels) -> None:
+    assert objects_are_equal(
+        sparse_labels.to_dense("v1"),
+        np.array(
+            [[True, False, False], [True, False, True], [True, True, True], [True, False, False]]
+        ),
+    )
+
+
+def test_sparse_frame_labels_to_dense_window(sparse_labels: SparseFrameLabels) -> None:
+    assert objects_are_equal(
+        sparse_labels.to_dense("v1", start=2, end=6),
+        np.array([[True, True, True], [True, False, False], [False, False, False], [False] * 3]),
+    )
+
+
+def test_sparse_frame_labels_to_dense_empty_window(sparse_labels: SparseFrameLabels) -> None:
+    assert sparse_labels.to_dense("v1", start=2, end=2).shape == (0, 3)
+
+
+def test_sparse_frame_labels_to_dense_batch(sparse_labels: SparseFrameLabels) -> None:
+    assert objects_are_equal(
+        sparse_labels.to_dense_batch(["v1", "v2"], starts=[2, 0], window_size=2),
+        np.ma.masked_array(
+            data=np.array(
+                [
+                    [[True, True, True], [True, False, False]],
+                    [[False, True, False], [False, False, False]],
+                ]
+            ),
+            mask=np.array([[[False] * 3, [False] * 3], [[False] * 3, [True] * 3]]),
+        ),
+    )
+
+
+def test_sparse_frame_labels_to_dense_matches_rasterize_segments() -> None:
+    rng = np.random.default_rng(42)
+    starts = rng.uniform(0, 50, size=100)
+    frame = pl.DataFrame(
+        {
+            "video": rng.integers(0, 4, size=100),
+            "start": starts,
+            "end": starts + rng.uniform(0, 10, size=100),
+            "action_id": rng.integers(0, 5, size=100),
+        }
+    )
+    kwargs = {
+        "group_cols": ["video"],
+        "start_col": "start",
+        "end_col": "end",
+        "label_col": "action_id",
+        "fps": 2.5,
+        "num_classes": 5,
+    }
+    dense = rasterize_segments(frame, multi_hot=True, **kwargs)
+    sparse = SparseFrameLabels.from_frame(frame, **kwargs)
+    for i, key in enumerate(sparse.sequence_index.keys()):
+        num_frames = sparse.get_num_frames(key)
+        assert objects_are_equal(sparse.to_dense(key), dense.data[i, :num_frames])
+
+
+def test_sparse_frame_labels_from_frame_num_classes(frame: pl.DataFrame) -> None:
+    assert (
+        SparseFrameLabels.from_frame(
+            frame,
+            group_cols=["video"],
+            start_col="start_time",
+            end_col="end_time",
+            label_col="action_id",
+            num_classes=65,
+        ).num_classes
+        == 65
+    )
+
+
+##########################################
+#     Tests for compute_frame_bounds     #
+##########################################
+
+
+def test_compute_frame_bounds() -> None:
+    assert objects_are_equal(
+        compute_frame_bounds([0.0, 1.5, 2.2], [1.5, 2.2, 4.0], fps=2.0),
+        (np.array([0, 3, 5]), np.array([3, 5, 8])),
+    )
+
+
+def test_compute_frame_bounds_stride() -> None:
+    assert objects_are_equal(
+        compute_frame_bounds([0.0, 1.0, 2.2], [1.0, 2.2, 4.0], fps=10.0, stride=5),
+        (np.array([0, 2, 5]), np.array([2, 5, 8])),
+    )
+
+
+def test_compute_frame_bounds_float_error() -> None:
+    assert objects_are_equal(
+        compute_frame_bounds([0.2], [0.6], fps=5.0), (np.array([1]), np.array([3]))
+    )
+
+
+def test_compute_frame_bounds_negative() -> None:
+    assert objects_are_equal(compute_frame_bounds([-1.0], [2.0]), (np.array([0]), np.array([2])))
+
+
+########################################
+#     Tests for rasterize_segments     #
+########################################
+
+
+def test_rasterize_segments(frame: pl.DataFrame) -> None:
+    assert objects_are_equal(
+        rasterize_segments(
+            frame,
+            group_cols=["video"],
+            start_col="start_time",
+            end_col="end_time",
+            label_col="action_id",
+        ),
+        np.ma.masked_array(
+            data=np.array([[0, 2, 1, 0], [1, -1, -1, -1]]),
+            mask=np.array([[False, False, False, False], [False, True, True, True]]),
+        ),
+    )
+
+
+def test_rasterize_segments_fps(frame: pl.DataFrame) -> None:
+    assert objects_are_equal(
+        rasterize_segments(
+            frame,
+            group_cols=["video"],
+            start_col="start_time",
+            end_col="end_time",
+            label_col="action_id",
+            fps=2.0,
+            stride=2,
+        ),
+        np.ma.masked_array(
+            data=np.array([[0, 2, 1, 0], [1, -1, -1, -1]]),
+            mask=np.array([[False, False, False, False], [False, True, True, True]]),
+        ),
+    )
+
+
+def test_rasterize_segments_background() -> None:
+    frame = pl.DataFrame(
+        {"video": ["v1", "v1"], "start": [0, 3], "end": [1, 5], "action_id": [4, 2]}
+    )
+    assert objects_are_equal(
+        rasterize_segments(
+            frame,
+            group_cols=["video"],
+            start_col="start",
+            end_col="end",
+            label_col="action_id",
+            background=7,
+        ),
+        np.ma.masked_array(
+            data=np.array([[4, 7, 7, 2, 2]]), mask=np.array([[False, False, False, False, False]])
+        ),
+    )
+
+
+def test_rasterize_segments_num_frames(frame: pl.DataFrame) -> None:
+    assert objects_are_equal(
+        rasterize_segments(
+            frame,
+            group_cols=["video"],
+            start_col="start_time",
+            end_col="end_time",
+            label_col="action_id",
+            num_frames=2,
+        ),
+        np.ma.masked_array(
+            data=np.array([[0, 2], [1, -1]]),
+            mask=np.array([[False, False], [False, True]]),
+        ),
+    )
+
+
+def test_rasterize_segments_multiple_group_cols() -> None:
+    frame = pl.DataFrame(
+        {
+            "person": ["P1", "P1", "P1"],
+            "activity": ["tea", "coffee", "tea"],
+            "start": [0, 0, 1],
+            "end": [1, 2, 2],
+            "action_id": [0, 1, 2],
+        }
+    )
+    assert objects_are_equal(
+        rasterize_segments(
+            frame,
+            group_cols=["person", "activity"],
+            start_col="start",
+            end_col="end",
+            label_col="action_id",
+        ),
+        np.ma.masked_array(
+            data=np.array([[1, 1], [0, 2]]), mask=np.array([[False, False], [False, False]])
+        ),
+    )
+
+
+def test_rasterize_segments_multi_hot(frame: pl.DataFrame) -> None:
+    assert objects_are_equal(
+        rasterize_segments(
+            frame,
+            group_cols=["video"],
+            start_col="start_time",
+            end_col="end_time",
+            label_col="action_id",
+            multi_hot=True,
+        ),
+        np.ma.masked_array(
+            data=np.array(
+                [
+                    [
+                        [True, False, False],
+                        [True, False, True],
+                        [True, True, True],
+                        [True, False, False],
+                    ],
+                    [
+                        [False, True, False],
+                        [False, False, False],
+                        [False, False, False],
+                        [False, False, False],
+                    ],
+                ]
+            ),
+            mask=np.array(
+                [
+                    [[False] * 3, [False] * 3, [False] * 3, [False] * 3],
+                    [[False] * 3, [True] * 3, [True] * 3, [True] * 3],
+                ]
+            ),
+        ),
+    )
+
+
+def test_rasterize_segments_multi_hot_num_classes(frame: pl.DataFrame) -> None:
+    assert rasterize_segments(
+        frame,
+        group_cols=["video"],
+        start_col="start_time",
+        end_col="end_time",
+        label_col="action_id",
+        multi_hot=True,
+        num_classes=5,
+    ).shape == (2, 4, 5)
+
+
+def test_rasterize_segments_ignore_nulls() -> None:
+    frame = pl.DataFrame(
+        {"video": ["v1", "v1"], "start": [0, None], "end": [2, 3], "action_id": [1, 0]}
+    )
+    assert objects_are_equal(
+        rasterize_segments(
+            frame, group_cols=["video"], start_col="start", end_col="end", label_col="action_id"
+        ),
+        np.ma.masked_array(data=np.array([[1, 1]]), mask=np.array([[False, False]])),
+    )
+
+
+def test_rasterize_segments_empty() -> None:
+    frame = pl.DataFrame(
+        {"video": [], "start": [], "end": [], "action_id": []},
+        schema={"video": pl.String, "start": pl.Float64, "end": pl.Float64, "action_id": pl.Int64},
+    )
+    assert rasterize_segments(
+        frame, group_cols=["video"], start_col="start", end_col="end", label_col="action_id"
+    ).shape == (0, 0)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import numpy as np
+import polars as pl
+import pytest
+from coola import objects_are_equal
+
+from arctix.utils.window import (
+    create_anticipation_windows,
+    gather_windows,
+    generate_window_indices,
+)
+
+#############################################
+#     Tests for generate_window_indices     #
+#############################################
+
+
+def test_generate_window_indices() -> None:
+    assert objects_are_equal(
+        generate_window_indices([5, 2, 4], history=2, future=1),
+        (np.array([0, 0, 0, 2, 2]), np.array([0, 1, 2, 0, 1]), np.array([3, 4, 5, 3, 4])),
+    )
+
+
+def test_generate_window_indices_no_future() -> None:
+    assert objects_are_equal(
+        generate_window_indices([3, 1], history=1),
+        (np.array([0, 0, 0, 1]), np.array([0, 1, 2, 0]), np.array([1, 2, 3, 1])),
+    )
+
+
+def test_generate_window_indices_stride() -> None:
+    assert objects_are_equal(
+        generate_window_indices([7], history=2, future=1, stride=2),
+        (np.array([0, 0, 0]), np.array([0, 2, 4]), np.array([3, 5, 7])),
+    )
+
+
+def test_generate_window_indices_min_history() -> None:
+    assert objects_are_equal(
+        generate_window_indices([4, 1], history=3, future=1, min_history=1),
+        (np.array([0, 0, 0]), np.array([-2, -1, 0]), np.array([2, 3, 4])),
+    )
+
+
+def test_generate_window_indices_min_history_zero() -> None:
+    assert objects_are_equal(
+        generate_window_indices([2], history=2, future=1, min_history=0),
+        (np.array([0, 0]), np.array([-2, -1]), np.array([1, 2])),
+    )
+
+
+def test_generate_window_indices_empty() -> None:
+    assert objects_are_equal(
+        generate_window_indices([], history=2, future=1),
+        (np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([], dtype=np.int64)),
+    )
+
+
+def test_generate_window_indices_too_short() -> None:
+    sequence_ids, _, _ = generate_window_indices([1, 2], history=2, future=1)
+    assert sequence_ids.shape == (0,)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"history": 0},
+        {"history": 2, "future": -1},
+        {"history": 2, "stride": 0},
+        {"history": 2, "min_history": 3},
+        {"history": 2, "min_history": -1},
+    ],
+)
+def test_generate_window_indices_incorrect_parameters(kwargs: dict) -> None:
+    with pytest.raises(RuntimeError, match="Incorrect window parameters"):
+        generate_window_indices([5], **kwargs)
+
+
+def test_generate_window_indices_large() -> None:
+    lengths = np.random.default_rng(42).integers(0, 100, size=10000)
+    sequence_ids, starts, ends = generate_window_indices(lengths, history=4, future=2, stride=3)
+    assert sequence_ids.shape == starts.shape == ends.shape
+    assert np.all(starts >= 0)
+    assert np.all(ends <= lengths[sequence_ids])
+    assert np.all(ends - starts == 6)
+
+
+####################################
+#     Tests for gather_windows     #
+####################################
+
+
+def test_gather_windows() -> None:
+    assert objects_are_equal(
+        gather_windows(
+            np.array([1, 2, 3, 4, 5, 6]),
+            lengths=[4, 2],
+            sequence_ids=np.array([0, 0, 1]),
+            starts=np.array([0, 2, -1]),
+            window_size=2,
+        ),
+        np.ma.masked_array(
+            data=np.array([[1, 2], [3, 4], [1, 5]]),
+            mask=np.array([[False, False], [False, False], [True, False]]),
+        ),
+    )
+
+
+def test_gather_windows_after_end() -> None:
+    assert objects_are_equal(
+        gather_windows(
+            np.array([1, 2, 3]),
+            lengths=[2, 1],
+            sequence_ids=np.array([0]),
+            starts=np.array([1]),
+            window_size=2,
+        ),
+        np.ma.masked_array(data=np.array([[2, 1]]), mask=np.array([[False, True]])),
+    )
+
+
+def test_gather_windows_2d() -> None:
+    assert objects_are_equal(
+        gather_windows(
+            np.array([[1, 2], [3, 4], [5, 6]]),
+            lengths=[3],
+            sequence_ids=np.array([0]),
+            starts=np.array([-1]),
+            window_size=2,
+        ),
+        np.ma.masked_array(
+            data=np.array([[[1, 2], [1, 2]]]), mask=np.array([[[True, True], [False, False]]])
+        ),
+    )
+
+
+def test_gather_windows_empty() -> None:
+    assert gather_windows(
+        np.array([1, 2, 3]),
+        lengths=[3],
+        sequence_ids=np.array([], dtype=np.int64),
+        starts=np.array([], dtype=np.int64),
+        window_size=2,
+    ).shape == (0, 2)
+
+
+#################################################
+#     Tests for create_anticipation_windows     #
+#################################################
+
+
+def test_create_anticipation_windows() -> None:
+    frame = pl.DataFrame(
+        {
+            "clip": ["c2", "c1", "c1", "c2", "c1", "c1"],
+            "verb_id": [5, 1, 2, 6, 3, 4],
+            "noun_id": [50, 10, 20, 60, 30, 40],
+        }
+    )
+    assert objects_are_equal(
+        create_anticipation_windows(
+            frame,
+            group_cols=["clip"],
+            columns=["verb_id", "noun_id"],
+            history=2,
+            future=1,
+            min_history=1,
+        ),
+        {
+            "sequence_id": np.array([0, 0, 0, 1]),
+            "anchor": np.array([1, 2, 3, 1]),
+            "history_verb_id": np.ma.masked_array(
+                data=np.array([[1, 1], [1, 2], [2, 3], [1, 5]]),
+                mask=np.array([[True, False], [False, False], [False, False], [True, False]]),
+            ),
+            "future_verb_id": np.ma.masked_array(
+                data=np.array([[2], [3], [4], [6]]),
+                mask=np.array([[False], [False], [False], [False]]),
+            ),
+            "history_noun_id": np.ma.masked_array(
+                data=np.array([[10, 10], [10, 20], [20, 30], [10, 50]]),
+                mask=np.array([[True, False], [False, False], [False, False], [True, False]]),
+            ),
+            "future_noun_id": np.ma.masked_array(
+                data=np.array([[20], [30], [40], [60]]),
+                mask=np.array([[False], [False], [False], [False]]),
+            ),
+        },
+    )
+
+
+def test_create_anticipation_windows_multiple_future() -> None:
+    frame = pl.DataFrame({"clip": ["c1"] * 5, "verb_id": [1, 2, 3, 4, 5]})
+    windows = create_anticipation_windows(
+        frame, group_cols=["clip"], columns=["verb_id"], history=2, future=2, stride=2
+    )
+    assert objects_are_equal(
+        windows["future_verb_id"],
+        np.ma.masked_array(data=np.array([[3, 4]]), mask=np.array([[False, False]])),
+    )